@@ -67,6 +67,9 @@ def main():
     # ------------------------------------------------------------------
     root.mainloop()
 
+    # Encerra health-check e pool do Mongo
+    datastore.close()
+
 
 if __name__ == "__main__":
     main()
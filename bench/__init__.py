@@ -0,0 +1,14 @@
+"""
+Benchmarks e demonstrações (fora do código da aplicação).
+
+Cada módulo roda sozinho, sobre dados sintéticos num diretório temporário:
+
+    python -m bench.table 1000000          memória: lista de dicts × CandidaturaTable
+    python -m bench.autocomplete 100000    tempo por consulta do autocompletar
+    python -m bench.analytics 1000000      contagem por status: DataFrame × cópia colunar
+    python -m bench.importer 200000        vazão do importador (linhas/s)
+    python -m bench.dashboard 100000       tempo até o primeiro gráfico, com e sem fotografia
+    python -m bench.render_cache           desenho completo × acerto no cache de bitmaps
+    python -m bench.csv_stress             vários processos gravando no mesmo CSV
+    python -m bench.linkcheck              verificação de links contra um servidor local
+"""
@@ -0,0 +1,87 @@
+"""
+Contagem por status com 1 milhão de registros (core/analytics.py): lista
+de dicts → DataFrame × fotografia colunar mapeada.
+
+    python -m bench.analytics 1000000
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from bench.data import synthetic_rows
+from core.analytics import AnalyticsSnapshot, Builder, _import_arrow, status_counts
+
+
+def run(n: int, runs: int = 5):
+    import pandas as pd
+
+    if _import_arrow() is None:
+        raise SystemExit("pyarrow não está instalado (pip install pyarrow)")
+
+    rows = list(synthetic_rows(n))
+    tmp = Path(tempfile.mkdtemp(prefix="analytics-bench-"))
+    try:
+        snap = AnalyticsSnapshot(tmp / "analytics")
+        t0 = time.perf_counter()
+        builder = Builder()
+        builder.extend(rows)
+        snap.write([], [builder.table()], rows=n, archived=0)
+        build = time.perf_counter() - t0
+        del builder
+
+        def from_dicts():
+            # o caminho antigo: registros → DataFrame → normalização por coluna
+            df = pd.DataFrame(rows)
+            df["data"] = pd.to_datetime(df["data"], format="%d-%m-%Y", errors="coerce")
+            df["status"] = df["status"].fillna("").astype("category")
+            df["tipo"] = df["tipo"].fillna("").astype("category")
+            return df["status"].value_counts().to_dict()
+
+        def from_snapshot():
+            return status_counts(snap.table(rows=n, archived=0))
+
+        # algumas alterações pendentes no log (antes da compactação)
+        overlay = {row["id"]: {"status": "Entrevista"} for row in rows[:: max(1, n // 200)]}
+
+        def from_snapshot_log():
+            return status_counts(snap.table(rows=n, archived=0), overlay)
+
+        def best(fn):
+            times = []
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+            return min(times)
+
+        assert {k: v for k, v in from_dicts().items() if v} == from_snapshot()
+        t_dicts = best(from_dicts)
+        t_snap = best(from_snapshot)
+        t_log = best(from_snapshot_log)
+        size = sum(p.stat().st_size for p in snap.path.iterdir())
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    mb = 1024 * 1024
+    print(f"Registros:                     {n:,}")
+    print(f"Fotografia (construção):       {build:8.2f} s  ({size / mb:.1f} MB em disco)")
+    print(f"Dicts → DataFrame → contagem:  {t_dicts * 1000:8.1f} ms")
+    print(f"Fotografia mapeada → contagem: {t_snap * 1000:8.1f} ms")
+    print(f"  ...com {len(overlay)} alterações no log: {t_log * 1000:8.1f} ms")
+    print(f"Aceleração:                    {t_dicts / max(t_snap, 1e-9):8.1f}x")
+    return t_dicts, t_snap, t_log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.analytics")
+    parser.add_argument("n", type=int, nargs="?", default=1_000_000,
+                        help="registros sintéticos")
+    args = parser.parse_args(argv)
+    run(args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Tempo por consulta do autocompletar (core/autocomplete.py) com 100 mil
+valores distintos.
+
+    python -m bench.autocomplete 100000
+"""
+
+import argparse
+import random
+import time
+
+from core.autocomplete import PrefixTrie
+
+
+def run(n: int, queries: int = 2000):
+    rng = random.Random(42)
+    syllables = ["ta", "ve", "ri", "mo", "lu", "can", "per", "so", "dex", "qui", "bra", "nor"]
+    suffixes = ["", " Ltda", " S.A.", " Tecnologia", " Sistemas", " Digital"]
+    values = set()
+    while len(values) < n:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        values.add(name.capitalize() + rng.choice(suffixes))
+    values = list(values)
+
+    trie = PrefixTrie()
+    t0 = time.perf_counter()
+    for v in values:
+        trie.add(v, rng.randint(1, 20))
+    build = time.perf_counter() - t0
+
+    prefixes = []
+    for _ in range(queries):
+        v = rng.choice(values)
+        prefixes.append(v[: rng.randint(1, min(6, len(v)))])
+
+    times = []
+    for p in prefixes:
+        t0 = time.perf_counter()
+        trie.suggest(p)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+
+    print(f"Valores distintos: {len(trie):,}")
+    print(f"Construção:        {build:8.2f} s")
+    print(f"Consulta mediana:  {times[len(times) // 2] * 1000:8.3f} ms")
+    print(f"Consulta p99:      {times[int(len(times) * 0.99)] * 1000:8.3f} ms")
+    print(f"Consulta máxima:   {times[-1] * 1000:8.3f} ms")
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.autocomplete")
+    parser.add_argument("n", type=int, nargs="?", default=100_000,
+                        help="valores distintos")
+    args = parser.parse_args(argv)
+    run(args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Estresse do armazenamento CSV (core/csvstore.py): vários processos
+inserindo no mesmo arquivo, mais um leitor, e a verificação de que nenhuma
+linha foi perdida, duplicada ou corrompida.
+
+    python -m bench.csv_stress --processos 4 --linhas 500 --layout partitioned
+"""
+
+import argparse
+import datetime
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.csvstore import new_record_id, open_store, row_date_key
+from core.dates import parse_br_date
+
+
+def _stress_writer(layout: str, target: str, proc: int, n: int, late: float) -> List[str]:
+    """Processo escritor: `n` inserções individuais; uma fração `late` com data antiga."""
+    import random
+
+    rnd = random.Random(proc)
+    store = open_store(layout, Path(target), Path(target))
+    today = datetime.date.today()
+    ids = []
+    for i in range(n):
+        day = today - datetime.timedelta(days=rnd.randrange(1, 400)) if rnd.random() < late else today
+        row = {
+            "empresa": f"P{proc}-{i}",
+            "cargo": "estresse",
+            "data": day.strftime("%d-%m-%Y"),
+            "tipo": "Remoto",
+            "status": "Inscrito",
+            "observacoes": "linha 1\nlinha \"2\"" if i % 7 == 0 else "",
+            "link": f"https://exemplo.com/{proc}/{i}",
+            "id": new_record_id(),
+        }
+        store.append(row)
+        ids.append(row["id"])
+    store.close()
+    return ids
+
+
+def _stress_reader(layout: str, target: str, stop) -> Tuple[int, int]:
+    """Processo leitor: consultas contínuas; conta linhas malformadas vistas."""
+    store = open_store(layout, Path(target), Path(target))
+    reads = bad = 0
+    while not stop.is_set():
+        for row in store.iter_query(newest_first=True):
+            if len(row.get("id", "")) != 24 or parse_br_date(row.get("data", "")) is None:
+                bad += 1
+        reads += 1
+    return reads, bad
+
+
+def stress_test(target: Path, layout: str = "single", procs: int = 4, rows: int = 500, late: float = 0.1) -> Dict:
+    """
+    `procs` processos inserindo ao mesmo tempo (mais um leitor) e a
+    verificação: nenhuma linha perdida, duplicada ou malformada, arquivo em
+    ordem. Retorna as contagens e a vazão agregada (linhas/s).
+    """
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager, ctx.Pool(procs + 1) as pool:
+        stop = manager.Event()
+        reader = pool.apply_async(_stress_reader, (layout, str(target), stop))
+        t0 = time.perf_counter()
+        results = [pool.apply_async(_stress_writer, (layout, str(target), p, rows, late)) for p in range(procs)]
+        written = [rid for r in results for rid in r.get()]
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        reads, bad_reads = reader.get()
+
+    store = open_store(layout, target, target)
+    found = list(store.iter_query(newest_first=False))
+    ids = [r["id"] for r in found]
+    dates = [row_date_key(r) for r in found]
+    return {
+        "written": len(written),
+        "found": len(found),
+        "lost": len(set(written) - set(ids)),
+        "duplicated": len(ids) - len(set(ids)),
+        "malformed": sum(1 for r in found if not r["empresa"].startswith("P") or len(r["id"]) != 24),
+        "ordered": dates == sorted(dates),
+        "reads": reads,
+        "bad_reads": bad_reads,
+        "seconds": elapsed,
+        "rows_per_s": len(written) / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.csv_stress",
+        description="Vários processos gravando no mesmo CSV (diretório temporário).",
+    )
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--linhas", type=int, default=500, help="inserções por processo")
+    parser.add_argument("--atrasadas", type=float, default=0.1, help="fração com data antiga (vai para o delta)")
+    parser.add_argument("--layout", default="single", choices=["single", "partitioned"])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / ("candidaturas.csv" if args.layout == "single" else "candidaturas")
+        res = stress_test(target, args.layout, args.processos, args.linhas, args.atrasadas)
+    ok = not (res["lost"] or res["duplicated"] or res["malformed"] or res["bad_reads"]) and res["ordered"]
+    print(
+        f"{args.processos} processos × {args.linhas} inserções ({args.layout}): "
+        f"{res['written']:,} gravadas, {res['found']:,} lidas\n"
+        f"Perdidas: {res['lost']}  Duplicadas: {res['duplicated']}  "
+        f"Malformadas: {res['malformed']}  Em ordem: {'sim' if res['ordered'] else 'NÃO'}\n"
+        f"Leitor concorrente: {res['reads']} varreduras, {res['bad_reads']} linhas malformadas\n"
+        f"Vazão agregada: {res['rows_per_s']:,.0f} inserções/s ({res['seconds']:.1f}s)\n"
+        f"{'OK' if ok else 'FALHOU'}"
+    )
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Tempo até o primeiro gráfico da dashboard (graphics/dashboard_graphs.py),
+com e sem a fotografia da sessão anterior (core/snapshot.py).
+
+    python -m bench.dashboard 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+from bench.data import write_export
+from graphics.dashboard_graphs import DashboardGraphs
+from graphics.render_cache import RenderCache
+
+
+class _InlineStore:
+    """AsyncDataStore síncrono: o benchmark mede o caminho inteiro numa thread só."""
+
+    def submit(self, fn, *args, key=None, callback=None, errback=None, **kwargs):
+        result = fn(*args, **kwargs)
+        if callback is not None:
+            callback(result)
+
+
+def _first_chart(datastore_cls, snapshot: bool):
+    """(s até o primeiro gráfico, s até os gráficos em dia) numa partida a frio."""
+    t0 = time.perf_counter()
+    datastore = datastore_cls(mongo_uri="")
+    datastore.snapshot.enabled = snapshot
+
+    graphs = DashboardGraphs(None, datastore, _InlineStore())
+    graphs.render_cache = RenderCache()  # cada partida é um processo novo
+    graphs.build(headless=True)
+
+    drawn = []
+    draw = graphs._draw
+
+    def timed_draw():
+        draw()
+        drawn.append(time.perf_counter() - t0)
+
+    graphs._draw = timed_draw
+    try:
+        graphs.start()
+    finally:
+        datastore.close()
+        plt.close(graphs.fig)
+    return drawn[0], drawn[-1]
+
+
+def run(n: int, new: int, runs: int):
+    from core.datastore import DataStore
+    from core.importer import import_file
+
+    plt.switch_backend("Agg")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "export.csv"
+        os.environ["CANDIDATURAS_CSV_PATH"] = str(Path(tmp) / "candidaturas.csv")
+        os.environ["CANDIDATURAS_CSV_LAYOUT"] = "single"
+
+        print(f"Gerando {n:,} candidaturas...")
+        write_export(src, n)
+        ds = DataStore(mongo_uri="")
+        import_file(ds, src)
+        ds.close()
+        _first_chart(DataStore, snapshot=True)  # a "sessão anterior" grava a fotografia
+
+        def other_session(i: int):
+            # registros incluídos desde a última fotografia
+            ds = DataStore(mongo_uri="")
+            ds.insert_many([
+                {"empresa": f"Nova {i}-{k}", "cargo": "Dev", "data": "2025-11-20",
+                 "status": "Inscrito", "link": f"https://jobs.example/novo/{i}/{k}"}
+                for k in range(new)
+            ])
+            ds.close()
+
+        results = {}
+        for label, snapshot in (("sem fotografia", False), ("com fotografia", True)):
+            times = []
+            for i in range(runs):
+                other_session(len(results) * runs + i)
+                times.append(_first_chart(DataStore, snapshot))
+            first = sorted(t for t, _ in times)[runs // 2]
+            done = sorted(t for _, t in times)[runs // 2]
+            results[label] = (first, done)
+            print(f"{label:15}  primeiro gráfico {first * 1000:7.0f} ms   em dia {done * 1000:7.0f} ms")
+
+        print(f"(mediana de {runs} partidas; {new} registros novos antes de cada uma)")
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.dashboard")
+    parser.add_argument("n", type=int, nargs="?", default=100_000,
+                        help="candidaturas no CSV temporário")
+    parser.add_argument("--novos", type=int, default=50,
+                        help="registros incluídos entre uma partida e outra")
+    parser.add_argument("--partidas", type=int, default=3)
+    args = parser.parse_args(argv)
+    run(args.n, args.novos, args.partidas)
+
+
+if __name__ == "__main__":
+    main()
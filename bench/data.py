@@ -0,0 +1,47 @@
+"""Dados sintéticos dos benchmarks."""
+
+import csv
+import datetime
+from pathlib import Path
+from typing import Dict, Iterator
+
+
+def synthetic_rows(n: int) -> Iterator[Dict]:
+    """Registros no formato do DataStore (data DD-MM-YYYY, id de 24 hex)."""
+    empresas = [f"Empresa {i}" for i in range(500)]
+    cargos = ["Desenvolvedor", "QA", "Backend Jr", "Analista de Dados", "DevOps"]
+    tipos = ["Presencial", "Remoto", "Híbrido"]
+    status = ["Inscrito", "Entrevista", "Rejeitado", "Contratado"]
+    base = datetime.date(2020, 1, 1)
+    for i in range(n):
+        d = base + datetime.timedelta(days=i % 2000)
+        yield {
+            "empresa": empresas[i % len(empresas)],
+            "cargo": cargos[i % len(cargos)],
+            # cada linha lida do CSV/Mongo chega como string nova
+            "data": d.strftime("%d-%m-%Y"),
+            "tipo": "".join(tipos[i % 3]),
+            "status": "".join(status[i % 4]),
+            "observacoes": "",
+            "link": f"https://vagas.example/{i}",
+            "id": f"{i:024x}",
+        }
+
+
+def write_export(path: Path, n: int):
+    """Exportação fictícia no estilo de um site de vagas (cabeçalhos em inglês)."""
+    stages = ["Applied", "Interview", "Rejected", "Offer", "applied"]
+    types = ["Remote", "Hybrid", "On-site"]
+    base = datetime.date(2018, 1, 1)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["Company Name", "Job Title", "Date Applied", "Workplace Type", "Stage", "Job URL", "Notes"])
+        for i in range(n):
+            d = base + datetime.timedelta(days=i % 3000)
+            date = d.isoformat() if i % 2 else d.strftime("%d/%m/%Y")
+            if i % 997 == 0:
+                date = "??"  # linha inválida proposital
+            w.writerow([
+                f"Empresa {i % 5000}", f"Cargo {i % 37}", date,
+                types[i % 3], stages[i % 5], f"https://jobs.example/{i}", "",
+            ])
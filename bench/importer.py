@@ -0,0 +1,50 @@
+"""
+Vazão do importador (core/importer.py): uma exportação sintética de N
+linhas importada num CSV temporário.
+
+    python -m bench.importer 200000 --lote 5000
+"""
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from bench.data import write_export
+from core.importer import DEFAULT_BATCH, import_file
+
+
+def run(n: int, batch_size: int = DEFAULT_BATCH):
+    from core.datastore import DataStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "export.csv"
+        print(f"Gerando {n:,} linhas sintéticas...")
+        write_export(src, n)
+
+        os.environ["CANDIDATURAS_CSV_PATH"] = str(Path(tmp) / "candidaturas.csv")
+        os.environ["CANDIDATURAS_CSV_LAYOUT"] = "single"
+        ds = DataStore(mongo_uri="")
+
+        report = import_file(ds, src, batch_size=batch_size)
+        print(report.resumo())
+
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"Pico de memória: {peak:.0f} MB")
+        except Exception:
+            pass
+        ds.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.importer")
+    parser.add_argument("n", type=int, nargs="?", default=200_000, help="linhas sintéticas")
+    parser.add_argument("--lote", type=int, default=DEFAULT_BATCH, help="linhas por lote")
+    args = parser.parse_args(argv)
+    run(args.n, args.lote)
+
+
+if __name__ == "__main__":
+    main()
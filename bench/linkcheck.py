@@ -0,0 +1,106 @@
+"""
+Verificador de links (core/linkcheck.py) contra um servidor HTTP local com
+vagas ativas, encerradas e redirecionadas: status, requisições feitas,
+conexões abertas e a segunda rodada vinda do cache.
+
+    python -m bench.linkcheck
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.linkcheck import LinkChecker
+
+
+def _stand_in_server():
+    """Servidor HTTP local com vagas ativas, encerradas e redirecionadas."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def _reply(self, body: bool):
+            hits["count"] += 1
+            if self.path.startswith("/vaga/ativa"):
+                code, headers = 200, {}
+            elif self.path.startswith("/vaga/encerrada"):
+                code, headers = 404, {}
+            elif self.path.startswith("/vaga/removida"):
+                code, headers = 410, {}
+            elif self.path.startswith("/vaga/movida"):
+                code, headers = 301, {"Location": "/vaga/ativa-nova"}
+            elif self.path.startswith("/sem-head") and self.command == "HEAD":
+                code, headers = 405, {}
+            elif self.path.startswith("/sem-head"):
+                code, headers = 200, {}
+            else:
+                code, headers = 500, {}
+
+            payload = b"ok" if body else b""
+            self.send_response(code)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(2 if body else 0))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_HEAD(self):
+            self._reply(body=False)
+
+        def do_GET(self):
+            self._reply(body=True)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def run():
+    server, hits = _stand_in_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [
+        f"{base}/vaga/ativa/{i}" for i in range(20)
+    ] + [
+        f"{base}/vaga/encerrada/1",
+        f"{base}/vaga/removida/1",
+        f"{base}/vaga/movida/1",
+        f"{base}/sem-head/1",
+        f"{base}/erro/1",
+        "não-é-url",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checker = LinkChecker(Path(tmp) / "links.json", min_interval=0.0)
+
+        start = time.perf_counter()
+        results = checker.check_many(urls)
+        elapsed = time.perf_counter() - start
+        for url in urls[-6:]:
+            r = results[url]
+            print(f"{url:45} status={r['status']} ativa={r['ativa']} final={r['final_url']} {r['erro']}")
+        pool = checker._pool("http", server.server_address[0] + f":{server.server_address[1]}")
+        print(f"\n{len(results)} links em {elapsed:.2f}s; {hits['count']} requisições; "
+              f"{pool.opened} conexões abertas")
+
+        # segunda rodada: tudo em cache (dentro do TTL) → nenhuma requisição
+        before = hits["count"]
+        again = LinkChecker(Path(tmp) / "links.json").check_many(urls)
+        print(f"Segunda rodada: {len(again)} verificados, {hits['count'] - before} requisições")
+        checker.close()
+
+    server.shutdown()
+
+
+def main(argv=None):
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Custo de um desenho completo da dashboard × um acerto no cache de bitmaps
+(graphics/render_cache.py).
+
+    python -m bench.render_cache --rodadas 10
+"""
+
+import argparse
+import datetime
+import time
+from collections import Counter
+
+from core.rollups import DAY
+from graphics.render_cache import RenderCache
+
+
+def run(runs: int = 10):
+    import matplotlib.pyplot as plt
+
+    from graphics.dashboard_graphs import DashboardGraphs
+
+    plt.switch_backend("Agg")
+    graphs = DashboardGraphs(None, None, None)
+    graphs.render_cache = RenderCache()
+    graphs.build(headless=True)
+
+    start = datetime.date(2024, 1, 1)
+    graphs._status_counts = Counter({"Inscrito": 420, "Entrevista": 97, "Rejeitado": 210, "Contratado": 12})
+    graphs._has_status = True
+    graphs._series = ([(start + datetime.timedelta(days=i), (i * 7) % 23) for i in range(365)], DAY)
+
+    # desenho completo: o que cada volta à "Visão Geral" custava
+    full = []
+    for _ in range(runs):
+        graphs.render_cache.clear()
+        graphs._composed = None  # tela nova: eixos montados de novo
+        t0 = time.perf_counter()
+        graphs._draw()
+        full.append(time.perf_counter() - t0)
+
+    # mesma versão e mesmo tamanho: bitmap do cache (até o buffer do renderer)
+    cached = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        graphs._draw()
+        cached.append(time.perf_counter() - t0)
+
+    full.sort()
+    cached.sort()
+    w, h = graphs.canvas.get_width_height()
+    cache = graphs.render_cache
+    print(f"Figura:            {w} × {h} px ({cache.nbytes / 1024 / 1024:.1f} MB no cache)")
+    print(f"Desenho completo:  {full[len(full) // 2] * 1000:8.1f} ms")
+    print(f"Acerto no cache:   {cached[len(cached) // 2] * 1000:8.2f} ms")
+    print(f"(mediana de {runs}; acertos {cache.hits}, erros {cache.misses})")
+    plt.close(graphs.fig)
+    return full, cached
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.render_cache")
+    parser.add_argument("--rodadas", type=int, default=10)
+    args = parser.parse_args(argv)
+    run(args.rodadas)
+
+
+if __name__ == "__main__":
+    main()
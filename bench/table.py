@@ -0,0 +1,47 @@
+"""
+Memória de 1 milhão de candidaturas: lista de dicts × CandidaturaTable
+(core/table.py).
+
+    python -m bench.table 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from bench.data import synthetic_rows
+from core.table import CandidaturaTable
+
+
+def run(n: int):
+    gc.collect()
+    tracemalloc.start()
+    rows = list(synthetic_rows(n))
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+    gc.collect()
+
+    tracemalloc.start()
+    table = CandidaturaTable.from_rows(synthetic_rows(n))
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    mb = 1024 * 1024
+    print(f"Registros:        {n:,}")
+    print(f"Lista de dicts:   {dict_bytes / mb:8.1f} MB  ({dict_bytes / n:.0f} B/registro)")
+    print(f"CandidaturaTable: {table_bytes / mb:8.1f} MB  ({table_bytes / n:.0f} B/registro)")
+    print(f"Redução:          {dict_bytes / max(1, table_bytes):8.1f}x")
+    return dict_bytes, table_bytes, len(table)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.table")
+    parser.add_argument("n", type=int, nargs="?", default=1_000_000,
+                        help="registros sintéticos")
+    args = parser.parse_args(argv)
+    run(args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+AnalyticsSnapshot — cópia colunar (Apache Arrow) do CSV para as agregações.
+
+No CSV, a contagem por status do painel decodificava o arquivo inteiro a
+cada leitura completa (↻, RESET depois de uma importação, "incluir
+arquivadas"): uma linha de texto → dict por registro, só para contar uma
+coluna. Esta fotografia guarda as colunas que as agregações usam num
+arquivo Arrow IPC sem compressão, aberto com memory-map: as colunas são
+lidas direto das páginas do arquivo, sem cópia nem conversão, e a contagem
+é um `value_counts` sobre os códigos do dicionário.
+
+Colunas:
+    id         string
+    data       date32                    (nula = sem data)
+    status     dictionary<int32, string>
+    tipo       dictionary<int32, string>
+    empresa    string
+    cargo      string
+    arquivada  bool                      (linha do arquivo frio, core/archive.py)
+
+Arquivos, num diretório ao lado do CSV (`candidaturas.analytics/`; no
+layout particionado, `_analytics/`):
+• base.arrow    — refeita na compactação (`DataStore.compact_csv`), com as
+                  arquivadas no início: o conjunto quente é um `slice`;
+• delta-*.arrow — um por anexação ao CSV, gravado logo depois dela;
+                  passando de MAX_SEGMENTS, viram um só.
+
+Alterações e exclusões ficam no log do CSV (core/changelog.py) até a
+compactação; quem lê aplica o log por cima (`apply_overlay` e
+`status_counts`) — só os registros do log são copiados, o resto continua
+mapeado. Aplicar o log de novo sobre uma linha que já o tem não muda nada.
+
+Validade: a base guarda quantas linhas o CSV e o arquivo frio tinham
+quando foi feita; base + deltas têm de fechar com as contagens atuais.
+Se não fecham (queda entre a anexação e o delta, CSV gravado por uma versão
+antiga do app...), o DataStore refaz a fotografia com uma leitura completa.
+
+O pyarrow é opcional: sem ele, as contagens voltam à leitura linha a linha.
+Ele só é importado quando uma fotografia é lida ou gravada (importá-lo
+custa ~150 ms; a partida do app e do CLI não paga isso).
+
+Contagem por status com 1 milhão de registros (lista de dicts → DataFrame
+× fotografia mapeada):
+
+    python -m bench.analytics 1000000
+"""
+
+import datetime
+import importlib.util
+import os
+import shutil
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from core.changelog import ChangeLog
+from core.dates import parse_date
+from core.filelock import temp_path
+
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+pa = None
+pc = None
+
+
+def _import_arrow():
+    global pa, pc, PYARROW_AVAILABLE
+    if pa is None and PYARROW_AVAILABLE:
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except Exception:
+            PYARROW_AVAILABLE = False
+    return pa
+
+
+MAX_SEGMENTS = 32
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+_META_ROWS = b"rows"          # linhas do CSV quente cobertas pela base
+_META_ARCHIVED = b"archived"  # contagem do arquivo frio quando a base foi feita
+_META_COLD = b"cold"          # linhas arquivadas no início da base
+
+
+def schema():
+    _import_arrow()
+    return pa.schema([
+        ("id", pa.string()),
+        ("data", pa.date32()),
+        ("status", pa.dictionary(pa.int32(), pa.string())),
+        ("tipo", pa.dictionary(pa.int32(), pa.string())),
+        ("empresa", pa.string()),
+        ("cargo", pa.string()),
+        ("arquivada", pa.bool_()),
+    ])
+
+
+# --------------------------------------------------------------------------
+# CONSTRUÇÃO
+# --------------------------------------------------------------------------
+class Builder:
+    """Acumula registros (dicts do DataStore) em colunas e monta a tabela."""
+
+    def __init__(self):
+        self.id: List[str] = []
+        self.data: List[Optional[int]] = []
+        self.status: List[str] = []
+        self.tipo: List[str] = []
+        self.empresa: List[str] = []
+        self.cargo: List[str] = []
+        self.arquivada: List[bool] = []
+
+    def __len__(self):
+        return len(self.id)
+
+    def add(self, row: Dict, archived: bool = False):
+        d = parse_date(row.get("data"))
+        self.id.append(row.get("id") or "")
+        self.data.append(None if d is None else d.toordinal() - EPOCH_ORDINAL)
+        self.status.append(row.get("status") or "")
+        self.tipo.append(row.get("tipo") or "")
+        self.empresa.append(row.get("empresa") or "")
+        self.cargo.append(row.get("cargo") or "")
+        self.arquivada.append(archived)
+
+    def extend(self, rows: Iterable[Dict], archived: bool = False):
+        for row in rows:
+            self.add(row, archived)
+
+    def table(self):
+        _import_arrow()
+        return pa.table(
+            [
+                pa.array(self.id, pa.string()),
+                pa.array(self.data, pa.int32()).cast(pa.date32()),
+                pa.array(self.status, pa.string()).dictionary_encode(),
+                pa.array(self.tipo, pa.string()).dictionary_encode(),
+                pa.array(self.empresa, pa.string()),
+                pa.array(self.cargo, pa.string()),
+                pa.array(self.arquivada, pa.bool_()),
+            ],
+            schema=schema(),
+        )
+
+
+def _write(path: Path, table, metadata: Optional[Dict[bytes, bytes]] = None):
+    """Grava `table` como Arrow IPC (sem compressão: mapeável) com troca atômica."""
+    _import_arrow()
+    # o formato de arquivo não admite troca de dicionário entre lotes
+    table = table.unify_dictionaries()
+    if metadata:
+        table = table.replace_schema_metadata(metadata)
+    tmp = temp_path(path)
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _read(path: Path):
+    """Tabela do arquivo, mapeada em memória (sem cópia)."""
+    _import_arrow()
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+# --------------------------------------------------------------------------
+# FOTOGRAFIA
+# --------------------------------------------------------------------------
+class AnalyticsSnapshot:
+    """
+    Base + deltas em Arrow IPC. No processo, as escritas (`write`,
+    `append`) acontecem com o lock de gravação do CSV do DataStore, junto
+    com a gravação que acompanham. A leitura não trava: os arquivos só
+    mudam por troca atômica, e o que sai de uma corrida (leitura no meio de
+    uma escrita, compactação de outro processo entre uma anexação e o seu
+    delta) não fecha com as contagens em `table`.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.base_path = self.path / "base.arrow"
+
+    @property
+    def enabled(self) -> bool:
+        return PYARROW_AVAILABLE
+
+    def exists(self) -> bool:
+        return self.base_path.exists()
+
+    def _deltas(self) -> List[Path]:
+        try:
+            return sorted(self.path.glob("delta-*.arrow"))
+        except OSError:
+            return []
+
+    # ----------------------------------------------------------------------
+    # ESCRITA
+    # ----------------------------------------------------------------------
+    def write(self, cold: List, hot: List, rows: int, archived: int):
+        """
+        Nova base: as tabelas de `cold` (arquivadas) e depois as de `hot`.
+        `rows`/`archived` são as contagens do CSV quente e do arquivo frio
+        que ela cobre (ver `table`). Os deltas deixam de valer.
+        """
+        _import_arrow()
+        self.path.mkdir(parents=True, exist_ok=True)
+        _write(self.base_path, pa.concat_tables([*cold, *hot]), {
+            _META_ROWS: str(rows).encode(),
+            _META_ARCHIVED: str(archived).encode(),
+            _META_COLD: str(sum(t.num_rows for t in cold)).encode(),
+        })
+        for path in self._deltas():
+            path.unlink(missing_ok=True)
+
+    def append(self, rows: List[Dict]):
+        """Registros anexados ao CSV quente → um segmento delta."""
+        if not rows or not self.exists():
+            return  # sem base, a próxima leitura refaz tudo
+        builder = Builder()
+        builder.extend(rows)
+        _write(self.path / f"delta-{time.time_ns():020d}-{os.getpid()}.arrow", builder.table())
+
+        deltas = self._deltas()
+        if len(deltas) > MAX_SEGMENTS:
+            merged = pa.concat_tables([_read(p) for p in deltas])
+            _write(deltas[-1], merged)
+            for path in deltas[:-1]:
+                path.unlink(missing_ok=True)
+
+    def discard(self):
+        """Apaga a fotografia (refeita na próxima leitura)."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    # ----------------------------------------------------------------------
+    # LEITURA
+    # ----------------------------------------------------------------------
+    def _open(self, rows: int, archived: int):
+        """(base, linhas arquivadas no início dela, deltas) ou None se não vale."""
+        if not self.exists():
+            return None
+        _import_arrow()
+        try:
+            base = _read(self.base_path)
+            deltas = [_read(p) for p in self._deltas()]
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+        meta = base.schema.metadata or {}
+        try:
+            base_rows = int(meta[_META_ROWS])
+            base_archived = int(meta[_META_ARCHIVED])
+            cold = int(meta[_META_COLD])
+        except (KeyError, ValueError):
+            return None
+        if base_archived != archived or base_rows + sum(t.num_rows for t in deltas) != rows:
+            return None
+        return base.replace_schema_metadata(None), cold, deltas
+
+    def table(self, rows: int, archived: int, include_archived: bool = False):
+        """
+        Base + deltas mapeados, ou None se a fotografia não existe ou não
+        fecha com `rows` (linhas do CSV quente) e `archived` (contagem do
+        arquivo frio). Sem as arquivadas, a base entra como `slice` (sem cópia).
+        """
+        opened = self._open(rows, archived)
+        if opened is None:
+            return None
+        base, cold, deltas = opened
+        if not include_archived:
+            base = base.slice(cold)
+        return pa.concat_tables([base, *deltas])
+
+    def archived_table(self, rows: int, archived: int):
+        """Só as arquivadas da base (sem cópia), ou None se a fotografia não vale."""
+        opened = self._open(rows, archived)
+        return None if opened is None else opened[0].slice(0, opened[1])
+
+
+# --------------------------------------------------------------------------
+# LEITURA COM O LOG DE ALTERAÇÕES
+# --------------------------------------------------------------------------
+def _overlay_mask(table, overlay: Dict[str, Optional[Dict]]):
+    _import_arrow()
+    return pc.is_in(table["id"], value_set=pa.array(list(overlay), pa.string()))
+
+
+def _touched_rows(table, mask) -> List[Dict]:
+    """Linhas marcadas, como dicts no formato do Builder (data em date)."""
+    return table.filter(mask).to_pylist()
+
+
+def apply_overlay(table, overlay: Dict[str, Optional[Dict]]):
+    """
+    Tabela com o log aplicado: sem log, a própria (mapeada); com log, as
+    linhas alteradas são refeitas e as excluídas somem.
+    """
+    if not overlay:
+        return table
+    mask = _overlay_mask(table, overlay)
+    builder = Builder()
+    for row in _touched_rows(table, mask):
+        archived = row["arquivada"]
+        row = ChangeLog.apply(row, overlay)
+        if row is not None:
+            builder.add(row, archived)
+    rest = table.filter(pc.invert(mask))
+    return pa.concat_tables([rest, builder.table()])
+
+
+def status_counts(table, overlay: Optional[Dict[str, Optional[Dict]]] = None) -> Dict[str, int]:
+    """
+    Quantidade por status ("" = sem status). O log entra como correção:
+    tira a contagem das linhas que ele toca e soma o status novo.
+    """
+    _import_arrow()
+    counts = Counter()
+    for entry in pc.value_counts(table["status"]).to_pylist():
+        counts[entry["values"] or ""] += entry["counts"]
+
+    if overlay:
+        for row in _touched_rows(table, _overlay_mask(table, overlay)):
+            counts[row["status"] or ""] -= 1
+            row = ChangeLog.apply(row, overlay)
+            if row is not None:
+                counts[row.get("status") or ""] += 1
+    return {status: n for status, n in counts.items() if n > 0}
@@ -0,0 +1,247 @@
+"""
+Arquivamento — candidaturas antigas saem do conjunto "quente".
+
+Quem está procurando emprego olha os últimos meses; o resto é histórico.
+Sem arquivamento, toda leitura (tabela, contagens, exportação) percorre o
+histórico inteiro. A política abaixo separa os registros em dois níveis:
+
+• quente — `candidaturas` (Mongo) e o CSV de sempre: tudo o que as telas,
+  o CLI e as contagens leem por padrão;
+• frio   — coleção `candidaturas_arquivadas` (Mongo) e um CSV comprimido
+  ao lado do CSV principal (`candidaturas.archive.csv.gz`; no layout
+  particionado, `_archive.csv.gz`). Só é lido com "incluir arquivadas".
+
+O arquivamento é opcional (desligado por padrão). Vai para o frio:
+
+    MEU_EMPREGO_ARCHIVE_DAYS=180          candidaturas mais antigas que isto
+                                          (0 ou ausente: desligado)
+    MEU_EMPREGO_ARCHIVE_STATUSES=Rejeitado,Contratado
+    MEU_EMPREGO_ARCHIVE_STATUS_DAYS=30    ...ou com status final há mais
+                                          que isto
+
+O prazo do status final conta da última mudança de status registrada no
+histórico (core/history.py); sem ela, da data da candidatura. Registros
+sem data ficam sempre no quente. Ligado, o DataStore arquiva sozinho uma
+vez por dia, em segundo plano (e `python -m meu_emprego arquivar`).
+
+No CSV o arquivamento é uma compactação (ver `DataStore.compact_csv`): as
+linhas frias são gravadas num membro gzip à parte (`.pending`) enquanto o
+CSV quente é regravado sem elas; o membro só é anexado ao arquivo frio
+depois da troca. Uma queda no meio deixa o `.pending`, que na próxima
+abertura é anexado só com os registros que não estão mais no quente.
+
+Alterações e exclusões de registros arquivados seguem o caminho de sempre:
+no Mongo, na coleção onde o registro está; no CSV, o log de alterações
+(core/changelog.py) também vale para o arquivo frio, que é regravado na
+compactação quando alguma alteração é dele.
+
+A linha do tempo (rollups) e os resumos da sincronização (core/sync.py)
+continuam cobrindo o histórico inteiro: arquivar muda onde o registro
+fica, não a contagem de candidaturas enviadas por período.
+"""
+
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from core.csvstore import CSV_HEADER
+from core.dates import parse_date
+from core.filelock import temp_path
+
+
+COLLECTION = "candidaturas_arquivadas"
+TERMINAL_STATUSES = ("Rejeitado", "Contratado")
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    days: int = 0
+    statuses: Tuple[str, ...] = TERMINAL_STATUSES
+    status_days: int = 30
+
+    @classmethod
+    def from_env(cls) -> "ArchivePolicy":
+        statuses = os.getenv("MEU_EMPREGO_ARCHIVE_STATUSES")
+        return cls(
+            days=max(0, int(os.getenv("MEU_EMPREGO_ARCHIVE_DAYS") or "0")),
+            statuses=TERMINAL_STATUSES if statuses is None else tuple(
+                s.strip() for s in statuses.split(",") if s.strip()
+            ),
+            status_days=max(0, int(os.getenv("MEU_EMPREGO_ARCHIVE_STATUS_DAYS", "30"))),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.days > 0
+
+    def cutoffs(self, today: datetime.date) -> Tuple[datetime.date, datetime.date]:
+        """(antes disto: frio; antes disto e com status final: frio)."""
+        return (
+            today - datetime.timedelta(days=self.days),
+            today - datetime.timedelta(days=self.status_days),
+        )
+
+    def is_cold(
+        self, row: Dict, today: datetime.date, status_since: Optional[datetime.date] = None
+    ) -> bool:
+        """`status_since`: dia da última mudança de status (None = a data da candidatura)."""
+        d = parse_date(row.get("data"))
+        if d is None or not self.enabled:
+            return False
+        by_age, by_status = self.cutoffs(today)
+        return d < by_age or (row.get("status") in self.statuses and (status_since or d) < by_status)
+
+    def mongo_query(self, today: datetime.date, recent: Iterable = ()) -> Dict:
+        """
+        Filtro dos documentos frios. A data da candidatura nunca é posterior
+        à última mudança de status: o filtro por data do status final pega
+        um superconjunto, do qual saem os `_id` em `recent` (status mudado
+        depois do corte).
+        """
+        by_age, by_status = (datetime.datetime.combine(d, datetime.time.min) for d in self.cutoffs(today))
+        query = [{"data": {"$lt": by_age}}]
+        if self.statuses:
+            final = {"status": {"$in": list(self.statuses)}, "data": {"$lt": by_status}}
+            recent = list(recent)
+            if recent:
+                final["_id"] = {"$nin": recent}
+            query.append(final)
+        return {"$or": query}
+
+
+class ArchiveFile:
+    """
+    CSV comprimido (gzip) só-anexação, com cabeçalho em cada membro.
+    Cada arquivamento acrescenta um membro; a leitura atravessa todos.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.pending_path = self.path.with_name(self.path.name + ".pending")
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def has_pending(self) -> bool:
+        return self.pending_path.exists()
+
+    # ----------------------------------------------------------------------
+    # LEITURA
+    # ----------------------------------------------------------------------
+    def iter_rows(self, path: Optional[Path] = None) -> Iterator[Dict]:
+        """Registros do arquivo (um membro cortado no fim é ignorado)."""
+        try:
+            f = gzip.open(path or self.path, "rt", encoding="utf-8", newline="")
+        except FileNotFoundError:
+            return
+        with f:
+            reader = csv.reader(f)
+            try:
+                for values in reader:
+                    if not any(values) or values == CSV_HEADER:
+                        continue
+                    yield dict(zip(CSV_HEADER, values))
+            except (EOFError, OSError, zlib.error) as e:
+                print("[ARQUIVO] Fim do arquivo frio incompleto:", e)
+
+    # ----------------------------------------------------------------------
+    # ESCRITA
+    # ----------------------------------------------------------------------
+    def open_pending(self) -> "PendingMember":
+        return PendingMember(self.pending_path)
+
+    def absorb(self, skip_ids: Optional[Set[str]] = None) -> int:
+        """
+        Anexa o membro pendente ao arquivo frio e o apaga. `skip_ids`
+        (recuperação depois de uma queda): registros que ainda estão no
+        quente ficam de fora. Retorna quantos registros entraram.
+        """
+        if not self.has_pending():
+            return 0
+        rows = [r for r in self.iter_rows(self.pending_path) if not skip_ids or r["id"] not in skip_ids]
+        if rows:
+            data = _member(rows)
+            with self.path.open("ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        self.pending_path.unlink()
+        return len(rows)
+
+    def rewrite(self, transform: Callable[[Dict], Optional[Dict]]) -> int:
+        """Regrava o arquivo aplicando `transform` (None = remove); troca atômica."""
+        tmp = temp_path(self.path)
+        kept = 0
+        with gzip.open(tmp, "wt", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for row in self.iter_rows():
+                row = transform(row)
+                if row is not None:
+                    writer.writerow([row.get(field, "") for field in CSV_HEADER])
+                    kept += 1
+        os.replace(tmp, self.path)
+        return kept
+
+
+class PendingMember:
+    """Membro gzip em construção (`.pending`): recebe as linhas frias da compactação."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rows = 0
+        self._f = gzip.open(self.path, "wt", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(CSV_HEADER)
+
+    def write(self, row: Dict):
+        self._writer.writerow([row.get(field, "") for field in CSV_HEADER])
+        self.rows += 1
+
+    def close(self):
+        """Fecha e grava em disco — antes de o CSV quente ser trocado."""
+        if self._f.closed:
+            return
+        self._f.close()
+        with self.path.open("rb") as f:
+            os.fsync(f.fileno())
+
+    def discard(self):
+        if not self._f.closed:
+            self._f.close()
+        self.path.unlink(missing_ok=True)
+
+
+# --------------------------------------------------------------------------
+# ÚLTIMA EXECUÇÃO (arquivamento automático uma vez por dia)
+# --------------------------------------------------------------------------
+def last_run(path: Path) -> Optional[datetime.date]:
+    try:
+        with Path(path).open("r", encoding="utf-8") as f:
+            return datetime.date.fromisoformat(json.load(f)["last_run"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def mark_run(path: Path, day: datetime.date, result: Dict):
+    path = Path(path)
+    tmp = temp_path(path)
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump({"last_run": day.isoformat(), **result}, f)
+    os.replace(tmp, path)
+
+
+def _member(rows) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow([row.get(field, "") for field in CSV_HEADER])
+    return gzip.compress(buf.getvalue().encode("utf-8"))
@@ -0,0 +1,146 @@
+"""
+AsyncDataStore — fachada assíncrona do DataStore para a interface.
+
+Cada chamada roda num ThreadPoolExecutor limitado
+(MEU_EMPREGO_UI_WORKERS, padrão 4) e devolve um `Future`. O resultado é
+entregue à UI por uma função `deliver(callback, valor)` — na aplicação, o
+TkDispatcher (ui/dispatcher.py), que executa o callback na thread do
+Tkinter via `after()`. Esta camada não importa tkinter.
+
+Coalescência por chave: pedidos com a mesma `key` (ex.: "visualizacao.load")
+nunca rodam em paralelo. Enquanto um está em execução, só o mais recente
+fica na fila — os intermediários são cancelados — e a resposta de um
+pedido já superado não é entregue. Cliques repetidos em ↻ disparam no
+máximo a consulta em andamento e a última.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+
+def _print_error(exc: BaseException):
+    print("\n[ERRO] Operação em segundo plano falhou:", exc, "\n")
+
+
+@dataclass
+class _Call:
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    callback: Optional[Callable[[Any], None]]
+    errback: Optional[Callable[[BaseException], None]]
+    future: Future = field(default_factory=Future)
+
+    def run(self):
+        return self.fn(*self.args, **self.kwargs)
+
+
+@dataclass
+class _Slot:
+    running: bool = False
+    queued: Optional[_Call] = None
+
+
+class AsyncDataStore:
+    """Executa operações do DataStore fora da thread da UI."""
+
+    def __init__(
+        self,
+        datastore,
+        deliver: Callable[..., None],
+        max_workers: Optional[int] = None,
+    ):
+        self.datastore = datastore
+        self.deliver = deliver
+
+        workers = max_workers or int(os.getenv("MEU_EMPREGO_UI_WORKERS", "4"))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="datastore")
+        self._slots: Dict[str, _Slot] = {}
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    # API GENÉRICA
+    # ----------------------------------------------------------------------
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        key: Optional[str] = None,
+        callback: Optional[Callable[[Any], None]] = None,
+        errback: Optional[Callable[[BaseException], None]] = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Agenda `fn(*args, **kwargs)`; `callback(resultado)` ou
+        `errback(exceção)` são entregues via `deliver`.
+        """
+        call = _Call(fn, args, kwargs, callback, errback)
+
+        if key is not None:
+            with self._lock:
+                slot = self._slots.setdefault(key, _Slot())
+                if slot.running:
+                    if slot.queued is not None:
+                        slot.queued.future.cancel()  # superado pelo novo pedido
+                    slot.queued = call
+                    return call.future
+                slot.running = True
+
+        self._start(key, call)
+        return call.future
+
+    def call(self, method: str, *args, key: Optional[str] = None, callback=None, errback=None, **kwargs) -> Future:
+        """Atalho: `call("list_candidaturas", limit=10, callback=...)`."""
+        return self.submit(
+            getattr(self.datastore, method), *args,
+            key=key, callback=callback, errback=errback, **kwargs,
+        )
+
+    # ----------------------------------------------------------------------
+    def _start(self, key: Optional[str], call: _Call):
+        if not call.future.set_running_or_notify_cancel():
+            self._finish(key, call, None, None)
+            return
+        try:
+            inner = self._executor.submit(call.run)
+        except RuntimeError as e:  # executor encerrado
+            self._finish(key, call, None, e)
+            return
+        inner.add_done_callback(lambda f: self._finish(key, call, f, None))
+
+    def _finish(self, key: Optional[str], call: _Call, inner: Optional[Future], error: Optional[BaseException]):
+        superseded = False
+        nxt = None
+        if key is not None:
+            with self._lock:
+                slot = self._slots[key]
+                nxt, slot.queued = slot.queued, None
+                if nxt is None:
+                    slot.running = False
+            superseded = nxt is not None
+
+        if inner is not None:
+            error = inner.exception()
+
+        if call.future.running():
+            if error is not None:
+                call.future.set_exception(error)
+            else:
+                call.future.set_result(inner.result() if inner is not None else None)
+
+            # a resposta só interessa se ninguém pediu a mesma coisa depois
+            if not superseded:
+                if error is not None:
+                    self.deliver(call.errback or _print_error, error)
+                elif call.callback is not None:
+                    self.deliver(call.callback, call.future.result())
+
+        if nxt is not None:
+            self._start(key, nxt)
+
+    # ----------------------------------------------------------------------
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
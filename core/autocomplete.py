@@ -0,0 +1,293 @@
+"""
+Autocompletar de empresa e cargo no cadastro.
+
+O mesmo nome digitado de jeitos diferentes ("Acme", "ACME S.A.", "acme")
+vira empresas diferentes nas contagens. O cadastro passa a sugerir, a cada
+tecla, os valores já usados que começam com o texto digitado — os mais
+frequentes primeiro, na grafia que já está na base.
+
+Estrutura: uma trie de prefixos compactada (radix: cada aresta guarda um
+trecho, não um caractere) sobre a chave normalizada (sem acentos,
+minúsculas, espaços colapsados — a mesma das duplicatas, core/dedup.py).
+Cada nó guarda as K chaves mais frequentes da sua subárvore; a consulta
+só desce até o nó do prefixo e devolve essa lista: O(tamanho do prefixo),
+independente de quantos valores existem. Uma inclusão sobe a contagem e
+acerta as listas dos nós do caminho (O(profundidade × K)).
+
+Persistência: arquivo só-anexação ao lado do CSV (`candidaturas.suggest`;
+no layout particionado, `_suggest`), uma linha "campo<TAB>n<TAB>valor" por
+inclusão. A abertura lê o arquivo — nunca o CSV, exceto na primeira vez,
+quando ele ainda não existe — e o compacta (uma linha por valor, com a
+contagem) quando as linhas passam do dobro dos valores distintos. Outros
+processos também acrescentam; antes de cada consulta só os bytes novos são
+lidos (como o índice de duplicatas). As contagens só crescem: valores de
+candidaturas excluídas continuam sendo sugeridos.
+
+Tempo por consulta com 100 mil valores distintos:
+
+    python -m bench.autocomplete 100000
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.dedup import _norm_text
+from core.filelock import temp_path
+
+
+FIELDS = ("empresa", "cargo")
+TOP_K = 8
+
+
+def _clean(value: Optional[str]) -> str:
+    """Grafia exibida: espaços colapsados (sem TAB/quebra de linha no arquivo)."""
+    return " ".join((value or "").split())
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class _Node:
+    __slots__ = ("label", "children", "top")
+
+    def __init__(self, label: str = "", children: Optional[Dict] = None, top: Optional[List[str]] = None):
+        self.label = label                  # trecho da aresta que chega aqui
+        self.children = children            # 1º caractere do trecho → nó (None numa folha)
+        self.top = top if top is not None else []  # chaves mais frequentes da subárvore
+
+
+class PrefixTrie:
+    """Trie radix com as `k` chaves mais frequentes de cada subárvore."""
+
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self.root = _Node(children={})
+        self.counts: Dict[str, int] = {}   # chave normalizada → frequência
+        self.display: Dict[str, str] = {}  # chave normalizada → grafia sugerida
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _bump(self, node: _Node, key: str):
+        """Reposiciona `key` (cuja contagem subiu) na lista do nó."""
+        top, counts = node.top, self.counts
+        rank = (-counts[key], key)
+        if key in top:
+            top.remove(key)
+        elif len(top) >= self.k:
+            last = top[-1]
+            if (-counts[last], last) <= rank:
+                return
+            top.pop()
+        i = len(top)
+        while i and (-counts[top[i - 1]], top[i - 1]) > rank:
+            i -= 1
+        top.insert(i, key)
+
+    def add(self, value: Optional[str], n: int = 1):
+        key = _norm_text(value)
+        if key and n > 0:
+            self._add(key, _clean(value), n)
+
+    def _add(self, key: str, display: str, n: int):
+        if key not in self.counts:
+            self.display[key] = display  # vale a primeira grafia vista
+        self.counts[key] = self.counts.get(key, 0) + n
+
+        node, rest = self.root, key
+        self._bump(node, key)
+        while rest:
+            if node.children is None:
+                node.children = {}
+            child = node.children.get(rest[0])
+            if child is None:
+                node.children[rest[0]] = _Node(rest, top=[key])
+                return
+
+            common = _common_prefix(child.label, rest)
+            if common < len(child.label):
+                # divide a aresta: o nó do meio tem a mesma subárvore
+                tail = child.label[common:]
+                mid = _Node(child.label[:common], {tail[0]: child}, list(child.top))
+                child.label = tail
+                node.children[rest[0]] = mid
+                child = mid
+
+            node, rest = child, rest[common:]
+            self._bump(node, key)
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> List[str]:
+        """Até `limit` (≤ k) grafias que começam com `prefix`, mais frequentes primeiro."""
+        rest = _norm_text(prefix)
+        if not rest:
+            return []
+        if prefix[-1].isspace():
+            rest += " "  # "Banco " já encerrou a palavra: não sugere "Bancoxyz"
+        node = self.root
+        while rest:
+            child = (node.children or {}).get(rest[0])
+            if child is None:
+                return []
+            if rest.startswith(child.label):
+                rest = rest[len(child.label):]
+            elif child.label.startswith(rest):
+                rest = ""
+            else:
+                return []
+            node = child
+        return [self.display[key] for key in node.top[:limit]]
+
+
+class Autocomplete:
+    """Uma `PrefixTrie` por campo, persistida num arquivo só-anexação."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tries = {f: PrefixTrie() for f in FIELDS}
+        self.loaded = False
+        self._offset = 0
+        self._ino = 0
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    # CARGA
+    # ----------------------------------------------------------------------
+    def load(self, rows: Callable[[], Iterable[Dict]]):
+        """
+        Lê o arquivo (e o compacta, se preciso). Se ele ainda não existe,
+        constrói a partir de `rows()` — a única varredura completa.
+        """
+        with self._lock:
+            if self.loaded:
+                return
+            if self.path.exists():
+                counts, lines = self._read()
+            else:
+                counts, lines = self._aggregate(rows()), None
+
+            # inserção por frequência decrescente: cada nó só recebe anexações
+            for field, values in counts.items():
+                trie = self.tries[field]
+                for key in sorted(values, key=lambda k: -values[k][0]):
+                    n, display = values[key]
+                    trie._add(key, display, n)
+
+            distinct = sum(len(t) for t in self.tries.values())
+            if lines is None or lines > 2 * distinct + 1000:
+                self._write()
+            self.loaded = True
+
+    @staticmethod
+    def _aggregate(rows: Iterable[Dict]) -> Dict[str, Dict[str, List]]:
+        counts = {f: {} for f in FIELDS}
+        for row in rows:
+            for field in FIELDS:
+                value = row.get(field)
+                key = _norm_text(value)
+                if key:
+                    entry = counts[field].setdefault(key, [0, _clean(value)])
+                    entry[0] += 1
+        return counts
+
+    def _read(self):
+        """Arquivo inteiro → contagens por campo (e quantas linhas havia)."""
+        counts = {f: {} for f in FIELDS}
+        lines = 0
+        with self.path.open("rb") as f:
+            data = f.read()
+            self._ino = os.fstat(f.fileno()).st_ino
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            field, _, rest = line.partition("\t")
+            n, _, value = rest.partition("\t")
+            key = _norm_text(value)
+            if field in counts and n.isdigit() and key:
+                entry = counts[field].setdefault(key, [0, value])
+                entry[0] += int(n)
+                lines += 1
+        self._offset, self._lines = end, lines
+        return counts, lines
+
+    def _reset(self):
+        self.tries = {f: PrefixTrie() for f in FIELDS}
+        self._offset = self._ino = self._lines = 0
+
+    def _write(self):
+        """Regrava o arquivo com uma linha por valor (troca atômica)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = temp_path(self.path)
+        with tmp.open("w", encoding="utf-8") as f:
+            for field, trie in self.tries.items():
+                for key, n in trie.counts.items():
+                    f.write(f"{field}\t{n}\t{trie.display[key]}\n")
+        os.replace(tmp, self.path)
+        st = self.path.stat()
+        self._offset, self._ino = st.st_size, st.st_ino
+        self._lines = sum(len(t) for t in self.tries.values())
+
+    def _catch_up(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            return
+        if st.st_size < self._offset or (self._ino and st.st_ino != self._ino):
+            self._reset()  # compactado por outro processo
+        self._ino = st.st_ino
+        if st.st_size == self._offset:
+            return
+
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(st.st_size - self._offset)
+
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].decode("utf-8", errors="replace").splitlines():
+            field, _, rest = line.partition("\t")
+            n, _, value = rest.partition("\t")
+            trie = self.tries.get(field)
+            if trie is not None and n.isdigit():
+                trie.add(value, int(n))
+                self._lines += 1
+        self._offset += end
+
+    # ----------------------------------------------------------------------
+    # USO
+    # ----------------------------------------------------------------------
+    def add_rows(self, rows: Iterable[Dict]):
+        """Conta os valores de registros novos (antes da carga, só no arquivo)."""
+        lines = [
+            f"{field}\t1\t{_clean(row.get(field))}\n"
+            for row in rows
+            for field in FIELDS
+            if _norm_text(row.get(field))
+        ]
+        if not lines:
+            return
+        with self._lock:
+            if not self.path.exists():
+                return  # a primeira carga lê tudo do CSV
+            if self.loaded:
+                self._catch_up()
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("".join(lines))
+            if self.loaded:
+                self._catch_up()
+
+    def suggest(self, field: str, prefix: str, limit: int = TOP_K) -> List[str]:
+        """Sugestões para `prefix`; vazia enquanto a carga não terminou."""
+        if not self.loaded or not self._lock.acquire(blocking=False):
+            return []
+        try:
+            self._catch_up()
+            trie = self.tries.get(field)
+            return trie.suggest(prefix, limit) if trie is not None else []
+        finally:
+            self._lock.release()
@@ -0,0 +1,323 @@
+"""
+ChangeFeed — Alimentação de mudanças em tempo real para as telas.
+
+Responsabilidades:
+- Ouvir inserções/alterações feitas por OUTROS processos no mesmo banco:
+  • MongoDB: change streams (`collection.watch()`), com resume token;
+  • CSV: watcher por mtime + offset que lê apenas os bytes acrescentados
+    (um por arquivo; no layout particionado, partições novas entram sozinhas);
+    alterações/exclusões vêm do log só-anexação (core/changelog.py).
+- Entregar as mudanças como eventos incrementais (`ChangeEvent`) numa fila
+  thread-safe, drenada pela thread do Tkinter via `poll()`.
+
+As threads de observação nunca tocam em widgets; a UI chama `poll()`
+periodicamente com `after()`.
+
+As gravações do próprio processo também aparecem aqui, mas chegam antes
+pelo EventBus do DataStore (core/events.py); a janela principal descarta
+o eco (`EventBus.claim`).
+"""
+
+import csv
+import io
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.changelog import DELETE, parse_line
+from core.datastore import CSV_HEADER, doc_to_row
+from core.events import DELETED, INSERTED, RESET, UPDATED, ChangeEvent
+
+
+def _complete_prefix(data: bytes) -> int:
+    """
+    Tamanho do maior prefixo de `data` que termina num fim de registro CSV.
+
+    Uma quebra de linha só encerra o registro quando está fora de aspas
+    (observações podem ter várias linhas).
+    """
+    in_quotes = False
+    end = 0
+    for i, ch in enumerate(data):
+        if ch == 0x22:  # "
+            in_quotes = not in_quotes
+        elif ch == 0x0A and not in_quotes:  # \n
+            end = i + 1
+    return end
+
+
+# --------------------------------------------------------------------------
+# CSV — mtime + offset
+# --------------------------------------------------------------------------
+class CsvTailWatcher:
+    """
+    Acompanha um CSV só-anexação lendo apenas o que foi acrescentado.
+
+    A cada intervalo faz um `stat()`; se o tamanho/mtime mudou, lê do último
+    offset conhecido até o fim, processa somente registros completos e
+    avança o offset. Se o arquivo encolher (reescrita), emite RESET.
+    """
+
+    def __init__(self, path: Path, from_start: bool = False):
+        self.path = Path(path)
+
+        self.offset = 0
+        self._mtime_ns = 0
+        self._ino = 0
+        self._header: List[str] = list(CSV_HEADER)
+
+        # por padrão começa no fim do arquivo: só interessa o que vier depois
+        if not from_start:
+            self._sync_to_end()
+
+    def _sync_to_end(self):
+        try:
+            st = self.path.stat()
+        except OSError:
+            self.offset, self._mtime_ns, self._ino = 0, 0, 0
+            return
+
+        self.offset = st.st_size
+        self._mtime_ns = st.st_mtime_ns
+        self._ino = st.st_ino
+        self._header = self._read_header() or list(CSV_HEADER)
+
+    def _read_header(self) -> Optional[List[str]]:
+        try:
+            with self.path.open("r", encoding="utf-8", newline="") as f:
+                first = f.readline()
+        except OSError:
+            return None
+        if not first:
+            return None
+        return next(csv.reader([first]))
+
+    def check(self) -> List[ChangeEvent]:
+        """Uma rodada de verificação; retorna os eventos novos."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return []
+
+        if st.st_size == self.offset and st.st_mtime_ns == self._mtime_ns:
+            return []
+
+        if st.st_size < self.offset or (self._ino and st.st_ino != self._ino):
+            # arquivo truncado/reescrito (cabeçalho reparado, compactação...)
+            self._sync_to_end()
+            return [ChangeEvent(RESET)]
+
+        if not self._ino:
+            self._ino = st.st_ino
+
+        self._mtime_ns = st.st_mtime_ns
+        if st.st_size == self.offset:
+            return []
+
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+
+        end = _complete_prefix(chunk)
+        if not end:
+            return []  # última linha ainda sendo escrita
+        self.offset += end
+
+        events = []
+        text = chunk[:end].decode("utf-8", errors="replace")
+        for values in csv.reader(io.StringIO(text, newline="")):
+            if not any(values):
+                continue
+            if values == self._header:
+                continue
+            row = dict(zip(self._header, values))
+            events.append(ChangeEvent(
+                INSERTED,
+                {f: row.get(f, "") for f in CSV_HEADER},
+                "csv",
+            ))
+        return events
+
+
+class ChangeLogWatcher:
+    """
+    Acompanha o log de alterações do CSV (JSON Lines só-anexação) e
+    converte cada linha nova em UPDATED/DELETED com o id do registro.
+    Quando a compactação esvazia o log, apenas volta ao início (o RESET
+    vem do watcher do próprio CSV, que foi regravado).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            self.offset = self.path.stat().st_size
+        except OSError:
+            self.offset = 0
+
+    def check(self) -> List[ChangeEvent]:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+
+        end = chunk.rfind(b"\n") + 1
+        self.offset += end
+
+        events = []
+        for line in chunk[:end].splitlines():
+            rec = parse_line(line)
+            if rec is None:
+                continue
+            if rec["op"] == DELETE:
+                events.append(ChangeEvent(DELETED, {"id": rec["id"]}, "csv"))
+            else:
+                events.append(ChangeEvent(UPDATED, {"id": rec["id"], **rec.get("fields", {})}, "csv"))
+        return events
+
+
+# --------------------------------------------------------------------------
+# ORQUESTRADOR
+# --------------------------------------------------------------------------
+class ChangeFeed:
+    """
+    Junta as fontes de mudança de um DataStore numa única fila.
+
+    Com o Mongo ativo, os eventos vêm do change stream (o CSV é apenas
+    backup e seu offset só acompanha o fim do arquivo). Sem Mongo, valem
+    os eventos do watcher do CSV.
+    """
+
+    def __init__(self, datastore, csv_interval: float = 0.5):
+        self.datastore = datastore
+        self.events: "queue.Queue[ChangeEvent]" = queue.Queue()
+
+        self.csv_interval = csv_interval
+        self._watchers: Dict[str, CsvTailWatcher] = {
+            str(p): CsvTailWatcher(p) for p in datastore.csv_store.files()
+        }
+        self._log_watcher = ChangeLogWatcher(datastore.csv_log.path)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._stream_active = threading.Event()
+        self._resume_token = None
+
+    # ----------------------------------------------------------------------
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+
+        self._spawn(self._csv_loop, "changefeed-csv")
+        if self.datastore.mongo.configured:
+            self._spawn(self._mongo_loop, "changefeed-mongo")
+
+    def stop(self):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads = []
+
+    def poll(self, max_events: int = 1000) -> List[ChangeEvent]:
+        """Drena a fila sem bloquear (chamado pela thread do Tkinter)."""
+        out = []
+        while len(out) < max_events:
+            try:
+                out.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return out
+
+    def _spawn(self, target, name):
+        t = threading.Thread(target=target, name=name, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    # ----------------------------------------------------------------------
+    def _csv_check(self) -> List[ChangeEvent]:
+        # arquivos criados depois da partida (ex.: partição de um mês novo)
+        # são lidos desde o início
+        for p in self.datastore.csv_store.files():
+            if str(p) not in self._watchers:
+                self._watchers[str(p)] = CsvTailWatcher(p, from_start=True)
+
+        events = []
+        for watcher in self._watchers.values():
+            events.extend(watcher.check())
+        events.extend(self._log_watcher.check())
+        return events
+
+    def _csv_loop(self):
+        while not self._stop.wait(self.csv_interval):
+            try:
+                events = self._csv_check()
+            except Exception:
+                continue
+
+            if self._stream_active.is_set() and self.datastore.use_mongo:
+                continue  # Mongo já entrega estes registros
+
+            for ev in events:
+                self.events.put(ev)
+
+    def _mongo_loop(self):
+        while not self._stop.is_set():
+            if not self.datastore.use_mongo:
+                self._stream_active.clear()
+                self._stop.wait(1.0)
+                continue
+
+            try:
+                coll = self.datastore.db["candidaturas"]
+                with coll.watch(
+                    full_document="updateLookup",
+                    resume_after=self._resume_token,
+                    max_await_time_ms=500,
+                ) as stream:
+                    self._stream_active.set()
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is None:
+                            continue
+                        self._resume_token = stream.resume_token
+                        ev = self._from_change(change)
+                        if ev is not None:
+                            self.events.put(ev)
+
+            except Exception:
+                # change streams exigem replica set (Atlas tem); em servidor
+                # standalone ou queda de rede, volta a valer o watcher do CSV
+                self._stream_active.clear()
+                self._stop.wait(5.0)
+
+        self._stream_active.clear()
+
+    @staticmethod
+    def _from_change(change: Dict) -> Optional[ChangeEvent]:
+        op = change.get("operationType")
+        doc = change.get("fullDocument") or {}
+
+        if op == "insert":
+            return ChangeEvent(INSERTED, doc_to_row(doc), "mongo")
+        if op in ("update", "replace"):
+            return ChangeEvent(UPDATED, doc_to_row(doc), "mongo")
+        if op == "delete":
+            key = change.get("documentKey") or {}
+            return ChangeEvent(DELETED, {"id": str(key.get("_id", ""))}, "mongo")
+        if op in ("drop", "rename", "dropDatabase", "invalidate"):
+            return ChangeEvent(RESET, {}, "mongo")
+        return None
+
+
+def feed_enabled() -> bool:
+    """Permite desligar a atualização ao vivo (MEU_EMPREGO_LIVE_REFRESH=0)."""
+    return os.getenv("MEU_EMPREGO_LIVE_REFRESH", "1") not in ("0", "false", "False")
@@ -0,0 +1,172 @@
+"""
+ChangeLog — alterações e exclusões do CSV como registros só-anexação.
+
+O CSV de candidaturas nunca é reescrito a cada edição. Cada alteração vira
+uma linha JSON num arquivo auxiliar (`candidaturas.changes`):
+
+    {"op": "update", "id": "...", "fields": {"status": "Entrevista"}, "ts": "..."}
+    {"op": "delete", "id": "...", "ts": "..."}
+
+Na leitura, as mudanças são aplicadas por id com "last-writer-wins" (a
+última linha do log vence). Editar custa um append O(1); a compactação
+(feita em segundo plano pelo DataStore) regrava o CSV com as mudanças
+aplicadas e esvazia o log quando a proporção de lixo fica alta.
+
+Com a trava do CSV (core/filelock.py), cada anexo toma a trava
+compartilhada — vários processos anexam juntos, cada linha num único
+write() — e a compactação, com a exclusiva, não perde alterações feitas
+entre ler o log e esvaziá-lo.
+"""
+
+import datetime
+import json
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+UPDATE = "update"
+DELETE = "delete"
+
+
+def parse_line(line: bytes) -> Optional[Dict]:
+    """Uma linha do log → registro (None se corrompida/incompleta)."""
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(rec, dict) or rec.get("op") not in (UPDATE, DELETE) or not rec.get("id"):
+        return None
+    return rec
+
+
+class ChangeLog:
+    """
+    Log de alterações por id de registro.
+
+    `overlay` guarda, por id, os campos alterados acumulados ou None quando
+    o registro foi excluído. Como no CsvKeyIndex, outros processos também
+    acrescentam no arquivo; antes de cada consulta só os bytes novos são lidos.
+    """
+
+    def __init__(self, path: Path, file_lock=None):
+        self.path = Path(path)
+        self.file_lock = file_lock
+        self.entries = 0  # linhas no log (= versões que viraram lixo)
+        self._overlay: Dict[str, Optional[Dict]] = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    # LEITURA INCREMENTAL
+    # ----------------------------------------------------------------------
+    def _catch_up(self):
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        if size < self._offset:  # log esvaziado pela compactação
+            self._overlay, self._offset, self.entries = {}, 0, 0
+        if size == self._offset:
+            return
+
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            rec = parse_line(line)
+            if rec is not None:
+                self._apply(rec)
+        self._offset += end
+
+    def _apply(self, rec: Dict):
+        self.entries += 1
+        rid = rec["id"]
+        if rec["op"] == DELETE:
+            self._overlay[rid] = None
+            return
+
+        if rid in self._overlay and self._overlay[rid] is None:
+            return  # excluído continua excluído
+        merged = dict(self._overlay.get(rid) or {})
+        merged.update(rec.get("fields") or {})
+        self._overlay[rid] = merged
+
+    # ----------------------------------------------------------------------
+    # ESCRITA
+    # ----------------------------------------------------------------------
+    def append(self, op: str, record_id: str, fields: Optional[Dict] = None):
+        rec = {"op": op, "id": record_id}
+        if op == UPDATE:
+            rec["fields"] = fields or {}
+        rec["ts"] = datetime.datetime.now().isoformat(timespec="seconds")
+
+        line = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+        shared = self.file_lock.shared() if self.file_lock is not None else nullcontext()
+        with shared, self._lock:
+            self._catch_up()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab", buffering=0) as f:
+                f.write(line)
+            # a própria linha é aplicada no próximo _catch_up
+
+    def update(self, record_id: str, fields: Dict):
+        self.append(UPDATE, record_id, fields)
+
+    def delete(self, record_id: str):
+        self.append(DELETE, record_id)
+
+    def clear(self):
+        """Esvazia o log (depois que a compactação aplicou tudo no CSV)."""
+        with self._lock:
+            self.path.write_bytes(b"")
+            self._overlay, self._offset, self.entries = {}, 0, 0
+
+    # ----------------------------------------------------------------------
+    # APLICAÇÃO (last-writer-wins)
+    # ----------------------------------------------------------------------
+    def overlay(self) -> Dict[str, Optional[Dict]]:
+        with self._lock:
+            self._catch_up()
+            return self._overlay
+
+    def __len__(self):
+        with self._lock:
+            self._catch_up()
+            return self.entries
+
+    def touches(self, field: str) -> bool:
+        """True se alguma alteração pendente muda `field` (ex.: a data)."""
+        return any(
+            fields is not None and field in fields
+            for fields in self.overlay().values()
+        )
+
+    @staticmethod
+    def apply(row: Dict, overlay: Dict[str, Optional[Dict]]) -> Optional[Dict]:
+        rid = row.get("id")
+        if not rid or rid not in overlay:
+            return row
+        fields = overlay[rid]
+        if fields is None:
+            return None
+        merged = dict(row)
+        merged.update(fields)
+        return merged
+
+    def iter_apply(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        """Aplica o log linha a linha, sem materializar (linhas excluídas somem)."""
+        overlay = self.overlay()
+        if not overlay:
+            yield from rows
+            return
+        for row in rows:
+            row = self.apply(row, overlay)
+            if row is not None:
+                yield row
+
+    def apply_all(self, rows: Iterable[Dict]) -> List[Dict]:
+        return list(self.iter_apply(rows))
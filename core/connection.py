@@ -0,0 +1,297 @@
+"""
+Conexão com o MongoDB — pool, circuit breaker e health-check.
+
+Responsabilidades:
+- Criar o MongoClient com opções de pool ajustáveis (maxPoolSize,
+  connectTimeoutMS, socketTimeoutMS).
+- Controlar falhas com um circuit breaker (fechado / aberto / meio-aberto)
+  e backoff exponencial, em vez de desligar o Mongo para sempre.
+- Rodar um health-check em thread separada que restaura o backend
+  automaticamente, sem bloquear a thread da interface.
+"""
+
+import importlib.util
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# O pymongo só é importado ao conectar (importá-lo custa ~200 ms; no modo
+# CSV e no CLI ele nem é carregado). Sem ele, tudo vai para o CSV.
+PYMONGO_AVAILABLE = importlib.util.find_spec("pymongo") is not None
+MongoClient = None
+
+
+def _mongo_client_class():
+    global MongoClient, PYMONGO_AVAILABLE
+    if MongoClient is None and PYMONGO_AVAILABLE:
+        try:
+            from pymongo import MongoClient
+        except Exception:
+            PYMONGO_AVAILABLE = False
+    return MongoClient
+
+
+# Estados do circuit breaker
+CLOSED = "closed"        # Mongo saudável, operações liberadas
+OPEN = "open"            # Mongo em falha, operações vão direto para o CSV
+HALF_OPEN = "half_open"  # uma tentativa de religação em andamento
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples e thread-safe.
+
+    • fechado     → todas as chamadas passam; falhas seguidas abrem o circuito
+    • aberto      → chamadas bloqueadas até o fim do backoff
+    • meio-aberto → uma única tentativa; sucesso fecha, falha reabre com
+                    backoff dobrado (limitado por `max_delay`)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 2,
+        base_delay: float = 2.0,
+        max_delay: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_delay = base_delay
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Diz se uma tentativa no Mongo pode ser feita agora."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and self._clock() >= self._opened_at + self.retry_delay:
+                self.state = HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.retry_delay = self.base_delay
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+            if self.state == HALF_OPEN:
+                # religação falhou: espera o dobro antes da próxima tentativa
+                self.retry_delay = min(self.retry_delay * 2, self.max_delay)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def seconds_until_retry(self) -> float:
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.retry_delay - self._clock())
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = self._clock()
+
+
+class MongoConnection:
+    """
+    Gerencia o ciclo de vida do MongoClient para o DataStore.
+
+    O DataStore pergunta `is_up()` antes de cada operação e informa o
+    resultado com `record_success()` / `record_failure()`. O loop de
+    health-check cuida de religar o backend em segundo plano.
+    """
+
+    def __init__(
+        self,
+        uri: Optional[str],
+        db_name: str,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.uri = uri
+        self.db_name = db_name
+
+        # Opções de pool/timeouts (sobrescrevíveis pelo .env)
+        self.client_options = {
+            "maxPoolSize": _env_int("MEU_EMPREGO_MONGO_MAX_POOL", 20),
+            "minPoolSize": _env_int("MEU_EMPREGO_MONGO_MIN_POOL", 0),
+            "connectTimeoutMS": _env_int("MEU_EMPREGO_MONGO_CONNECT_TIMEOUT_MS", 4000),
+            "socketTimeoutMS": _env_int("MEU_EMPREGO_MONGO_SOCKET_TIMEOUT_MS", 8000),
+            "serverSelectionTimeoutMS": _env_int("MEU_EMPREGO_MONGO_SELECTION_TIMEOUT_MS", 6000),
+            "retryWrites": True,
+            "retryReads": True,
+        }
+        self.health_interval = _env_float("MEU_EMPREGO_MONGO_HEALTH_INTERVAL", 10.0)
+
+        self.breaker = breaker or CircuitBreaker()
+
+        self.client = None
+        self.db = None
+        self.last_error: Optional[str] = None
+        self.server_version: Optional[str] = None
+
+        self._listeners: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----------------------------------------------------------------------
+    # ESTADO
+    # ----------------------------------------------------------------------
+    @property
+    def configured(self) -> bool:
+        return bool(PYMONGO_AVAILABLE and self.uri)
+
+    def is_up(self) -> bool:
+        """
+        True se o Mongo pode ser usado agora (cliente criado e circuito fechado).
+
+        Operações da interface nunca fazem a tentativa do estado meio-aberto:
+        isso fica com o health-check, para não travar a UI em timeouts.
+        """
+        return self.db is not None and self.breaker.state == CLOSED
+
+    def add_listener(self, callback: Callable[[bool], None]):
+        """
+        Registra callback(online) chamado quando o backend cai ou volta.
+        Atenção: pode ser chamado a partir da thread de health-check.
+        """
+        self._listeners.append(callback)
+
+    # ----------------------------------------------------------------------
+    # CONEXÃO
+    # ----------------------------------------------------------------------
+    def connect(self) -> bool:
+        """
+        Cria o cliente (uma vez) e faz um ping.
+        Retorna True se o servidor respondeu.
+        """
+        if not self.configured:
+            return False
+
+        was_up = self.is_up()
+
+        with self._lock:
+            try:
+                if self.client is None:
+                    self.client = _mongo_client_class()(self.uri, **self.client_options)
+
+                info = self.client.server_info()
+                self.server_version = info.get("version", "?")
+                self.db = self.client[self.db_name]
+
+            except Exception as e:
+                self.record_failure(e)
+                return False
+
+        self.record_success()
+        if not was_up:
+            self._notify(True)
+        return True
+
+    def collection(self, name: str):
+        """Coleção do banco atual (use somente após `is_up()`)."""
+        return self.db[name]
+
+    def record_success(self):
+        self.breaker.record_success()
+        self.last_error = None
+
+    def record_failure(self, exc: Optional[Exception] = None):
+        was_up = self.is_up()
+        if exc is not None:
+            self.last_error = str(exc)
+            print("\n[ERRO MONGO]", exc, "\n")
+
+        self.breaker.record_failure()
+        if was_up and not self.is_up():
+            self._notify(False)
+
+    def _notify(self, online: bool):
+        for cb in list(self._listeners):
+            try:
+                cb(online)
+            except Exception:
+                pass
+
+    # ----------------------------------------------------------------------
+    # HEALTH-CHECK EM SEGUNDO PLANO
+    # ----------------------------------------------------------------------
+    def start_health_check(self):
+        """Inicia a thread de health-check (idempotente)."""
+        if not self.configured or (self._thread and self._thread.is_alive()):
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._health_loop,
+            name="mongo-health",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+
+    def _health_loop(self):
+        while not self._stop.is_set():
+            if self.breaker.state == CLOSED:
+                wait = self.health_interval
+            else:
+                wait = max(0.5, self.breaker.seconds_until_retry())
+
+            if self._stop.wait(wait):
+                return
+
+            # Circuito fechado: ping leve para detectar queda cedo.
+            # Circuito aberto: só tenta quando o backoff libera (meio-aberto).
+            if self.breaker.allow_request():
+                self.connect()
+
+    # ----------------------------------------------------------------------
+    # DIAGNÓSTICO (botão 🌐)
+    # ----------------------------------------------------------------------
+    def status(self) -> Dict:
+        return {
+            "configured": self.configured,
+            "state": self.breaker.state,
+            "retry_in": round(self.breaker.seconds_until_retry(), 1),
+            "server": self.server_version,
+            "error": self.last_error,
+        }
@@ -0,0 +1,1241 @@
+"""
+Armazenamento CSV do Meu Emprego (fallback / backup do MongoDB).
+
+Dois layouts com a mesma interface:
+
+• SingleCsvStore      — um único arquivo (`assets/candidaturas.csv`), layout
+                        histórico da aplicação.
+• PartitionedCsvStore — um arquivo por mês (`AAAA-MM.csv`) dentro de um
+                        diretório, com um `manifest.json` guardando, por
+                        partição, a quantidade de linhas e as datas mín./máx.
+                        Consultas por intervalo de datas ou "mais recentes
+                        primeiro" só abrem as partições necessárias, e
+                        inserções só tocam o arquivo do mês do registro.
+
+Cada linha tem um `id` (24 hex, mesmo formato do ObjectId do Mongo);
+arquivos antigos, sem a coluna, ganham ids na primeira abertura.
+
+Cada arquivo (o único ou cada partição) é mantido em ordem de data, com um
+delta para inserções fora de ordem e um índice esparso de posições em bytes
+(ver SingleCsvStore); arquivos antigos, fora de ordem, são ordenados uma vez
+na primeira consulta.
+
+Vários processos podem usar os mesmos arquivos: escritas e compactação
+tomam a trava exclusiva (`<nome>.lock`, core/filelock.py), leituras a
+compartilhada só pelo tempo de abrir os arquivos e anotar o tamanho — a
+leitura em si não segura a trava e para onde o arquivo terminava. Vários
+processos gravando ao mesmo tempo: `python -m bench.csv_stress`.
+
+Migração do layout único para o particionado:
+
+    python -m core.csvstore migrar --origem assets/candidaturas.csv \\
+                                   --destino assets/candidaturas
+"""
+
+import argparse
+import csv
+import datetime
+import heapq
+import io
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.dates import parse_br_date
+from core.csvwriter import CsvAppender, Durability, repair_tail
+from core.filelock import FileLock, temp_path
+
+
+# Campos base da aplicação
+CSV_FIELDS = [
+    "empresa",
+    "cargo",
+    "data",
+    "tipo",
+    "status",
+    "observacoes",
+    "link",
+]
+
+# Colunas gravadas no arquivo: campos + identificador do registro
+CSV_HEADER = CSV_FIELDS + ["id"]
+
+# Partição para registros sem data válida
+UNDATED = "sem-data"
+
+# Índice esparso: uma entrada (data, posição em bytes) a cada INDEX_EVERY linhas
+INDEX_EVERY = 256
+
+# O delta (inserções fora de ordem) é incorporado ao arquivo principal quando
+# passa de DELTA_MIN linhas e de 1/DELTA_RATIO do arquivo
+DELTA_MIN = 1000
+DELTA_RATIO = 4
+
+
+def new_record_id() -> str:
+    """
+    Id novo de candidatura: 4 bytes de timestamp + 8 aleatórios, em hex
+    (mesmo layout do ObjectId, então serve também como `_id` no Mongo).
+    """
+    return f"{int(time.time()):08x}{os.urandom(8).hex()}"
+
+
+# --------------------------------------------------------------------------
+# DATAS
+# --------------------------------------------------------------------------
+def row_date_key(row: Dict) -> datetime.date:
+    """Chave de ordenação por data; sem data vai para `date.min`."""
+    return parse_br_date(row.get("data", "")) or datetime.date.min
+
+
+def sort_rows(rows: List[Dict], newest_first: bool = True) -> List[Dict]:
+    rows.sort(key=row_date_key, reverse=newest_first)
+    return rows
+
+
+def in_date_range(
+    row: Dict,
+    date_from: Optional[datetime.date],
+    date_to: Optional[datetime.date],
+) -> bool:
+    if date_from is None and date_to is None:
+        return True
+
+    d = parse_br_date(row.get("data", ""))
+    if d is None:
+        return False
+    if date_from is not None and d < date_from:
+        return False
+    if date_to is not None and d > date_to:
+        return False
+    return True
+
+
+def _normalize(row: Dict) -> Dict:
+    return {field: row.get(field) or "" for field in CSV_HEADER}
+
+
+def _values(row: Dict) -> List[str]:
+    return [row.get(field, "") for field in CSV_HEADER]
+
+
+def _row_ord(row: Dict) -> int:
+    return row_date_key(row).toordinal()
+
+
+def _records(f, start: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    (posição, bytes) de cada registro completo de `f` (binário) a partir de
+    `start`. Uma quebra de linha só encerra o registro fora de aspas
+    (observações com várias linhas); um registro sem a quebra final — ainda
+    sendo escrito — é ignorado.
+    """
+    f.seek(start)
+    pos = rec_start = start
+    parts: List[bytes] = []
+    quotes = 0
+    for line in f:
+        parts.append(line)
+        pos += len(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0 and line.endswith(b"\n"):
+            yield rec_start, b"".join(parts)
+            parts, quotes, rec_start = [], 0, pos
+
+
+def _lines(f, size: int) -> Iterator[str]:
+    """Linhas (texto) de `f` até `size` bytes — o que existia ao tirar a fotografia."""
+    pos = 0
+    for line in f:
+        pos += len(line)
+        if pos > size:
+            return
+        yield line.decode("utf-8", errors="replace")
+
+
+def _record_ord(rec: bytes, col: int) -> int:
+    """Data (ordinal) de um registro bruto; sem data → `date.min`."""
+    if b'"' in rec:
+        values = next(csv.reader([rec.decode("utf-8", errors="replace")]), [])
+    else:
+        values = rec.decode("utf-8", errors="replace").rstrip("\r\n").split(",")
+    d = parse_br_date(values[col]) if len(values) > col else None
+    return (d or datetime.date.min).toordinal()
+
+
+def file_mark(path: Path) -> Optional[Tuple[int, int]]:
+    """(inode, tamanho) de `path` — muda em anexos e em substituições; None se não existe."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size
+
+
+def _marks(paths: List[Path]) -> Dict[str, Tuple[int, int]]:
+    marks = {}
+    for p in paths:
+        mark = file_mark(p)
+        if mark is not None:
+            marks[p.name] = mark
+    return marks
+
+
+def _rows_since(paths: List[Path], marks: Dict[str, Tuple[int, int]]):
+    """
+    Registros anexados a `paths` depois de `marks` ({nome: (inode, tamanho)})
+    e as marcas atuais. None se algum arquivo marcado sumiu, encolheu ou foi
+    substituído (merge do delta, compactação, migração).
+    """
+    by_name = {p.name: p for p in paths}
+    current = _marks(paths)
+    if any(name not in current for name in marks):
+        return None
+
+    rows: List[Dict] = []
+    for name, (ino, size) in current.items():
+        p = by_name[name]
+        start = 0
+        if name in marks:
+            old_ino, start = marks[name]
+            if old_ino != ino or size < start:
+                return None
+        if size == start:
+            continue
+        with p.open("rb") as f:
+            f.seek(start)
+            text = f.read(size - start).decode("utf-8", errors="replace")
+        reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=None if start == 0 else CSV_HEADER)
+        rows.extend(_normalize(r) for r in reader if any(r.values()))
+    return rows, current
+
+
+# --------------------------------------------------------------------------
+# LAYOUT ÚNICO
+# --------------------------------------------------------------------------
+class SingleCsvStore:
+    """
+    Um único CSV com todos os registros, ordenado por data.
+
+    • Arquivo principal: linhas em ordem crescente de data (sem data primeiro).
+      Inserções com data ≥ à última (o caso comum: candidatura de hoje) são
+      simplesmente anexadas.
+    • Delta (`<nome>.delta`): inserções fora de ordem, anexadas sem ordem;
+      é pequeno, lido inteiro nas consultas e incorporado ao principal pela
+      compactação (ou quando passa de DELTA_MIN linhas e 1/DELTA_RATIO do
+      arquivo).
+    • Índice esparso (`<nome>.idx`): uma linha "data posição" a cada
+      INDEX_EVERY registros. Intervalos de datas e "os N mais recentes" são
+      respondidos com busca binária no índice + seek, lendo só os blocos
+      necessários. Novos registros no fim são indexados incrementalmente;
+      se o arquivo for reescrito (outro inode), o índice é refeito.
+    • Escrita: principal e delta ficam abertos num CsvAppender (core/csvwriter.py)
+      com a política de durabilidade configurada; cabeçalho e fim do arquivo
+      (registro interrompido por uma queda) são verificados uma vez, no
+      primeiro `ensure()`.
+    • Concorrência entre processos: trava exclusiva em `<nome>.lock` para
+      anexar, reparar e reescrever; compartilhada para fotografar os
+      arquivos antes de ler. Se outro processo deixar o principal fora de
+      ordem (ex.: versão antiga), as leituras ordenam em memória e a próxima
+      escrita reordena o arquivo.
+    """
+
+    layout = "single"
+
+    def __init__(self, path: Path, durability: Optional[Durability] = None):
+        self.path = Path(path)
+        self.delta_path = self.sidecar_path("delta")
+        self.index_path = self.sidecar_path("idx")
+
+        self.lock = FileLock(self.sidecar_path("lock"))
+
+        durability = durability or Durability.from_env()
+        self._main_out = CsvAppender(self.path, CSV_HEADER, durability, self.lock)
+        self._delta_out = CsvAppender(self.delta_path, CSV_HEADER, durability, self.lock)
+        self._ready = False
+        self._tail_last: Optional[int] = None   # data da última linha ainda no buffer
+        self._delta_rows: Optional[int] = None
+
+        self._lock = threading.RLock()
+        self._ino = None
+        self._size = 0            # bytes cobertos pelo índice (registros completos)
+        self._rows = 0
+        self._last: Optional[int] = None
+        self._ords: List[int] = []
+        self._offsets: List[int] = []
+        self._persisted = -1      # maior posição já gravada no .idx
+        self._fields: List[str] = list(CSV_HEADER)
+        self._date_col = CSV_HEADER.index("data")
+        self._unsorted = False    # fora de ordem, à espera de uma escrita que reordene
+
+    def ensure(self):
+        """
+        Cria o CSV caso não exista, arruma cabeçalho incorreto e recupera um
+        fim de arquivo interrompido — uma vez por instância.
+        """
+        if self._ready:
+            return
+        with self.lock.exclusive(), self._lock:
+            if not self._ready:
+                self._check()
+                self._ready = True
+
+    def _check(self):
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)
+            return
+
+        # garantir cabeçalho correto
+        with self.path.open("r", encoding="utf-8") as f:
+            first = f.readline()
+
+        if not first or "empresa" not in first.lower():
+            with self.path.open("w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)
+        elif "id" not in next(csv.reader([first])):
+            self._add_ids()
+        self._recover()
+
+    def _recover(self):
+        """Registro incompleto no fim do principal ou do delta (queda durante a escrita)."""
+        self._sync_index()
+        fixed = [(self.path, repair_tail(self.path, self._size, len(self._fields)))]
+
+        end = 0
+        try:
+            with self.delta_path.open("rb") as f:
+                for off, rec in _records(f, 0):
+                    end = off + len(rec)
+        except OSError:
+            pass
+        else:
+            fixed.append((self.delta_path, repair_tail(self.delta_path, end, len(CSV_HEADER))))
+
+        for path, action in fixed:
+            if action is not None:
+                what = "completada" if action == "completed" else "descartada"
+                print(f"\n[AVISO CSV] Última linha de {path} estava incompleta e foi {what}.\n")
+        self._sync_index()
+
+    def _add_ids(self):
+        """Arquivo anterior aos ids: regrava uma vez com um id por linha."""
+        with self.path.open("r", encoding="utf-8", newline="") as f:
+            rows = [_normalize(r) for r in csv.DictReader(f) if any(r.values())]
+        for row in rows:
+            row["id"] = new_record_id()
+        self._write(rows)
+
+    def _write(self, rows: Iterable[Dict], presorted: bool = False, drop_delta: bool = False):
+        """Regrava o arquivo principal (ordenado por data) de forma atômica."""
+        if not presorted:
+            rows = sorted(rows, key=row_date_key)
+        tmp = temp_path(self.path)
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows([row.get(field, "") for field in CSV_HEADER] for row in rows)
+        self.adopt(tmp, drop_delta=drop_delta)
+
+    def adopt(self, tmp: Path, drop_delta: bool = True):
+        """
+        Substitui o arquivo principal por `tmp` (já completo) e refaz o
+        índice; se `tmp` não estiver em ordem de data, é ordenado aqui.
+        """
+        with self.lock.exclusive(), self._lock:
+            self._main_out.close()
+            os.replace(tmp, self.path)
+            if drop_delta:
+                self._delta_out.close()
+                self.delta_path.unlink(missing_ok=True)
+                self._delta_rows = 0
+            self._ino = None
+            self._sync_index()
+
+    def remove(self):
+        """Apaga o arquivo e seus auxiliares (partição que ficou vazia)."""
+        with self.lock.exclusive(), self._lock:
+            self.close()
+            for p in (self.path, self.delta_path, self.index_path):
+                p.unlink(missing_ok=True)
+            self._ino = None
+            self._ready = False
+            self._delta_rows = None
+
+    def files(self) -> List[Path]:
+        """Arquivos que recebem registros novos (acompanhados pelo ChangeFeed)."""
+        return [self.path, self.delta_path]
+
+    def sidecar_path(self, name: str) -> Path:
+        """Arquivo auxiliar ao lado do CSV (ex.: candidaturas.keys)."""
+        return self.path.with_name(f"{self.path.stem}.{name}")
+
+    def marks(self) -> Dict[str, Tuple[int, int]]:
+        """Versão atual dos arquivos de dados: {nome: (inode, tamanho)}."""
+        paths = self.files()
+        self.flush()
+        with self.lock.shared():
+            return _marks(paths)
+
+    def rows_since(self, marks: Dict[str, Tuple[int, int]]):
+        """Registros anexados depois de `marks` e as marcas atuais (None: reler tudo)."""
+        paths = self.files()
+        self.flush()
+        with self.lock.shared():
+            return _rows_since(paths, marks)
+
+    # ----------------------------------------------------------------------
+    # ÍNDICE ESPARSO
+    # ----------------------------------------------------------------------
+    def _sync_index(self):
+        """Deixa o índice em memória cobrindo o arquivo todo (barato se nada mudou)."""
+        with self._lock:
+            try:
+                st = self.path.stat()
+            except OSError:
+                self._ino = None
+                self._ords, self._offsets = [], []
+                self._size = self._rows = 0
+                self._last = None
+                return
+
+            if st.st_ino != self._ino or st.st_size < self._size:
+                self._load_index(st)
+            elif st.st_size > self._size:
+                self._scan()
+
+    def _load_index(self, st):
+        """Carrega o .idx (se for deste arquivo) e indexa o que faltar."""
+        self._unsorted = False
+        with self.path.open("rb") as f:
+            header = next(_records(f, 0), None)
+        if header is None:
+            data_start = 0
+        else:
+            data_start = len(header[1])
+            self._fields = next(csv.reader([header[1].decode("utf-8", errors="replace")]))
+            if "data" in self._fields:
+                self._date_col = self._fields.index("data")
+
+        ords: List[int] = []
+        offsets: List[int] = []
+        try:
+            with self.index_path.open("r", encoding="ascii") as f:
+                if f.readline().strip() == f"ino={st.st_ino} every={INDEX_EVERY}":
+                    for line in f:
+                        try:
+                            o, off = (int(x) for x in line.split())
+                        except ValueError:
+                            break
+                        if off >= st.st_size:
+                            break
+                        if offsets and off <= offsets[-1]:
+                            continue  # entrada repetida por outro processo
+                        ords.append(o)
+                        offsets.append(off)
+        except OSError:
+            pass
+
+        self._ino = st.st_ino
+        if offsets:
+            # a última entrada é revalidada pela varredura (pode ter virado
+            # lixo se o arquivo foi truncado e regravado no mesmo inode)
+            self._persisted = offsets[-1]
+            self._size = offsets.pop()
+            ords.pop()
+            self._rows = len(offsets) * INDEX_EVERY
+            self._last = ords[-1] if ords else None
+        else:
+            tmp = self._index_tmp()
+            with tmp.open("w", encoding="ascii") as f:
+                f.write(f"ino={st.st_ino} every={INDEX_EVERY}\n")
+            os.replace(tmp, self.index_path)
+            self._persisted = -1
+            self._size = data_start
+            self._rows = 0
+            self._last = None
+
+        self._ords, self._offsets = ords, offsets
+        self._scan()
+
+    def _scan(self):
+        """
+        Indexa os registros depois de `_size`. Um registro fora de ordem faz
+        o arquivo ser reordenado — se houver trava exclusiva; numa leitura,
+        só é marcado (`_unsorted`) para a próxima escrita.
+        """
+        new = []
+        with self.path.open("rb") as f:
+            for off, rec in _records(f, self._size):
+                o = _record_ord(rec, self._date_col)
+                if self._last is not None and o < self._last:
+                    if self.lock.held_exclusive():
+                        self._resort()
+                    else:
+                        self._unsorted = True
+                    return
+                if self._rows % INDEX_EVERY == 0:
+                    self._ords.append(o)
+                    self._offsets.append(off)
+                    if off > self._persisted:
+                        new.append(f"{o} {off}\n")
+                        self._persisted = off
+                self._rows += 1
+                self._last = o
+                self._size = off + len(rec)
+
+        if new:
+            with self.index_path.open("a", encoding="ascii") as f:
+                f.writelines(new)
+
+    def _index_tmp(self) -> Path:
+        # leitores de processos diferentes podem refazer o índice ao mesmo tempo
+        return temp_path(self.index_path)
+
+    def _resort(self):
+        """Arquivo fora de ordem (ex.: anterior a esta versão): ordena uma vez."""
+        self._write(list(self._iter_main()))
+
+    # ----------------------------------------------------------------------
+    # ESCRITA
+    # ----------------------------------------------------------------------
+    def append(self, row: Dict):
+        """Acrescenta uma linha (data já em DD-MM-YYYY)."""
+        self.append_many([row])
+
+    def append_many(self, rows: List[Dict]):
+        """
+        Linhas com data ≥ à última do arquivo vão para o fim do principal;
+        as demais vão para o delta. A chamada é uma transação: termina com
+        `commit()` (ver a política de durabilidade em core/csvwriter.py).
+        """
+        self.ensure()
+        with self.lock.exclusive(), self._lock:
+            if self._main_out.pending:
+                last = self._tail_last   # o arquivo ainda não tem o buffer
+            else:
+                self._sync_index()
+                last = self._last
+
+            in_order, late = [], []
+            for row in sorted(rows, key=row_date_key):
+                o = _row_ord(row)
+                if last is None or o >= last:
+                    in_order.append(row)
+                    last = o
+                else:
+                    late.append(row)
+
+            if in_order:
+                self._main_out.write_rows(_values(row) for row in in_order)
+                self._tail_last = last
+
+            if late:
+                if self._delta_rows is None:
+                    self._delta_out.flush()
+                    self._delta_rows = sum(1 for _ in self._iter_file(self.delta_path))
+                self._delta_out.write_rows(_values(row) for row in late)
+                self._delta_rows += len(late)
+
+            self.commit()
+            if late and self._delta_rows >= max(DELTA_MIN, self._rows // DELTA_RATIO):
+                self.merge_delta()
+
+    def commit(self):
+        self._main_out.commit()
+        self._delta_out.commit()
+
+    def flush(self):
+        """Leva o que estiver no buffer para os arquivos (antes de ler)."""
+        self._main_out.flush()
+        self._delta_out.flush()
+
+    def close(self):
+        self._main_out.close()
+        self._delta_out.close()
+
+    def merge_delta(self) -> int:
+        """
+        Incorpora o delta ao arquivo principal: merge em fluxo dos registros
+        brutos (sem decodificar o principal em dicionários), montando o
+        índice durante a escrita em vez de varrer o arquivo de novo.
+        """
+        with self.lock.exclusive(), self._lock:
+            self.flush()
+            late = sorted(self._iter_file(self.delta_path), key=row_date_key)
+            if not late:
+                return 0
+            self._sync_index()
+            if self._fields != CSV_HEADER:
+                merged = heapq.merge(self._iter_main(), late, key=row_date_key)
+                self._write(merged, presorted=True, drop_delta=True)
+                return len(late)
+
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            pending = []
+            for row in late:
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow([row.get(field, "") for field in CSV_HEADER])
+                pending.append((_row_ord(row), buf.getvalue().encode("utf-8")))
+
+            col = self._date_col
+            ords: List[int] = []
+            offsets: List[int] = []
+            rows = 0
+            last = None
+            tmp = temp_path(self.path)
+            with self.path.open("rb") as src, tmp.open("wb") as out:
+                header = next(_records(src, 0))[1]
+                out.write(header)
+                pos = len(header)
+                main = ((_record_ord(rec, col), rec) for _, rec in _records(src, pos))
+                for o, rec in heapq.merge(main, pending, key=lambda item: item[0]):
+                    if rows % INDEX_EVERY == 0:
+                        ords.append(o)
+                        offsets.append(pos)
+                    out.write(rec)
+                    pos += len(rec)
+                    rows += 1
+                    last = o
+
+            self.close()
+            os.replace(tmp, self.path)
+            self.delta_path.unlink(missing_ok=True)
+            self._delta_rows = 0
+            self._install_index(ords, offsets, rows, last, pos)
+            return len(late)
+
+    def _install_index(self, ords: List[int], offsets: List[int], rows: int, last: Optional[int], size: int):
+        """Adota um índice montado durante a escrita do arquivo principal."""
+        st = self.path.stat()
+        tmp = self._index_tmp()
+        with tmp.open("w", encoding="ascii") as f:
+            f.write(f"ino={st.st_ino} every={INDEX_EVERY}\n")
+            f.writelines(f"{o} {off}\n" for o, off in zip(ords, offsets))
+        os.replace(tmp, self.index_path)
+        self._ino = st.st_ino
+        self._ords, self._offsets = ords, offsets
+        self._rows, self._last, self._size = rows, last, size
+        self._persisted = offsets[-1] if offsets else -1
+        self._fields = list(CSV_HEADER)
+        self._date_col = CSV_HEADER.index("data")
+        self._unsorted = False
+
+    # ----------------------------------------------------------------------
+    # LEITURA
+    # ----------------------------------------------------------------------
+    def _snapshot(self, path: Path) -> Optional[Tuple[object, int]]:
+        """Abre `path` e anota o tamanho sob a trava compartilhada (só registros completos)."""
+        with self.lock.shared():
+            try:
+                f = path.open("rb")
+            except OSError:
+                return None
+            return f, os.fstat(f.fileno()).st_size
+
+    @staticmethod
+    def _iter_snapshot(snap: Optional[Tuple[object, int]]) -> Iterator[Dict]:
+        if snap is None:
+            return
+        f, size = snap
+        with f:
+            for row in csv.DictReader(_lines(f, size)):
+                if any(row.values()):
+                    yield _normalize(row)
+
+    def _iter_file(self, path: Path) -> Iterator[Dict]:
+        # a fotografia é tirada já na chamada, não na primeira iteração
+        return self._iter_snapshot(self._snapshot(path))
+
+    def _iter_main(self) -> Iterator[Dict]:
+        return self._iter_file(self.path)
+
+    def iter_rows(self) -> Iterable[Dict]:
+        """Todos os registros: principal (em ordem) e depois o delta."""
+        self.ensure()
+        self.flush()
+        # as duas fotografias juntas: um merge do delta entre elas
+        # duplicaria (ou perderia) as linhas do delta
+        with self.lock.shared():
+            main = self._iter_main()
+            delta = self._iter_file(self.delta_path)
+        yield from main
+        yield from delta
+
+    def _block(self, f, fields: List[str], start: int, end: int) -> List[Dict]:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+        return [
+            _normalize(dict(zip(fields, values)))
+            for values in csv.reader(io.StringIO(text, newline=""))
+            if any(values)
+        ]
+
+    def _main_snapshot(self):
+        """
+        Índice em dia + handle do principal, sob a trava compartilhada. O
+        handle continua vendo este arquivo mesmo que uma compactação o
+        substitua depois.
+        """
+        with self.lock.shared(), self._lock:
+            for _ in range(3):
+                self._sync_index()
+                try:
+                    f = self.path.open("rb")
+                except OSError:
+                    return None
+                # trocado por um processo sem a trava: refaz o índice
+                st = os.fstat(f.fileno())
+                if st.st_ino == self._ino:
+                    return (
+                        f,
+                        self._size,
+                        list(self._ords),
+                        list(self._offsets),
+                        list(self._fields),
+                        st.st_size if self._unsorted else None,
+                    )
+                f.close()
+        return None
+
+    def _iter_main_range(
+        self,
+        snap,
+        date_from: Optional[datetime.date],
+        date_to: Optional[datetime.date],
+        newest_first: bool,
+    ) -> Iterator[Dict]:
+        """Registros do principal no intervalo, lendo só os blocos necessários."""
+        if snap is None:
+            return
+        f, size, ords, offsets, fields, unsorted_size = snap
+
+        if unsorted_size is not None:
+            # fora de ordem até a próxima escrita: ordena em memória
+            rows = (
+                r for r in self._iter_snapshot((f, unsorted_size))
+                if in_date_range(r, date_from, date_to)
+            )
+            yield from sorted(rows, key=row_date_key, reverse=newest_first)
+            return
+
+        bounds = offsets[1:] + [size]
+        lo = date_from.toordinal() if date_from else None
+        hi = date_to.toordinal() if date_to else None
+
+        with f:
+            if newest_first:
+                last = bisect_right(ords, hi) - 1 if hi is not None else len(ords) - 1
+                for i in range(last, -1, -1):
+                    for row in reversed(self._block(f, fields, offsets[i], bounds[i])):
+                        if in_date_range(row, date_from, date_to):
+                            yield row
+                    if lo is not None and ords[i] < lo:
+                        return  # blocos anteriores são todos mais antigos
+            else:
+                first = max(0, bisect_left(ords, lo) - 1) if lo is not None else 0
+                for i in range(first, len(ords)):
+                    if hi is not None and ords[i] > hi:
+                        return
+                    for row in self._block(f, fields, offsets[i], bounds[i]):
+                        if hi is not None and _row_ord(row) > hi:
+                            return
+                        if in_date_range(row, date_from, date_to):
+                            yield row
+
+    def iter_query(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        newest_first: Optional[bool] = None,
+    ) -> Iterator[Dict]:
+        """
+        Registros do intervalo em ordem de data (crescente, ou decrescente
+        com `newest_first`), um a um: busca binária no índice para achar o
+        primeiro bloco, leitura sequencial a partir dele e merge com o delta.
+        """
+        self.ensure()
+        self.flush()
+        desc = bool(newest_first)
+        with self.lock.shared(), self._lock:
+            snap = self._main_snapshot()
+            delta = self._iter_file(self.delta_path)
+        late = sorted(
+            (r for r in delta if in_date_range(r, date_from, date_to)),
+            key=row_date_key,
+            reverse=desc,
+        )
+        main = self._iter_main_range(snap, date_from, date_to, desc)
+        if not late:
+            yield from main
+        else:
+            yield from heapq.merge(main, late, key=row_date_key, reverse=desc)
+
+    def query(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        return list(islice(self.iter_query(date_from, date_to, newest_first), limit or None))
+
+    def count(self) -> int:
+        """Total de linhas: o principal pelo índice (só a cauda nova é lida) + o delta."""
+        self.ensure()
+        self.flush()
+        with self.lock.shared(), self._lock:
+            self._sync_index()
+            main = sum(1 for _ in self._iter_main()) if self._unsorted else self._rows
+            delta = sum(1 for _ in self._iter_file(self.delta_path))
+        return main + delta
+
+    def compact(
+        self,
+        transform: Callable[[Dict], Optional[Dict]],
+        before_commit: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """
+        Regrava o arquivo aplicando `transform` a cada linha (None = remove)
+        e incorpora o delta. Em fluxo: as linhas que mantêm a data seguem na
+        ordem do arquivo; só as que mudaram de data e as do delta ficam em
+        memória até o merge final. A troca é atômica (os.replace).
+        `before_commit` roda depois da última chamada a `transform`, antes
+        da troca.
+        """
+        with self.lock.exclusive(), self._lock:
+            self.flush()
+            moved: List[Dict] = []
+            kept = 0
+            stage = self.path.with_name(self.path.name + ".stage")
+            with stage.open("w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)
+                for row in self._iter_main():
+                    new = transform(row)
+                    if new is None:
+                        continue
+                    kept += 1
+                    if row_date_key(new) != row_date_key(row):
+                        moved.append(new)
+                    else:
+                        writer.writerow([new.get(field, "") for field in CSV_HEADER])
+
+            for row in self._iter_file(self.delta_path):
+                new = transform(row)
+                if new is not None:
+                    kept += 1
+                    moved.append(new)
+
+            if before_commit is not None:
+                before_commit()
+            moved.sort(key=row_date_key)
+            merged = heapq.merge(self._iter_file(stage), moved, key=row_date_key)
+            self._write(merged, presorted=True, drop_delta=True)
+            stage.unlink(missing_ok=True)
+            return kept
+
+
+# --------------------------------------------------------------------------
+# LAYOUT PARTICIONADO POR MÊS
+# --------------------------------------------------------------------------
+class PartitionedCsvStore:
+    """
+    Um CSV por mês + manifest.json.
+
+    manifest = {"version": 1, "partitions": {"2025-11": {"rows": 12,
+                "min": "2025-11-03", "max": "2025-11-28"}, ...}}
+
+    Cada partição tem a própria trava; `_lock` no diretório serializa, entre
+    processos, a atualização do manifest e a compactação (sempre tomada
+    antes da trava de uma partição).
+    """
+
+    layout = "partitioned"
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.manifest_path = self.root / self.MANIFEST
+        self.partitions: Dict[str, Dict] = {}
+        self._manifest_mtime = None
+        self._parts: Dict[str, SingleCsvStore] = {}  # índice em memória por partição
+        self.lock = FileLock(self.sidecar_path("lock"))
+
+    # ----------------------------------------------------------------------
+    # MANIFEST
+    # ----------------------------------------------------------------------
+    def ensure(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            self.rebuild_manifest()
+            return
+
+        if mtime == self._manifest_mtime:
+            return  # já carregado
+
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.partitions = dict(data.get("partitions", {}))
+            self._manifest_mtime = mtime
+        except Exception:
+            self.rebuild_manifest()
+
+    def _save_manifest(self):
+        tmp = temp_path(self.manifest_path)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"version": 1, "partitions": dict(sorted(self.partitions.items()))},
+                f,
+                indent=1,
+            )
+        os.replace(tmp, self.manifest_path)
+        self._manifest_mtime = self.manifest_path.stat().st_mtime_ns
+
+    def rebuild_manifest(self):
+        """Reconstrói o manifest lendo todas as partições (recuperação)."""
+        self.partitions = {}
+        for path in sorted(self.root.glob("*.csv")):
+            if not self.is_partition_name(path.stem):
+                continue  # arquivos auxiliares (_*.csv) não são partições
+            entry = {"rows": 0, "min": None, "max": None}
+            for row in self._part(path.stem).iter_rows():
+                self._account(entry, row)
+            self.partitions[path.stem] = entry
+        self._save_manifest()
+
+    @staticmethod
+    def _account(entry: Dict, row: Dict):
+        entry["rows"] += 1
+        d = parse_br_date(row.get("data", ""))
+        if d is None:
+            return
+        iso = d.isoformat()
+        if entry["min"] is None or iso < entry["min"]:
+            entry["min"] = iso
+        if entry["max"] is None or iso > entry["max"]:
+            entry["max"] = iso
+
+    # ----------------------------------------------------------------------
+    # PARTIÇÕES
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def partition_key(row: Dict) -> str:
+        d = parse_br_date(row.get("data", ""))
+        return f"{d.year:04d}-{d.month:02d}" if d else UNDATED
+
+    @staticmethod
+    def is_partition_name(stem: str) -> bool:
+        if stem == UNDATED:
+            return True
+        y, _, m = stem.partition("-")
+        return len(y) == 4 and len(m) == 2 and y.isdigit() and m.isdigit()
+
+    def partition_path(self, key: str) -> Path:
+        return self.root / f"{key}.csv"
+
+    def _part(self, key: str) -> SingleCsvStore:
+        part = self._parts.get(key)
+        if part is None:
+            part = self._parts[key] = SingleCsvStore(self.partition_path(key))
+        return part
+
+    def files(self) -> List[Path]:
+        """Partições e seus deltas (acompanhados pelo ChangeFeed)."""
+        self.ensure()
+        return [p for k in sorted(self.partitions) for p in self._part(k).files()]
+
+    def sidecar_path(self, name: str) -> Path:
+        """Arquivo auxiliar dentro do diretório das partições."""
+        return self.root / f"_{name}"
+
+    def marks(self) -> Dict[str, Tuple[int, int]]:
+        """Versão atual das partições e deltas: {nome: (inode, tamanho)}."""
+        paths = self.files()
+        self.flush()
+        with self.lock.shared():
+            return _marks(paths)
+
+    def rows_since(self, marks: Dict[str, Tuple[int, int]]):
+        """Registros anexados depois de `marks` (partições novas entram inteiras)."""
+        paths = self.files()
+        self.flush()
+        with self.lock.shared():
+            return _rows_since(paths, marks)
+
+    def _keys_for(
+        self,
+        date_from: Optional[datetime.date],
+        date_to: Optional[datetime.date],
+    ) -> List[str]:
+        """Partições cujo intervalo [min, max] cruza o intervalo pedido."""
+        lo = date_from.isoformat() if date_from else None
+        hi = date_to.isoformat() if date_to else None
+
+        keys = []
+        for key, entry in self.partitions.items():
+            if not entry.get("rows"):
+                continue
+            if key == UNDATED:
+                if lo is None and hi is None:
+                    keys.append(key)
+                continue
+            if lo is not None and entry.get("max") and entry["max"] < lo:
+                continue
+            if hi is not None and entry.get("min") and entry["min"] > hi:
+                continue
+            keys.append(key)
+        return keys
+
+    # ----------------------------------------------------------------------
+    # ESCRITA / LEITURA
+    # ----------------------------------------------------------------------
+    def append(self, row: Dict):
+        """Acrescenta a linha apenas no arquivo do mês do registro."""
+        self.append_many([row])
+
+    def append_many(self, rows: List[Dict]):
+        """Agrupa as linhas por mês: uma escrita por partição e um manifest."""
+        groups: Dict[str, List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(self.partition_key(row), []).append(row)
+        if not groups:
+            return
+
+        with self.lock.exclusive():
+            self.ensure()  # manifest de outro processo, se mudou
+
+            for key, part in groups.items():
+                self._part(key).append_many(part)
+
+                entry = self.partitions.setdefault(key, {"rows": 0, "min": None, "max": None})
+                for row in part:
+                    self._account(entry, row)
+
+            self._save_manifest()
+
+        # só as partições deste lote ficam com arquivos abertos
+        for key, part in self._parts.items():
+            if key not in groups:
+                part.close()
+
+    def commit(self):
+        for part in self._parts.values():
+            part.commit()
+
+    def flush(self):
+        for part in self._parts.values():
+            part.flush()
+
+    def close(self):
+        for part in self._parts.values():
+            part.close()
+
+    def iter_rows(self) -> Iterable[Dict]:
+        self.ensure()
+        for key in sorted(self.partitions):
+            yield from self._part(key).iter_rows()
+
+    def iter_query(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        newest_first: Optional[bool] = None,
+    ) -> Iterator[Dict]:
+        """
+        Registros do intervalo, partição por partição. Com ordenação, só
+        uma partição (um mês) fica em memória de cada vez.
+        """
+        self.ensure()
+
+        # "AAAA-MM" ordena cronologicamente; sem-data fica como a mais antiga
+        keys = sorted(
+            self._keys_for(date_from, date_to),
+            key=lambda k: "" if k == UNDATED else k,
+            reverse=bool(newest_first),
+        )
+
+        for key in keys:
+            yield from self._part(key).iter_query(date_from, date_to, newest_first)
+
+    def query(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        newest_first: bool = True,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        # as partições são lidas sob demanda: com `limit`, as mais antigas
+        # (ou mais novas) nem chegam a ser abertas
+        return list(islice(self.iter_query(date_from, date_to, newest_first), limit or None))
+
+    def count(self) -> int:
+        """Total de linhas, direto do manifest."""
+        self.ensure()
+        return sum(entry.get("rows", 0) for entry in self.partitions.values())
+
+    def compact(
+        self,
+        transform: Callable[[Dict], Optional[Dict]],
+        before_commit: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """
+        Regrava todas as partições aplicando `transform` (None = remove).
+        Uma linha cuja data mudou vai para a partição do novo mês. Todos os
+        temporários são escritos antes das trocas, que acontecem em sequência;
+        `before_commit` roda entre as duas etapas.
+        """
+        with self.lock.exclusive():
+            return self._compact(transform, before_commit)
+
+    def _compact(
+        self,
+        transform: Callable[[Dict], Optional[Dict]],
+        before_commit: Optional[Callable[[], None]] = None,
+    ) -> int:
+        self.ensure()
+        old = set(self.partitions)
+
+        handles = {}
+        partitions: Dict[str, Dict] = {}
+        kept = 0
+        try:
+            for row in self.iter_rows():
+                row = transform(row)
+                if row is None:
+                    continue
+                key = self.partition_key(row)
+                if key not in handles:
+                    tmp = self.partition_path(key).with_suffix(".csv.tmp")
+                    f = tmp.open("w", newline="", encoding="utf-8")
+                    writer = csv.writer(f)
+                    writer.writerow(CSV_HEADER)
+                    handles[key] = (f, writer)
+                    partitions[key] = {"rows": 0, "min": None, "max": None}
+
+                handles[key][1].writerow([row.get(field, "") for field in CSV_HEADER])
+                self._account(partitions[key], row)
+                kept += 1
+        finally:
+            for f, _ in handles.values():
+                f.close()
+
+        if before_commit is not None:
+            before_commit()
+
+        # cada partição é ordenada por data e reindexada na troca; o delta
+        # já foi lido por iter_rows e é descartado
+        for key in partitions:
+            self._part(key).adopt(self.partition_path(key).with_suffix(".csv.tmp"))
+        for key in old - set(partitions):
+            self._part(key).remove()
+
+        self.partitions = partitions
+        self._save_manifest()
+        return kept
+
+
+# --------------------------------------------------------------------------
+# FÁBRICA + MIGRAÇÃO
+# --------------------------------------------------------------------------
+def open_store(layout: str, csv_path: Path, csv_dir: Path):
+    """Abre o layout configurado (`single` ou `partitioned`)."""
+    if (layout or "single").lower() in ("partitioned", "particionado"):
+        return PartitionedCsvStore(csv_dir)
+    return SingleCsvStore(csv_path)
+
+
+def migrate_to_partitions(src: Path, dest: Path, force: bool = False) -> Dict:
+    """
+    Copia o CSV único para o layout particionado, em uma passada.
+    O arquivo de origem não é alterado (exceto ganhar a coluna `id`, se
+    ainda não a tiver, para que os ids sejam os mesmos nos dois layouts).
+    """
+    src, dest = Path(src), Path(dest)
+    store = PartitionedCsvStore(dest)
+
+    if (dest / PartitionedCsvStore.MANIFEST).exists() and not force:
+        store.ensure()
+        if any(e.get("rows") for e in store.partitions.values()):
+            raise RuntimeError(
+                f"{dest} já contém partições; use --force para sobrescrever."
+            )
+
+    dest.mkdir(parents=True, exist_ok=True)
+    for old in dest.glob("*.csv"):
+        if PartitionedCsvStore.is_partition_name(old.stem):
+            SingleCsvStore(old).remove()
+
+    handles = {}
+    partitions: Dict[str, Dict] = {}
+    total = 0
+    try:
+        for row in SingleCsvStore(src).iter_rows():
+            key = PartitionedCsvStore.partition_key(row)
+            if key not in handles:
+                tmp = store.partition_path(key).with_suffix(".csv.tmp")
+                f = tmp.open("w", newline="", encoding="utf-8")
+                writer = csv.writer(f)
+                writer.writerow(CSV_HEADER)
+                handles[key] = (f, writer)
+                partitions[key] = {"rows": 0, "min": None, "max": None}
+
+            handles[key][1].writerow([row[field] for field in CSV_HEADER])
+            PartitionedCsvStore._account(partitions[key], row)
+            total += 1
+    finally:
+        for f, _ in handles.values():
+            f.close()
+
+    for key in partitions:
+        store._part(key).adopt(store.partition_path(key).with_suffix(".csv.tmp"))
+
+    store.partitions = partitions
+    store._save_manifest()
+    return {"rows": total, "partitions": len(partitions)}
+
+
+def main(argv=None):
+    from dotenv import load_dotenv
+
+    load_dotenv(".env")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m core.csvstore",
+        description="Ferramentas do armazenamento CSV do Meu Emprego.",
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    mig = sub.add_parser("migrar", help="CSV único → partições mensais")
+    mig.add_argument("--origem", default=os.getenv("CANDIDATURAS_CSV_PATH", "assets/candidaturas.csv"))
+    mig.add_argument("--destino", default=os.getenv("CANDIDATURAS_CSV_DIR", "assets/candidaturas"))
+    mig.add_argument("--force", action="store_true", help="sobrescreve partições existentes")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "migrar":
+        res = migrate_to_partitions(Path(args.origem), Path(args.destino), force=args.force)
+        print(
+            f"{res['rows']} registros migrados em {res['partitions']} partições → {args.destino}\n"
+            "Defina CANDIDATURAS_CSV_LAYOUT=partitioned no .env para usar o novo layout."
+        )
+
+
+if __name__ == "__main__":
+    main()
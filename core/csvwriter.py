@@ -0,0 +1,201 @@
+"""
+CsvAppender — escritor de longa duração para os CSVs (group commit).
+
+Antes, cada inserção abria o CSV, escrevia uma linha e fechava. Aqui o
+arquivo fica aberto em modo de anexação e as linhas se acumulam num buffer
+em memória; cada descarga é uma única chamada `write()` com registros
+completos. O momento da descarga segue a política de durabilidade
+(MEU_EMPREGO_CSV_DURABILITY):
+
+• "commit" (padrão) — cada `commit()` (uma inserção, ou um lote do
+                      importador) chega ao sistema operacional, como antes.
+• "sync"            — como "commit", mais `fsync`: o commit só volta com os
+                      dados no disco.
+• "group"           — `commit()` não descarrega; o buffer vai para o arquivo
+                      a cada MEU_EMPREGO_CSV_FLUSH_ROWS linhas ou
+                      MEU_EMPREGO_CSV_FLUSH_MS milissegundos (e antes de
+                      qualquer leitura do próprio processo). Mais rápido em
+                      rajadas; uma queda do processo perde no máximo esse
+                      intervalo.
+
+Em qualquer modo, lotes grandes são descarregados a cada FLUSH_ROWS linhas
+(o buffer não cresce sem limite).
+
+Cada descarga acontece sob a trava exclusiva do arquivo (core/filelock.py)
+e é um único `write()` em modo de anexação: linhas de processos diferentes
+nunca se intercalam, e quem lê sob a trava compartilhada nunca vê um
+registro pela metade.
+
+Recuperação: `repair_tail` trata um registro incompleto no fim do arquivo
+(queda no meio de uma escrita) — descartado ou, se todas as colunas
+estiverem lá e faltar só a quebra de linha, completado.
+"""
+
+import atexit
+import csv
+import io
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+from core.filelock import FileLock
+
+
+COMMIT = "commit"
+SYNC = "sync"
+GROUP = "group"
+
+
+@dataclass(frozen=True)
+class Durability:
+    mode: str = COMMIT
+    flush_rows: int = 256
+    flush_ms: int = 200
+
+    @classmethod
+    def from_env(cls) -> "Durability":
+        mode = os.getenv("MEU_EMPREGO_CSV_DURABILITY", COMMIT).strip().lower()
+        return cls(
+            mode=mode if mode in (COMMIT, SYNC, GROUP) else COMMIT,
+            flush_rows=max(1, int(os.getenv("MEU_EMPREGO_CSV_FLUSH_ROWS", "256"))),
+            flush_ms=max(1, int(os.getenv("MEU_EMPREGO_CSV_FLUSH_MS", "200"))),
+        )
+
+
+def repair_tail(path: Path, end: int, columns: int) -> Optional[str]:
+    """
+    Trata os bytes depois de `end` (fim do último registro completo).
+    Retorna "completed", "truncated" ou None (nada a fazer).
+    """
+    try:
+        f = Path(path).open("r+b")
+    except OSError:
+        return None
+    with f:
+        f.seek(end)
+        tail = f.read()
+        if not tail:
+            return None
+
+        if tail.count(b'"') % 2 == 0:
+            values = next(csv.reader([tail.decode("utf-8", errors="replace")]), [])
+            if len(values) == columns:
+                # linha inteira, só sem a quebra final (ex.: editada à mão)
+                f.seek(0, os.SEEK_END)
+                f.write(b"\r\n")
+                return "completed"
+
+        f.truncate(end)
+        return "truncated"
+
+
+class CsvAppender:
+    """Anexa linhas a um CSV mantendo o arquivo aberto entre escritas."""
+
+    def __init__(
+        self,
+        path: Path,
+        header: List[str],
+        durability: Optional[Durability] = None,
+        lock: Optional[FileLock] = None,
+    ):
+        self.path = Path(path)
+        self.header = list(header)
+        self.durability = durability or Durability.from_env()
+        self.lock = lock or FileLock(self.path.with_name(self.path.name + ".lock"))
+        self.pending = 0
+
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        self._f = None
+        self._ino = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    # API
+    # ----------------------------------------------------------------------
+    def write_rows(self, rows: Iterable[Sequence[str]]):
+        """Enfileira linhas (listas de valores na ordem do cabeçalho)."""
+        with self.lock.exclusive(), self._lock:
+            for values in rows:
+                self._writer.writerow(values)
+                self.pending += 1
+                if self.pending >= self.durability.flush_rows:
+                    self._flush()
+            if self.pending and self.durability.mode == GROUP and self._timer is None:
+                self._timer = threading.Timer(self.durability.flush_ms / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def commit(self):
+        """Fim de uma transação (inserção ou lote) — ver a política acima."""
+        if self.durability.mode == GROUP:
+            return
+        with self.lock.exclusive(), self._lock:
+            self._flush(sync=self.durability.mode == SYNC)
+
+    def flush(self):
+        """Descarrega o buffer no arquivo (sem fsync)."""
+        with self.lock.exclusive(), self._lock:
+            self._flush()
+
+    def close(self):
+        """Descarrega e fecha o arquivo (antes de ele ser substituído)."""
+        if self._f is None and not self.pending:
+            return  # nada aberto: não precisa da trava
+        with self.lock.exclusive(), self._lock:
+            self._flush()
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+                atexit.unregister(self.close)
+
+    # ----------------------------------------------------------------------
+    # (chamados com a trava exclusiva e self._lock)
+    # ----------------------------------------------------------------------
+    def _open(self):
+        # o arquivo pode ter sido substituído (compactação, outro processo)
+        if self._f is not None:
+            try:
+                same = os.stat(self.path).st_ino == self._ino
+            except OSError:
+                same = False
+            if same:
+                return
+            self._f.close()
+            self._f = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("ab", buffering=0)
+        st = os.fstat(self._f.fileno())
+        self._ino = st.st_ino
+        if st.st_size == 0:
+            buf = io.StringIO()
+            csv.writer(buf).writerow(self.header)
+            self._write_all(buf.getvalue().encode("utf-8"))
+        atexit.unregister(self.close)
+        atexit.register(self.close)  # o buffer não se perde na saída normal
+
+    def _flush(self, sync: bool = False):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.pending:
+            data = self._buf.getvalue().encode("utf-8")
+            self._buf.seek(0)
+            self._buf.truncate()
+            self.pending = 0
+
+            self._open()
+            self._write_all(data)
+        if sync and self._f is not None:
+            os.fsync(self._f.fileno())
+
+    def _write_all(self, data: bytes):
+        # um write() só; o laço cobre apenas escritas parciais (disco cheio, sinal)
+        view = memoryview(data)
+        while view:
+            view = view[self._f.write(view):]
@@ -4,36 +4,166 @@ DataStore — Camada de persistência do Meu Emprego.
 Responsabilidades:
 - Centralizar acesso aos dados das candidaturas.
 - Tentar usar MongoDB Atlas como backend principal.
-- Fazer fallback automático para CSV (`assets/candidaturas.csv`) se o Mongo falhar.
+- Fazer fallback automático para CSV (`assets/candidaturas.csv`) se o Mongo falhar,
+  religando o Mongo sozinho quando ele voltar (ver core/connection.py).
+- O CSV pode ser um arquivo único ou particionado por mês (ver core/csvstore.py).
+- Alterar/excluir: no Mongo via `update_one`/`delete_one`; no CSV como registros
+  só-anexação num log (ver core/changelog.py), compactado em segundo plano.
+- Registrar as transições de status (ver core/history.py).
+- Manter contagens por dia/semana/mês para a linha do tempo (ver core/rollups.py).
+- Guardar o cache de verificação dos links das vagas (ver core/linkcheck.py).
+- Guardar a fotografia dos agregados para abrir sem esperar (ver core/snapshot.py).
+- Publicar cada gravação (inserção, alteração, exclusão) como evento, com
+  contador de versão, para as telas se atualizarem sem reler (ver core/events.py).
+- Manter resumos mensais dos dois lados e sincronizar Mongo ↔ CSV só nos
+  meses que diferem (ver core/sync.py).
+- Arquivar candidaturas antigas ou encerradas num nível frio, fora das
+  leituras padrão (ver core/archive.py).
+- Listar com só a prévia das observações; o texto completo é lido por id,
+  sob demanda, com cache LRU (`get_observacoes`).
+- Sugerir empresa/cargo já usados enquanto o usuário digita (ver
+  core/autocomplete.py).
+- Manter uma cópia colunar (Arrow, mapeada em memória) do CSV para as
+  agregações, como a contagem por status (ver core/analytics.py).
 - Garantir consistência entre campos (empresa, cargo, data, tipo, status, observacoes, link).
 """
 
 import csv
+import heapq
 import os
 import datetime
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from itertools import chain, islice
+from typing import Dict, Iterator, List, Optional
 
 from dotenv import load_dotenv
 
-# Tenta importar MongoDB caso de erro vai para CSV
-try:
-    from pymongo import MongoClient
-    PYMONGO_AVAILABLE = True
-except Exception:
-    PYMONGO_AVAILABLE = False
+from core.connection import MongoConnection, PYMONGO_AVAILABLE
 
+# bson/pymongo são importados só quando há Mongo configurado (ver
+# `_import_driver`); até lá — ou sem o pymongo instalado — valem os
+# substitutos abaixo, que nunca são levantados.
+ObjectId = None
 
-# Campos base da aplicação
-CSV_FIELDS = [
-    "empresa",
-    "cargo",
-    "data",
-    "tipo",
-    "status",
-    "observacoes",
-    "link",
-]
+
+class DuplicateKeyError(Exception):
+    """Substituto quando o pymongo não está carregado."""
+
+
+class BulkWriteError(Exception):
+    """Substituto quando o pymongo não está carregado."""
+
+
+def _import_driver():
+    global ObjectId, BulkWriteError, DuplicateKeyError
+    try:
+        from bson import ObjectId
+        from pymongo.errors import BulkWriteError, DuplicateKeyError
+    except Exception:
+        pass
+
+from core import analytics, archive
+from core.autocomplete import Autocomplete
+from core.changelog import ChangeLog
+from core.csvstore import (
+    CSV_FIELDS,
+    CSV_HEADER,
+    UNDATED,
+    file_mark,
+    in_date_range,
+    new_record_id,
+    open_store,
+    row_date_key,
+    sort_rows,
+)
+from core.dates import format_br, iso_to_br, parse_date, to_datetime
+from core.dedup import CsvKeyIndex, dedup_key, ensure_mongo_index, key_hash
+from core.events import DELETED, INSERTED, RESET, UPDATED, ChangeEvent, EventBus
+from core.filelock import temp_path
+from core.history import StatusHistory, applied_ts, deletion, now_ts, transition
+from core.linkcheck import LinkChecker
+from core import rollups as rollup
+from core import sync
+from core.snapshot import SnapshotCache
+from core.table import PREVIEW_CHARS, CandidaturaTable, TextCache, is_preview
+from core.table import preview as obs_preview
+
+
+def doc_to_row(doc: Dict) -> Dict:
+    """
+    Converte um documento do Mongo para o formato de linha da aplicação
+    (mesmos campos do CSV, data em DD-MM-YYYY).
+    """
+    return {
+        "id": str(doc.get("_id", "")),
+        "empresa": doc.get("empresa", ""),
+        "cargo": doc.get("cargo", ""),
+        "data": format_br(doc.get("data")),
+        "tipo": doc.get("tipo", ""),
+        "status": doc.get("status", ""),
+        "observacoes": doc.get("observacoes", ""),
+        "link": doc.get("link", ""),
+    }
+
+
+def _csv_row(doc: Dict) -> Dict:
+    """Documento da aplicação (data ISO) → linha do CSV (data DD-MM-YYYY)."""
+    row = {field: doc.get(field, "") for field in CSV_HEADER}
+    row["data"] = iso_to_br(row["data"])
+    return row
+
+
+def _mongo_id(record_id: str):
+    """Id da aplicação → `_id` do Mongo (ObjectId quando o formato permite)."""
+    if ObjectId is not None and ObjectId.is_valid(record_id):
+        return ObjectId(record_id)
+    return record_id
+
+
+def _mongo_fields(fields: Dict) -> Dict:
+    """Campos alterados → `$set` do Mongo (data datetime, `_chave.*` recalculada)."""
+    out = {k: v for k, v in fields.items() if k in CSV_FIELDS}
+    if "data" in out:
+        out["data"] = to_datetime(out["data"])
+    chave = dedup_key(fields)
+    for k in ("empresa", "cargo", "link"):
+        if k in fields:
+            out[f"_chave.{k}"] = chave[k]
+    return out
+
+
+def _mongo_doc(doc: Dict) -> Dict:
+    """Documento da aplicação → documento do Mongo (data datetime + `_chave`)."""
+    doc_mongo = doc.copy()
+    if doc_mongo.get("id"):
+        doc_mongo["_id"] = _mongo_id(doc_mongo.pop("id"))
+    doc_mongo["_chave"] = dedup_key(doc)
+    if "data" in doc_mongo:
+        doc_mongo["data"] = to_datetime(doc_mongo["data"])
+    return doc_mongo
+
+
+# Projeção das listagens com prévia: as observações são cortadas no servidor
+# (PREVIEW_CHARS + 1 caracteres bastam para saber se houve corte)
+_PREVIEW_PROJECTION = {
+    **{field: 1 for field in ("empresa", "cargo", "data", "tipo", "status", "link")},
+    "observacoes": {"$substrCP": [{"$ifNull": ["$observacoes", ""]}, 0, PREVIEW_CHARS + 1]},
+}
+
+
+def _doc_date_key(doc: Dict) -> datetime.datetime:
+    """Chave de ordenação por data de um documento do Mongo (sem data primeiro, como no `sort`)."""
+    d = doc.get("data")
+    return d if isinstance(d, datetime.datetime) else datetime.datetime.min
+
+
+def _mongo_key_filter(doc: Dict) -> Dict:
+    """Filtro que usa o índice único `_chave.*`."""
+    return {f"_chave.{k}": v for k, v in dedup_key(doc).items()}
 
 
 class DataStore:
@@ -42,6 +172,9 @@ class DataStore:
     A aplicação usa sempre os mesmos métodos independentemente do backend.
     """
 
+    # acima disto, `insert_many` publica um RESET em vez de um evento por linha
+    EVENTS_PER_BATCH = 200
+
     def __init__(self, mongo_uri: str = None, db_name: str = "meu_emprego"):
         # Carrega variáveis do .env
         load_dotenv()
@@ -55,203 +188,1602 @@ class DataStore:
             os.getenv("CANDIDATURAS_CSV_PATH", "assets/candidaturas.csv")
         )
 
-        self.client = None
-        self.db = None
-        self.use_mongo: bool = False
+        # Layout do CSV: "single" (arquivo único) ou "partitioned" (um por mês)
+        self.csv_layout = os.getenv("CANDIDATURAS_CSV_LAYOUT", "single")
+        self.csv_dir = Path(
+            os.getenv("CANDIDATURAS_CSV_DIR", "assets/candidaturas")
+        )
+        self.csv_store = open_store(self.csv_layout, self.csv_path, self.csv_dir)
+
+        # Conexão Mongo com pool + circuit breaker; o health-check religa
+        # o backend em segundo plano depois de uma queda.
+        self.mongo = MongoConnection(self.mongo_uri, self.db_name)
+
+        # Gravações deste processo → telas (eventos + versão dos dados)
+        self.events = EventBus()
+
+        # observações completas lidas sob demanda (as listagens trazem a prévia)
+        self.obs_cache = TextCache(64)
 
         self._connect_mongo()
         self._ensure_csv()
 
+        # Alterações/exclusões do CSV (só-anexação) + compactação em background
+        self.csv_log = ChangeLog(self.csv_store.sidecar_path("changes"), self.csv_store.lock)
+        self.compact_ratio = float(os.getenv("MEU_EMPREGO_COMPACT_RATIO", "0.2"))
+        self.compact_min = int(os.getenv("MEU_EMPREGO_COMPACT_MIN", "100"))
+        self._csv_lock = threading.RLock()
+        self._compactor: Optional[threading.Thread] = None
+
+        # Sugestões de empresa/cargo (carregadas sob demanda: `load_suggestions`)
+        self.suggestions = Autocomplete(self.csv_store.sidecar_path("suggest"))
+
+        # Nível frio (ver core/archive.py): CSV comprimido + contagem por dia
+        # dos arquivados; um arquivamento interrompido termina aqui
+        self.archive_policy = archive.ArchivePolicy.from_env()
+        self.csv_archive = archive.ArchiveFile(self.csv_store.sidecar_path("archive.csv.gz"))
+        self.archive_rollups = rollup.Rollups(self.csv_store.sidecar_path("archive.rollups.json"))
+        recovered = 0
+        if self.csv_archive.has_pending():
+            recovered = self.csv_archive.absorb(skip_ids={r.get("id") for r in self.csv_store.iter_rows()})
+        if self.archive_rollups.exists() and not recovered:
+            self.archive_rollups.load()
+        elif self.csv_archive.exists():
+            self.archive_rollups.rebuild(self._archive_iter())
+        self._archiver: Optional[threading.Thread] = None
+
+        # Índice de duplicatas do CSV (hashes de empresa+cargo+link, quentes e
+        # arquivadas); a reconstrução lê os registros em fluxo, já sem os excluídos
+        self.csv_keys = CsvKeyIndex(self.csv_store.sidecar_path("keys"))
+        self.csv_keys.load(self._csv_iter(include_archived=True))
+
+        # Cópia colunar para as agregações (feita na primeira leitura, se faltar)
+        self.analytics = analytics.AnalyticsSnapshot(self.csv_store.sidecar_path("analytics"))
+
+        # Histórico de transições de status (funil / tempo de resposta)
+        self.history = StatusHistory(self.csv_store.sidecar_path("history"))
+        if not self.history.exists():
+            self.history.seed(self._csv_iter())
+
+        # Contagens pré-agregadas (dia/semana/mês) do CSV
+        self.csv_rollups = rollup.Rollups(self.csv_store.sidecar_path("rollups.json"))
+        if self.csv_rollups.exists():
+            self.csv_rollups.load()
+        else:
+            self.csv_rollups.rebuild(self._csv_iter(include_archived=True))
+
+        # Resumos por mês (comparação Mongo ↔ CSV) e gravações que ficaram
+        # só no CSV durante o fallback
+        self.csv_digests = sync.BucketDigests(self.csv_store.sidecar_path("digests.json"))
+        if self.csv_digests.exists():
+            self.csv_digests.load()
+        else:
+            self.csv_digests.rebuild(self._csv_iter(include_archived=True))
+        self.unsynced = sync.SyncJournal(self.csv_store.sidecar_path("unsynced"), self.csv_store.lock)
+        self._sync_lock = threading.Lock()
+        self._syncer: Optional[threading.Thread] = None
+
+        # "Vaga ativa?": verificação dos links com cache (TTL) ao lado do CSV
+        self.link_checker = LinkChecker(self.csv_store.sidecar_path("links.json"))
+
+        # Fotografia dos agregados da última sessão (partida a frio)
+        self.snapshot = SnapshotCache(self.csv_store.sidecar_path("snapshot"))
+
+        # Mongo de volta (ou aberto com pendências): sincroniza em segundo plano
+        self.auto_sync = os.getenv("MEU_EMPREGO_SYNC", "1").strip() != "0"
+        self.mongo.add_listener(lambda online: online and self._sync_in_background())
+        if self.use_mongo and len(self.unsynced):
+            self._sync_in_background()
+
+        # arquivamento automático, uma vez por dia
+        self.archive_state = self.csv_store.sidecar_path("archive.json")
+        if self.archive_policy.enabled and archive.last_run(self.archive_state) != datetime.date.today():
+            self._archive_in_background()
+
     # ----------------------------------------------------------------------
     # MONGO
     # ----------------------------------------------------------------------
+    @property
+    def use_mongo(self) -> bool:
+        """True enquanto o Mongo estiver saudável (circuito fechado)."""
+        return self.mongo.is_up()
+
+    @property
+    def client(self):
+        return self.mongo.client
+
+    @property
+    def version(self) -> int:
+        """Versão dos dados: cresce a cada gravação feita por este processo."""
+        return self.events.version
+
+    @property
+    def db(self):
+        return self.mongo.db
+
     def _connect_mongo(self):
         """
         Tenta conectar no MongoDB.
-        Se falhar, ativa fallback para CSV sem quebrar o app.
+        Se falhar, ativa fallback para CSV sem quebrar o app; o health-check
+        continua tentando religar com backoff.
         """
 
-        if not (PYMONGO_AVAILABLE and self.mongo_uri):
-            self.use_mongo = False
+        if not self.mongo.configured:
             return
+        _import_driver()
 
-        try:
-            self.client = MongoClient(
-                self.mongo_uri,
-                serverSelectionTimeoutMS=6000,
-            )
-            self.client.server_info()
+        # índices são (re)garantidos sempre que o Mongo volta
+        self.mongo.add_listener(
+            lambda online: online and self._ensure_mongo_indexes()
+        )
 
-            self.db = self.client[self.db_name]
-            self.use_mongo = True
+        if self.mongo.connect():
+            self._ensure_mongo_indexes()
+        self.mongo.start_health_check()
 
+    def _ensure_mongo_indexes(self):
+        try:
+            ensure_mongo_index(self.db["candidaturas"])
+            ensure_mongo_index(self.db[archive.COLLECTION], unique=False)
+            self.db[archive.COLLECTION].create_index("data")
         except Exception as e:
-            print("\n[ERRO MONGO] Falha ao conectar:", e, "\n")
-            self.client = None
-            self.db = None
-            self.use_mongo = False
+            print("\n[ERRO MONGO] Falha ao criar índice de duplicatas:", e, "\n")
+
+        # rollups ausentes (base anterior a eles): agregação única no servidor
+        try:
+            if (
+                self.db["rollups"].estimated_document_count() == 0
+                and self.db["candidaturas"].estimated_document_count() > 0
+            ):
+                rollup.mongo_rebuild(self.db, ("candidaturas", archive.COLLECTION))
+        except Exception as e:
+            print("\n[ERRO MONGO] Falha ao calcular rollups:", e, "\n")
+
+    def close(self):
+        """
+        Encerra o health-check, os pools de conexões (Mongo e links) e os
+        arquivos CSV abertos (depois de uma sincronização ou arquivamento
+        em andamento).
+        """
+        self.mongo.stop()
+        self.link_checker.close()
+        for worker in (self._syncer, self._archiver):
+            if worker is not None:
+                worker.join()
+        with self._csv_lock:
+            self.csv_store.close()
 
     def test_connection(self) -> Dict[str, str]:
-        """Usado pelo botão 🌐 na UI."""
+        """
+        Usado pelo botão 🌐 na UI.
+        Força uma tentativa de religação, mesmo com o circuito aberto.
+        """
         if not self.mongo_uri:
             return {"ok": False, "msg": "Nenhuma URI configurada"}
 
         if not PYMONGO_AVAILABLE:
             return {"ok": False, "msg": "pymongo não instalado"}
 
-        try:
-            info = self.client.server_info()
-            return {"ok": True, "server": info.get("version", "?")}
-        except Exception as e:
-            return {"ok": False, "msg": str(e)}
+        if self.mongo.connect():
+            return {"ok": True, "server": self.mongo.server_version or "?"}
+
+        status = self.mongo.status()
+        msg = status.get("error") or "sem detalhes"
+        if status.get("retry_in"):
+            msg += f"\nNova tentativa automática em {status['retry_in']:.0f}s."
+        return {"ok": False, "msg": msg}
 
     # ----------------------------------------------------------------------
     # CSV fallback
     # ----------------------------------------------------------------------
     def _ensure_csv(self):
-        """Cria o CSV caso não exista ou arruma cabeçalho incorreto."""
-        if not self.csv_path.exists():
-            self.csv_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.csv_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(CSV_FIELDS)
-            return
+        """Cria o CSV (ou diretório de partições) e arruma cabeçalho incorreto."""
+        self.csv_store.ensure()
+
+    def _csv_iter(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        newest_first: Optional[bool] = None,
+        match: Optional[Dict] = None,
+        include_archived: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Registros do CSV com as alterações pendentes do log aplicadas, um a
+        um (`newest_first=None` = ordem do arquivo, em fluxo).
 
-        # garantir cabeçalho correto
-        with self.csv_path.open("r", encoding="utf-8") as f:
-            lines = f.readlines()
+        Sem mudanças de data no log, o recorte de datas fica com o
+        armazenamento (só as partições do intervalo são abertas); se alguma
+        data mudou, a linha pode ter trocado de mês: a leitura é completa e
+        o filtro de datas vem depois do log, até a próxima compactação.
 
-        if not lines or "empresa" not in lines[0].lower():
-            with self.csv_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(CSV_FIELDS)
+        `include_archived` acrescenta o arquivo frio (lido inteiro; com
+        ordenação, ordenado em memória e intercalado com o quente).
+        """
+        if not self.csv_log.touches("data"):
+            rows = self.csv_log.iter_apply(
+                self.csv_store.iter_query(date_from, date_to, newest_first)
+            )
+        else:
+            rows = (
+                r for r in self.csv_log.iter_apply(self.csv_store.iter_rows())
+                if in_date_range(r, date_from, date_to)
+            )
+            if newest_first is not None:
+                rows = iter(sort_rows(list(rows), newest_first))
+
+        if include_archived and self.csv_archive.exists():
+            cold = self._archive_iter(date_from, date_to)
+            if newest_first is None:
+                rows = chain(rows, cold)
+            else:
+                cold = sort_rows(list(cold), newest_first)
+                rows = heapq.merge(rows, cold, key=row_date_key, reverse=newest_first)
+
+        if match:
+            rows = (r for r in rows if all(r.get(k) == v for k, v in match.items()))
+        return rows
+
+    @contextmanager
+    def _csv_write(self):
+        """
+        Gravação no CSV: `_csv_lock` e a trava exclusiva do arquivo. Os
+        auxiliares (índice de duplicatas, contagens, resumos, histórico) são
+        relidos, alterados e gravados dentro dela — outra instância que
+        grave ao mesmo tempo espera, em vez de ter a gravação sobrescrita.
+        """
+        with self._csv_lock, self.csv_store.lock.exclusive():
+            yield
+
+    def _csv_append(self, rows: List[Dict]):
+        """Anexa ao CSV e à cópia colunar (chamado dentro de `_csv_write`)."""
+        self.csv_store.append_many(rows)
+        if self.analytics.enabled:
+            try:
+                self.analytics.append(rows)
+            except Exception as e:
+                # sem o delta a cópia não fecha com o CSV: é refeita na leitura
+                print("[ANALYTICS] Falha ao anexar:", e)
+
+    def _archive_iter(
+        self,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+    ) -> Iterator[Dict]:
+        """Registros do arquivo frio do CSV, com as alterações do log aplicadas."""
+        return (
+            r for r in self.csv_log.iter_apply(self.csv_archive.iter_rows())
+            if in_date_range(r, date_from, date_to)
+        )
 
     # ----------------------------------------------------------------------
     # INSERT
     # ----------------------------------------------------------------------
-    def insert_candidatura(self, doc: Dict) -> Dict:
+    def insert_candidatura(self, doc: Dict, on_duplicate: str = "reject") -> Dict:
         """
         Insere uma candidatura no Mongo (se disponível) E sempre no CSV para backup.
+
+        Duplicatas (mesma empresa + cargo + link normalizados) são detectadas
+        em O(1) pelos índices. `on_duplicate`:
+        • "reject" (padrão) → não grava e retorna {"ok": False, "duplicate": True,
+                               "id": <id do registro existente>}
+        • "merge"           → completa o registro existente com os campos preenchidos
+
+        O Mongo grava primeiro: uma recusa do índice único (duplicata que o
+        índice local não conhecia) volta antes de qualquer escrita no CSV.
         """
 
-        # converter datas para datetime no Mongo
-        doc_mongo = doc.copy()
-        if isinstance(doc_mongo.get("data"), str):
+        if self.find_duplicate(doc):
+            return self._on_duplicate(doc, on_duplicate)
+
+        doc = {**doc, "id": doc.get("id") or new_record_id()}
+        day = parse_date(doc.get("data"))
+        row = _csv_row(doc)
+        incs = sync.increments([row])
+
+        # MongoDB (se disponível)
+        backend = "csv"
+        if self.use_mongo:
             try:
-                doc_mongo["data"] = datetime.datetime.fromisoformat(doc_mongo["data"])
-            except Exception:
-                pass
+                self.db["candidaturas"].insert_one(_mongo_doc(doc))
+                self.mongo.record_success()
+                backend = "mongo+csv"
+            except DuplicateKeyError:
+                self.mongo.record_success()
+                return self._on_duplicate(doc, on_duplicate)
+            except Exception as e:
+                self.mongo.record_failure(e)  # segue só no CSV
 
-        # Sempre salva no CSV (backup)
-        self._ensure_csv()
-        data_str = doc.get("data", "")
-        if data_str:
+        # Sempre salva no CSV (backup); a chave é conferida de novo sob a
+        # trava: outra instância pode ter gravado a mesma desde a consulta
+        with self._csv_write():
+            duplicate = backend == "csv" and key_hash(doc) in self.csv_keys
+            if not duplicate:
+                self._csv_append([row])
+                self.csv_keys.add(key_hash(doc))
+                self.suggestions.add_rows([row])
+                self._rollup_csv([day])
+                self._digest_csv(incs)
+        if duplicate:
+            return self._on_duplicate(doc, on_duplicate)
+        self._log_status([transition(doc["id"], "", doc.get("status"), applied_ts(doc))])
+
+        if backend == "mongo+csv":
+            self._rollup_mongo([day])
+            self._digest_mongo(incs)
+        else:
+            self._mark_unsynced(sync.UPSERT, [(doc["id"], [sync.bucket_of(row)])])
+        self.events.publish([ChangeEvent(INSERTED, row)])
+        return {"ok": True, "id": doc["id"], "backend": backend}
+
+    def _on_duplicate(self, doc: Dict, on_duplicate: str) -> Dict:
+        """Duplicata na inserção: mescla, ou recusa informando o id do registro existente."""
+        if on_duplicate == "merge":
+            return self._merge_duplicate(doc)
+        res = {
+            "ok": False,
+            "duplicate": True,
+            "msg": "Candidatura já cadastrada (mesma empresa, cargo e link).",
+        }
+        existing = self._find_by_key(doc)
+        if existing is not None:
+            res["id"] = existing["id"]
+        return res
+
+    def insert_many(self, docs: List[Dict], on_duplicate: str = "reject") -> Dict:
+        """
+        Inserção em lote (importador): uma escrita no CSV e um `insert_many`
+        no Mongo por lote. Duplicatas — contra a base e dentro do próprio
+        lote — são filtradas em O(1) por registro; as que só o índice único
+        do Mongo recusa também não chegam ao CSV.
+        """
+        fresh, dups = [], []
+        seen = set()
+        for doc in docs:
+            h = key_hash(doc)
+            if h in seen or h in self.csv_keys:
+                dups.append(doc)
+                continue
+            seen.add(h)
+            fresh.append((h, {**doc, "id": doc.get("id") or new_record_id()}))
+
+        result = {"ok": True, "backend": "csv"}
+
+        if fresh and self.use_mongo:
             try:
-                y, m, d = data_str.split('-')
-                data_str = f"{d}-{m}-{y}"
-            except:
-                pass
-        with self.csv_path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                doc.get("empresa", ""),
-                doc.get("cargo", ""),
-                data_str,
-                doc.get("tipo", ""),
-                doc.get("status", ""),
-                doc.get("observacoes", ""),
-                doc.get("link", ""),
+                self.db["candidaturas"].insert_many(
+                    [_mongo_doc(doc) for _, doc in fresh], ordered=False
+                )
+                self.mongo.record_success()
+                result["backend"] = "mongo+csv"
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if all(err.get("code") == 11000 for err in errors):
+                    # demais documentos do lote foram gravados
+                    self.mongo.record_success()
+                    result["backend"] = "mongo+csv"
+                    result["mongo_duplicates"] = len(errors)
+                    failed = {err.get("index") for err in errors}
+                    dups += [doc for i, (_, doc) in enumerate(fresh) if i in failed]
+                    fresh = [item for i, item in enumerate(fresh) if i not in failed]
+                else:
+                    self.mongo.record_failure(e)
+            except Exception as e:
+                self.mongo.record_failure(e)  # segue só no CSV
+
+        if fresh:
+            with self._csv_write():
+                if result["backend"] == "csv":
+                    # outra instância pode ter gravado as mesmas desde o filtro
+                    taken = {h for h, _ in fresh if h in self.csv_keys}
+                    dups += [doc for h, doc in fresh if h in taken]
+                    fresh = [(h, doc) for h, doc in fresh if h not in taken]
+                rows = [_csv_row(doc) for _, doc in fresh]
+                days = [parse_date(doc.get("data")) for _, doc in fresh]
+                if rows:
+                    self._csv_append(rows)
+                    self.csv_keys.add_many(h for h, _ in fresh)
+                    self.suggestions.add_rows(rows)
+                    self._rollup_csv(days)
+                    self._digest_csv(sync.increments(rows))
+            self._log_status([
+                transition(doc["id"], "", doc.get("status"), applied_ts(doc))
+                for _, doc in fresh
             ])
 
-        # MongoDB (se disponível)
+            if result["backend"] == "mongo+csv":
+                self._rollup_mongo(days)
+                self._digest_mongo(sync.increments(rows))
+            else:
+                self._mark_unsynced(sync.UPSERT, [(row["id"], [sync.bucket_of(row)]) for row in rows])
+
+            # lotes grandes (importação): as telas recarregam em vez de
+            # inserir linha a linha
+            if len(rows) > self.EVENTS_PER_BATCH:
+                self.events.publish([ChangeEvent(RESET)])
+            elif rows:
+                self.events.publish([ChangeEvent(INSERTED, row) for row in rows])
+
+        result["inserted"] = len(fresh)
+        result["duplicates"] = len(dups)
+        if on_duplicate == "merge":
+            result["merged"] = sum(1 for doc in dups if self._merge_duplicate(doc).get("ok"))
+
+        return result
+
+    # ----------------------------------------------------------------------
+    # UPDATE / DELETE
+    # ----------------------------------------------------------------------
+    def update_candidatura(
+        self, record_id: str, fields: Dict, previous: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Altera campos de uma candidatura (ex.: {"status": "Entrevista"}).
+
+        Mongo: `update_one` pelo `_id` (na coleção das arquivadas, se não
+        estiver na principal). CSV: um registro no log de alterações
+        (O(1), sem reescrever o arquivo; vale também para o arquivo frio).
+        `previous` é a linha como a tela a mostra (evita uma leitura; se
+        trouxer só a prévia das observações, o texto completo é buscado);
+        sem ele, o registro atual é lido pelo id. Com a linha anterior o
+        índice de duplicatas acompanha empresa, cargo e link, e as
+        contagens por dia acompanham a data.
+        """
+        fields = {k: v for k, v in fields.items() if k in CSV_FIELDS}
+        if not record_id or not fields:
+            return {"ok": False, "msg": "Nada para alterar."}
+        previous = self._full_previous(record_id, previous)
+
+        key_change = previous is not None and any(k in fields for k in ("empresa", "cargo", "link"))
+        if key_change:
+            new = {**previous, **fields}
+            if key_hash(new) != key_hash(previous) and self.find_duplicate(new):
+                return {
+                    "ok": False,
+                    "duplicate": True,
+                    "msg": "Já existe candidatura com a mesma empresa, cargo e link.",
+                }
+
+        # a data mudou: a contagem passa de um dia para outro
+        moved = []
+        if previous is not None and "data" in fields:
+            old_day, new_day = parse_date(previous.get("data")), parse_date(fields["data"])
+            if old_day != new_day:
+                moved = [(old_day, -1), (new_day, 1)]
+
+        csv_fields = dict(fields)
+        if "data" in csv_fields:
+            csv_fields["data"] = iso_to_br(csv_fields["data"])
+
+        backend = "csv"
+        shown = None  # o registro como estava antes (para o evento)
+        if self.use_mongo:
+            try:
+                for name in ("candidaturas", archive.COLLECTION):
+                    before = self.db[name].find_one_and_update(
+                        {"_id": _mongo_id(record_id)},
+                        {"$set": _mongo_fields(fields)},
+                        projection={"_chave": 0},
+                    )
+                    if before is not None:
+                        break  # senão: talvez esteja arquivada
+                self.mongo.record_success()
+                backend = "mongo+csv"
+                for day, n in moved:
+                    self._rollup_mongo([day], n)
+                if before is not None:
+                    shown = doc_to_row(before)
+                    self._digest_mongo(sync.increments([{**shown, **csv_fields}], [shown]))
+            except DuplicateKeyError:
+                self.mongo.record_success()
+                return {
+                    "ok": False,
+                    "duplicate": True,
+                    "msg": "Já existe candidatura com a mesma empresa, cargo e link.",
+                }
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        if "observacoes" in fields:
+            self.obs_cache.put(record_id, fields["observacoes"] or "")
+
+        old = {**previous, "id": record_id} if previous is not None else None
+        with self._csv_write():
+            self.csv_log.update(record_id, csv_fields)
+            if key_change:
+                self.csv_keys.discard(key_hash(previous))
+                self.csv_keys.add(key_hash({**previous, **fields}))
+            self.suggestions.add_rows([fields])
+            for day, n in moved:
+                self._rollup_csv([day], n)
+            if old is not None:
+                self._digest_csv(sync.increments([{**old, **csv_fields}], [old]))
+
+        if backend == "csv":
+            changed = [r for r in (old, csv_fields if "data" in csv_fields else None) if r]
+            self._mark_unsynced(sync.UPSERT, [(record_id, [sync.bucket_of(r) for r in changed])])
+
+        old_status = (previous or {}).get("status", "")
+        if "status" in fields and fields["status"] != old_status:
+            self._log_status([transition(record_id, old_status, fields["status"], now_ts())])
+
+        shown = shown or old
+        self.events.publish([ChangeEvent(UPDATED, {**(shown or {}), **csv_fields, "id": record_id}, previous=shown)])
+
+        self._maybe_compact()
+        return {"ok": True, "id": record_id, "backend": backend}
+
+    def delete_candidatura(self, record_id: str, previous: Optional[Dict] = None) -> Dict:
+        """
+        Exclui uma candidatura: `delete_one` no Mongo e uma lápide no log do CSV.
+        A chave sai do índice de duplicatas e a contagem do dia é
+        decrementada na hora; a exclusão entra no histórico de status para o
+        funil descontá-la. `previous` (a linha da tela) evita ler o registro
+        pelo id.
+        """
+        if not record_id:
+            return {"ok": False, "msg": "Registro sem id."}
+
+        previous = self._full_previous(record_id, previous)
+        self.obs_cache.discard(record_id)
+        day = parse_date((previous or {}).get("data"))
+
+        backend = "csv"
+        shown = None
+        if self.use_mongo:
+            try:
+                for name in ("candidaturas", archive.COLLECTION):
+                    deleted = self.db[name].find_one_and_delete({"_id": _mongo_id(record_id)}, projection={"_chave": 0})
+                    if deleted is not None:
+                        break
+                self.mongo.record_success()
+                backend = "mongo+csv"
+                if deleted is not None:
+                    shown = doc_to_row(deleted)
+                    self._rollup_mongo([day], -1)
+                    self._digest_mongo(sync.increments(removed=[shown]))
+                # a exclusão não volta do CSV de outra máquina (ver core/sync.py)
+                self.db[sync.TOMBSTONES].update_one(
+                    {"_id": record_id}, {"$set": {"ts": now_ts()}}, upsert=True
+                )
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        old = {**previous, "id": record_id} if previous is not None else None
+        with self._csv_write():
+            self.csv_log.delete(record_id)
+            if previous is not None:
+                self.csv_keys.discard(key_hash(previous))
+                self._rollup_csv([day], -1)
+                self._digest_csv(sync.increments(removed=[old]))
+
+        gone = shown or old
+        if gone is not None:
+            # o funil desconta a candidatura excluída
+            self._log_status([deletion(record_id, gone.get("status"), now_ts())])
+
+        if backend == "csv":
+            self._mark_unsynced(sync.DELETE, [(record_id, [sync.bucket_of(old)] if old else [])])
+        self.events.publish([ChangeEvent(DELETED, {"id": record_id}, previous=gone)])
+
+        self._maybe_compact()
+        return {"ok": True, "id": record_id, "backend": backend}
+
+    # ----------------------------------------------------------------------
+    # HISTÓRICO DE STATUS
+    # ----------------------------------------------------------------------
+    def _log_status(self, events: List[Dict]):
+        """Grava transições no log local e, com o Mongo ativo, em `status_historico`."""
+        with self._csv_write():
+            self.history.append_many(events)
+
+        if events and self.use_mongo:
+            try:
+                self.db["status_historico"].insert_many([dict(ev) for ev in events], ordered=False)
+                self.mongo.record_success()
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+    def status_events_since(self, offset: int = 0):
+        """Transições gravadas depois de `offset` → (eventos, novo offset, reset)."""
+        return self.history.read_since(offset)
+
+    # ----------------------------------------------------------------------
+    # ROLLUPS (LINHA DO TEMPO)
+    # ----------------------------------------------------------------------
+    def _rollup_csv(self, days, n: int = 1):
+        # dentro de _csv_write: relê o que outra instância gravou antes de somar
+        self.csv_rollups.load()
+        for day in days:
+            self.csv_rollups.add(day, n)
+        self.csv_rollups.save()
+
+    def _rollup_mongo(self, days, n: int = 1):
+        try:
+            rollup.mongo_apply(self.db["rollups"], days, n)
+        except Exception as e:
+            self.mongo.record_failure(e)
+
+    def rollup_series(self, window: str = rollup.DEFAULT_WINDOW):
+        """
+        Pontos (início do período, quantidade) da janela pedida
+        (ver `rollups.WINDOWS`) e a granularidade usada. Custa O(pontos),
+        independente do número de registros.
+        """
+        if self.use_mongo:
+            try:
+                coll = self.db["rollups"]
+                start, end, g = rollup.window_range(window, rollup.mongo_bounds(coll))
+                points = rollup.mongo_series(coll, start, end, g) if start else []
+                self.mongo.record_success()
+                return points, g
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        # a interface lê de threads de trabalho (core/asyncstore.py)
+        with self._csv_lock:
+            self.csv_rollups.load()
+            start, end, g = rollup.window_range(window, self.csv_rollups.bounds())
+            return (self.csv_rollups.series(start, end, g) if start else []), g
+
+    # ----------------------------------------------------------------------
+    # SINCRONIZAÇÃO MONGO ↔ CSV (ver core/sync.py)
+    # ----------------------------------------------------------------------
+    def _digest_csv(self, incs):
+        # dentro de _csv_write (como _rollup_csv)
+        self.csv_digests.load()
+        self.csv_digests.apply(incs)
+        self.csv_digests.save()
+
+    def _digest_mongo(self, incs):
+        try:
+            sync.mongo_apply(self.db[sync.DIGESTS], incs)
+        except Exception as e:
+            self.mongo.record_failure(e)
+
+    def _mark_unsynced(self, op: str, entries):
+        """Anota gravações que ficaram só no CSV (só quando há Mongo configurado)."""
+        if self.mongo.configured:
+            self.unsynced.append(op, entries)
+
+    def _sync_in_background(self):
+        if not self.auto_sync or (self._syncer is not None and self._syncer.is_alive()):
+            return
+        self._syncer = threading.Thread(target=self._auto_sync, name="mongo-csv-sync", daemon=True)
+        self._syncer.start()
+
+    def _auto_sync(self):
+        try:
+            report = self.sync_stores()
+        except Exception as e:
+            print("\n[ERRO SYNC] Falha ao sincronizar Mongo ↔ CSV:", e, "\n")
+            return
+        if report is not None and report.total:
+            print("\n[SYNC] Mongo ↔ CSV\n" + report.resumo(detalhes=0) + "\n")
+
+    def _csv_bucket(self, bucket: str) -> List[Dict]:
+        """Registros do CSV quente de um mês (pelo índice de datas; "sem-data" lê tudo)."""
+        if bucket == UNDATED:
+            rows = self._csv_iter()
+        else:
+            first = datetime.date(int(bucket[:4]), int(bucket[5:7]), 1)
+            last = rollup.next_period(first, rollup.MONTH) - datetime.timedelta(days=1)
+            rows = self._csv_iter(first, last)
+        return [r for r in rows if sync.bucket_of(r) == bucket]
+
+    def _csv_buckets(self, buckets) -> Dict[str, List[Dict]]:
+        """Registros do CSV dos meses pedidos: quente por mês + uma passada no arquivo frio."""
+        out = {bucket: self._csv_bucket(bucket) for bucket in buckets}
+        if out and self.csv_archive.exists():
+            for row in self._archive_iter():
+                rows = out.get(sync.bucket_of(row))
+                if rows is not None:
+                    rows.append(row)
+        return out
+
+    def _mongo_bucket(self, bucket: str) -> List[Dict]:
+        if bucket == UNDATED:
+            query = {"data": {"$not": {"$type": "date"}}}
+        else:
+            first = datetime.date(int(bucket[:4]), int(bucket[5:7]), 1)
+            query = {"data": {
+                "$gte": datetime.datetime.combine(first, datetime.time.min),
+                "$lt": datetime.datetime.combine(rollup.next_period(first, rollup.MONTH), datetime.time.min),
+            }}
+        rows = (
+            doc_to_row(doc)
+            for name in ("candidaturas", archive.COLLECTION)
+            for doc in self.db[name].find(query, projection={"_chave": 0})
+        )
+        return [r for r in rows if sync.bucket_of(r) == bucket]
+
+    def _mongo_all(self) -> Iterator[Dict]:
+        """Todos os registros do Mongo, quentes e arquivados (recálculo dos resumos)."""
+        for name in ("candidaturas", archive.COLLECTION):
+            for doc in self.db[name].find({}, projection={"_chave": 0}):
+                yield doc_to_row(doc)
+
+    def _locate(self, record_id: str) -> List[str]:
+        """Mês de um registro pendente sem mês anotado (caminho raro)."""
+        for name in ("candidaturas", archive.COLLECTION):
+            doc = self.db[name].find_one({"_id": _mongo_id(record_id)}, projection={"data": 1})
+            if doc is not None:
+                return [sync.bucket_of(doc_to_row(doc))]
+        for row in self._csv_iter(match={"id": record_id}, include_archived=True):
+            return [sync.bucket_of(row)]
+        return []
+
+    def sync_stores(self, dry_run: bool = False, full: bool = False) -> Optional[sync.SyncReport]:
+        """
+        Compara Mongo e CSV pelos resumos mensais e copia, nos dois sentidos,
+        só os registros dos meses que diferem (mais os pendentes do fallback).
+        `dry_run` só monta o relatório; `full` recalcula os resumos lendo
+        todos os registros (O(total), para conferência). None sem Mongo.
+        """
+        if not self.use_mongo:
+            return None
+
+        start = time.perf_counter()
+        report = sync.SyncReport()
+        with self._sync_lock:
+            try:
+                self._sync(report, dry_run, full)
+            except Exception as e:
+                self.mongo.record_failure(e)
+                raise
+
+        report.segundos = time.perf_counter() - start
+        return report
+
+    def _sync(self, report: sync.SyncReport, dry_run: bool, full: bool):
+        coll = self.db["candidaturas"]
+        pending = self.unsynced.pending()
+
+        # 1) resumos: O(meses)
+        if full:
+            csv_d = sync.digests_of(self._csv_iter(include_archived=True))
+            mongo_d = sync.digests_of(self._mongo_all())
+        else:
+            with self._csv_lock:
+                self.csv_digests.load()
+                csv_d = dict(self.csv_digests.buckets)
+            mongo_d = sync.mongo_digests(self.db[sync.DIGESTS])
+            if not mongo_d and coll.estimated_document_count():
+                # base anterior aos resumos: cálculo único
+                mongo_d = sync.digests_of(self._mongo_all())
+                full = True
+
+        if full and not dry_run:
+            with self._csv_write():
+                self.csv_digests.buckets = dict(csv_d)
+                self.csv_digests.save()
+            sync.mongo_set(self.db[sync.DIGESTS], {
+                **{k: None for k in sync.mongo_digests(self.db[sync.DIGESTS])}, **mongo_d
+            })
+
+        months = set(csv_d) | set(mongo_d)
+        buckets = {k for k in months if csv_d.get(k) != mongo_d.get(k)}
+        report.meses_comparados = len(months)
+
+        # 2) pendências do fallback entram qualquer que seja o resumo
+        for rid, rec in pending.items():
+            buckets.update(rec.get("meses") or self._locate(rid))
+        report.pendentes = len(pending)
+        report.meses_diferentes = sorted(buckets)
+
+        # 3) só os meses diferentes são lidos dos dois lados
+        csv_rows, mongo_rows = {}, {}
+        for rows in self._csv_buckets(report.meses_diferentes).values():
+            csv_rows.update((r["id"], r) for r in rows if r.get("id"))
+        for bucket in report.meses_diferentes:
+            mongo_rows.update((r["id"], r) for r in self._mongo_bucket(bucket))
+        report.lidos_csv, report.lidos_mongo = len(csv_rows), len(mongo_rows)
+
+        only_csv = [rid for rid in csv_rows if rid not in mongo_rows]
+        tombstones = {
+            doc["_id"] for doc in self.db[sync.TOMBSTONES].find({"_id": {"$in": only_csv}})
+        } if only_csv else set()
+
+        sync.plan(report, csv_rows, mongo_rows, pending, tombstones)
+
+        if not dry_run:
+            self._apply_sync(report)
+
+            # 4) resumos dos meses relidos passam a ser os valores reais
+            with self._csv_write():
+                self.csv_digests.load()
+                for bucket, rows in self._csv_buckets(report.meses_diferentes).items():
+                    self.csv_digests.set(bucket, sync.digests_of(rows).get(bucket))
+                self.csv_digests.save()
+            sync.mongo_set(self.db[sync.DIGESTS], {
+                bucket: sync.digests_of(self._mongo_bucket(bucket)).get(bucket)
+                for bucket in report.meses_diferentes
+            })
+
+            self.unsynced.resolve(pending)
+            self.mongo.record_success()
+            report.aplicado = True
+
+            # mudanças em lote, dos dois lados: as telas recarregam
+            if report.total:
+                self.events.publish([ChangeEvent(RESET)])
+
+    def _apply_sync(self, report: sync.SyncReport):
+        """Executa as ações do relatório nos dois armazenamentos."""
+        coll = self.db["candidaturas"]
+
+        # ------------------ CSV → MONGO ------------------
+        if report.inserir_mongo:
+            docs = [_mongo_doc(row) for row in report.inserir_mongo]
+            failed = set()
+            try:
+                coll.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if not all(err.get("code") == 11000 for err in errors):
+                    raise
+                failed = {err.get("index") for err in errors}
+                report.conflitos += len(failed)
+            self._rollup_mongo(
+                parse_date(row.get("data")) for i, row in enumerate(report.inserir_mongo) if i not in failed
+            )
+
+        for old, new in report.atualizar_mongo:
+            try:
+                res = coll.replace_one({"_id": _mongo_id(new["id"])}, _mongo_doc(new))
+                if not res.matched_count:
+                    self.db[archive.COLLECTION].replace_one({"_id": _mongo_id(new["id"])}, _mongo_doc(new))
+            except DuplicateKeyError:
+                report.conflitos += 1
+                continue
+            self._rollup_mongo([parse_date(old.get("data"))], -1)
+            self._rollup_mongo([parse_date(new.get("data"))])
+
+        if report.excluir_mongo:
+            ids = {"_id": {"$in": [_mongo_id(r["id"]) for r in report.excluir_mongo]}}
+            coll.delete_many(ids)
+            self.db[archive.COLLECTION].delete_many(ids)
+            self._rollup_mongo((parse_date(r.get("data")) for r in report.excluir_mongo), -1)
+
+        # ------------------ MONGO → CSV ------------------
+        with self._csv_write():
+            if report.inserir_csv:
+                self._csv_append(report.inserir_csv)
+                self.csv_keys.add_many(key_hash(r) for r in report.inserir_csv)
+                self._rollup_csv(parse_date(r.get("data")) for r in report.inserir_csv)
+                self.history.append_many([
+                    transition(r["id"], "", r.get("status"), applied_ts(r)) for r in report.inserir_csv
+                ])
+
+            for old, new in report.atualizar_csv:
+                fields = {f: new[f] for f in CSV_FIELDS if (new.get(f) or "") != (old.get(f) or "")}
+                self.csv_log.update(new["id"], fields)
+                self.csv_keys.discard(key_hash(old))
+                self.csv_keys.add(key_hash(new))
+                self._rollup_csv([parse_date(old.get("data"))], -1)
+                self._rollup_csv([parse_date(new.get("data"))])
+                if "status" in fields:
+                    self.history.append_many([transition(new["id"], old.get("status"), new["status"], now_ts())])
+
+            for row in report.excluir_csv:
+                self.csv_log.delete(row["id"])
+                self.csv_keys.discard(key_hash(row))
+                self._rollup_csv([parse_date(row.get("data"))], -1)
+
+        self._maybe_compact()
+
+    # ----------------------------------------------------------------------
+    # COMPACTAÇÃO DO CSV
+    # ----------------------------------------------------------------------
+    def garbage_ratio(self) -> float:
+        """Registros no log de alterações / registros no CSV."""
+        return len(self.csv_log) / max(1, len(self.csv_keys))
+
+    def _maybe_compact(self):
+        """Dispara a compactação em segundo plano quando o lixo passa do limite."""
+        entries = len(self.csv_log)
+        if entries < self.compact_min or self.garbage_ratio() < self.compact_ratio:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        self._compactor = threading.Thread(
+            target=self.compact_csv, name="csv-compaction", daemon=True
+        )
+        self._compactor.start()
+
+    def compact_csv(self, archive_today: Optional[datetime.date] = None) -> Dict:
+        """
+        Regrava o CSV com as alterações do log aplicadas, remove as linhas
+        excluídas, refaz o índice de duplicatas (quentes + arquivadas) e as
+        contagens por dia e esvazia o log.
+        Com `archive_today`, as linhas frias pela política de arquivamento
+        saem do CSV quente para o arquivo frio (ver core/archive.py); as
+        alterações do log que são de registros arquivados regravam o frio.
+        Escritas no CSV esperam o fim (mesmo lock e, entre processos, a trava
+        exclusiva do CSV); leituras continuam.
+        """
+        with self._csv_lock, self.csv_store.lock.exclusive():
+            overlay = dict(self.csv_log.overlay())
+            archiving = archive_today is not None and self.archive_policy.enabled
+            if not overlay and not archiving:
+                return {"ok": True, "rows": len(self.csv_keys), "applied": 0, "archived": 0}
+
+            hashes = []
+            counts = rollup.Rollups(self.csv_rollups.path)
+            cold = rollup.Rollups()
+            applied = set()
+            pending = self.csv_archive.open_pending() if archiving else None
+            # prazo do status final: da última mudança de status, não da data
+            status_since = self.history.last_changes() if archiving else {}
+
+            # cópia colunar refeita junto: quentes e recém-arquivadas vêm da
+            # mesma passada; as já arquivadas, da cópia atual (se vale)
+            snap_hot = snap_cold = snap_archived = old_cold = None
+            if self.analytics.enabled:
+                snap_hot, snap_cold = analytics.Builder(), analytics.Builder()
+                try:
+                    old_cold = self.analytics.archived_table(self.csv_store.count(), self._archived_total())
+                except Exception:
+                    old_cold = None
+
+            def transform(row):
+                if row.get("id") in overlay:
+                    applied.add(row["id"])
+                row = ChangeLog.apply(row, overlay)
+                if row is None:
+                    return None
+                if pending is not None and self.archive_policy.is_cold(
+                    row, archive_today, status_since.get(row.get("id"))
+                ):
+                    pending.write(row)
+                    cold.add(parse_date(row.get("data")))
+                    if snap_cold is not None:
+                        snap_cold.add(row, archived=True)
+                    return None
+                hashes.append(key_hash(row))
+                counts.add(parse_date(row.get("data")))
+                if snap_hot is not None:
+                    snap_hot.add(row)
+                return row
+
+            try:
+                kept = self.csv_store.compact(transform, pending.close if pending else None)
+            except Exception as e:
+                if pending is not None:
+                    pending.discard()
+                print("\n[ERRO CSV] Falha na compactação:", e, "\n")
+                return {"ok": False, "msg": str(e)}
+
+            archived = self.csv_archive.absorb() if pending is not None else 0
+
+            # alterações que sobraram são de registros arquivados
+            self.archive_rollups.load()
+            if any(rid not in applied for rid in overlay) and self.csv_archive.exists():
+                rebuilt = rollup.Rollups(self.archive_rollups.path)
+                snap_archived = analytics.Builder() if self.analytics.enabled else None
+
+                def cold_transform(row):
+                    row = ChangeLog.apply(row, overlay)
+                    if row is not None:
+                        rebuilt.add(parse_date(row.get("data")))
+                        if snap_archived is not None:
+                            snap_archived.add(row, archived=True)
+                    return row
+
+                self.csv_archive.rewrite(cold_transform)
+                self.archive_rollups = rebuilt
+            for day, n in cold.buckets[rollup.DAY].items():
+                self.archive_rollups.add(day, n)
+            if self.csv_archive.exists():
+                self.archive_rollups.save()
+
+            # a linha do tempo continua cobrindo o histórico inteiro
+            for day, n in self.archive_rollups.buckets[rollup.DAY].items():
+                counts.add(day, n)
+
+            if snap_hot is not None:
+                if snap_archived is not None:
+                    archived_parts = [snap_archived.table()]  # o frio foi regravado inteiro
+                elif old_cold is not None:
+                    archived_parts = [old_cold, snap_cold.table()]
+                else:
+                    rebuilt_cold = analytics.Builder()
+                    rebuilt_cold.extend(self._archive_iter(), archived=True)
+                    archived_parts = [rebuilt_cold.table()]
+                self._write_analytics(archived_parts, [snap_hot.table()])
+
+            # as chaves das arquivadas continuam no índice: a mesma vaga não
+            # volta como nova depois do arquivamento
+            if self.csv_archive.exists():
+                hashes.extend(key_hash(r) for r in self._archive_iter())
+
+            self.csv_log.clear()
+            self.csv_keys.rebuild(hashes)
+            counts.save()
+            self.csv_rollups = counts
+
+        return {"ok": True, "rows": kept, "applied": len(overlay), "archived": archived}
+
+    # ----------------------------------------------------------------------
+    # CÓPIA COLUNAR (ver core/analytics.py)
+    # ----------------------------------------------------------------------
+    def _archived_total(self) -> int:
+        """Registros no arquivo frio do CSV, pela contagem por dia."""
+        if not self.csv_archive.exists():
+            return 0
+        self.archive_rollups.load()
+        return sum(self.archive_rollups.buckets[rollup.DAY].values())
+
+    def _write_analytics(self, cold: List, hot: List):
+        """Grava a base (com `_csv_lock`); uma falha só apaga a cópia."""
+        try:
+            self.analytics.write(cold, hot, self.csv_store.count(), self._archived_total())
+        except Exception as e:
+            print("[ANALYTICS] Falha ao gravar a cópia colunar:", e)
+            self.analytics.discard()
+
+    def _rebuild_analytics(self):
+        """Leitura completa do CSV (e do frio) → nova base."""
+        cold, hot = analytics.Builder(), analytics.Builder()
+        if self.csv_archive.exists():
+            cold.extend(self._archive_iter(), archived=True)
+        hot.extend(self._csv_iter())
+        self._write_analytics([cold.table()], [hot.table()])
+
+    def analytics_table(self, include_archived: bool = False):
+        """
+        Registros do CSV como tabela Arrow (id, data, status, tipo, empresa,
+        cargo, arquivada), mapeada do disco, com as alterações pendentes do
+        log aplicadas. Se a cópia falta ou não fecha com o CSV, é refeita
+        aqui (uma leitura completa). None sem o pyarrow.
+        """
+        if not self.analytics.enabled:
+            return None
+        table = self._analytics_raw(include_archived)
+        return None if table is None else analytics.apply_overlay(table, self.csv_log.overlay())
+
+    def _analytics_raw(self, include_archived: bool):
+        """Base + deltas (sem o log), refazendo a cópia se preciso."""
+        for _ in range(2):  # uma escrita no meio da leitura: tenta de novo
+            table = self.analytics.table(self.csv_store.count(), self._archived_total(), include_archived)
+            if table is not None:
+                return table
+
+        with self._csv_lock, self.csv_store.lock.exclusive():
+            table = self.analytics.table(self.csv_store.count(), self._archived_total(), include_archived)
+            if table is None:
+                self._rebuild_analytics()
+                table = self.analytics.table(self.csv_store.count(), self._archived_total(), include_archived)
+        return table
+
+    # ----------------------------------------------------------------------
+    # ARQUIVAMENTO (ver core/archive.py)
+    # ----------------------------------------------------------------------
+    def archive_old(self, today: Optional[datetime.date] = None) -> Dict:
+        """
+        Move para o nível frio as candidaturas que a política manda arquivar,
+        no Mongo (coleção `candidaturas_arquivadas`) e no CSV (compactação).
+        Retorna quantas foram movidas em cada backend.
+        """
+        today = today or datetime.date.today()
+        if not self.archive_policy.enabled:
+            return {"ok": True, "mongo": 0, "csv": 0}
+
+        moved_mongo = 0
         if self.use_mongo:
             try:
-                res = self.db["candidaturas"].insert_one(doc_mongo)
-                return {"ok": True, "id": str(res.inserted_id), "backend": "mongo+csv"}
-            except Exception:
-                self.use_mongo = False  # desativa mongo, mas CSV já foi salvo
+                moved_mongo = self._archive_mongo(today)
+                self.mongo.record_success()
+            except Exception as e:
+                self.mongo.record_failure(e)
+                print("\n[ERRO ARQUIVO] Falha ao arquivar no Mongo:", e, "\n")
+
+        res = self.compact_csv(archive_today=today)
+        if not res.get("ok"):
+            return {"ok": False, "msg": res.get("msg"), "mongo": moved_mongo, "csv": 0}
+
+        result = {"ok": True, "mongo": moved_mongo, "csv": res["archived"]}
+        archive.mark_run(self.archive_state, today, result)
+        if moved_mongo or res["archived"]:
+            self.events.publish([ChangeEvent(RESET)])
+        return result
+
+    def _archive_mongo(self, today: datetime.date, batch: int = 1000) -> int:
+        """
+        Copia os documentos frios para a coleção das arquivadas e os apaga
+        da principal, em lotes. Uma queda entre as duas etapas só deixa
+        cópias, que a próxima rodada ignora (mesmo `_id`).
+        """
+        hot, cold = self.db["candidaturas"], self.db[archive.COLLECTION]
+        query = self.archive_policy.mongo_query(today, self._status_changed_since(today))
+        moved = 0
+        while True:
+            docs = list(hot.find(query, limit=batch))
+            if not docs:
+                return moved
+            try:
+                cold.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    raise
+            hot.delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+            moved += len(docs)
+
+    def _status_changed_since(self, today: datetime.date) -> List:
+        """`_id`s com mudança de status depois do corte do status final (Mongo e log local)."""
+        cutoff = self.archive_policy.cutoffs(today)[1]
+        ids = {rid for rid, d in self.history.last_changes().items() if d >= cutoff}
+        ids.update(self.db["status_historico"].distinct(
+            "id", {"de": {"$ne": ""}, "ts": {"$gte": cutoff.isoformat()}}
+        ))
+        return [_mongo_id(rid) for rid in ids if rid]
+
+    def _archive_in_background(self):
+        """Arquivamento diário sem travar a abertura."""
+        def run():
+            try:
+                res = self.archive_old()
+                if res.get("mongo") or res.get("csv"):
+                    print(f"[ARQUIVO] Arquivadas: {res['mongo']} no Mongo, {res['csv']} no CSV")
+            except Exception as e:
+                print("\n[ERRO ARQUIVO]", e, "\n")
 
-        return {"ok": True, "backend": "csv"}
+        self._archiver = threading.Thread(target=run, name="archiver", daemon=True)
+        self._archiver.start()
+
+    # ----------------------------------------------------------------------
+    # SUGESTÕES (AUTOCOMPLETAR)
+    # ----------------------------------------------------------------------
+    def load_suggestions(self):
+        """Carrega as sugestões (na primeira vez, a partir do CSV); chamar fora da thread do Tk."""
+        self.suggestions.load(lambda: self._csv_iter(include_archived=True))
+
+    def suggest(self, field: str, prefix: str, limit: int = 8) -> List[str]:
+        """Valores já usados de `field` ("empresa"/"cargo") que começam com `prefix`."""
+        return self.suggestions.suggest(field, prefix, limit)
+
+    # ----------------------------------------------------------------------
+    # DUPLICATAS
+    # ----------------------------------------------------------------------
+    def find_duplicate(self, doc: Dict) -> bool:
+        """True se já existe candidatura com a mesma empresa + cargo + link."""
+        if key_hash(doc) in self.csv_keys:
+            return True
+
+        if self.use_mongo:
+            try:
+                found = any(
+                    self.db[name].find_one(_mongo_key_filter(doc), projection={"_id": 1}) is not None
+                    for name in ("candidaturas", archive.COLLECTION)
+                )
+                self.mongo.record_success()
+                return found
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        return False
+
+    def _merge_duplicate(self, doc: Dict) -> Dict:
+        """
+        Completa o registro existente (mesma chave) com os campos não vazios
+        de `doc` — uma alteração comum (`update_candidatura`): Mongo, log do
+        CSV, contagens e evento para as telas.
+        """
+        existing = self._find_by_key(doc)
+        if existing is None:
+            # a chave ficou no índice, mas o registro sumiu (outro processo)
+            return {"ok": False, "msg": "Candidatura existente não encontrada."}
+
+        fields = {
+            k: v for k, v in doc.items()
+            if k in CSV_FIELDS and k not in ("empresa", "cargo", "link") and v and v != existing.get(k)
+        }
+        if "data" in fields and parse_date(fields["data"]) == parse_date(existing.get("data")):
+            del fields["data"]  # mesma data em outro formato
+        if not fields:
+            backend = "mongo+csv" if self.use_mongo else "csv"
+            return {"ok": True, "merged": True, "id": existing["id"], "backend": backend}
+
+        res = self.update_candidatura(existing["id"], fields, previous=existing)
+        return {**res, "merged": True} if res.get("ok") else res
+
+    def _find_by_key(self, doc: Dict) -> Optional[Dict]:
+        """Registro com a mesma empresa + cargo + link (Mongo: índice `_chave`; CSV: leitura em fluxo)."""
+        if self.use_mongo:
+            try:
+                for name in ("candidaturas", archive.COLLECTION):
+                    found = self.db[name].find_one(_mongo_key_filter(doc), projection={"_chave": 0})
+                    if found is not None:
+                        break
+                self.mongo.record_success()
+                if found is not None:
+                    return doc_to_row(found)
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        h = key_hash(doc)
+        for row in self._csv_iter(include_archived=True):
+            if key_hash(row) == h:
+                return row
+        return None
 
     # ----------------------------------------------------------------------
     # READ
     # ----------------------------------------------------------------------
+    def iter_candidaturas(
+        self,
+        filters: Optional[Dict] = None,
+        sort: Optional[str] = None,
+        batch_size: int = 1000,
+        limit: Optional[int] = None,
+        include_archived: bool = False,
+        preview: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Percorre os registros sem montar a lista inteira (gerador).
+
+        • filters: `date_from` / `date_to` (date, inclusivos) e igualdade
+          nos demais campos, ex.: {"status": "Entrevista"};
+        • sort: "data" (mais antigas primeiro), "-data" (mais novas
+          primeiro) ou None (ordem de armazenamento — a mais barata);
+        • batch_size: documentos por lote do cursor do Mongo;
+        • include_archived: inclui o nível frio (ver core/archive.py);
+        • preview: observações só com a prévia (core/table.py); no Mongo o
+          corte é feito no servidor, na projeção.
+
+        No Mongo, se a consulta cair antes do primeiro registro a leitura
+        segue pelo CSV; depois disso o erro é propagado (trocar de fonte no
+        meio repetiria registros).
+        """
+        filters = dict(filters or {})
+        date_from = filters.pop("date_from", None)
+        date_to = filters.pop("date_to", None)
+        match = {k: v for k, v in filters.items() if k in CSV_HEADER}
+        newest_first = {"data": False, "-data": True}.get(sort)
+
+        # ------------------ MONGO ------------------
+        if self.use_mongo:
+            query = {k: v for k, v in match.items() if k != "id"}
+            if "id" in match:
+                query["_id"] = _mongo_id(match["id"])
+            if "data" in query:
+                query["data"] = to_datetime(query["data"])
+            if date_from or date_to:
+                query["data"] = {}
+                if date_from:
+                    query["data"]["$gte"] = datetime.datetime.combine(date_from, datetime.time.min)
+                if date_to:
+                    query["data"]["$lte"] = datetime.datetime.combine(date_to, datetime.time.max)
+
+            yielded = False
+            try:
+                cursors = []
+                for name in ("candidaturas", archive.COLLECTION)[:2 if include_archived else 1]:
+                    cursor = self.db[name].find(
+                        query,
+                        projection=_PREVIEW_PROJECTION if preview else {"_chave": 0},
+                        batch_size=batch_size,
+                    )
+                    if newest_first is not None:
+                        cursor = cursor.sort("data", -1 if newest_first else 1)
+                    if limit:
+                        cursor = cursor.limit(limit)
+                    cursors.append(cursor)
+
+                if newest_first is None:
+                    docs = chain(*cursors)
+                else:
+                    docs = heapq.merge(*cursors, key=_doc_date_key, reverse=newest_first)
+
+                for doc in islice(docs, limit or None):
+                    yielded = True
+                    row = doc_to_row(doc)
+                    if preview:
+                        row["observacoes"] = obs_preview(row["observacoes"])
+                    yield row
+
+                self.mongo.record_success()
+                return
+
+            except Exception as e:
+                self.mongo.record_failure(e)  # falhou → CSV nesta chamada
+                if yielded:
+                    raise
+
+        # ------------------ CSV ------------------
+        if "data" in match:
+            match["data"] = format_br(match["data"])
+        rows = self._csv_iter(date_from, date_to, newest_first, match, include_archived)
+        for row in islice(rows, limit or None):
+            if preview:
+                row["observacoes"] = obs_preview(row.get("observacoes"))
+            yield row
+
     def list_candidaturas(
         self,
         limit: Optional[int] = None,
         order_by_date_desc: bool = True,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        include_archived: bool = False,
+        preview: bool = True,
     ) -> List[Dict]:
         """
         Lista registros do Mongo ou CSV.
+        `date_from` / `date_to` (inclusivos) restringem o intervalo de datas;
+        no CSV particionado só as partições do intervalo são lidas.
+        Observações vêm só com a prévia (`preview=False` traz o texto
+        inteiro; para um registro, `get_observacoes`).
         """
+        return list(
+            self.iter_candidaturas(
+                {"date_from": date_from, "date_to": date_to},
+                sort="-data" if order_by_date_desc else "data",
+                limit=limit,
+                include_archived=include_archived,
+                preview=preview,
+            )
+        )
+
+    def get_observacoes(self, record_id: str, data: Optional[str] = None) -> Optional[str]:
+        """
+        Texto completo das observações de um registro (None se não existe).
+        `data` (DD-MM-YYYY, como na tabela) limita a busca no CSV às linhas
+        daquele dia. O resultado fica num cache LRU (`obs_cache`).
+        """
+        if not record_id:
+            return None
+        text = self.obs_cache.get(record_id)
+        if text is not None:
+            return text
 
-        # ------------------ MONGO ------------------
         if self.use_mongo:
             try:
-                cursor = self.db["candidaturas"].find()
-
-                if order_by_date_desc:
-                    cursor = cursor.sort("data", -1)
-                if limit:
-                    cursor = cursor.limit(limit)
-
-                items = []
-                for d in cursor:
-                    dt = d.get("data")
-                    if hasattr(dt, "isoformat"):
-                        dt = dt.isoformat()
-                        # DD-MM-YYYY
-                        if dt:
-                            try:
-                                y, m, d = dt.split('-')
-                                dt = f"{d}-{m}-{y}"
-                            except:
-                                pass
-
-                    items.append({
-                        "empresa": d.get("empresa", ""),
-                        "cargo": d.get("cargo", ""),
-                        "data": dt or "",
-                        "tipo": d.get("tipo", ""),
-                        "status": d.get("status", ""),
-                        "observacoes": d.get("observacoes", ""),
-                        "link": d.get("link", ""),
-                    })
-
-                return items
-
-            except Exception:
-                self.use_mongo = False  # falhou → CSV
+                for name in ("candidaturas", archive.COLLECTION):
+                    doc = self.db[name].find_one(
+                        {"_id": _mongo_id(record_id)}, projection={"observacoes": 1}
+                    )
+                    if doc is not None:
+                        break
+                self.mongo.record_success()
+                if doc is not None:
+                    text = doc.get("observacoes") or ""
+            except Exception as e:
+                self.mongo.record_failure(e)
 
-        # ------------------ CSV ------------------
-        self._ensure_csv()
+        if text is None:
+            day = parse_date(data)
+            for row in self._csv_iter(day, day, match={"id": record_id}, include_archived=True):
+                text = row.get("observacoes") or ""
+                break
+            if text is None and day is not None:
+                # a data mostrada pode ter mudado em outro processo
+                for row in self._csv_iter(match={"id": record_id}, include_archived=True):
+                    text = row.get("observacoes") or ""
+                    break
+
+        if text is not None:
+            self.obs_cache.put(record_id, text)
+        return text
+
+    def _full_previous(self, record_id: str, previous: Optional[Dict]) -> Optional[Dict]:
+        """
+        `previous` vindo da tabela (só a prévia) → com as observações
+        completas; sem `previous` (linha de comando, scripts), o registro
+        atual pelo id.
+        """
+        if previous is None:
+            return self._find_by_id(record_id)
+        if not is_preview(previous.get("observacoes")):
+            return previous
+        text = self.get_observacoes(record_id, previous.get("data"))
+        return previous if text is None else {**previous, "observacoes": text}
+
+    def _find_by_id(self, record_id: str) -> Optional[Dict]:
+        """Registro atual (Mongo: as duas coleções; CSV: leitura em fluxo com o log)."""
+        if self.use_mongo:
+            try:
+                for name in ("candidaturas", archive.COLLECTION):
+                    doc = self.db[name].find_one({"_id": _mongo_id(record_id)}, projection={"_chave": 0})
+                    if doc is not None:
+                        break
+                self.mongo.record_success()
+                if doc is not None:
+                    return doc_to_row(doc)
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        for row in self._csv_iter(match={"id": record_id}, include_archived=True):
+            return row
+        return None
 
-        items = []
-        with self.csv_path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if any(row.values()):
-                    items.append(row)
+    def count_candidaturas(self, include_archived: bool = False) -> int:
+        """
+        Total de registros sem trazer os documentos: `count_documents` no
+        Mongo; no CSV, o índice/manifest (e, com as arquivadas, a contagem
+        por dia do arquivo frio) — a leitura completa só acontece se houver
+        exclusões pendentes no log (até a próxima compactação).
+        """
+        if self.use_mongo:
+            try:
+                total = self.db["candidaturas"].count_documents({})
+                if include_archived:
+                    total += self.db[archive.COLLECTION].count_documents({})
+                self.mongo.record_success()
+                return total
+            except Exception as e:
+                self.mongo.record_failure(e)
 
-        # normalização
-        for r in items:
-            for field in CSV_FIELDS:
-                r[field] = r.get(field, "")
+        deletes = any(fields is None for fields in self.csv_log.overlay().values())
+        total = sum(1 for _ in self._csv_iter()) if deletes else self.csv_store.count()
+        if include_archived and self.csv_archive.exists():
+            if deletes:
+                total += sum(1 for _ in self._archive_iter())
+            else:
+                self.archive_rollups.load()
+                total += sum(self.archive_rollups.buckets[rollup.DAY].values())
+        return total
+
+    def count_by_status(self, include_archived: bool = False, columnar: bool = True) -> Dict[str, int]:
+        """
+        Quantidade por status ("" = sem status): no Mongo, um `$group` no
+        servidor; no CSV, a coluna de status da cópia colunar. `columnar=False`
+        conta os registros em fluxo, sem importar o pyarrow (CLI: a importação
+        custa mais que a contagem de uma base pequena).
+        """
+        if self.use_mongo:
+            try:
+                counts = Counter()
+                for name in ("candidaturas", archive.COLLECTION)[:2 if include_archived else 1]:
+                    for doc in self.db[name].aggregate(
+                        [{"$group": {"_id": "$status", "n": {"$sum": 1}}}]
+                    ):
+                        counts[doc["_id"] or ""] += doc["n"]
+                self.mongo.record_success()
+                return dict(counts)
+            except Exception as e:
+                self.mongo.record_failure(e)
 
-        # ordenação por data
+        # cópia colunar mapeada (core/analytics.py): só a coluna de status é lida
+        if columnar and self.analytics.enabled:
+            try:
+                table = self._analytics_raw(include_archived)
+                if table is not None:
+                    return analytics.status_counts(table, self.csv_log.overlay())
+            except Exception as e:
+                print("[ANALYTICS] Cópia colunar indisponível:", e)
+
+        rows = self._csv_iter(include_archived=include_archived)
+        return dict(Counter(row.get("status") or "" for row in rows))
+
+    def export_csv(
+        self,
+        path,
+        filters: Optional[Dict] = None,
+        sort: Optional[str] = "-data",
+        include_archived: bool = False,
+    ) -> int:
+        """
+        Grava os registros em `path` (CSV UTF-8 com BOM, abre direto no
+        Excel) em fluxo, sem montar a lista. Sem registros (ou com erro no
+        meio), o arquivo não é criado nem alterado. Retorna quantos foram
+        gravados.
+        """
+        path = Path(path)
+        tmp = temp_path(path)  # exclusivo: duas exportações não dividem o .tmp
+        total = 0
         try:
-            def date_key(x):
-                d_str = x.get("data", "")
-                try:
-                    d, m, y = d_str.split('-')
-                    return datetime.date(int(y), int(m), int(d))
-                except:
-                    return datetime.date.min
-            items.sort(key=date_key, reverse=order_by_date_desc)
-        except Exception:
-            pass
-
-        if limit:
-            return items[:limit]
-
-        return items
+            with tmp.open("w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_HEADER, extrasaction="ignore")
+                writer.writeheader()
+                for row in self.iter_candidaturas(filters, sort=sort, include_archived=include_archived):
+                    writer.writerow(row)
+                    total += 1
+            if total:
+                os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return total
+
+    def load_table(
+        self,
+        order_by_date_desc: bool = True,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        include_archived: bool = False,
+    ) -> CandidaturaTable:
+        """
+        Mesmos registros de `list_candidaturas`, em formato colunar compacto
+        (ver core/table.py). É o formato que as telas mantêm em memória;
+        os registros vão direto do cursor/arquivo para as colunas (com a
+        prévia das observações).
+        """
+        return CandidaturaTable.from_rows(
+            self.iter_candidaturas(
+                {"date_from": date_from, "date_to": date_to},
+                sort="-data" if order_by_date_desc else "data",
+                include_archived=include_archived,
+                preview=True,
+            )
+        )
+
+    # ----------------------------------------------------------------------
+    # FOTOGRAFIA (PARTIDA A FRIO)
+    # ----------------------------------------------------------------------
+    def snapshot_watermark(self) -> Dict:
+        """
+        Marca d'água dos dados atuais, guardada com a fotografia: o maior
+        `_id` no Mongo; no CSV, (inode, tamanho) dos arquivos e do log.
+        Deve ser tirada antes da leitura que ela acompanha.
+        """
+        if self.use_mongo:
+            try:
+                last = self.db["candidaturas"].find_one({}, projection={"_id": 1}, sort=[("_id", -1)])
+                self.mongo.record_success()
+                return {"backend": "mongo", "last_id": str(last["_id"]) if last else ""}
+            except Exception as e:
+                self.mongo.record_failure(e)
+
+        return {
+            "backend": "csv",
+            "files": self.csv_store.marks(),
+            "log": file_mark(self.csv_log.path),
+        }
+
+    def records_since(self, watermark: Dict, total: int):
+        """
+        Registros incluídos depois de `watermark` → (registros, nova marca).
+
+        `total` é quantos registros a fotografia já contava; se `total` +
+        novos não fecha com a contagem atual (exclusões, ids fora de ordem,
+        anexos no meio da leitura) — ou se a marca não vale mais (outro
+        backend, CSV reescrito, log de alterações mudou) — retorna None e
+        quem chamou relê tudo. No Mongo, edições feitas por outras
+        instâncias não mudam a contagem: chegam pelo ChangeFeed ou pelo ↻.
+        """
+        if watermark.get("backend") == "mongo":
+            if not self.use_mongo:
+                return None
+            try:
+                coll = self.db["candidaturas"]
+                query = {}
+                if watermark.get("last_id"):
+                    query["_id"] = {"$gt": _mongo_id(watermark["last_id"])}
+                rows = [
+                    doc_to_row(doc)
+                    for doc in coll.find(query, projection={"_chave": 0}).sort("_id", 1)
+                ]
+                current = coll.count_documents({})
+                self.mongo.record_success()
+            except Exception as e:
+                self.mongo.record_failure(e)
+                return None
+            if total + len(rows) != current:
+                return None
+            last_id = rows[-1]["id"] if rows else watermark.get("last_id", "")
+            return rows, {"backend": "mongo", "last_id": last_id}
+
+        if self.use_mongo or watermark.get("backend") != "csv":
+            return None
+        log = file_mark(self.csv_log.path)
+        if log != watermark.get("log"):
+            return None  # edições/exclusões: o log vale para registros antigos
+        since = self.csv_store.rows_since(watermark.get("files") or {})
+        if since is None:
+            return None
+        rows, marks = since
+        if total + len(rows) != self.count_candidaturas():
+            return None
+        return rows, {"backend": "csv", "files": marks, "log": log}
+
+    def load_snapshot(self) -> Optional[Dict]:
+        """Última fotografia gravada ({"watermark", "total", "views", ...}) ou None."""
+        return self.snapshot.load()
+
+    def save_snapshot(self, watermark: Dict, total: int, views: Dict[str, bytes]):
+        try:
+            self.snapshot.save(watermark, total, views)
+        except OSError as e:
+            print("[SNAPSHOT] Falha ao gravar a fotografia:", e)
@@ -0,0 +1,79 @@
+"""
+Codec de datas do Meu Emprego — todas as conversões de data num só lugar.
+
+Formatos em uso:
+• CSV e telas:              'DD-MM-YYYY'
+• formulário e importação:  'YYYY-MM-DD'
+• MongoDB:                  datetime (meia-noite)
+
+Muitos registros compartilham a mesma data, então a formatação date → texto
+é memorizada: cada dia distinto é formatado uma única vez por processo.
+"""
+
+import datetime
+from functools import lru_cache
+from typing import Optional
+
+
+def parse_br_date(value: str) -> Optional[datetime.date]:
+    """'DD-MM-YYYY' → date (None se inválida)."""
+    try:
+        d, m, y = value.split("-")
+        return datetime.date(int(y), int(m), int(d))
+    except Exception:
+        return None
+
+
+def parse_date(value) -> Optional[datetime.date]:
+    """Data em DD-MM-YYYY (CSV), YYYY-MM-DD (UI) ou date/datetime (Mongo)."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    d = parse_br_date(value or "")
+    if d is None:
+        try:
+            d = datetime.date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+    return d
+
+
+def iso_to_br(value: str) -> str:
+    """'YYYY-MM-DD' → 'DD-MM-YYYY' (mantém o valor se não for ISO)."""
+    if value:
+        try:
+            y, m, d = value.split("-")
+            return f"{d}-{m}-{y}"
+        except Exception:
+            pass
+    return value
+
+
+@lru_cache(maxsize=8192)
+def _br(d: datetime.date) -> str:
+    return f"{d.day:02d}-{d.month:02d}-{d.year:04d}"
+
+
+def format_br(value) -> str:
+    """
+    Qualquer data reconhecida por `parse_date` → 'DD-MM-YYYY'.
+    Textos que não são datas voltam como estão; None → ''.
+    """
+    d = parse_date(value)
+    if d is None:
+        return value if isinstance(value, str) else ""
+    return _br(d)
+
+
+def to_datetime(value):
+    """
+    Valor da aplicação → datetime para o Mongo (meia-noite do dia).
+    Valores que não são datas reconhecíveis voltam como estão.
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    d = parse_date(value)
+    if d is None:
+        return value
+    return datetime.datetime(d.year, d.month, d.day)
@@ -0,0 +1,184 @@
+"""
+Detecção de candidaturas duplicadas.
+
+Uma candidatura é considerada a mesma quando a chave normalizada
+(empresa, cargo, link) coincide:
+• empresa/cargo: sem acentos, minúsculas, espaços colapsados;
+• link: esquema/host em minúsculas, sem "www.", sem "/" final e sem #fragmento.
+
+Índices persistentes (consulta O(1), sem varrer `list_candidaturas()`):
+• MongoDB: índice único composto em `_chave.empresa/_chave.cargo/_chave.link`;
+• CSV: arquivo auxiliar com um hash por linha (`candidaturas.keys`),
+  carregado num set e acrescentado a cada inserção (linhas "-hash"
+  retiram a chave quando a candidatura é excluída/alterada).
+"""
+
+import hashlib
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from core.filelock import temp_path
+
+
+def _norm_text(value: Optional[str]) -> str:
+    value = value or ""
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value)
+        value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join(value.casefold().split())
+
+
+def _norm_link(value: Optional[str]) -> str:
+    value = (value or "").strip()
+    if not value:
+        return ""
+
+    # sem urlsplit: este caminho roda para cada linha do importador
+    value = value.split("#", 1)[0]
+    scheme, sep, rest = value.partition("://")
+    if not sep:
+        scheme, rest = "", value
+
+    host, slash, path = rest.partition("/")
+    host = host.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    path, qmark, query = path.partition("?")
+    path = path.rstrip("/")
+
+    out = f"{scheme.lower()}://{host}" if sep else host
+    if path:
+        out += "/" + path
+    if qmark:
+        out += "?" + query
+    return out
+
+
+def dedup_key(doc: Dict) -> Dict[str, str]:
+    """Chave normalizada (também gravada no Mongo como `_chave`)."""
+    return {
+        "empresa": _norm_text(doc.get("empresa")),
+        "cargo": _norm_text(doc.get("cargo")),
+        "link": _norm_link(doc.get("link")),
+    }
+
+
+def key_hash(doc: Dict) -> str:
+    """Hash curto e estável da chave normalizada."""
+    key = dedup_key(doc)
+    raw = "\x1f".join((key["empresa"], key["cargo"], key["link"]))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+# Índice único do Mongo (parcial: documentos antigos sem `_chave` não colidem)
+MONGO_INDEX_KEYS = [("_chave.empresa", 1), ("_chave.cargo", 1), ("_chave.link", 1)]
+MONGO_INDEX_NAME = "uniq_candidatura"
+
+
+def ensure_mongo_index(collection, unique: bool = True):
+    collection.create_index(
+        MONGO_INDEX_KEYS,
+        name=MONGO_INDEX_NAME,
+        unique=unique,
+        partialFilterExpression={"_chave.empresa": {"$exists": True}},
+    )
+
+
+class CsvKeyIndex:
+    """
+    Conjunto persistente de hashes das candidaturas do CSV.
+
+    O arquivo é só-anexação (um hash por linha). Outros processos também
+    acrescentam nele; antes de cada consulta só os bytes novos são lidos.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._keys = set()
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def load(self, rows: Iterable[Dict]):
+        """
+        Carrega o índice; se o arquivo ainda não existe, constrói a partir
+        dos registros (única varredura completa, feita uma vez).
+        """
+        if not self.path.exists():
+            self.rebuild(key_hash(r) for r in rows)
+            return
+
+        with self._lock:
+            self._keys = set()
+            self._offset = 0
+            self._catch_up()
+
+    def rebuild(self, hashes: Iterable[str]):
+        """Regrava o arquivo só com `hashes` (descarta as linhas "-hash")."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(self.path)
+            with tmp.open("w", encoding="ascii") as f:
+                for h in set(hashes):
+                    f.write(h + "\n")
+            os.replace(tmp, self.path)
+
+            self._keys = set()
+            self._offset = 0
+            self._catch_up()
+
+    def _catch_up(self):
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size < self._offset:  # arquivo recriado
+            self._keys, self._offset = set(), 0
+        if size == self._offset:
+            return
+
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].split():
+            if line.startswith(b"-"):
+                self._keys.discard(line[1:].decode("ascii"))
+            else:
+                self._keys.add(line.decode("ascii"))
+        self._offset += end
+
+    def __contains__(self, h: str) -> bool:
+        with self._lock:
+            self._catch_up()
+            return h in self._keys
+
+    def add(self, h: str):
+        self.add_many([h])
+
+    def add_many(self, hashes: Iterable[str]):
+        with self._lock:
+            self._catch_up()
+            new = [h for h in hashes if h not in self._keys]
+            if not new:
+                return
+            with self.path.open("a", encoding="ascii") as f:
+                f.write("".join(h + "\n" for h in new))
+            # as próprias linhas serão relidas no próximo _catch_up (sem efeito)
+            self._keys.update(new)
+
+    def discard(self, h: str):
+        with self._lock:
+            self._catch_up()
+            if h not in self._keys:
+                return
+            with self.path.open("a", encoding="ascii") as f:
+                f.write(f"-{h}\n")
+            self._keys.discard(h)
+
+    def __len__(self):
+        return len(self._keys)
@@ -0,0 +1,153 @@
+"""
+EventBus — mudanças feitas por ESTE processo, entregues às telas.
+
+O ChangeFeed (core/changefeed.py) observa o armazenamento e traz o que
+outros processos gravaram, com alguns centésimos de segundo de atraso e,
+em alterações/exclusões, sem o estado anterior do registro. As gravações
+feitas aqui mesmo (cadastro, troca de status, exclusão) não precisam
+esperar por ele: o DataStore publica cada uma no barramento, logo depois
+de gravar, como `ChangeEvent` com o registro completo e o estado anterior
+(`previous`). Com isso a tela ajusta contadores e tabela em O(1) por
+evento, sem reler nada.
+
+Versão dos dados: cada evento publicado recebe o próximo número de
+`EventBus.version`. Uma tela guarda a versão em que fez a última leitura
+completa (`consistent`) e usa o `VersionTracker` para descartar eventos já
+contidos nela e reaplicar os que chegaram enquanto a leitura rodava.
+
+Os assinantes são chamados na thread que gravou; a interface repassa para
+a thread do Tkinter (TkDispatcher). O barramento lembra por alguns
+segundos os ids publicados (`claim`), para que o eco da mesma gravação
+vindo do ChangeFeed não seja aplicado duas vezes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Tipos de evento
+INSERTED = "inserted"
+UPDATED = "updated"
+DELETED = "deleted"
+RESET = "reset"  # a fonte foi reescrita: a tela deve recarregar tudo
+
+
+@dataclass
+class ChangeEvent:
+    """Uma mudança observada no armazenamento."""
+
+    kind: str
+    record: Dict = field(default_factory=dict)
+    source: str = "csv"
+    previous: Optional[Dict] = None  # registro antes da mudança (eventos locais)
+    version: int = 0                 # 0 = de outro processo (ChangeFeed)
+
+
+class EventBus:
+    """Publica listas de `ChangeEvent` para os assinantes, com contador de versão."""
+
+    ECHO_TTL = 30.0  # segundos em que o eco de um evento local é ignorado
+
+    def __init__(self):
+        self.version = 0
+        self._subscribers: List[Callable[[List[ChangeEvent]], None]] = []
+        self._recent: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None]) -> Callable[[], None]:
+        """Registra `callback(eventos)`; devolve a função que cancela a assinatura."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, events: List[ChangeEvent]):
+        """Numera os eventos (versão) e entrega a lista a cada assinante."""
+        if not events:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for ev in events:
+                self.version += 1
+                ev.version = self.version
+                ev.source = "local"
+                rid = ev.record.get("id")
+                if rid:
+                    self._recent[(ev.kind, rid)] = now
+                    self._recent.move_to_end((ev.kind, rid))
+            self._expire(now)
+            subscribers = list(self._subscribers)
+
+        for cb in subscribers:
+            try:
+                cb(events)
+            except Exception as e:
+                print("\n[ERRO] Assinante de eventos falhou:", e, "\n")
+
+    def claim(self, ev: ChangeEvent) -> bool:
+        """True se `ev` (do ChangeFeed) é o eco de um evento já publicado aqui."""
+        rid = ev.record.get("id")
+        if ev.version or not rid:
+            return False
+        with self._lock:
+            ts = self._recent.get((ev.kind, rid))
+        return ts is not None and time.monotonic() - ts < self.ECHO_TTL
+
+    def consistent(self, fn: Callable, *args, **kwargs):
+        """
+        Executa a leitura `fn(*args, **kwargs)` → (resultado, versão).
+        Se algo foi publicado durante a leitura, tenta de novo (até 3
+        vezes); na última, vale a versão do início — os eventos
+        posteriores serão reaplicados pela tela.
+        """
+        for _ in range(3):
+            before = self.version
+            result = fn(*args, **kwargs)
+            if self.version == before:
+                break
+        return result, before
+
+    def _expire(self, now: float):
+        while self._recent:
+            key, ts = next(iter(self._recent.items()))
+            if now - ts < self.ECHO_TTL and len(self._recent) <= 10_000:
+                break
+            self._recent.popitem(last=False)
+
+
+class VersionTracker:
+    """
+    Versão dos dados que uma tela carregou + eventos locais recebidos
+    depois dela (para reaplicar sobre uma leitura completa mais nova).
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._seen: List[ChangeEvent] = []
+
+    def fresh(self, events: List[ChangeEvent]) -> List[ChangeEvent]:
+        """Eventos que ainda não estão nos dados carregados."""
+        out = []
+        for ev in events:
+            if ev.version:
+                if ev.version <= self.version:
+                    continue
+                self._seen.append(ev)
+            out.append(ev)
+        return out
+
+    def loaded(self, version: Optional[int]) -> List[ChangeEvent]:
+        """Leitura completa na `version`: devolve os eventos a reaplicar sobre ela."""
+        if version is None:
+            return []
+        self.version = version
+        self._seen = [ev for ev in self._seen if ev.version > version]
+        return list(self._seen)
@@ -0,0 +1,144 @@
+"""
+FileLock — trava consultiva entre processos para os arquivos do CSV.
+
+Várias instâncias da aplicação (e importações por script) podem usar o
+mesmo CSV. A trava é um `fcntl.flock` num arquivo auxiliar (`<nome>.lock`)
+— não no próprio CSV, que é substituído por os.replace na compactação:
+
+• compartilhada (`shared()`)   — leituras e anexos ao log de alterações;
+• exclusiva     (`exclusive()`) — anexos ao CSV, reparo de cabeçalho,
+                                  merge do delta e compactação.
+
+Dentro do processo as threads seguem a mesma regra (vários leitores ou um
+escritor). A trava exclusiva é reentrante na thread que a detém e admite
+leituras aninhadas; pedir a exclusiva segurando a compartilhada é um erro
+(deadlock certo) e levanta RuntimeError.
+
+Sem fcntl (Windows) a trava vale só entre as threads do processo.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class FileLock:
+    """Leitores compartilhados / escritor exclusivo, entre threads e processos."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._owner = None
+        self._depth = 0
+        self._local = threading.local()
+        self._fd = None
+        self._pid = None
+
+    # ----------------------------------------------------------------------
+    # API
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def shared(self):
+        if self._owner == threading.get_ident():
+            yield  # leitura dentro da própria trava exclusiva
+            return
+        self._acquire_shared()
+        try:
+            yield
+        finally:
+            self._release_shared()
+
+    @contextmanager
+    def exclusive(self):
+        self._acquire_exclusive()
+        try:
+            yield
+        finally:
+            self._release_exclusive()
+
+    def held_exclusive(self) -> bool:
+        """True se a thread atual detém a trava exclusiva."""
+        return self._owner == threading.get_ident()
+
+    # ----------------------------------------------------------------------
+    def _acquire_shared(self):
+        with self._cond:
+            while self._owner is not None:
+                self._cond.wait()
+            if self._readers == 0:
+                self._flock("LOCK_SH")
+            self._readers += 1
+        self._local.shared = getattr(self._local, "shared", 0) + 1
+
+    def _release_shared(self):
+        self._local.shared -= 1
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._flock("LOCK_UN")
+                self._cond.notify_all()
+
+    def _acquire_exclusive(self):
+        me = threading.get_ident()
+        if self._owner == me:
+            self._depth += 1
+            return
+        if getattr(self._local, "shared", 0):
+            raise RuntimeError(f"{self.path}: trava exclusiva pedida dentro de uma leitura")
+        with self._cond:
+            while self._owner is not None or self._readers:
+                self._cond.wait()
+            self._owner = me
+            self._depth = 1
+            self._flock("LOCK_EX")
+
+    def _release_exclusive(self):
+        self._depth -= 1
+        if self._depth:
+            return
+        with self._cond:
+            self._flock("LOCK_UN")
+            self._owner = None
+            self._cond.notify_all()
+
+    def _flock(self, op: str):
+        if fcntl is None:
+            return
+        if self._fd is None or self._pid != os.getpid():
+            # depois de um fork o descritor herdado seria a mesma trava do pai
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        fcntl.flock(self._fd, getattr(fcntl, op))
+
+
+# --------------------------------------------------------------------------
+# ARQUIVOS AUXILIARES
+# --------------------------------------------------------------------------
+def temp_path(path: Path) -> Path:
+    """
+    Temporário ao lado de `path` para a troca atômica (os.replace), único
+    por processo e thread: dois escritores nunca gravam no mesmo arquivo.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def file_stamp(path: Path):
+    """
+    (inode, mtime, tamanho) de `path`, ou None se não existe. Cada os.replace
+    troca o inode: detecta a regravação por outro processo mesmo quando o
+    mtime não muda (sistemas de arquivos com relógio grosso).
+    """
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
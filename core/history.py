@@ -0,0 +1,138 @@
+"""
+StatusHistory — log de transições de status das candidaturas.
+
+Cada candidatura guarda apenas o status atual; as transições ficam num
+arquivo só-anexação ao lado dos registros (`candidaturas.history`, JSON Lines):
+
+    {"id": "...", "de": "", "para": "Inscrito", "ts": "2025-11-02T00:00:00"}
+    {"id": "...", "de": "Inscrito", "para": "Entrevista", "ts": "2025-11-09T14:31:02"}
+
+• a inscrição é registrada com a data da candidatura;
+• alterações de status usam o horário da alteração;
+• `ts` é null quando o momento é desconhecido (histórico reconstruído);
+• a exclusão é uma transição para `EXCLUIDA`, e quem agrega o histórico
+  desconta o registro (ver `deletion`).
+
+Leitores consomem o log de forma incremental com `read_since(offset)`
+(ver graphics/funnel.py). Com o Mongo ativo, as transições também são
+gravadas na coleção `status_historico`.
+"""
+
+import datetime
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.dates import parse_date
+from core.filelock import temp_path
+
+
+# `para` da transição que registra a exclusão (não é um status da tela)
+EXCLUIDA = "__excluida__"
+
+
+def transition(record_id: str, de: str, para: str, ts: Optional[str]) -> Dict:
+    return {"id": record_id, "de": de or "", "para": para or "", "ts": ts}
+
+
+def deletion(record_id: str, de: str, ts: Optional[str]) -> Dict:
+    """Exclusão de `record_id` (que estava com o status `de`)."""
+    return transition(record_id, de, EXCLUIDA, ts)
+
+
+def now_ts() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+def applied_ts(row: Dict) -> str:
+    """Momento da inscrição: a data da candidatura (ISO ou DD-MM-YYYY) ou agora."""
+    d = parse_date(row.get("data"))
+    if d is None:
+        return now_ts()
+    return datetime.datetime.combine(d, datetime.time.min).isoformat()
+
+
+def seed_events(row: Dict) -> List[Dict]:
+    """
+    Histórico mínimo de um registro anterior ao log: a inscrição e, se o
+    status atual já for outro, uma transição sem horário conhecido.
+    """
+    events = [transition(row.get("id", ""), "", "Inscrito", applied_ts(row))]
+    status = row.get("status") or ""
+    if status and status != "Inscrito":
+        events.append(transition(row.get("id", ""), "Inscrito", status, None))
+    return events
+
+
+class StatusHistory:
+    """Arquivo JSON Lines de transições, lido de forma incremental."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def seed(self, rows: Iterable[Dict]):
+        """Cria o log a partir dos registros atuais (uma vez, se não existir)."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(self.path)
+            with tmp.open("w", encoding="utf-8") as f:
+                for row in rows:
+                    for ev in seed_events(row):
+                        f.write(json.dumps(ev, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+
+    def append_many(self, events: List[Dict]):
+        if not events:
+            return
+        data = "".join(json.dumps(ev, ensure_ascii=False) + "\n" for ev in events)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(data)
+
+    def last_changes(self) -> Dict[str, datetime.date]:
+        """
+        Dia da última transição de cada registro (leitura completa). Fica de
+        fora quem tem a última transição sem horário conhecido.
+        """
+        last: Dict[str, Optional[str]] = {}
+        events, _, _ = self.read_since(0)
+        for ev in events:
+            last[ev.get("id")] = ev.get("ts")
+        return {rid: parse_date(ts[:10]) for rid, ts in last.items() if rid and ts}
+
+    def read_since(self, offset: int) -> Tuple[List[Dict], int, bool]:
+        """
+        Transições gravadas depois de `offset`.
+        Retorna (eventos, novo offset, reset); `reset` indica que o arquivo
+        foi recriado e o leitor deve descartar o que acumulou.
+        """
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return [], 0, offset > 0
+
+        reset = size < offset
+        if reset:
+            offset = 0
+        if size == offset:
+            return [], offset, reset
+
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+
+        end = chunk.rfind(b"\n") + 1
+        events = []
+        for line in chunk[:end].splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events, offset + end, reset
@@ -0,0 +1,361 @@
+"""
+Importador em lote de candidaturas (planilhas e exportações de sites de vagas).
+
+Fluxo, com memória limitada ao tamanho do lote:
+
+    arquivo → leitor em streaming (linha a linha)
+            → mapeamento de colunas para CSV_FIELDS
+            → normalização vetorizada por lote (pandas): datas, status, modelo
+            → DataStore.insert_many (dedup O(1) + escrita em lote)
+
+Formatos: .csv/.tsv/.txt, .xlsx (requer openpyxl), .jsonl/.ndjson e .json
+(lista de objetos; em streaming se `ijson` estiver instalado).
+
+Uso pela linha de comando:
+
+    python -m core.importer minhas_vagas.xlsx
+    python -m core.importer export.csv --lote 10000 --simular
+
+Vazão medida em bench/importer.py (`python -m bench.importer 200000`).
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from core.csvstore import CSV_FIELDS
+
+
+DEFAULT_BATCH = 5000
+
+
+# --------------------------------------------------------------------------
+# MAPEAMENTO DE COLUNAS E VALORES
+# --------------------------------------------------------------------------
+def _norm_name(value) -> str:
+    value = unicodedata.normalize("NFKD", str(value or ""))
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    return " ".join("".join(c if c.isalnum() else " " for c in value.casefold()).split())
+
+
+# nome de coluna normalizado → campo da aplicação
+COLUMN_ALIASES = {
+    "empresa": "empresa", "company": "empresa", "company name": "empresa",
+    "nome da empresa": "empresa", "employer": "empresa", "organization": "empresa",
+    "cargo": "cargo", "vaga": "cargo", "title": "cargo", "job title": "cargo",
+    "position": "cargo", "role": "cargo", "funcao": "cargo",
+    "data": "data", "date": "data", "data da inscricao": "data",
+    "applied": "data", "applied at": "data", "applied on": "data",
+    "application date": "data", "date applied": "data",
+    "tipo": "tipo", "modelo": "tipo", "modelo de trabalho": "tipo",
+    "work type": "tipo", "workplace type": "tipo", "remote": "tipo",
+    "location type": "tipo", "modalidade": "tipo",
+    "status": "status", "stage": "status", "situacao": "status",
+    "application status": "status",
+    "observacoes": "observacoes", "descricao": "observacoes", "notes": "observacoes",
+    "description": "observacoes", "descricao e requisitos": "observacoes",
+    "link": "link", "url": "link", "job url": "link", "link da vaga": "link",
+    "job link": "link", "posting url": "link",
+}
+
+STATUS_ALIASES = {
+    "inscrito": "Inscrito", "applied": "Inscrito", "enviado": "Inscrito",
+    "submitted": "Inscrito", "candidatado": "Inscrito", "aplicado": "Inscrito",
+    "entrevista": "Entrevista", "interview": "Entrevista", "interviewing": "Entrevista",
+    "screening": "Entrevista", "em processo": "Entrevista", "phone screen": "Entrevista",
+    "rejeitado": "Rejeitado", "rejected": "Rejeitado", "reprovado": "Rejeitado",
+    "declined": "Rejeitado", "not selected": "Rejeitado", "recusado": "Rejeitado",
+    "contratado": "Contratado", "hired": "Contratado", "offer": "Contratado",
+    "aprovado": "Contratado", "offer accepted": "Contratado",
+}
+
+TIPO_ALIASES = {
+    "presencial": "Presencial", "on site": "Presencial", "onsite": "Presencial",
+    "in office": "Presencial",
+    "remoto": "Remoto", "remote": "Remoto", "home office": "Remoto",
+    "hibrido": "Híbrido", "híbrido": "Híbrido", "hybrid": "Híbrido",
+}
+
+
+def map_columns(header: Iterable[str]) -> Dict[str, str]:
+    """coluna do arquivo → campo da aplicação (colunas desconhecidas ficam de fora)."""
+    mapping = {}
+    for col in header:
+        target = COLUMN_ALIASES.get(_norm_name(col))
+        if target and target not in mapping.values():
+            mapping[col] = target
+    return mapping
+
+
+# --------------------------------------------------------------------------
+# LEITORES EM STREAMING
+# --------------------------------------------------------------------------
+def _read_csv(path: Path) -> Iterator[Dict]:
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.DictReader(f, dialect=dialect)
+
+
+def _read_xlsx(path: Path) -> Iterator[Dict]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise RuntimeError("Importar .xlsx requer o pacote openpyxl (pip install openpyxl).") from e
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(c) if c is not None else "" for c in next(rows, [])]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def _read_jsonl(path: Path) -> Iterator[Dict]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _read_json(path: Path) -> Iterator[Dict]:
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    with path.open("rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "item")
+            return
+        # sem ijson: a lista inteira é carregada (arquivos grandes → use .jsonl)
+        data = json.load(f)
+    yield from (data if isinstance(data, list) else data.get("items", []))
+
+
+READERS: Dict[str, Callable[[Path], Iterator[Dict]]] = {
+    ".csv": _read_csv,
+    ".tsv": _read_csv,
+    ".txt": _read_csv,
+    ".xlsx": _read_xlsx,
+    ".jsonl": _read_jsonl,
+    ".ndjson": _read_jsonl,
+    ".json": _read_json,
+}
+
+
+def iter_records(path: Path) -> Iterator[Dict]:
+    path = Path(path)
+    reader = READERS.get(path.suffix.lower())
+    if reader is None:
+        raise ValueError(f"Formato não suportado: {path.suffix}")
+    return reader(path)
+
+
+# --------------------------------------------------------------------------
+# NORMALIZAÇÃO VETORIZADA
+# --------------------------------------------------------------------------
+def _date_cell(value):
+    """datetime/date → 'AAAA-MM-DD'; outros valores passam como estão."""
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def normalize_batch(raw: List[Dict], mapping: Dict[str, str]):
+    """
+    Normaliza um lote inteiro com operações de coluna do pandas.
+    Retorna (documentos válidos, {motivo: quantidade} dos rejeitados).
+    """
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(
+        [{mapping[k]: v for k, v in r.items() if k in mapping} for r in raw],
+        columns=CSV_FIELDS,
+    )
+    # células de data do XLSX (datetime) e datas do JSON já convertidas:
+    # só o dia interessa, sem passar pelo texto
+    df["data"] = df["data"].map(_date_cell)
+    for col in CSV_FIELDS:
+        df[col] = df[col].astype("string").fillna("").str.strip()
+
+    # datas: começando pelo ano (AAAA-MM-DD, com ou sem horário) são lidas
+    # como ano-mês-dia; o resto, com dia primeiro
+    ymd = df["data"].str.extract(r"^(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?:$|[T ])")
+    iso = pd.to_datetime(
+        ymd[0] + "-" + ymd[1].str.zfill(2) + "-" + ymd[2].str.zfill(2),
+        format="%Y-%m-%d", errors="coerce",
+    )
+    other = pd.to_datetime(df["data"].where(ymd[0].isna()), dayfirst=True, errors="coerce", format="mixed")
+    dates = iso.fillna(other)
+    df["data"] = dates.dt.strftime("%Y-%m-%d")
+
+    # status/modelo: chave em minúsculas e sem pontuação → vocabulário da UI
+    status_key = df["status"].str.casefold().str.replace(r"[\W_]+", " ", regex=True).str.strip()
+    df["status"] = (
+        status_key.map(STATUS_ALIASES)
+        .fillna(df["status"].where(df["status"] != "", "Inscrito"))
+    )
+    tipo_key = df["tipo"].str.casefold().str.replace(r"[\W_]+", " ", regex=True).str.strip()
+    df["tipo"] = tipo_key.map(TIPO_ALIASES).fillna(df["tipo"])
+
+    missing = (df["empresa"] == "") | (df["cargo"] == "")
+    bad_date = dates.isna() & ~missing
+
+    rejected = {}
+    if missing.any():
+        rejected["sem empresa/cargo"] = int(missing.sum())
+    if bad_date.any():
+        rejected["data inválida"] = int(bad_date.sum())
+
+    ok = df[~(missing | bad_date)]
+    columns = [ok[col].tolist() for col in CSV_FIELDS]
+    docs = [dict(zip(CSV_FIELDS, values)) for values in zip(*columns)]
+    return docs, rejected
+
+
+# --------------------------------------------------------------------------
+# IMPORTAÇÃO
+# --------------------------------------------------------------------------
+@dataclass
+class ImportReport:
+    arquivo: str = ""
+    lidos: int = 0
+    inseridos: int = 0
+    duplicados: int = 0
+    mesclados: int = 0
+    rejeitados: Dict[str, int] = field(default_factory=dict)
+    segundos: float = 0.0
+
+    @property
+    def total_rejeitados(self) -> int:
+        return sum(self.rejeitados.values())
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        return self.lidos / self.segundos if self.segundos else 0.0
+
+    def resumo(self) -> str:
+        linhas = [
+            f"Arquivo:     {self.arquivo}",
+            f"Lidos:       {self.lidos:,}",
+            f"Inseridos:   {self.inseridos:,}",
+            f"Duplicados:  {self.duplicados:,}" + (f" ({self.mesclados:,} mesclados)" if self.mesclados else ""),
+            f"Rejeitados:  {self.total_rejeitados:,}",
+        ]
+        for motivo, n in sorted(self.rejeitados.items()):
+            linhas.append(f"  • {motivo}: {n:,}")
+        linhas.append(f"Tempo:       {self.segundos:.1f}s ({self.linhas_por_segundo:,.0f} linhas/s)")
+        return "\n".join(linhas)
+
+
+def import_file(
+    datastore,
+    path,
+    batch_size: int = DEFAULT_BATCH,
+    on_duplicate: str = "reject",
+    dry_run: bool = False,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """
+    Importa `path` em lotes de `batch_size` linhas.
+    `progress(report)` é chamado ao fim de cada lote (de qualquer thread).
+    """
+    path = Path(path)
+    report = ImportReport(arquivo=str(path))
+    start = time.perf_counter()
+
+    mapping: Optional[Dict[str, str]] = None
+    batch: List[Dict] = []
+
+    def flush():
+        docs, rejected = normalize_batch(batch, mapping)
+        for motivo, n in rejected.items():
+            report.rejeitados[motivo] = report.rejeitados.get(motivo, 0) + n
+
+        if docs and not dry_run:
+            res = datastore.insert_many(docs, on_duplicate=on_duplicate)
+            report.inseridos += res.get("inserted", 0)
+            report.duplicados += res.get("duplicates", 0)
+            report.mesclados += res.get("merged", 0)
+        elif docs:
+            report.inseridos += len(docs)
+
+        batch.clear()
+        report.segundos = time.perf_counter() - start
+        if progress:
+            progress(report)
+
+    for record in iter_records(path):
+        if mapping is None:
+            mapping = map_columns(record.keys())
+            if "empresa" not in mapping.values() or "cargo" not in mapping.values():
+                raise ValueError(
+                    "Não encontrei colunas de empresa e cargo no arquivo "
+                    f"(colunas: {', '.join(map(str, record.keys()))})."
+                )
+
+        batch.append(record)
+        report.lidos += 1
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    report.segundos = time.perf_counter() - start
+    return report
+
+
+# --------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------
+def main(argv=None):
+    from dotenv import load_dotenv
+
+    load_dotenv(".env")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m core.importer",
+        description="Importa candidaturas de CSV/XLSX/JSON em lote.",
+    )
+    parser.add_argument("arquivo", help="arquivo a importar")
+    parser.add_argument("--lote", type=int, default=DEFAULT_BATCH, help="linhas por lote")
+    parser.add_argument("--mesclar", action="store_true",
+                        help="duplicatas completam o registro existente em vez de serem ignoradas")
+    parser.add_argument("--simular", action="store_true", help="valida sem gravar")
+    args = parser.parse_args(argv)
+
+    from core.datastore import DataStore
+
+    ds = DataStore()
+    try:
+        report = import_file(
+            ds,
+            args.arquivo,
+            batch_size=args.lote,
+            on_duplicate="merge" if args.mesclar else "reject",
+            dry_run=args.simular,
+            progress=lambda r: print(f"\r{r.lidos:,} linhas...", end="", flush=True),
+        )
+    finally:
+        ds.close()
+    print()
+    print(report.resumo())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+LinkChecker — verifica, em segundo plano, se os links das vagas ainda
+estão no ar.
+
+• Concorrência: ThreadPoolExecutor; cada host tem seu próprio pool de
+  conexões HTTP(S) persistentes (keep-alive, até `per_host` simultâneas)
+  e um intervalo mínimo entre requisições (limite de taxa por host).
+• Requisição: HEAD (GET quando o servidor não aceita HEAD), seguindo até
+  5 redirecionamentos para descobrir a URL final. Uma conexão do pool que
+  o servidor fechou enquanto ociosa é refeita uma vez, sem virar erro.
+• Cache: `candidaturas.links.json` com {url: {status, final_url,
+  checked_at, ativa, erro}}; só entradas mais velhas que o TTL
+  (MEU_EMPREGO_LINK_TTL_HOURS, padrão 24h) são verificadas de novo.
+
+Só usa a biblioteca padrão. Testes em core/tests/test_linkcheck.py, contra
+um servidor HTTP local; demonstração (nenhum acesso à internet):
+
+    python -m bench.linkcheck
+"""
+
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+from core.filelock import temp_path
+
+
+USER_AGENT = "MeuEmprego-LinkCheck/1.0"
+MAX_REDIRECTS = 5
+
+# status HTTP que indicam vaga encerrada
+GONE = (404, 410)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def is_active(status: Optional[int]) -> Optional[bool]:
+    """True (2xx/3xx), False (404/410) ou None (indeterminado)."""
+    if status is None:
+        return None
+    if status < 400:
+        return True
+    if status in GONE:
+        return False
+    return None
+
+
+# --------------------------------------------------------------------------
+# POOL DE CONEXÕES POR HOST
+# --------------------------------------------------------------------------
+class HostPool:
+    """Conexões keep-alive de um host + intervalo mínimo entre requisições."""
+
+    def __init__(self, scheme: str, netloc: str, size: int, min_interval: float, timeout: float):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.min_interval = min_interval
+
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._rate_lock = threading.Lock()
+        self._next_at = 0.0
+        self.opened = 0  # conexões criadas (para diagnóstico)
+
+    def _new_connection(self):
+        import http.client  # importado só ao verificar links (puxa o ssl)
+
+        self.opened += 1
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.netloc, timeout=self.timeout)
+
+    def _wait_turn(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def request(self, method: str, target: str):
+        """
+        Executa uma requisição; retorna (status, headers). Uma conexão
+        ociosa que o servidor já fechou (fim do keep-alive) é trocada por
+        uma nova, uma vez.
+        """
+        import http.client
+
+        with self._slots:
+            self._wait_turn()
+            try:
+                conn, reused = self._idle.get_nowait(), True
+            except queue.Empty:
+                conn, reused = self._new_connection(), False
+
+            try:
+                return self._send(conn, method, target)
+            except (ConnectionError, http.client.BadStatusLine):
+                if not reused:
+                    raise
+            return self._send(self._new_connection(), method, target)
+
+    def _send(self, conn, method: str, target: str):
+        try:
+            conn.request(method, target, headers={"User-Agent": USER_AGENT})
+            resp = conn.getresponse()
+            if method == "HEAD":
+                resp.read()
+                reuse = not resp.will_close
+            else:
+                # GET: não baixa a página inteira; a conexão é descartada
+                resp.read(1024)
+                reuse = False
+            status, headers = resp.status, resp.headers
+        except Exception:
+            conn.close()
+            raise
+
+        if reuse:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        return status, headers
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# --------------------------------------------------------------------------
+# CACHE + VERIFICADOR
+# --------------------------------------------------------------------------
+class LinkChecker:
+    """Verificação concorrente de links com cache persistente (TTL)."""
+
+    def __init__(
+        self,
+        cache_path: Path,
+        workers: int = 8,
+        per_host: int = 2,
+        min_interval: float = 0.25,
+        timeout: float = 8.0,
+        ttl_hours: Optional[float] = None,
+    ):
+        self.cache_path = Path(cache_path)
+        self.workers = workers
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.ttl = datetime.timedelta(
+            hours=ttl_hours if ttl_hours is not None else _env_float("MEU_EMPREGO_LINK_TTL_HOURS", 24)
+        )
+
+        self._cache: Optional[Dict[str, Dict]] = None
+        self._pools: Dict[str, HostPool] = {}
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    # CACHE
+    # ----------------------------------------------------------------------
+    @property
+    def cache(self) -> Dict[str, Dict]:
+        if self._cache is None:
+            try:
+                with self.cache_path.open("r", encoding="utf-8") as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _save(self):
+        with self._lock:
+            data = dict(self.cache)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = temp_path(self.cache_path)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.cache_path)
+
+    def result(self, url: str) -> Optional[Dict]:
+        return self.cache.get(url)
+
+    def is_stale(self, url: str, now: Optional[datetime.datetime] = None) -> bool:
+        entry = self.cache.get(url)
+        if not entry:
+            return True
+        try:
+            checked = datetime.datetime.fromisoformat(entry["checked_at"])
+        except (KeyError, TypeError, ValueError):
+            return True
+        return (now or datetime.datetime.now()) - checked >= self.ttl
+
+    # ----------------------------------------------------------------------
+    # VERIFICAÇÃO
+    # ----------------------------------------------------------------------
+    def _pool(self, scheme: str, netloc: str) -> HostPool:
+        key = f"{scheme}://{netloc}"
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HostPool(scheme, netloc, self.per_host, self.min_interval, self.timeout)
+                self._pools[key] = pool
+            return pool
+
+    def check(self, url: str) -> Dict:
+        """Verifica um link (sem consultar o cache) e grava o resultado na memória."""
+        status, final_url, erro = None, url, ""
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                parts = urlsplit(current)
+                if parts.scheme not in ("http", "https") or not parts.netloc:
+                    erro = "URL inválida"
+                    break
+
+                target = parts.path or "/"
+                if parts.query:
+                    target += "?" + parts.query
+
+                pool = self._pool(parts.scheme, parts.netloc)
+                status, headers = pool.request("HEAD", target)
+                if status in (405, 501):
+                    status, headers = pool.request("GET", target)
+
+                final_url = current
+                location = headers.get("Location")
+                if status in (301, 302, 303, 307, 308) and location:
+                    current = urljoin(current, location)
+                    continue
+                break
+            else:
+                erro = "redirecionamentos demais"
+        except Exception as e:
+            status, erro = None, str(e) or e.__class__.__name__
+
+        entry = {
+            "status": status,
+            "final_url": final_url,
+            "checked_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "ativa": None if erro else is_active(status),  # ex.: redirecionamentos em ciclo
+            "erro": erro,
+        }
+        with self._lock:
+            self.cache[url] = entry
+        return entry
+
+    def check_many(
+        self,
+        urls: Iterable[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+        force: bool = False,
+    ) -> Dict[str, Dict]:
+        """
+        Verifica em paralelo os links sem resultado ou vencidos (todos com
+        `force`). Retorna {url: resultado} dos verificados nesta rodada.
+        `progress(feitos, total)` é chamado de uma thread do pool.
+        """
+        pending: List[str] = []
+        seen = set()
+        for url in urls:
+            url = (url or "").strip()
+            if url and url not in seen and (force or self.is_stale(url)):
+                seen.add(url)
+                pending.append(url)
+
+        results: Dict[str, Dict] = {}
+        if not pending:
+            return results
+
+        done = 0
+        done_lock = threading.Lock()
+
+        def run(url):
+            nonlocal done
+            res = self.check(url)
+            with done_lock:
+                done += 1
+                results[url] = res
+                if progress:
+                    progress(done, len(pending))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="linkcheck") as ex:
+            list(ex.map(run, pending))
+
+        self._save()
+        return results
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
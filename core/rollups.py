@@ -0,0 +1,253 @@
+"""
+Rollups — contagens pré-agregadas de candidaturas por dia, semana e mês.
+
+A linha do tempo da dashboard não relê os registros: cada inserção soma 1
+no dia da candidatura, e as semanas (começando na segunda) e os meses são
+derivados dos dias e mantidos junto, de forma incremental. Qualquer janela
+(30 dias, 90 dias, 1 ano, tudo) é respondida em tempo proporcional ao
+número de pontos do gráfico, não ao número de registros.
+
+Armazenamento por backend:
+• CSV: `candidaturas.rollups.json` (só os dias; semanas/meses são
+  recalculados ao carregar), reconstruído a partir do CSV se não existir;
+• MongoDB: coleção `rollups`, um documento por período
+  ({"_id": "day:2025-11-02", "g": "day", "p": <datetime>, "n": 3}),
+  atualizado com `$inc` na mesma operação da inserção.
+"""
+
+import datetime
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.dates import parse_date
+from core.filelock import file_stamp, temp_path
+
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+GRANULARITIES = (DAY, WEEK, MONTH)
+
+# Janelas da dashboard: rótulo → (dias, granularidade); None = todo o período
+WINDOWS = {
+    "30 dias": (30, DAY),
+    "90 dias": (90, DAY),
+    "1 ano": (365, WEEK),
+    "Tudo": (None, MONTH),
+}
+DEFAULT_WINDOW = "30 dias"
+
+
+def period_start(d: datetime.date, granularity: str) -> datetime.date:
+    if granularity == WEEK:
+        return d - datetime.timedelta(days=d.weekday())
+    if granularity == MONTH:
+        return d.replace(day=1)
+    return d
+
+
+def next_period(d: datetime.date, granularity: str) -> datetime.date:
+    if granularity == WEEK:
+        return d + datetime.timedelta(days=7)
+    if granularity == MONTH:
+        return (d.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return d + datetime.timedelta(days=1)
+
+
+def periods(start: datetime.date, end: datetime.date, granularity: str) -> Iterable[datetime.date]:
+    p = period_start(start, granularity)
+    while p <= end:
+        yield p
+        p = next_period(p, granularity)
+
+
+def window_range(
+    label: str, bounds: Optional[Tuple[datetime.date, datetime.date]]
+) -> Tuple[Optional[datetime.date], Optional[datetime.date], str]:
+    """
+    Intervalo da janela, terminando na data mais recente com registros
+    (mesmo comportamento do gráfico de 30 dias original).
+    """
+    days, granularity = WINDOWS.get(label, WINDOWS[DEFAULT_WINDOW])
+    if bounds is None:
+        return None, None, granularity
+    first, last = bounds
+    if days is None:
+        return first, last, granularity
+    return last - datetime.timedelta(days=days - 1), last, granularity
+
+
+class Rollups:
+    """Contadores por dia/semana/mês em memória, com persistência em JSON."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.buckets: Dict[str, Counter] = {g: Counter() for g in GRANULARITIES}
+        self._stamp = None
+
+    # ----------------------------------------------------------------------
+    # ATUALIZAÇÃO INCREMENTAL
+    # ----------------------------------------------------------------------
+    def add(self, d: Optional[datetime.date], n: int = 1):
+        if d is None:
+            return
+        for g in GRANULARITIES:
+            key = period_start(d, g)
+            self.buckets[g][key] += n
+            if self.buckets[g][key] <= 0:
+                del self.buckets[g][key]
+
+    def add_rows(self, rows: Iterable[Dict], n: int = 1):
+        for row in rows:
+            self.add(parse_date(row.get("data")), n)
+
+    @classmethod
+    def from_daily(cls, daily: Dict[datetime.date, int], path: Optional[Path] = None) -> "Rollups":
+        """Deriva semanas e meses a partir das contagens diárias."""
+        r = cls(path)
+        for d, n in daily.items():
+            r.add(d, n)
+        return r
+
+    # ----------------------------------------------------------------------
+    # CONSULTA
+    # ----------------------------------------------------------------------
+    def bounds(self) -> Optional[Tuple[datetime.date, datetime.date]]:
+        daily = self.buckets[DAY]
+        if not daily:
+            return None
+        return min(daily), max(daily)
+
+    def series(
+        self, start: datetime.date, end: datetime.date, granularity: str
+    ) -> List[Tuple[datetime.date, int]]:
+        """Um ponto por período do intervalo (zeros incluídos)."""
+        counts = self.buckets[granularity]
+        return [(p, counts.get(p, 0)) for p in periods(start, end, granularity)]
+
+    # ----------------------------------------------------------------------
+    # PERSISTÊNCIA (CSV)
+    # ----------------------------------------------------------------------
+    def exists(self) -> bool:
+        return self.path is not None and self.path.exists()
+
+    def load(self):
+        """Relê o arquivo se outro processo o alterou (ver `file_stamp`)."""
+        stamp = file_stamp(self.path)
+        if stamp is None or stamp == self._stamp:
+            return
+
+        with self.path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        fresh = Rollups.from_daily(
+            {datetime.date.fromisoformat(k): int(v) for k, v in data.get("daily", {}).items()}
+        )
+        self.buckets = fresh.buckets
+        self._stamp = stamp
+
+    def save(self):
+        daily = {d.isoformat(): n for d, n in sorted(self.buckets[DAY].items())}
+        tmp = temp_path(self.path)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"version": 1, "daily": daily}, f)
+        os.replace(tmp, self.path)
+        self._stamp = file_stamp(self.path)
+
+    def rebuild(self, rows: Iterable[Dict]):
+        self.buckets = {g: Counter() for g in GRANULARITIES}
+        self.add_rows(rows)
+        self.save()
+
+
+# --------------------------------------------------------------------------
+# MONGO
+# --------------------------------------------------------------------------
+def mongo_increments(dates: Iterable[Optional[datetime.date]], n: int = 1) -> Dict[str, Dict]:
+    """Agrupa os `$inc` por documento de período (um por dia/semana/mês)."""
+    incs: Dict[str, Dict] = {}
+    for d in dates:
+        if d is None:
+            continue
+        for g in GRANULARITIES:
+            p = period_start(d, g)
+            key = f"{g}:{p.isoformat()}"
+            entry = incs.setdefault(key, {"g": g, "p": p, "n": 0})
+            entry["n"] += n
+    return incs
+
+
+def mongo_apply(collection, dates: Iterable[Optional[datetime.date]], n: int = 1):
+    from pymongo import UpdateOne
+
+    ops = [
+        UpdateOne(
+            {"_id": key},
+            {
+                "$inc": {"n": e["n"]},
+                "$setOnInsert": {
+                    "g": e["g"],
+                    "p": datetime.datetime.combine(e["p"], datetime.time.min),
+                },
+            },
+            upsert=True,
+        )
+        for key, e in mongo_increments(dates, n).items()
+    ]
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+
+
+def mongo_rebuild(db, collections=("candidaturas",)):
+    """
+    Recalcula a coleção `rollups` a partir das candidaturas (agregação no
+    servidor); `collections` soma outras coleções (ex.: as arquivadas).
+    """
+    pipeline = [
+        {"$match": {"data": {"$type": "date"}}},
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$data"}}, "n": {"$sum": 1}}},
+    ]
+    daily: Dict[datetime.date, int] = {}
+    for name in collections:
+        for doc in db[name].aggregate(pipeline):
+            day = datetime.date.fromisoformat(doc["_id"])
+            daily[day] = daily.get(day, 0) + doc["n"]
+    rollups = Rollups.from_daily(daily)
+
+    docs = [
+        {
+            "_id": f"{g}:{p.isoformat()}",
+            "g": g,
+            "p": datetime.datetime.combine(p, datetime.time.min),
+            "n": n,
+        }
+        for g in GRANULARITIES
+        for p, n in rollups.buckets[g].items()
+    ]
+    db["rollups"].delete_many({})
+    if docs:
+        db["rollups"].insert_many(docs)
+    db["rollups"].create_index([("g", 1), ("p", 1)])
+
+
+def mongo_series(
+    collection, start: datetime.date, end: datetime.date, granularity: str
+) -> List[Tuple[datetime.date, int]]:
+    lo = datetime.datetime.combine(period_start(start, granularity), datetime.time.min)
+    hi = datetime.datetime.combine(end, datetime.time.max)
+    counts = {
+        doc["p"].date(): doc["n"]
+        for doc in collection.find({"g": granularity, "p": {"$gte": lo, "$lte": hi}})
+    }
+    return [(p, counts.get(p, 0)) for p in periods(start, end, granularity)]
+
+
+def mongo_bounds(collection) -> Optional[Tuple[datetime.date, datetime.date]]:
+    query = {"g": DAY, "n": {"$gt": 0}}
+    first = collection.find_one(query, sort=[("p", 1)])
+    last = collection.find_one(query, sort=[("p", -1)])
+    if not first or not last:
+        return None
+    return first["p"].date(), last["p"].date()
@@ -0,0 +1,97 @@
+"""
+SnapshotCache — fotografia local dos agregados para abrir sem esperar.
+
+Ao abrir, a Visão Geral e o contador esperavam o Mongo (ou a leitura
+completa do CSV) antes de mostrar qualquer número. Agora, a cada leitura
+completa, o estado das telas vai para um arquivo binário ao lado do CSV
+(`candidaturas.snapshot`, pickle), junto com a marca d'água dos dados:
+
+• CSV   — (inode, tamanho) de cada arquivo de dados e do log de alterações;
+• Mongo — o maior `_id` já contado.
+
+Na partida seguinte a tela desenha direto da fotografia e, em segundo
+plano, lê só os registros posteriores à marca (ver
+`DataStore.records_since`). Quando a marca não vale mais — compactação,
+merge do delta, edições/exclusões pendentes, troca de backend, total que
+não fecha — a tela faz a leitura completa, como antes.
+
+Cada tela serializa o próprio estado (`views`, em bytes): o arquivo pode
+ser lido sem importar matplotlib. É gerado e lido só pela aplicação
+(pickle não é formato de troca); formato diferente ou arquivo corrompido
+valem como "sem fotografia".
+
+Desligar: MEU_EMPREGO_SNAPSHOT=0. Tempo até o primeiro gráfico, com e sem
+a fotografia:
+
+    python -m bench.dashboard 100000
+"""
+
+import datetime
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.filelock import temp_path
+
+
+FORMAT = 1
+
+
+def snapshot_enabled() -> bool:
+    return os.getenv("MEU_EMPREGO_SNAPSHOT", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class SnapshotCache:
+    """
+    Arquivo único com {"format", "saved_at", "watermark", "total", "views"}.
+    Lido uma vez por processo; `save` substitui o arquivo de forma atômica.
+    """
+
+    def __init__(self, path: Path, enabled: Optional[bool] = None):
+        self.path = Path(path)
+        self.enabled = snapshot_enabled() if enabled is None else enabled
+        self._data: Optional[Dict] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if not self._loaded:
+                self._data = self._read()
+                self._loaded = True
+            return self._data
+
+    def _read(self) -> Optional[Dict]:
+        try:
+            with self.path.open("rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # truncado, classe renomeada, versão antiga...
+            print("[SNAPSHOT] Fotografia ignorada:", e)
+            return None
+        if not isinstance(data, dict) or data.get("format") != FORMAT:
+            return None
+        return data
+
+    def save(self, watermark: Dict, total: int, views: Dict[str, bytes]):
+        if not self.enabled:
+            return
+        data = {
+            "format": FORMAT,
+            "saved_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "watermark": watermark,
+            "total": total,
+            "views": dict(views),
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(self.path)
+            with tmp.open("wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+            self._data, self._loaded = data, True
@@ -0,0 +1,380 @@
+"""
+Sincronização MongoDB ↔ CSV por resumos mensais (digests).
+
+O CSV é o backup do Mongo, mas depois de um período em fallback (ou de
+gravações de outras máquinas direto no Mongo) os dois divergem. Comparar
+registro a registro exigiria ler as duas bases inteiras; aqui cada lado
+mantém, por mês da candidatura ("AAAA-MM", ou "sem-data"), um resumo
+independente da ordem:
+
+    (quantidade, Σ metade alta do hash, Σ metade baixa do hash)
+
+com o hash (blake2b, 64 bits) de todos os campos do registro. Inserir soma,
+excluir subtrai, alterar subtrai a versão antiga e soma a nova — o resumo é
+mantido na mesma gravação, como os rollups:
+
+• CSV:   `candidaturas.digests.json`;
+• Mongo: coleção `sync_digests`, um documento por mês, atualizado com `$inc`.
+
+A sincronização compara primeiro os resumos (O(meses)) e só lê dos dois
+lados os meses diferentes. Gravações no CSV que não chegaram ao Mongo (queda,
+circuito aberto) ficam anotadas em `candidaturas.unsynced` e entram sempre
+na comparação, qualquer que seja o resumo. O custo de uma rodada é
+proporcional ao que mudou, não ao total.
+
+Regras de resolução, por id, nos meses lidos:
+• só no CSV   → copiado para o Mongo, a não ser que o Mongo tenha registrado
+                a exclusão (`candidaturas_excluidas`): então sai do CSV;
+• só no Mongo → copiado para o CSV, a não ser que a exclusão tenha sido
+                feita no CSV durante o fallback: então sai do Mongo;
+• nos dois, com campos diferentes → vale o CSV se a última alteração foi
+                feita durante o fallback, senão o Mongo.
+
+Resumos que não batem por outros motivos (gravação interrompida entre os
+dados e o `$inc`, versão antiga do app) só custam a releitura daquele mês,
+que também corrige o resumo.
+
+    python -m core.sync --simular     # relatório, sem gravar
+    python -m core.sync               # aplica
+    python -m core.sync --completo    # recalcula os resumos lendo tudo
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.csvstore import CSV_HEADER, PartitionedCsvStore
+from core.filelock import file_stamp, temp_path
+
+
+DIGESTS = "sync_digests"
+TOMBSTONES = "candidaturas_excluidas"
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+_MASK32 = 0xFFFFFFFF
+
+Digest = Tuple[int, int, int]
+
+
+# --------------------------------------------------------------------------
+# RESUMOS
+# --------------------------------------------------------------------------
+def record_hash(row: Dict) -> int:
+    """Hash de 64 bits de todos os campos (linha no formato do CSV)."""
+    data = "\x1f".join(str(row.get(f) or "") for f in CSV_HEADER)
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def bucket_of(row: Dict) -> str:
+    """Mês da candidatura ("AAAA-MM") ou "sem-data" — o mesmo do CSV particionado."""
+    return PartitionedCsvStore.partition_key(row)
+
+
+def increments(added: Iterable[Dict] = (), removed: Iterable[Dict] = ()) -> Dict[str, List[int]]:
+    """Variação dos resumos por mês ao incluir `added` e retirar `removed`."""
+    incs: Dict[str, List[int]] = {}
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            h = record_hash(row)
+            e = incs.setdefault(bucket_of(row), [0, 0, 0])
+            e[0] += sign
+            e[1] += sign * (h >> 32)
+            e[2] += sign * (h & _MASK32)
+    return {k: e for k, e in incs.items() if any(e)}
+
+
+def digests_of(rows: Iterable[Dict]) -> Dict[str, Digest]:
+    return {k: tuple(e) for k, e in increments(rows).items() if e[0]}
+
+
+class BucketDigests:
+    """Resumos do CSV em memória, persistidos em JSON (mesmo padrão dos rollups)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.buckets: Dict[str, Digest] = {}
+        self._stamp = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self):
+        """Relê o arquivo se outro processo o alterou (ver `file_stamp`)."""
+        stamp = file_stamp(self.path)
+        if stamp is None or stamp == self._stamp:
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.buckets = {k: tuple(v) for k, v in data.get("buckets", {}).items()}
+        self._stamp = stamp
+
+    def save(self):
+        tmp = temp_path(self.path)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"version": 1, "buckets": dict(sorted(self.buckets.items()))}, f)
+        os.replace(tmp, self.path)
+        self._stamp = file_stamp(self.path)
+
+    def apply(self, incs: Dict[str, List[int]]):
+        for key, (n, a, b) in incs.items():
+            old = self.buckets.get(key, (0, 0, 0))
+            self.set(key, (old[0] + n, old[1] + a, old[2] + b))
+
+    def set(self, key: str, digest: Optional[Digest]):
+        if digest and digest[0]:
+            self.buckets[key] = tuple(digest)
+        else:
+            self.buckets.pop(key, None)
+
+    def rebuild(self, rows: Iterable[Dict]):
+        self.buckets = digests_of(rows)
+        self.save()
+
+
+# --------------------------------------------------------------------------
+# MONGO
+# --------------------------------------------------------------------------
+def mongo_apply(collection, incs: Dict[str, List[int]]):
+    from pymongo import UpdateOne
+
+    ops = [
+        UpdateOne({"_id": key}, {"$inc": {"n": n, "a": a, "b": b}}, upsert=True)
+        for key, (n, a, b) in incs.items()
+    ]
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+
+
+def mongo_digests(collection) -> Dict[str, Digest]:
+    return {
+        doc["_id"]: (int(doc.get("n", 0)), int(doc.get("a", 0)), int(doc.get("b", 0)))
+        for doc in collection.find({"n": {"$ne": 0}})
+    }
+
+
+def mongo_set(collection, digests: Dict[str, Optional[Digest]]):
+    """Grava o resumo recalculado de cada mês (None/vazio = mês sem registros)."""
+    from pymongo import DeleteOne, ReplaceOne
+
+    ops = [
+        ReplaceOne({"_id": key}, {"n": d[0], "a": d[1], "b": d[2]}, upsert=True)
+        if d and d[0] else DeleteOne({"_id": key})
+        for key, d in digests.items()
+    ]
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+
+
+# --------------------------------------------------------------------------
+# GRAVAÇÕES PENDENTES (FALLBACK)
+# --------------------------------------------------------------------------
+class SyncJournal:
+    """
+    Ids gravados no CSV sem chegar ao Mongo, com os meses afetados (JSON
+    Lines, só-anexação): {"op": "upsert"|"delete", "id": "...", "meses": [...]}.
+    A última linha de cada id vence; a sincronização regrava o arquivo sem
+    os ids resolvidos.
+    """
+
+    def __init__(self, path: Path, file_lock=None):
+        self.path = Path(path)
+        self.file_lock = file_lock
+        self._lock = threading.Lock()
+
+    def append(self, op: str, entries: Iterable[Tuple[str, Iterable[str]]]):
+        data = "".join(
+            json.dumps({"op": op, "id": rid, "meses": sorted(set(buckets))}, ensure_ascii=False) + "\n"
+            for rid, buckets in entries
+        ).encode("utf-8")
+        if not data:
+            return
+        shared = self.file_lock.shared() if self.file_lock is not None else nullcontext()
+        with shared, self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab", buffering=0) as f:
+                f.write(data)
+
+    def pending(self) -> Dict[str, Dict]:
+        """id → última entrada."""
+        out: Dict[str, Dict] = {}
+        try:
+            with self.path.open("rb") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # linha incompleta
+                    if isinstance(rec, dict) and rec.get("id"):
+                        out[rec["id"]] = rec
+        except OSError:
+            pass
+        return out
+
+    def resolve(self, done: Dict[str, Dict]):
+        """Retira as entradas resolvidas (as reescritas depois continuam)."""
+        exclusive = self.file_lock.exclusive() if self.file_lock is not None else nullcontext()
+        with exclusive, self._lock:
+            remaining = [
+                rec for rid, rec in self.pending().items()
+                if done.get(rid) != rec
+            ]
+            tmp = temp_path(self.path)
+            with tmp.open("w", encoding="utf-8") as f:
+                for rec in remaining:
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self.pending())
+
+
+# --------------------------------------------------------------------------
+# PLANO / RELATÓRIO
+# --------------------------------------------------------------------------
+@dataclass
+class SyncReport:
+    meses_comparados: int = 0
+    meses_diferentes: List[str] = field(default_factory=list)
+    pendentes: int = 0
+    lidos_csv: int = 0
+    lidos_mongo: int = 0
+
+    # CSV → Mongo
+    inserir_mongo: List[Dict] = field(default_factory=list)
+    atualizar_mongo: List[Tuple[Dict, Dict]] = field(default_factory=list)  # (antes, depois)
+    excluir_mongo: List[Dict] = field(default_factory=list)
+    # Mongo → CSV
+    inserir_csv: List[Dict] = field(default_factory=list)
+    atualizar_csv: List[Tuple[Dict, Dict]] = field(default_factory=list)
+    excluir_csv: List[Dict] = field(default_factory=list)
+
+    conflitos: int = 0  # chave duplicada (mesma vaga com ids diferentes)
+    aplicado: bool = False
+    segundos: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(map(len, (
+            self.inserir_mongo, self.atualizar_mongo, self.excluir_mongo,
+            self.inserir_csv, self.atualizar_csv, self.excluir_csv,
+        )))
+
+    def resumo(self, detalhes: int = 10) -> str:
+        linhas = [
+            f"Meses comparados:  {self.meses_comparados:,}",
+            f"Meses diferentes:  {len(self.meses_diferentes):,}"
+            + (f" ({', '.join(self.meses_diferentes[:12])}{'...' if len(self.meses_diferentes) > 12 else ''})"
+               if self.meses_diferentes else ""),
+            f"Pendências do fallback: {self.pendentes:,}",
+            f"Registros lidos:   {self.lidos_csv:,} no CSV, {self.lidos_mongo:,} no Mongo",
+        ]
+        acoes = [
+            ("CSV → Mongo, incluir", self.inserir_mongo),
+            ("CSV → Mongo, alterar", [new for _, new in self.atualizar_mongo]),
+            ("CSV → Mongo, excluir", self.excluir_mongo),
+            ("Mongo → CSV, incluir", self.inserir_csv),
+            ("Mongo → CSV, alterar", [new for _, new in self.atualizar_csv]),
+            ("Mongo → CSV, excluir", self.excluir_csv),
+        ]
+        for titulo, rows in acoes:
+            linhas.append(f"{titulo + ':':22} {len(rows):,}")
+            for row in rows[:detalhes]:
+                linhas.append(
+                    f"    {row.get('data', ''):10}  {row.get('empresa', '')[:24]:24}  "
+                    f"{row.get('cargo', '')[:24]:24}  {row.get('id', '')}"
+                )
+            if len(rows) > detalhes:
+                linhas.append(f"    ... e mais {len(rows) - detalhes:,}")
+        if self.conflitos:
+            linhas.append(f"Conflitos de chave: {self.conflitos:,} (mesma vaga com ids diferentes)")
+        if not self.total:
+            linhas.append("Nada a sincronizar.")
+        elif not self.aplicado:
+            linhas.append("Simulação: nada foi gravado.")
+        linhas.append(f"Tempo: {self.segundos:.2f}s")
+        return "\n".join(linhas)
+
+
+def _same(a: Dict, b: Dict) -> bool:
+    return all((a.get(f) or "") == (b.get(f) or "") for f in CSV_HEADER)
+
+
+def plan(
+    report: SyncReport,
+    csv_rows: Dict[str, Dict],
+    mongo_rows: Dict[str, Dict],
+    pending: Dict[str, Dict],
+    tombstones: Set[str],
+):
+    """Preenche as ações do relatório (regras no topo do módulo)."""
+    for rid, row in csv_rows.items():
+        other = mongo_rows.get(rid)
+        if other is None:
+            if rid in tombstones and rid not in pending:
+                report.excluir_csv.append(row)
+            else:
+                report.inserir_mongo.append(row)
+        elif not _same(row, other):
+            if rid in pending:
+                report.atualizar_mongo.append((other, row))
+            else:
+                report.atualizar_csv.append((row, other))
+
+    for rid, row in mongo_rows.items():
+        if rid in csv_rows:
+            continue
+        if pending.get(rid, {}).get("op") == DELETE:
+            report.excluir_mongo.append(row)
+        else:
+            report.inserir_csv.append(row)
+
+
+# --------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------
+def main(argv=None):
+    from dotenv import load_dotenv
+
+    load_dotenv(".env")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m core.sync",
+        description="Compara o MongoDB com o CSV (backup) por resumos mensais e copia só o que difere.",
+    )
+    parser.add_argument("--simular", action="store_true", help="só o relatório, sem gravar")
+    parser.add_argument("--completo", action="store_true",
+                        help="recalcula os resumos dos dois lados lendo todos os registros")
+    parser.add_argument("--detalhes", type=int, default=10, help="registros listados por ação")
+    args = parser.parse_args(argv)
+
+    from core.datastore import DataStore
+
+    datastore = DataStore(
+        mongo_uri=os.environ.get("MEU_EMPREGO_MONGO_URI", ""),
+        db_name=os.environ.get("MEU_EMPREGO_DB_NAME", "meu_emprego"),
+    )
+    try:
+        report = datastore.sync_stores(dry_run=args.simular, full=args.completo)
+    except Exception as e:
+        print(f"Falha ao sincronizar: {e}")
+        return 1
+    finally:
+        datastore.close()
+
+    if report is None:
+        print("MongoDB indisponível: nada a comparar.")
+        return 1
+    print(report.resumo(args.detalhes))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
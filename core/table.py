@@ -0,0 +1,366 @@
+"""
+CandidaturaTable — armazenamento colunar e compacto das candidaturas em memória.
+
+Em vez de uma lista de dicts (7 chaves por registro), cada campo vira uma
+coluna:
+
+• status / tipo  → `array('h')` de códigos (int16, alargado para int32 se
+                   o vocabulário passar de 32767 valores) + vocabulário
+                   (dictionary encoding)
+• data           → `array('q')` com o dia em segundos desde 1970-01-01
+                   (sempre múltiplo de 86400); registros sem data usam o
+                   sentinela NaT do numpy
+• empresa, cargo, link → listas de str com strings internadas
+                   (valores repetidos compartilham o mesmo objeto)
+• observacoes    → só a prévia (PREVIEW_CHARS caracteres + "…"): o texto
+                   completo costuma ser a descrição inteira da vaga e é
+                   lido sob demanda (`DataStore.get_observacoes`, com
+                   cache LRU — `TextCache`)
+• id             → lista de str (identificador usado para alterar/excluir)
+
+`to_pandas()` expõe as colunas numéricas ao pandas sem cópia (views sobre os
+buffers dos arrays, no mesmo layout de datetime64[s] e dos códigos inteiros
+de um `Categorical`).
+
+Benchmark de memória (lista de dicts × tabela):
+
+    python -m bench.table 1000000
+"""
+
+import datetime
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from core.dates import format_br, parse_br_date
+
+
+# Dia 0 da coluna de datas (mesma origem do datetime64 do numpy)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+DAY_SECONDS = 86400
+
+# Sentinela para "sem data" (= NaT quando visto como datetime64)
+NO_DATE = -(2 ** 63)
+
+STRING_FIELDS = ("empresa", "cargo", "observacoes", "link", "id")
+CATEGORY_FIELDS = ("tipo", "status")
+
+# Códigos das colunas categóricas: tipo do array → (maior código, próximo tipo)
+CODE_TYPES = {"h": (2 ** 15 - 1, "i"), "i": (2 ** 31 - 1, None)}
+
+# Prévia das observações mantida na tabela
+PREVIEW_CHARS = 120
+ELLIPSIS = "…"
+
+
+def date_to_day(value: str) -> int:
+    """'DD-MM-YYYY' → segundos desde 1970-01-01 à meia-noite (NO_DATE se inválida)."""
+    d = parse_br_date(value)
+    if d is None:
+        return NO_DATE
+    return (d.toordinal() - EPOCH_ORDINAL) * DAY_SECONDS
+
+
+def _desc_key(day: int) -> int:
+    """Chave de ordenação da coluna `data` em ordem decrescente (sem data no fim)."""
+    return -day if day != NO_DATE else 2 ** 63
+
+
+def preview(text: Optional[str]) -> str:
+    """Início do texto (PREVIEW_CHARS caracteres) + "…" quando foi cortado."""
+    text = text or ""
+    if len(text) <= PREVIEW_CHARS:
+        return text
+    return text[:PREVIEW_CHARS] + ELLIPSIS
+
+
+def is_preview(text: Optional[str]) -> bool:
+    """True se `text` é uma prévia cortada (o texto completo é maior)."""
+    return bool(text) and len(text) == PREVIEW_CHARS + 1 and text.endswith(ELLIPSIS)
+
+
+def day_to_date(day: int) -> Optional[datetime.date]:
+    if day == NO_DATE:
+        return None
+    return datetime.date.fromordinal(day // DAY_SECONDS + EPOCH_ORDINAL)
+
+
+def day_to_str(day: int) -> str:
+    return format_br(day_to_date(day))
+
+
+class Vocabulary:
+    """Dicionário valor ↔ código inteiro pequeno (status, tipo...)."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Sequence[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for v in values:
+            self.encode(v)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class TextCache:
+    """LRU pequeno id → texto completo (observações lidas sob demanda)."""
+
+    def __init__(self, size: int = 64):
+        self.size = size
+        self._items: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._items.get(key)
+            if text is not None:
+                self._items.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        if not key:
+            return
+        with self._lock:
+            self._items[key] = text
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def discard(self, key: str):
+        with self._lock:
+            self._items.pop(key, None)
+
+
+class CandidaturaTable:
+    """
+    Tabela colunar de candidaturas.
+
+    Métodos principais:
+    • from_rows(rows) / append(row) / insert(i, row)
+    • row(i) / iteração → dict no formato do DataStore
+    • status_counts() / day_counts() → agregações direto nos códigos
+    • to_pandas(columns) → DataFrame sem cópia das colunas numéricas
+    """
+
+    __slots__ = (
+        "empresa",
+        "cargo",
+        "observacoes",
+        "link",
+        "id",
+        "data",
+        "tipo",
+        "status",
+        "vocab",
+        "_interned",
+    )
+
+    def __init__(self):
+        self.empresa: List[str] = []
+        self.cargo: List[str] = []
+        self.observacoes: List[str] = []
+        self.link: List[str] = []
+        self.id: List[str] = []
+        self.data = array("q")
+        self.tipo = array("h")
+        self.status = array("h")
+
+        # vocabulários iniciados com os valores conhecidos da UI
+        self.vocab = {
+            "status": Vocabulary(["", "Inscrito", "Entrevista", "Rejeitado", "Contratado"]),
+            "tipo": Vocabulary(["", "Presencial", "Remoto", "Híbrido"]),
+        }
+        self._interned: Dict[str, str] = {}
+
+    # ----------------------------------------------------------------------
+    # CONSTRUÇÃO
+    # ----------------------------------------------------------------------
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "CandidaturaTable":
+        table = cls()
+        table.extend(rows)
+        return table
+
+    def _intern(self, value) -> str:
+        value = value or ""
+        return self._interned.setdefault(value, value)
+
+    def _code(self, col: str, value) -> int:
+        """Código de `value` na coluna categórica `col`, alargando o array se preciso."""
+        code = self.vocab[col].encode(value or "")
+        codes = getattr(self, col)
+        limit, wider = CODE_TYPES[codes.typecode]
+        if code > limit:
+            setattr(self, col, array(wider, codes))
+        return code
+
+    def append(self, row: Dict):
+        self.empresa.append(self._intern(row.get("empresa")))
+        self.cargo.append(self._intern(row.get("cargo")))
+        self.observacoes.append(preview(row.get("observacoes")))
+        self.link.append(row.get("link") or "")
+        self.id.append(row.get("id") or "")
+        self.data.append(date_to_day(row.get("data") or ""))
+        tipo, status = self._code("tipo", row.get("tipo")), self._code("status", row.get("status"))
+        self.tipo.append(tipo)
+        self.status.append(status)
+
+    def extend(self, rows: Iterable[Dict]):
+        for row in rows:
+            self.append(row)
+
+    def insert(self, i: int, row: Dict):
+        self.empresa.insert(i, self._intern(row.get("empresa")))
+        self.cargo.insert(i, self._intern(row.get("cargo")))
+        self.observacoes.insert(i, preview(row.get("observacoes")))
+        self.link.insert(i, row.get("link") or "")
+        self.id.insert(i, row.get("id") or "")
+        self.data.insert(i, date_to_day(row.get("data") or ""))
+        tipo, status = self._code("tipo", row.get("tipo")), self._code("status", row.get("status"))
+        self.tipo.insert(i, tipo)
+        self.status.insert(i, status)
+
+    def insort_desc(self, row: Dict) -> int:
+        """
+        Insere mantendo a ordem por data decrescente (sem data no fim).
+        Retorna a posição usada.
+        """
+        pos = bisect_right(self.data, _desc_key(date_to_day(row.get("data") or "")), key=_desc_key)
+        self.insert(pos, row)
+        return pos
+
+    # ----------------------------------------------------------------------
+    # ACESSO
+    # ----------------------------------------------------------------------
+    def __len__(self):
+        return len(self.data)
+
+    def row(self, i: int) -> Dict:
+        return {
+            "empresa": self.empresa[i],
+            "cargo": self.cargo[i],
+            "data": day_to_str(self.data[i]),
+            "tipo": self.vocab["tipo"].decode(self.tipo[i]),
+            "status": self.vocab["status"].decode(self.status[i]),
+            "observacoes": self.observacoes[i],
+            "link": self.link[i],
+            "id": self.id[i],
+        }
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> List[Dict]:
+        """Materializa apenas a fatia pedida (ex.: a página da tabela)."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [self.row(i) for i in range(start, stop)]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def index_of(self, record_id: str, data: Optional[str] = None) -> int:
+        """
+        Posição do registro com esse id (-1 se ausente). Com `data`
+        (DD-MM-YYYY, tabela em ordem decrescente), procura só entre os
+        registros daquele dia (bisect); sem ela, ou se não estiver lá,
+        busca linear.
+        """
+        if data is not None:
+            key = _desc_key(date_to_day(data))
+            lo = bisect_left(self.data, key, key=_desc_key)
+            hi = bisect_right(self.data, key, lo=lo, key=_desc_key)
+            for i in range(lo, hi):
+                if self.id[i] == record_id:
+                    return i
+        try:
+            return self.id.index(record_id)
+        except ValueError:
+            return -1
+
+    def delete(self, i: int):
+        for col in STRING_FIELDS:
+            del getattr(self, col)[i]
+        for col in ("data", "tipo", "status"):
+            del getattr(self, col)[i]
+
+    # ----------------------------------------------------------------------
+    # AGREGAÇÕES
+    # ----------------------------------------------------------------------
+    def status_counts(self) -> Dict[str, int]:
+        counts = [0] * len(self.vocab["status"])
+        for code in self.status:
+            counts[code] += 1
+        return {
+            self.vocab["status"].decode(code): n
+            for code, n in enumerate(counts)
+            if n
+        }
+
+    def day_counts(self) -> Dict[datetime.date, int]:
+        counts: Dict[int, int] = {}
+        for day in self.data:
+            if day != NO_DATE:
+                counts[day] = counts.get(day, 0) + 1
+        return {day_to_date(d): n for d, n in counts.items()}
+
+    # ----------------------------------------------------------------------
+    # PANDAS
+    # ----------------------------------------------------------------------
+    def to_pandas(self, columns: Optional[Sequence[str]] = None):
+        """
+        DataFrame com as colunas pedidas.
+
+        `data` é uma view datetime64[s] sobre o buffer do array (sem cópia) e
+        `status`/`tipo` são Categorical sobre os próprios códigos. Colunas de
+        texto são convertidas para object (essas exigem cópia).
+
+        Enquanto o DataFrame existir, os arrays ficam "exportados" e não
+        podem crescer (BufferError): use-o para leitura e descarte.
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns = list(columns or ("empresa", "cargo", "data", "tipo", "status", "observacoes", "link"))
+        out = {}
+        for col in columns:
+            if col == "data":
+                out[col] = np.frombuffer(self.data, dtype="datetime64[s]")
+            elif col in CATEGORY_FIELDS:
+                arr = getattr(self, col)
+                codes = np.frombuffer(arr, dtype=arr.typecode)
+                out[col] = pd.Categorical.from_codes(
+                    codes, categories=list(self.vocab[col].values), validate=False
+                )
+            else:
+                out[col] = getattr(self, col)
+        return pd.DataFrame(out, copy=False)
+
+    # ----------------------------------------------------------------------
+    # MEMÓRIA
+    # ----------------------------------------------------------------------
+    def nbytes(self) -> int:
+        """Estimativa do tamanho em memória (buffers + listas + strings únicas)."""
+        total = sum(sys.getsizeof(getattr(self, c)) for c in ("data", "tipo", "status"))
+        for col in STRING_FIELDS:
+            values = getattr(self, col)
+            total += sys.getsizeof(values)
+            seen = set()
+            for v in values:
+                if id(v) not in seen:
+                    seen.add(id(v))
+                    total += sys.getsizeof(v)
+        return total
@@ -0,0 +1,16 @@
+"""Testes do núcleo (pytest; só o CSV — sem Mongo)."""
+
+
+def candidatura(**fields):
+    """Documento de candidatura completo; `fields` sobrescreve os campos."""
+    doc = {
+        "empresa": "ACME",
+        "cargo": "Dev Python",
+        "link": "https://acme.example/vagas/1",
+        "data": "2024-03-10",
+        "tipo": "Remoto",
+        "status": "Inscrito",
+        "observacoes": "",
+    }
+    doc.update(fields)
+    return doc
@@ -0,0 +1,58 @@
+"""Fixtures dos testes: DataStore num diretório temporário, só com o CSV ou com o mongomock."""
+
+import pytest
+
+from core import connection
+from core.datastore import DataStore
+
+
+@pytest.fixture(params=["single", "partitioned"])
+def csv_env(request, tmp_path, monkeypatch):
+    """Ambiente de um DataStore sem Mongo, nos dois layouts do CSV."""
+    monkeypatch.setenv("MEU_EMPREGO_MONGO_URI", "")
+    monkeypatch.setenv("MEU_EMPREGO_ARCHIVE_DAYS", "0")
+    monkeypatch.setenv("CANDIDATURAS_CSV_LAYOUT", request.param)
+    monkeypatch.setenv("CANDIDATURAS_CSV_PATH", str(tmp_path / "candidaturas.csv"))
+    monkeypatch.setenv("CANDIDATURAS_CSV_DIR", str(tmp_path / "candidaturas"))
+    return tmp_path
+
+
+@pytest.fixture
+def store(csv_env):
+    ds = DataStore()
+    yield ds
+    ds.close()
+
+
+
+def _without_sort(method):
+    # o pymongo atual passa `sort` às operações em lote; o mongomock ainda não conhece
+    def wrapper(self, *args, **kwargs):
+        kwargs.pop("sort", None)
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+@pytest.fixture
+def client(csv_env, monkeypatch):
+    """Cliente mongomock no lugar do MongoClient (pula o teste sem o mongomock)."""
+    mongomock = pytest.importorskip("mongomock")
+    from mongomock.collection import BulkOperationBuilder
+
+    for name in ("add_update", "add_replace", "add_delete"):
+        if hasattr(BulkOperationBuilder, name):
+            monkeypatch.setattr(BulkOperationBuilder, name, _without_sort(getattr(BulkOperationBuilder, name)))
+
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(connection, "_mongo_client_class", lambda: (lambda *a, **k: client))
+    monkeypatch.setenv("MEU_EMPREGO_MONGO_URI", "mongodb://teste")
+    monkeypatch.setenv("MEU_EMPREGO_SYNC", "0")  # só a sincronização chamada pelo teste
+    return client
+
+
+@pytest.fixture
+def mongo_store(client):
+    ds = DataStore(db_name="teste")
+    assert ds.use_mongo
+    yield ds
+    ds.close()
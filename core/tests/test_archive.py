@@ -0,0 +1,113 @@
+"""Arquivamento: opcional, prazo do status final e ida e volta pelo nível frio."""
+
+import datetime
+
+import pytest
+
+from core.datastore import DataStore
+from core.tests import candidatura
+
+TODAY = datetime.date.today()
+
+
+def _days_ago(n):
+    return (TODAY - datetime.timedelta(days=n)).isoformat()
+
+
+@pytest.fixture
+def archiving(csv_env, monkeypatch):
+    monkeypatch.setenv("MEU_EMPREGO_ARCHIVE_DAYS", "180")
+    ds = DataStore()
+    if ds._archiver is not None:
+        ds._archiver.join()  # rodada diária da abertura (base vazia)
+    yield ds
+    ds.close()
+
+
+def _ids(store, include_archived=False):
+    return {r["id"] for r in store.iter_candidaturas(include_archived=include_archived)}
+
+
+def test_disabled_by_default(csv_env, monkeypatch):
+    monkeypatch.delenv("MEU_EMPREGO_ARCHIVE_DAYS")
+    ds = DataStore()
+    try:
+        assert not ds.archive_policy.enabled and ds._archiver is None
+        ds.insert_candidatura(candidatura(data="2015-01-01"))
+        assert ds.archive_old() == {"ok": True, "mongo": 0, "csv": 0}
+    finally:
+        ds.close()
+
+
+def test_round_trip(archiving):
+    old = archiving.insert_candidatura(candidatura(data=_days_ago(400)))["id"]
+    new = archiving.insert_candidatura(candidatura(cargo="Dev Go", data=_days_ago(5)))["id"]
+
+    assert archiving.archive_old()["csv"] == 1
+    assert _ids(archiving) == {new}
+    assert _ids(archiving, include_archived=True) == {old, new}
+    assert archiving.count_candidaturas(include_archived=True) == 2
+
+    # alteração de um arquivado: log do CSV, regravado no frio na compactação
+    archiving.update_candidatura(old, {"status": "Entrevista"})
+    archiving.compact_csv()
+    (row,) = [r for r in archiving.iter_candidaturas(include_archived=True) if r["id"] == old]
+    assert row["status"] == "Entrevista"
+    assert _ids(archiving) == {new}
+
+
+def test_status_days_count_from_status_change(archiving):
+    # inscrita já como Rejeitado há 60 dias: o status é tão antigo quanto ela
+    stale = archiving.insert_candidatura(candidatura(data=_days_ago(60), status="Rejeitado"))["id"]
+    # rejeitada hoje, para uma candidatura de 60 dias atrás: fica no quente
+    fresh = archiving.insert_candidatura(candidatura(cargo="Dev Go", data=_days_ago(60)))["id"]
+    archiving.update_candidatura(fresh, {"status": "Rejeitado"})
+
+    assert archiving.archive_old()["csv"] == 1
+    assert _ids(archiving) == {fresh}
+    assert stale in _ids(archiving, include_archived=True)
+
+
+def test_archived_key_still_duplicate(archiving):
+    doc = candidatura(data=_days_ago(400))
+    old = archiving.insert_candidatura(doc)["id"]
+    assert archiving.archive_old()["csv"] == 1
+
+    res = archiving.insert_candidatura(doc)
+    assert res["duplicate"] and res["id"] == old
+    assert archiving.insert_many([doc])["duplicates"] == 1
+
+    # índice refeito do zero (arquivo apagado): as arquivadas entram de novo
+    archiving.csv_keys.path.unlink()
+    reopened = DataStore()
+    try:
+        assert reopened.find_duplicate(doc)
+    finally:
+        reopened.close()
+
+    # excluída a arquivada, a vaga pode voltar
+    archiving.delete_candidatura(old)
+    archiving.compact_csv()
+    assert archiving.insert_candidatura(doc)["ok"]
+
+
+@pytest.fixture
+def mongo_archiving(client, monkeypatch):
+    monkeypatch.setenv("MEU_EMPREGO_ARCHIVE_DAYS", "180")
+    ds = DataStore(db_name="teste")
+    if ds._archiver is not None:
+        ds._archiver.join()
+    yield ds
+    ds.close()
+
+
+def test_archived_key_still_duplicate_in_mongo(client, mongo_archiving):
+    doc = candidatura(data=_days_ago(400))
+    old = mongo_archiving.insert_candidatura(doc)["id"]
+    assert mongo_archiving.archive_old() == {"ok": True, "mongo": 1, "csv": 1}
+
+    # o CSV não sabe da vaga: só a coleção de arquivadas a conhece
+    mongo_archiving.csv_keys.rebuild([])
+    res = mongo_archiving.insert_candidatura(doc)
+    assert res["duplicate"] and res["id"] == old
+    assert client["teste"]["candidaturas"].count_documents({}) == 0
@@ -0,0 +1,61 @@
+"""Autocompletar: trie de prefixos e o arquivo só-anexação compartilhado."""
+
+from core.autocomplete import Autocomplete, PrefixTrie
+
+
+def test_trie_prefixes():
+    trie = PrefixTrie(k=3)
+    for value, n in [("Banco do Brasil", 5), ("Bancoxyz", 2), ("banco  inter", 3), ("Bradesco", 1), ("Ácme", 4)]:
+        trie.add(value, n)
+    trie.add("BANCO DO BRASIL")  # mesma chave: conta, mas mantém a 1ª grafia
+
+    assert trie.suggest("ban") == ["Banco do Brasil", "banco inter", "Bancoxyz"]
+    assert trie.suggest("Banco ") == ["Banco do Brasil", "banco inter"]
+    assert trie.suggest("banco   d") == ["Banco do Brasil"]
+    assert trie.suggest("b", limit=1) == ["Banco do Brasil"]
+    assert trie.suggest("ACME") == ["Ácme"]
+    assert trie.suggest("bx") == trie.suggest("   ") == []
+    assert trie.counts["banco do brasil"] == 6
+
+
+def _lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_file_compaction(tmp_path):
+    path = tmp_path / "candidaturas.suggest"
+    first = Autocomplete(path)
+    first.load(lambda: [{"empresa": "Acme", "cargo": "Dev"}])
+    assert len(_lines(path)) == 2
+
+    first.add_rows([{"empresa": "Acme", "cargo": f"Dev {i % 3}"} for i in range(1200)])
+    assert len(_lines(path)) == 2 + 2 * 1200
+
+    # a próxima abertura compacta: uma linha por valor, com a contagem
+    again = Autocomplete(path)
+    again.load(lambda: [])
+    assert sorted(_lines(path)) == sorted([
+        "empresa\t1201\tAcme", "cargo\t1\tDev", "cargo\t400\tDev 0", "cargo\t400\tDev 1", "cargo\t400\tDev 2",
+    ])
+    assert again.suggest("empresa", "ac") == ["Acme"]
+    assert again.suggest("cargo", "dev ") == ["Dev 0", "Dev 1", "Dev 2"]
+
+
+def test_catch_up_after_other_instance_writes(tmp_path):
+    path = tmp_path / "candidaturas.suggest"
+    a, b = Autocomplete(path), Autocomplete(path)
+    a.load(lambda: [{"empresa": "Acme", "cargo": "Dev"}])
+    b.load(lambda: [])
+
+    a.add_rows([{"empresa": "Globex", "cargo": "QA"}] * 2)
+    assert b.suggest("empresa", "g") == ["Globex"]
+    assert b.tries["empresa"].counts["globex"] == 2
+
+    # outra instância compacta (troca o arquivo): b relê do início
+    c = Autocomplete(path)
+    c.load(lambda: [])
+    c.add_rows([{"empresa": "Initech"}])
+    c._write()
+    assert len(_lines(path)) == 5
+    assert b.suggest("empresa", "i") == ["Initech"]
+    assert b.tries["empresa"].counts == {"acme": 1, "globex": 2, "initech": 1}
@@ -0,0 +1,49 @@
+"""ChangeFeed do CSV: só os bytes novos, registros completos, eventos de outra instância."""
+
+from core.changefeed import ChangeFeed, CsvTailWatcher
+from core.csvstore import CSV_HEADER
+from core.datastore import DataStore
+from core.events import DELETED, INSERTED, RESET, UPDATED
+from core.tests import candidatura
+
+
+def test_events_from_another_instance(store):
+    feed = ChangeFeed(store)
+    other = DataStore()
+    try:
+        rid = other.insert_candidatura(candidatura())["id"]
+        events = feed._csv_check()
+        assert [(ev.kind, ev.record["id"], ev.record["empresa"]) for ev in events] == [(INSERTED, rid, "ACME")]
+        assert feed._csv_check() == []  # nada novo: nada relido
+
+        other.update_candidatura(rid, {"status": "Entrevista"})
+        other.delete_candidatura(rid)
+        events = feed._csv_check()
+        assert [(ev.kind, ev.record["id"]) for ev in events] == [(UPDATED, rid), (DELETED, rid)]
+        assert events[0].record["status"] == "Entrevista"
+    finally:
+        other.close()
+
+
+def test_tail_waits_for_complete_record_and_resets(tmp_path):
+    path = tmp_path / "candidaturas.csv"
+    header = ",".join(CSV_HEADER) + "\n"
+    path.write_text(header, encoding="utf-8")
+    watcher = CsvTailWatcher(path)
+
+    row = dict.fromkeys(CSV_HEADER, "")
+    row.update(id="1", empresa="ACME", observacoes='"linha 1\nlinha 2"')
+    line = ",".join(row[f] for f in CSV_HEADER) + "\n"
+    cut = line.index("linha 2")  # quebra de linha dentro das aspas
+    with path.open("a", encoding="utf-8") as f:
+        f.write(line[:cut])
+    assert watcher.check() == []
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write(line[cut:])
+    (ev,) = watcher.check()
+    assert (ev.kind, ev.record["id"], ev.record["observacoes"]) == (INSERTED, "1", "linha 1\nlinha 2")
+
+    path.write_text(header, encoding="utf-8")  # reescrito (ex.: compactação)
+    assert [ev.kind for ev in watcher.check()] == [RESET]
+    assert watcher.check() == []
@@ -0,0 +1,44 @@
+"""`python -m meu_emprego`: recusa e mescla de duplicatas no add; stats sem o pyarrow."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import meu_emprego
+
+ADD = ["add", "--empresa", "ACME", "--cargo", "Dev Python", "--link", "https://acme.example/vagas/1"]
+
+
+def test_add_duplicate_reports_existing_id(csv_env, capsys):
+    assert meu_emprego.main(ADD) == 0
+    rid = capsys.readouterr().out.split()[0]
+
+    assert meu_emprego.main(ADD) == 1
+    assert rid in capsys.readouterr().err
+
+
+def test_add_merge(csv_env, capsys):
+    meu_emprego.main(ADD)
+    rid = capsys.readouterr().out.split()[0]
+
+    assert meu_emprego.main(ADD + ["--status", "Entrevista", "--mesclar"]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith(rid) and "atualizado" in out
+
+
+def test_stats_counts_without_pyarrow(csv_env, capsys):
+    meu_emprego.main(ADD)
+    meu_emprego.main(["add", "--empresa", "Beta", "--cargo", "QA", "--status", "Entrevista"])
+    capsys.readouterr()
+
+    assert meu_emprego.main(["stats"]) == 0
+    out = capsys.readouterr().out
+    assert "Candidaturas: 2" in out and "Inscrito" in out and "Entrevista" in out
+
+    # processo novo: nada da dashboard é importado
+    code = "import sys, meu_emprego; meu_emprego.main(['stats']); print(sorted({'pyarrow', 'numpy', 'pandas'} & set(sys.modules)))"
+    res = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(meu_emprego.__file__).parent,
+        capture_output=True, text=True, check=True,
+    )
+    assert res.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,59 @@
+"""Várias instâncias (threads e processos) gravando no mesmo CSV."""
+
+import multiprocessing
+import threading
+
+from core import rollups as rollup
+from core import sync
+from core.datastore import DataStore
+from core.tests import candidatura
+
+PROCS, THREADS, ROWS = 2, 3, 15
+
+
+def _writer(tag):
+    ds = DataStore()
+    try:
+        for i in range(ROWS):
+            res = ds.insert_candidatura(candidatura(
+                empresa=f"E{tag}", cargo=f"C{i}", link="", data=f"2024-0{1 + i % 3}-1{i % 9}",
+            ))
+            assert res["ok"], res
+    finally:
+        ds.close()
+
+
+def _process(proc):
+    threads = [threading.Thread(target=_writer, args=(f"{proc}-{t}",)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_inserts_keep_sidecars_in_step(csv_env):
+    DataStore().close()  # arquivos criados antes da disputa
+
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    procs = [ctx.Process(target=_process, args=(p,)) for p in range(PROCS)]
+    for p in procs:
+        p.start()
+    _process("main")
+    for p in procs:
+        p.join()
+    assert [p.exitcode for p in procs] == [0] * PROCS
+
+    expected = (PROCS + 1) * THREADS * ROWS
+    ds = DataStore()
+    try:
+        rows = list(ds.iter_candidaturas())
+        assert len(rows) == len({r["id"] for r in rows}) == expected
+
+        ds.csv_rollups.load()
+        ds.csv_digests.load()
+        assert sum(ds.csv_rollups.buckets[rollup.DAY].values()) == expected
+        assert ds.csv_digests.buckets == sync.digests_of(rows)
+        assert len(ds.csv_keys) == expected
+        assert sum(1 for _ in ds.history.path.open()) == expected
+    finally:
+        ds.close()
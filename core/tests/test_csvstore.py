@@ -0,0 +1,96 @@
+"""CSV ordenado por data: delta, índice esparso e consultas por intervalo."""
+
+import csv
+import datetime
+import random
+
+import pytest
+
+from core.csvstore import CSV_HEADER, INDEX_EVERY, SingleCsvStore, new_record_id, row_date_key
+
+START = datetime.date(2024, 1, 1)
+
+
+def _row(d: datetime.date) -> dict:
+    return {**dict.fromkeys(CSV_HEADER, ""), "empresa": "ACME", "data": d.strftime("%d-%m-%Y"), "id": new_record_id()}
+
+
+def _expected(rows, date_from=None, date_to=None, newest_first=True):
+    keep = [r for r in rows if (date_from is None or row_date_key(r) >= date_from)
+            and (date_to is None or row_date_key(r) <= date_to)]
+    return sorted(keep, key=row_date_key, reverse=newest_first)
+
+
+def _dates(rows):
+    return [r["data"] for r in rows]
+
+
+def _check_queries(store, rows):
+    assert store.count() == len(rows)
+    lo, hi = START + datetime.timedelta(days=100), START + datetime.timedelta(days=140)
+    for args in [(lo, hi), (lo, None), (None, hi), (None, None)]:
+        for desc in (True, False):
+            got = store.query(*args, newest_first=desc)
+            want = _expected(rows, *args, newest_first=desc)
+            assert _dates(got) == _dates(want)
+            assert {r["id"] for r in got} == {r["id"] for r in want}
+    assert _dates(store.query(limit=10)) == _dates(_expected(rows))[:10]
+
+
+@pytest.fixture
+def csv_store(tmp_path):
+    store = SingleCsvStore(tmp_path / "candidaturas.csv")
+    yield store
+    store.close()
+
+
+def test_late_rows_go_to_delta_and_merge(csv_store):
+    rnd = random.Random(3)
+    in_order = [_row(START + datetime.timedelta(days=i // 3)) for i in range(3 * INDEX_EVERY)]
+    csv_store.append_many(in_order)
+    late = [_row(START + datetime.timedelta(days=rnd.randrange(200))) for _ in range(50)]
+    for row in late:
+        csv_store.append(row)
+    rows = in_order + late
+
+    assert csv_store.delta_path.exists()
+    with csv_store.delta_path.open(encoding="utf-8") as f:
+        assert sum(1 for _ in f) - 1 == sum(1 for r in late if row_date_key(r) < row_date_key(in_order[-1]))
+
+    # uma entrada no .idx a cada INDEX_EVERY registros do principal
+    main = csv_store._rows
+    csv_store.query(START, START)
+    with csv_store.index_path.open(encoding="ascii") as f:
+        assert len(f.readlines()) - 1 == -(-main // INDEX_EVERY)
+    _check_queries(csv_store, rows)
+
+    assert csv_store.merge_delta() > 0
+    assert not csv_store.delta_path.exists()
+    with csv_store.path.open(encoding="utf-8", newline="") as f:
+        on_disk = list(csv.DictReader(f))
+    assert _dates(on_disk) == _dates(_expected(rows, newest_first=False))
+    _check_queries(csv_store, rows)
+
+
+def test_legacy_unsorted_file(tmp_path):
+    rnd = random.Random(5)
+    rows = [_row(START + datetime.timedelta(days=rnd.randrange(200))) for _ in range(600)]
+    path = tmp_path / "candidaturas.csv"
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    store = SingleCsvStore(path)
+    try:
+        _check_queries(store, rows)
+        extra = _row(START)
+        store.append(extra)  # a escrita reordena o arquivo
+        rows.append(extra)
+        with path.open(encoding="utf-8", newline="") as f:
+            on_disk = list(csv.DictReader(f))
+        keys = [row_date_key(r) for r in on_disk]
+        assert keys == sorted(keys)
+        _check_queries(store, rows)
+    finally:
+        store.close()
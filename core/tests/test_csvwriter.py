@@ -0,0 +1,87 @@
+"""CsvAppender: políticas de durabilidade, troca do arquivo e reparo do fim."""
+
+import csv
+import os
+import time
+
+from core.csvwriter import COMMIT, GROUP, CsvAppender, Durability, repair_tail
+from core.datastore import DataStore
+from core.tests import candidatura
+
+HEADER = ["a", "b"]
+
+
+def _rows(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_commit_writes_each_transaction(tmp_path):
+    path = tmp_path / "x.csv"
+    out = CsvAppender(path, HEADER, Durability(COMMIT))
+    try:
+        out.write_rows([["1", "um"], ["2", "dois, com vírgula"]])
+        assert not path.exists()  # ainda no buffer
+        out.commit()
+        assert _rows(path) == [HEADER, ["1", "um"], ["2", "dois, com vírgula"]]
+    finally:
+        out.close()
+
+
+def test_group_flushes_by_rows_and_time(tmp_path):
+    path = tmp_path / "x.csv"
+    out = CsvAppender(path, HEADER, Durability(GROUP, flush_rows=3, flush_ms=50))
+    try:
+        out.write_rows([["1", ""]])
+        out.commit()
+        assert out.pending == 1 and not path.exists()
+        time.sleep(0.3)  # o temporizador descarrega
+        assert out.pending == 0 and len(_rows(path)) == 2
+
+        out.write_rows([[str(i), ""] for i in range(2, 6)])  # passa de flush_rows
+        assert out.pending == 1 and len(_rows(path)) == 5
+        out.flush()
+        assert [r[0] for r in _rows(path)] == ["a", "1", "2", "3", "4", "5"]
+    finally:
+        out.close()
+
+
+def test_reopens_replaced_file(tmp_path):
+    path = tmp_path / "x.csv"
+    out = CsvAppender(path, HEADER, Durability(COMMIT))
+    try:
+        out.write_rows([["1", ""]])
+        out.commit()
+        tmp = tmp_path / "novo.csv"
+        tmp.write_text("a,b\r\n0,\r\n", encoding="utf-8")
+        os.replace(tmp, path)  # compactação por outro processo
+
+        out.write_rows([["2", ""]])
+        out.commit()
+        assert _rows(path) == [HEADER, ["0", ""], ["2", ""]]
+    finally:
+        out.close()
+
+
+def test_repair_tail(tmp_path):
+    path = tmp_path / "x.csv"
+    path.write_bytes(b'a,b\r\n1,ok\r\n2,"pela me')
+    end = len(b"a,b\r\n1,ok\r\n")
+    assert repair_tail(path, end, 2) == "truncated"
+    assert _rows(path) == [HEADER, ["1", "ok"]]
+
+    path.write_bytes(b"a,b\r\n1,ok\r\n2,sem quebra")
+    assert repair_tail(path, end, 2) == "completed"
+    assert _rows(path) == [HEADER, ["1", "ok"], ["2", "sem quebra"]]
+    assert repair_tail(path, path.stat().st_size, 2) is None
+
+
+def test_group_mode_reads_own_writes(csv_env, monkeypatch):
+    monkeypatch.setenv("MEU_EMPREGO_CSV_DURABILITY", GROUP)
+    monkeypatch.setenv("MEU_EMPREGO_CSV_FLUSH_MS", "60000")
+    ds = DataStore()
+    try:
+        rid = ds.insert_candidatura(candidatura())["id"]
+        assert [r["id"] for r in ds.iter_candidaturas()] == [rid]
+    finally:
+        ds.close()
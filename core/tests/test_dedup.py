@@ -0,0 +1,60 @@
+"""Duplicatas: recusa, mescla e o índice de chaves do CSV."""
+
+from core.tests import candidatura
+
+
+def _rows(store):
+    return list(store._csv_iter())
+
+
+def test_reject_duplicate(store):
+    first = store.insert_candidatura(candidatura())
+
+    res = store.insert_candidatura(candidatura(empresa=" acme ", link="https://ACME.example/vagas/1/"))
+
+    assert res["duplicate"] and not res["ok"]
+    assert [r["id"] for r in _rows(store)] == [first["id"]]
+
+
+def test_merge_updates_existing(store):
+    rid = store.insert_candidatura(candidatura(observacoes=""))["id"]
+
+    res = store.insert_candidatura(
+        candidatura(status="Entrevista", observacoes="retorno na sexta"), on_duplicate="merge"
+    )
+
+    assert res["ok"] and res["merged"] and res["id"] == rid
+    (row,) = _rows(store)
+    assert row["status"] == "Entrevista"
+    assert row["observacoes"] == "retorno na sexta"
+
+
+def test_merge_without_changes(store):
+    rid = store.insert_candidatura(candidatura())["id"]
+
+    res = store.insert_candidatura(candidatura(), on_duplicate="merge")
+
+    assert res["ok"] and res["merged"] and res["id"] == rid
+    assert len(store.csv_log) == 0
+
+
+def test_insert_many_filters_duplicates(store):
+    store.insert_candidatura(candidatura())
+
+    res = store.insert_many([
+        candidatura(),
+        candidatura(cargo="Dev Go"),
+        candidatura(cargo="Dev Go", status="Entrevista"),
+    ], on_duplicate="merge")
+
+    assert (res["inserted"], res["duplicates"], res["merged"]) == (1, 2, 2)
+    statuses = sorted(r["status"] for r in _rows(store))
+    assert statuses == ["Entrevista", "Inscrito"]
+
+
+def test_reject_returns_existing_id(store):
+    rid = store.insert_candidatura(candidatura())["id"]
+
+    res = store.insert_candidatura(candidatura(status="Entrevista"))
+
+    assert res["duplicate"] and res["id"] == rid
@@ -0,0 +1,45 @@
+"""EventBus: eventos locais de inserção, alteração e exclusão; eco e versões."""
+
+from core.events import DELETED, INSERTED, UPDATED, ChangeEvent, VersionTracker
+from core.tests import candidatura
+
+
+def test_store_publishes_changes(store):
+    got = []
+    unsubscribe = store.events.subscribe(got.extend)
+
+    rid = store.insert_candidatura(candidatura())["id"]
+    store.update_candidatura(rid, {"status": "Entrevista"})
+    store.delete_candidatura(rid)
+    unsubscribe()
+    store.insert_candidatura(candidatura(cargo="Dev Backend"))
+
+    assert [(ev.kind, ev.record["id"], ev.version, ev.source) for ev in got] == [
+        (INSERTED, rid, 1, "local"), (UPDATED, rid, 2, "local"), (DELETED, rid, 3, "local"),
+    ]
+    inserted, updated, deleted = got
+    assert inserted.record["empresa"] == "ACME" and inserted.previous is None
+    assert (updated.previous["status"], updated.record["status"]) == ("Inscrito", "Entrevista")
+    assert updated.record["empresa"] == "ACME"
+    assert deleted.previous["status"] == "Entrevista"
+    assert store.events.version == 4
+
+
+def test_echo_from_feed_is_claimed(store):
+    rid = store.insert_candidatura(candidatura())["id"]
+
+    assert store.events.claim(ChangeEvent(INSERTED, {"id": rid}, "csv"))
+    assert not store.events.claim(ChangeEvent(DELETED, {"id": rid}, "csv"))
+    assert not store.events.claim(ChangeEvent(INSERTED, {"id": "outro"}, "csv"))
+
+
+def test_version_tracker_replays_newer_events():
+    tracker = VersionTracker()
+    events = [ChangeEvent(INSERTED, {"id": str(v)}, version=v) for v in (1, 2, 3)]
+    feed = ChangeEvent(INSERTED, {"id": "feed"})  # de outro processo: versão 0
+
+    assert tracker.fresh(events[:2] + [feed]) == events[:2] + [feed]
+    # leitura completa feita na versão 1: só o evento 2 é reaplicado
+    assert tracker.loaded(1) == [events[1]]
+    assert tracker.fresh(events) == events[1:]
+    assert tracker.loaded(3) == []
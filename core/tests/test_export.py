@@ -0,0 +1,45 @@
+"""Exportação em CSV: troca atômica, sem sobras do arquivo temporário."""
+
+import csv
+
+import pytest
+
+from core.tests import candidatura
+
+
+def _read(path):
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_export_writes_all_rows(store, tmp_path):
+    store.insert_candidatura(candidatura())
+    store.insert_candidatura(candidatura(empresa="Globex", data="2024-03-12"))
+    out = tmp_path / "saida" / "export.csv"
+    out.parent.mkdir()
+
+    assert store.export_csv(out) == 2
+    assert [r["empresa"] for r in _read(out)] == ["Globex", "ACME"]
+    assert list(out.parent.iterdir()) == [out]
+
+    empty = tmp_path / "saida" / "vazio.csv"
+    assert store.export_csv(empty, filters={"empresa": "Initech"}) == 0
+    assert list(out.parent.iterdir()) == [out]
+
+
+def test_failed_export_keeps_previous_file(store, tmp_path, monkeypatch):
+    store.insert_candidatura(candidatura())
+    out = tmp_path / "saida" / "export.csv"
+    out.parent.mkdir()
+    assert store.export_csv(out) == 1
+    before = out.read_bytes()
+
+    def broken(*args, **kwargs):
+        yield candidatura(empresa="Globex")
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(store, "iter_candidaturas", broken)
+    with pytest.raises(OSError):
+        store.export_csv(out)
+    assert out.read_bytes() == before
+    assert list(out.parent.iterdir()) == [out]
@@ -0,0 +1,38 @@
+"""Importador: normalização das datas de planilhas e exportações."""
+
+import datetime
+
+import pytest
+
+from core.csvstore import CSV_FIELDS
+from core.importer import normalize_batch
+
+pytest.importorskip("pandas")
+
+MAPPING = {f: f for f in CSV_FIELDS}
+
+
+def _dates(values):
+    docs, rejected = normalize_batch(
+        [{"empresa": "ACME", "cargo": f"Dev {i}", "data": v} for i, v in enumerate(values)], MAPPING
+    )
+    return [d["data"] for d in docs], rejected
+
+
+def test_datetime_cells_keep_day_and_month():
+    dates, rejected = _dates([
+        datetime.datetime(2024, 1, 5, 10, 30),  # célula de data do XLSX
+        datetime.date(2024, 2, 3),
+    ])
+    assert dates == ["2024-01-05", "2024-02-03"] and not rejected
+
+
+def test_iso_strings_with_time_are_year_month_day():
+    dates, _ = _dates(["2024-01-05T10:00:00", "2024-01-05 00:00:00", "2024-01-05T10:00:00Z", "2024-1-5"])
+    assert dates == ["2024-01-05"] * 4
+
+
+def test_other_formats_are_day_first():
+    dates, rejected = _dates(["05/01/2024", "05-01-2024", "5.1.2024", "??"])
+    assert dates == ["2024-01-05"] * 3
+    assert rejected == {"data inválida": 1}
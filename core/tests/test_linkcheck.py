@@ -0,0 +1,145 @@
+"""LinkChecker contra um servidor HTTP local (http.server; sem internet)."""
+
+import datetime
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.linkcheck import LinkChecker
+
+REDIRECTS = {
+    "/vaga/movida": "/r/1",
+    "/r/1": "/r/2",
+    "/r/2": "/vaga/ativa-nova",
+    "/loop": "/loop",
+}
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.hits = Counter()  # (método, caminho)
+        self.connections = 0
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    timeout = 0.2  # conexão ociosa é fechada pelo servidor
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self, body: bool):
+        path = self.path
+        self.server.hits[self.command, path] += 1
+        headers = {}
+        if path in REDIRECTS:
+            code, headers = 301, {"Location": REDIRECTS[path]}
+        elif path.startswith("/vaga/encerrada"):
+            code = 404
+        elif path.startswith("/vaga/removida"):
+            code = 410
+        elif path.startswith("/sem-head") and self.command == "HEAD":
+            code = 405
+        else:
+            code = 200
+
+        self.send_response(code)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", "2" if body else "0")
+        self.end_headers()
+        if body:
+            self.wfile.write(b"ok")
+
+    def do_HEAD(self):
+        self._reply(body=False)
+
+    def do_GET(self):
+        self._reply(body=True)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StandIn()
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def checker(tmp_path):
+    checker = LinkChecker(tmp_path / "links.json", min_interval=0.0, timeout=2.0)
+    yield checker
+    checker.close()
+
+
+def test_gone_statuses(server, checker):
+    paths = ["/vaga/ativa/1", "/vaga/encerrada/1", "/vaga/removida/1"]
+    res = checker.check_many([server.base + p for p in paths] + ["não-é-url"])
+
+    assert [(res[server.base + p]["status"], res[server.base + p]["ativa"]) for p in paths] == [
+        (200, True), (404, False), (410, False),
+    ]
+    assert res["não-é-url"]["erro"] == "URL inválida" and res["não-é-url"]["ativa"] is None
+
+
+def test_redirect_chain(server, checker):
+    res = checker.check(f"{server.base}/vaga/movida")
+    assert (res["status"], res["final_url"]) == (200, f"{server.base}/vaga/ativa-nova")
+
+    loop = checker.check(f"{server.base}/loop")
+    assert loop["erro"] == "redirecionamentos demais" and loop["ativa"] is None
+
+
+def test_head_not_allowed_falls_back_to_get(server, checker):
+    res = checker.check(f"{server.base}/sem-head/1")
+    assert (res["status"], res["ativa"]) == (200, True)
+    assert server.hits["HEAD", "/sem-head/1"] == server.hits["GET", "/sem-head/1"] == 1
+
+
+def test_keep_alive_reuse_and_stale_connection(server, tmp_path):
+    checker = LinkChecker(tmp_path / "links.json", workers=1, per_host=1, min_interval=0.0, timeout=2.0)
+    try:
+        for i in range(5):
+            assert checker.check(f"{server.base}/vaga/ativa/{i}")["status"] == 200
+        assert server.connections == 1  # HEADs na mesma conexão
+
+        time.sleep(0.5)  # o servidor fecha a conexão ociosa
+        res = checker.check(f"{server.base}/vaga/ativa/depois")
+        assert (res["status"], res["erro"]) == (200, "")
+        assert server.connections == 2
+    finally:
+        checker.close()
+
+
+def test_ttl_rerun(server, checker, tmp_path):
+    urls = [f"{server.base}/vaga/ativa/{i}" for i in range(3)]
+    assert len(checker.check_many(urls)) == 3
+    before = sum(server.hits.values())
+
+    # dentro do TTL (e em outra instância, pelo arquivo): nada é refeito
+    again = LinkChecker(tmp_path / "links.json", min_interval=0.0)
+    assert again.check_many(urls) == {}
+    assert again.result(urls[0])["ativa"] is True
+    assert sum(server.hits.values()) == before
+
+    # uma entrada vencida volta a ser verificada
+    again.cache[urls[1]]["checked_at"] = (datetime.datetime.now() - datetime.timedelta(days=2)).isoformat()
+    assert list(again.check_many(urls)) == [urls[1]]
+    assert set(again.check_many(urls, force=True)) == set(urls)
+    again.close()
@@ -0,0 +1,43 @@
+"""Observações: listas com a prévia, texto completo sob demanda (com cache)."""
+
+from core.table import PREVIEW_CHARS, is_preview
+from core.tests import candidatura
+
+TEXT = "Requisitos:\n" + "Python, SQL e testes. " * 20
+
+
+def test_lazy_observacoes_csv(store):
+    rid = store.insert_candidatura(candidatura(observacoes=TEXT))["id"]
+    short = store.insert_candidatura(candidatura(cargo="Dev Backend", observacoes="curta"))["id"]
+
+    rows = {r["id"]: r for r in store.list_candidaturas()}
+    assert is_preview(rows[rid]["observacoes"]) and TEXT.startswith(rows[rid]["observacoes"][:PREVIEW_CHARS])
+    assert rows[short]["observacoes"] == "curta"
+    assert {r["id"]: r["observacoes"] for r in store.list_candidaturas(preview=False)}[rid] == TEXT
+    table = store.load_table()
+    assert table.row(table.id.index(rid))["observacoes"] == rows[rid]["observacoes"]
+
+    assert store.get_observacoes(rid, "10-03-2024") == TEXT
+    assert store.obs_cache.get(rid) == TEXT
+    # data desatualizada na tela: procura fora do dia
+    store.obs_cache.discard(rid)
+    assert store.get_observacoes(rid, "01-01-2000") == TEXT
+
+    store.update_candidatura(rid, {"observacoes": "nova"}, previous=rows[rid])
+    assert store.get_observacoes(rid) == "nova"
+    store.delete_candidatura(rid, previous={**rows[rid], "observacoes": "nova"})
+    assert store.get_observacoes(rid) is None
+    assert store.get_observacoes("") is None
+
+
+
+def test_get_observacoes_mongo(mongo_store):
+    # (o mongomock não conhece o $substrCP da prévia nas listas)
+    rid = mongo_store.insert_candidatura(candidatura(observacoes=TEXT))["id"]
+    mongo_store.obs_cache.discard(rid)
+    assert mongo_store.get_observacoes(rid) == TEXT
+    assert mongo_store.obs_cache.get(rid) == TEXT
+    assert mongo_store.use_mongo
+
+    mongo_store.delete_candidatura(rid)
+    assert mongo_store.get_observacoes(rid) is None
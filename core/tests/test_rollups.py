@@ -0,0 +1,52 @@
+"""Rollups: janelas da linha do tempo por dia, semana e mês, nos dois backends."""
+
+import datetime
+
+from core import rollups as rollup
+from core.datastore import DataStore
+from core.tests import candidatura
+
+D = datetime.date
+DATES = ["2023-12-31", "2024-01-01", "2024-01-03", "2024-01-03", "2024-02-10"]
+
+
+def _fill(store):
+    ids = [store.insert_candidatura(candidatura(cargo=f"Dev {i}", data=d))["id"] for i, d in enumerate(DATES)]
+    # exclusão e troca de data também entram na conta
+    store.delete_candidatura(ids[3])
+    store.update_candidatura(ids[2], {"data": "2024-01-04"})
+
+
+def _check(store):
+    points, g = store.rollup_series("30 dias")
+    assert g == rollup.DAY and len(points) == 30
+    assert points[0][0] == D(2024, 1, 12) and points[-1] == (D(2024, 2, 10), 1)
+    assert sum(n for _, n in points) == 1
+
+    points, g = store.rollup_series("1 ano")
+    assert g == rollup.WEEK
+    assert all(p.weekday() == 0 for p, _ in points)
+    assert [(p, n) for p, n in points if n] == [(D(2023, 12, 25), 1), (D(2024, 1, 1), 2), (D(2024, 2, 5), 1)]
+
+    points, g = store.rollup_series("Tudo")
+    assert (g, points) == (rollup.MONTH, [(D(2023, 12, 1), 1), (D(2024, 1, 1), 2), (D(2024, 2, 1), 1)])
+
+
+def test_windows_csv(store):
+    assert store.rollup_series("Tudo") == ([], rollup.MONTH)
+    _fill(store)
+    _check(store)
+
+    # sem o arquivo, a próxima abertura reconstrói a partir do CSV
+    store.close()
+    store.csv_rollups.path.unlink()
+    again = DataStore()
+    try:
+        _check(again)
+    finally:
+        again.close()
+
+
+def test_windows_mongo(mongo_store):
+    _fill(mongo_store)
+    _check(mongo_store)
@@ -0,0 +1,73 @@
+"""Fotografia e cópia colunar: o que mudou desde a marca, e releitura quando não fecha."""
+
+import shutil
+from collections import Counter
+
+import pytest
+
+from core.datastore import DataStore
+from core.tests import candidatura
+
+
+def _by_status(store):
+    return dict(Counter(r.get("status") or "" for r in store.iter_candidaturas()))
+
+
+def test_records_since_returns_new_rows(store):
+    store.insert_candidatura(candidatura(cargo="A"))
+    mark, total = store.snapshot_watermark(), store.count_candidaturas()
+
+    ids = {store.insert_candidatura(candidatura(cargo=c, data="2024-04-0" + c[-1]))["id"] for c in ("B1", "B2")}
+
+    rows, new_mark = store.records_since(mark, total)
+    assert {r["id"] for r in rows} == ids
+    rows, _ = store.records_since(new_mark, total + 2)
+    assert rows == []
+
+
+@pytest.mark.parametrize("change", ["update", "delete"])
+def test_records_since_asks_for_full_read(store, change):
+    rid = store.insert_candidatura(candidatura())["id"]
+    mark, total = store.snapshot_watermark(), store.count_candidaturas()
+
+    if change == "update":
+        store.update_candidatura(rid, {"status": "Entrevista"})
+    else:
+        store.delete_candidatura(rid)
+
+    assert store.records_since(mark, total) is None
+
+
+def test_status_counts_follow_writes(store):
+    pytest.importorskip("pyarrow")
+    ids = [store.insert_candidatura(candidatura(cargo=f"C{i}"))["id"] for i in range(6)]
+    assert store.count_by_status() == {"Inscrito": 6}
+
+    store.update_candidatura(ids[0], {"status": "Entrevista"})
+    store.update_candidatura(ids[1], {"status": "Rejeitado"})
+    store.delete_candidatura(ids[2])
+    assert store.count_by_status() == _by_status(store) == {"Inscrito": 3, "Entrevista": 1, "Rejeitado": 1}
+
+    # outra instância grava no mesmo CSV: a cópia não fecha e é refeita
+    other = DataStore()
+    try:
+        other.insert_candidatura(candidatura(cargo="Outra", status="Contratado"))
+    finally:
+        other.close()
+    assert store.count_by_status() == _by_status(store)
+
+    # cópia apagada: refeita na próxima leitura
+    shutil.rmtree(store.analytics.path)
+    assert store.count_by_status() == _by_status(store)
+    assert store.analytics_table().num_rows == store.count_candidaturas() == 6
+
+
+def test_status_counts_after_compaction(store):
+    pytest.importorskip("pyarrow")
+    ids = [store.insert_candidatura(candidatura(cargo=f"C{i}"))["id"] for i in range(4)]
+    store.update_candidatura(ids[0], {"status": "Entrevista"})
+    store.delete_candidatura(ids[1])
+
+    store.compact_csv()
+
+    assert store.count_by_status() == _by_status(store) == {"Inscrito": 2, "Entrevista": 1}
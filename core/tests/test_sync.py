@@ -0,0 +1,62 @@
+"""Sincronização Mongo ↔ CSV depois de uma queda (mongomock; pulado sem ele)."""
+
+import pytest
+
+from core.datastore import DataStore
+from core.tests import candidatura
+
+pytest.importorskip("mongomock")
+
+
+def _outage(store):
+    while store.use_mongo:
+        store.mongo.record_failure()
+
+
+def _mongo_rows(client):
+    return {str(d["_id"]): d.get("status") or "" for d in client["teste"]["candidaturas"].find()}
+
+
+def _csv_rows(store):
+    return {r["id"]: r.get("status") or "" for r in store.iter_candidaturas()}
+
+
+def test_writes_during_outage_reach_mongo(client, mongo_store):
+    kept = mongo_store.insert_candidatura(candidatura(cargo="A"))["id"]
+    gone = mongo_store.insert_candidatura(candidatura(cargo="B"))["id"]
+
+    _outage(mongo_store)
+    new = mongo_store.insert_candidatura(candidatura(cargo="C", data="2024-06-01"))
+    assert new["backend"] == "csv"
+    mongo_store.update_candidatura(kept, {"status": "Entrevista"})
+    mongo_store.delete_candidatura(gone)
+    assert len(mongo_store.unsynced) == 3
+
+    mongo_store.mongo.record_success()
+    report = mongo_store.sync_stores()
+
+    assert report.aplicado
+    assert _mongo_rows(client) == _csv_rows(mongo_store) == {kept: "Entrevista", new["id"]: "Inscrito"}
+    assert len(mongo_store.unsynced) == 0
+    assert mongo_store.sync_stores().total == 0
+
+
+def test_mongo_only_rows_reach_csv(client, mongo_store, tmp_path, monkeypatch):
+    rid = mongo_store.insert_candidatura(candidatura(cargo="A"))["id"]
+
+    # outra máquina, com o próprio CSV, grava no mesmo Mongo
+    monkeypatch.setenv("CANDIDATURAS_CSV_PATH", str(tmp_path / "outra.csv"))
+    monkeypatch.setenv("CANDIDATURAS_CSV_DIR", str(tmp_path / "outra"))
+    other = DataStore(db_name="teste")
+    try:
+        added = other.insert_candidatura(candidatura(cargo="B", data="2024-07-15"))["id"]
+        other.update_candidatura(rid, {"status": "Rejeitado"})
+    finally:
+        other.close()
+
+    report = mongo_store.sync_stores()
+
+    assert {r["id"] for r in report.inserir_csv} == {added}
+    assert _csv_rows(mongo_store) == _mongo_rows(client) == {rid: "Rejeitado", added: "Inscrito"}
+    assert mongo_store.find_duplicate(candidatura(cargo="B"))
+    assert mongo_store.sync_stores().total == 0
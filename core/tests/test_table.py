@@ -0,0 +1,39 @@
+"""CandidaturaTable: vocabulários grandes em tipo/status (texto livre)."""
+
+from core.table import CandidaturaTable
+from core.tests import candidatura
+
+
+def _rows(n, **fields):
+    return [
+        {**candidatura(cargo=f"Dev {i}", data="10-03-2024", **{k: v.format(i) for k, v in fields.items()}),
+         "id": f"{i:024x}"}
+        for i in range(n)
+    ]
+
+
+def test_more_than_127_tipos(store):
+    for row in _rows(200, tipo="Contrato {}"):
+        store.insert_candidatura(row)
+
+    table = store.load_table()
+    assert len(table) == 200 and len(table.vocab["tipo"]) > 200
+    assert {r["tipo"] for r in table} == {f"Contrato {i}" for i in range(200)}
+
+    df = table.to_pandas(["tipo", "status"])
+    assert sorted(df["tipo"].astype(str)) == sorted(r["tipo"] for r in table)
+    assert set(df["status"].astype(str)) == {"Inscrito"}
+
+
+def test_codes_widen_past_int16():
+    rows = _rows(33_000, status="Etapa {}")
+    table = CandidaturaTable.from_rows(rows[:100])
+    assert table.status.typecode == "h"
+
+    for row in rows[100:]:
+        table.append(row)
+    table.insort_desc({**rows[0], "status": "Nova etapa", "id": "x" * 24})
+
+    assert table.status.typecode == "i" and table.tipo.typecode == "h"
+    assert [table.row(i)["status"] for i in (0, 32_999, 33_000)] == ["Etapa 0", "Etapa 32999", "Nova etapa"]
+    assert table.to_pandas(["status"])["status"].astype(str).tolist() == [r["status"] for r in table]
@@ -0,0 +1,71 @@
+"""Alterar/excluir sem `previous`: índice de duplicatas e contagens em dia."""
+
+from core import rollups as rollup
+from core.tests import candidatura
+
+
+def _rollup_total(store):
+    store.csv_rollups.load()
+    return sum(store.csv_rollups.buckets[rollup.DAY].values())
+
+
+def test_delete_then_reinsert(store):
+    doc = candidatura()
+    rid = store.insert_candidatura(doc)["id"]
+
+    assert store.delete_candidatura(rid)["ok"]
+    assert not store.find_duplicate(doc)
+    assert _rollup_total(store) == 0
+
+    again = store.insert_candidatura(doc)
+    assert again["ok"] and again["id"] != rid
+    assert _rollup_total(store) == 1
+
+
+def test_rename_moves_key(store):
+    old = candidatura()
+    rid = store.insert_candidatura(old)["id"]
+
+    res = store.update_candidatura(rid, {"cargo": "Dev Backend"})
+    assert res["ok"]
+
+    new = candidatura(cargo="Dev Backend")
+    assert store.find_duplicate(new)
+    assert not store.find_duplicate(old)
+    assert store.insert_candidatura(old)["ok"]
+    assert store.insert_candidatura(new)["duplicate"]
+
+
+def test_date_change_moves_count(store):
+    rid = store.insert_candidatura(candidatura(data="2024-03-10"))["id"]
+
+    store.update_candidatura(rid, {"data": "2024-05-02"})
+
+    store.csv_rollups.load()
+    daily = store.csv_rollups.buckets[rollup.DAY]
+    assert sum(daily.values()) == 1
+    assert [d.isoformat() for d, n in daily.items() if n] == ["2024-05-02"]
+
+
+def test_delete_leaves_the_funnel(store):
+    from graphics.funnel import FIRST_RESPONSE, FunnelStats
+
+    funnel = FunnelStats()
+    keep = store.insert_candidatura(candidatura())["id"]
+    rid = store.insert_candidatura(candidatura(cargo="Dev Backend"))["id"]
+    store.update_candidatura(rid, {"status": "Entrevista"})
+    store.update_candidatura(keep, {"status": "Entrevista"})
+    funnel.consume(*store.status_events_since(funnel.offset))
+    assert [n for _, n, _ in funnel.funnel()] == [2, 2, 0]
+    assert funnel.latency[FIRST_RESPONSE].n == 2
+
+    assert store.delete_candidatura(rid)["ok"]
+    funnel.consume(*store.status_events_since(funnel.offset))
+    assert [n for _, n, _ in funnel.funnel()] == [1, 1, 0]
+    assert funnel.latency[FIRST_RESPONSE].n == 1
+    assert sum(funnel.latency[FIRST_RESPONSE].counts) == 1
+
+    # quem relê o histórico inteiro chega ao mesmo funil
+    fresh = FunnelStats()
+    fresh.consume(*store.status_events_since(0))
+    assert fresh.funnel() == funnel.funnel()
@@ -6,54 +6,46 @@ Ele funciona como um widget embutido no Tkinter, utilizando o backend TkAgg
 para integrar Matplotlib com Tkinter.
 
 Contém:
-• Gráfico de barras (Candidaturas por Status)
-• Gráfico de linha (Candidaturas nos últimos 30 dias)
+• Gráfico de barras (Candidaturas por Status — no CSV, contado na cópia
+  colunar mapeada, ver core/analytics.py)
+• Gráfico de linha (janela selecionável: 30/90 dias, 1 ano, tudo — lida dos
+  rollups pré-agregados, ver core/rollups.py)
+• Funil de contratação (Inscrito → Entrevista → Contratado)
+• Histograma de tempos de resposta (ver graphics/funnel.py)
+
+O primeiro desenho vem da fotografia da sessão anterior, quando existe
+(ver core/snapshot.py); só os registros novos são lidos em segundo plano.
+Figuras já desenhadas (mesmos dados, mesmo tamanho) voltam do cache de
+bitmaps (ver graphics/render_cache.py) — voltar à tela ou redimensionar a
+janela não chama o Matplotlib se nada mudou.
+Tempo até o primeiro gráfico, com e sem a fotografia:
+
+    python -m bench.dashboard 100000
 """
 
-from typing import Optional
-import datetime
+import hashlib
+import pickle
+from collections import Counter
+from typing import Dict, Optional
 
-import pandas as pd
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 
-from graphics.helpers import apply_rc_style, style_axes, PALETTE
+from core.events import DELETED, INSERTED, UPDATED, VersionTracker
+from core.rollups import DAY, DEFAULT_WINDOW, MONTH, WEEK
+from graphics.downsample import MAX_MARKERS, MAX_POINTS, labeled, lttb
+from graphics.funnel import BUCKETS, DECISION, FIRST_RESPONSE, FunnelStats
+from graphics.helpers import apply_rc_style, style_axes, theme_key, PALETTE
+from graphics.render_cache import CachedCanvasAgg, CachedCanvasTkAgg, shared_cache
 
 # Integração Tkinter + Matplotlib
 try:
     import tkinter as tk
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 except Exception:
     tk = None
-    FigureCanvasTkAgg = None
 
 
-# --------------------------------------------------------------------------
-# função utilitária para localizar a coluna correta ignorando maiúsculas/minúsculas
-# --------------------------------------------------------------------------
-def _find_col(df: pd.DataFrame, *names: str) -> Optional[str]:
-    cols = {c.lower(): c for c in df.columns}
-    for n in names:
-        if n.lower() in cols:
-            return cols[n.lower()]
-    return None
-
-
-# --------------------------------------------------------------------------
-# função correta para normalizar datas vindas do MongoDB e CSV
-# --------------------------------------------------------------------------
-def _normalize_date(v):
-    """
-    Aceita formatos:
-    • {"$date": "..."} (MongoDB)
-    • "2025-11-02" (string)
-    • datetime / Timestamp
-    """
-    try:
-        if isinstance(v, dict) and "$date" in v:
-            return pd.to_datetime(v["$date"], utc=True).tz_convert(None)
-        return pd.to_datetime(v, utc=True).tz_convert(None)
-    except Exception:
-        return pd.NaT
+GRANULARITY_LABEL = {DAY: "por dia", WEEK: "por semana", MONTH: "por mês"}
 
 
 # --------------------------------------------------------------------------
@@ -65,30 +57,65 @@ class DashboardGraphs:
 
     Métodos:
     • build() -> monta a figura no Tkinter
-    • refresh() -> redesenha os gráficos com os dados atuais
+    • start() -> primeiro desenho (da fotografia, se houver) e leitura do que falta
+    • refresh() -> relê os dados (em segundo plano) e redesenha os gráficos
+    • apply_changes(events) -> atualiza os agregados de forma incremental
+    • set_window(label) -> troca a janela da linha do tempo
     """
 
-    def __init__(self, parent, datastore):
-        if tk is None or FigureCanvasTkAgg is None:
-            raise RuntimeError("TkAgg/Tkinter não disponíveis no ambiente.")
-
+    def __init__(self, parent, datastore, async_store):
         self.parent = parent
         self.datastore = datastore
+        self.async_store = async_store
 
         self.fig = None
         self.canvas = None
         self.axs = None
+        self._headless = False
+        self._sized = False  # o canvas já recebeu o tamanho da tela?
+
+        # agregados: status → quantidade (a linha do tempo vem dos rollups)
+        self._has_status = False
+        self._status_counts = Counter()
+        self._loaded = VersionTracker()  # versão dos dados da última contagem
+        self.window = DEFAULT_WINDOW
+        self.include_archived = False  # contagem por status com o nível frio
+        self._series = ([], DAY)  # (pontos, granularidade) da janela atual
+
+        # funil: consome só as transições novas do histórico de status
+        self._funnel = FunnelStats()
+
+        # bitmaps já desenhados (do processo: sobrevivem à troca de tela)
+        self.render_cache = shared_cache()
+        self._composed = None  # versão dos dados montada nos eixos
 
     # ----------------------------------------------------------------------
-    def build(self):
-        """Cria a figura Matplotlib dentro do Tkinter."""
+    def build(self, headless: bool = False):
+        """Cria a figura Matplotlib dentro do Tkinter (`headless`: só em memória, p/ o benchmark)."""
+        if not headless and (tk is None or CachedCanvasTkAgg is None):
+            raise RuntimeError("TkAgg/Tkinter não disponíveis no ambiente.")
 
         apply_rc_style()
 
-        self.fig, self.axs = plt.subplots(1, 2, figsize=(10, 4))
+        self.fig, self.axs = plt.subplots(2, 2, figsize=(10, 7))
+        # layout refeito a cada desenho (inclusive ao redimensionar): os
+        # mesmos dados no mesmo tamanho dão sempre o mesmo bitmap
+        if hasattr(self.fig, "set_layout_engine"):
+            self.fig.set_layout_engine("tight")
+        else:
+            self.fig.set_tight_layout(True)
+
+        if headless:
+            self._headless = True
+            self.canvas = CachedCanvasAgg(self.fig)
+            self._setup_cache()
+            return
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.parent)
+        self.canvas = CachedCanvasTkAgg(self.fig, master=self.parent)
+        self._setup_cache()
         widget = self.canvas.get_tk_widget()
+        # até o primeiro <Configure> o canvas não tem o tamanho real
+        widget.bind("<Configure>", self._on_first_configure, add="+")
         widget.grid(row=0, column=0, sticky="nsew")
 
         try:
@@ -97,39 +124,284 @@ class DashboardGraphs:
         except:
             pass
 
+    def _on_first_configure(self, event=None):
+        self._sized = True
+
+    def _setup_cache(self):
+        self.canvas.render_cache = self.render_cache
+        self.canvas.theme = theme_key()
+        self.canvas.before_render = self._ensure_composed
+
     # ----------------------------------------------------------------------
-    def refresh(self):
-        """Recalcula e redesenha os gráficos com base nos dados mais recentes."""
+    # LEITURA (thread de trabalho) → APLICAÇÃO (thread do Tk)
+    # ----------------------------------------------------------------------
+    def _fetch(self, since: int, window: str, full: bool, include_archived: bool = False) -> Dict:
+        """
+        Roda fora da thread do Tk (ver core/asyncstore.py): lê os dados e
+        devolve tudo o que o desenho precisa, sem tocar nos widgets.
+        """
+        data = {"since": since, "window": window}
+
+        if full:
+            # a marca antes da leitura: o que entrar no meio é relido depois
+            try:
+                watermark = self.datastore.snapshot_watermark()
+            except Exception:
+                watermark = None
+
+            # agregado no servidor (Mongo) ou em fluxo (CSV)
+            counts, version = Counter(), None
+            try:
+                by_status, version = self.datastore.events.consistent(
+                    self.datastore.count_by_status, include_archived=include_archived
+                )
+                for status, n in by_status.items():
+                    counts[status or "(sem status)"] += n
+            except Exception:
+                counts, watermark = Counter(), None
+            data["status_counts"] = counts
+            data["has_status"] = bool(counts)
+            data["watermark"] = watermark
+            data["version"] = version
+            data["include_archived"] = include_archived
+
+        try:
+            data["events"] = self.datastore.status_events_since(since)
+        except Exception:
+            data["events"] = None
 
-        # Obtém dados do banco
         try:
-            rows = self.datastore.list_candidaturas(
-                limit=None,
-                order_by_date_desc=False
+            data["series"] = self.datastore.rollup_series(window)
+        except Exception:
+            data["series"] = ([], DAY)
+
+        return data
+
+    def _apply(self, data: Dict):
+        """Aplica o resultado de `_fetch` aos agregados e redesenha."""
+        if self.fig is None or not self._alive():
+            return
+
+        stale = False
+        if "status_counts" in data and data["include_archived"] != self.include_archived:
+            stale = True  # a opção mudou durante a leitura
+        elif "status_counts" in data:
+            self._has_status = data["has_status"]
+            self._status_counts = data["status_counts"]
+            # gravações publicadas durante a leitura
+            for ev in self._loaded.loaded(data.get("version")):
+                stale = not self._count(ev) or stale
+
+        # transições: só se ninguém consumiu este trecho antes (leituras
+        # concorrentes partem do mesmo offset)
+        if data["events"] is not None:
+            events, offset, reset = data["events"]
+            if reset or data["since"] == self._funnel.offset:
+                self._funnel.consume(events, offset, reset)
+
+        if data["window"] == self.window:
+            self._series = data["series"]
+
+        self._draw()
+
+        if stale:
+            self.refresh()
+        elif data.get("watermark") is not None and not self.include_archived:
+            # a fotografia guarda só o conjunto quente (o padrão ao abrir)
+            self._save_snapshot(data["watermark"])
+
+    def _request(self, key: str, full: bool):
+        self.async_store.submit(
+            self._fetch, self._funnel.offset, self.window, full, self.include_archived,
+            key=key, callback=self._apply,
+        )
+
+    def _alive(self) -> bool:
+        if self._headless:
+            return True
+        try:
+            return bool(self.canvas.get_tk_widget().winfo_exists())
+        except Exception:
+            return False
+
+    # ----------------------------------------------------------------------
+    # FOTOGRAFIA (ver core/snapshot.py)
+    # ----------------------------------------------------------------------
+    def start(self):
+        """
+        Primeiro desenho. Com fotografia, os gráficos aparecem na hora e só
+        os registros posteriores à marca d'água são lidos em segundo plano;
+        sem ela, leitura completa (`refresh`).
+        """
+        snap = self.datastore.load_snapshot()
+        state = self._thaw(snap["views"].get("dashboard")) if snap else None
+        if state is None:
+            self.refresh()
+            return
+
+        self._status_counts = state["status_counts"]
+        self._has_status = state["has_status"]
+        self._funnel = state["funnel"]
+        if state["window"] == self.window:
+            self._series = state["series"]
+        self._draw()
+
+        self.async_store.submit(
+            self._reconcile, snap["watermark"], Counter(self._status_counts),
+            self._funnel.offset, self.window,
+            key="dashboard.refresh", callback=self._apply,
+        )
+
+    def _reconcile(self, watermark: Dict, counts: Counter, since: int, window: str) -> Dict:
+        """Thread de trabalho: soma à fotografia os registros novos (ou relê tudo)."""
+        try:
+            res, version = self.datastore.events.consistent(
+                self.datastore.records_since, watermark, sum(counts.values())
             )
         except Exception:
-            rows = []
+            res = None
+        if res is None:
+            return self._fetch(since, window, True)
+
+        rows, watermark = res
+        data = self._fetch(since, window, False)
+        for row in rows:
+            counts[row.get("status") or "(sem status)"] += 1
+        data.update(status_counts=counts, has_status=bool(counts), watermark=watermark, version=version,
+                    include_archived=False)
+        return data
+
+    def _save_snapshot(self, watermark: Dict):
+        # o estado é congelado aqui, na thread do Tk; a gravação vai para o pool
+        state = pickle.dumps(
+            {
+                "status_counts": self._status_counts,
+                "has_status": self._has_status,
+                "window": self.window,
+                "series": self._series,
+                "funnel": self._funnel,
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self.async_store.submit(
+            self.datastore.save_snapshot, watermark, sum(self._status_counts.values()),
+            {"dashboard": state}, key="dashboard.snapshot",
+        )
+
+    @staticmethod
+    def _thaw(state: Optional[bytes]) -> Optional[Dict]:
+        if not state:
+            return None
+        try:
+            return pickle.loads(state)
+        except Exception:
+            return None
+
+    # ----------------------------------------------------------------------
+    def refresh(self):
+        """Relê os dados em segundo plano e redesenha os gráficos."""
+        # cliques repetidos em ↻ disparam no máximo a leitura atual e a última
+        self._request("dashboard.refresh", full=True)
 
-        df = pd.DataFrame(rows)
+    # ----------------------------------------------------------------------
+    def apply_changes(self, events):
+        """
+        Aplica eventos de mudança (ver core/events.py) sem reler a base.
+        Inserções, e alterações/exclusões com o estado anterior (gravações
+        deste processo), atualizam os contadores; as demais forçam um refresh.
+        """
+        if self.fig is None:
+            return
+
+        for ev in self._loaded.fresh(events):
+            if not self._count(ev):
+                self.refresh()
+                return
+
+        # funil e linha do tempo: só as transições novas e os rollups
+        self._request("dashboard.changes", full=False)
+
+    def _count(self, ev) -> bool:
+        """Aplica um evento aos contadores por status; False se for preciso reler."""
+        if ev.kind == INSERTED:
+            self._status_counts[ev.record.get("status") or "(sem status)"] += 1
+        elif ev.kind in (UPDATED, DELETED) and ev.previous is not None:
+            old = ev.previous.get("status") or "(sem status)"
+            self._status_counts[old] -= 1
+            if self._status_counts[old] <= 0:
+                del self._status_counts[old]
+            if ev.kind == UPDATED:
+                self._status_counts[ev.record.get("status") or "(sem status)"] += 1
+        else:
+            return False
+        self._has_status = bool(self._status_counts)
+        return True
+
+    def set_window(self, label: str):
+        """Troca a janela da linha do tempo (só relê os rollups)."""
+        self.window = label
+        if self.fig is not None:
+            self._request("dashboard.window", full=False)
+
+    def set_include_archived(self, value: bool):
+        """Inclui (ou não) as candidaturas arquivadas na contagem por status."""
+        self.include_archived = bool(value)
+        if self.fig is not None:
+            self.refresh()
+
+    # ----------------------------------------------------------------------
+    # DESENHO
+    # ----------------------------------------------------------------------
+    def _draw(self):
+        """
+        Exibe os gráficos dos agregados em memória. O canvas procura o
+        bitmap desta versão dos dados no cache; os eixos só são montados
+        (`_compose`) e desenhados pelo Matplotlib num erro.
+        """
+        self.canvas.render_version = self._fingerprint()
+        try:
+            if not self._headless and not self._sized:
+                return  # o <Configure> da primeira exibição desenha, já no tamanho real
+            self.canvas.draw()
+        except:
+            pass
 
-        # Detecção de colunas
-        date_col = _find_col(df, "data", "Date")
-        status_col = _find_col(df, "status", "Status")
+    def _fingerprint(self) -> bytes:
+        """Versão dos dados desenhados: resumo de tudo o que aparece nos gráficos."""
+        f = self._funnel
+        drawn = (
+            self._status_counts.most_common() if self._has_status else None,
+            self.window,
+            self._series,
+            f.funnel() if f.total else None,
+            f.rejected,
+            [(name, f.latency[name].counts, f.latency[name].mean) for name in (FIRST_RESPONSE, DECISION)],
+        )
+        return hashlib.blake2b(pickle.dumps(drawn, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).digest()
+
+    def _ensure_composed(self):
+        """Chamado pelo canvas antes de desenhar de fato."""
+        if self._composed != self.canvas.render_version:
+            self._compose()
+            self._composed = self.canvas.render_version
+
+    def _compose(self):
+        """Monta os quatro gráficos a partir dos agregados em memória."""
 
         # Limpa e cria novos eixos
         self.fig.clear()
-        axs = self.fig.subplots(1, 2)
+        axs = self.fig.subplots(2, 2)
 
         # ==================================================================
         # GRÁFICO 1 — Candidaturas por Status
         # ==================================================================
-        ax_bar = axs[0]
+        ax_bar = axs[0][0]
         style_axes(ax_bar)
 
-        if status_col and status_col in df.columns:
-            counts = df[status_col].fillna("(sem status)").value_counts()
-            labels = list(counts.index)
-            values = list(counts.values)
+        if self._has_status:
+            counts = self._status_counts.most_common()
+            labels = [lb for lb, _ in counts]
+            values = [v for _, v in counts]
 
             status_colors = {
                 "Inscrito": PALETTE["primary"],
@@ -159,60 +431,96 @@ class DashboardGraphs:
         ax_bar.set_title("Candidaturas por Status")
 
         # ==================================================================
-        # GRÁFICO 2 — Últimos 30 dias
+        # GRÁFICO 2 — Linha do tempo (rollups)
         # ==================================================================
-        ax_line = axs[1]
+        ax_line = axs[0][1]
         style_axes(ax_line)
 
-        if date_col and date_col in df.columns:
-
-            # Normaliza datas (CORRIGIDO)
-            df[date_col] = df[date_col].apply(_normalize_date)
-            times = df.dropna(subset=[date_col]).copy()
-
-            if not times.empty:
-                times["_day"] = times[date_col].dt.date
-                series = times.groupby("_day").size()
-
-                N = 30
-                last_date = series.index.max()
-                start_date = last_date - datetime.timedelta(days=N - 1)
-
-                rng = pd.date_range(start=start_date, end=last_date)
-                rng_days = [d.date() for d in rng]
-
-                series_full = pd.Series(index=rng_days, data=0)
-                for d, v in series.items():
-                    if d in series_full.index:
-                        series_full.loc[d] = v
+        points, granularity = self._series
+
+        if points:
+            # custo fixo: no máximo MAX_POINTS pontos e poucos rótulos,
+            # qualquer que seja o período
+            shown = lttb(points, MAX_POINTS)
+            xs = [p for p, _ in shown]
+            values = [n for _, n in shown]
+
+            ax_line.plot(
+                xs,
+                values,
+                marker="o" if len(shown) <= MAX_MARKERS else None,
+                color=PALETTE["primary"],
+                linewidth=2.2,
+            )
 
-                ax_line.plot(
-                    series_full.index,
-                    series_full.values,
-                    marker="o",
-                    color=PALETTE["primary"],
-                    linewidth=2.2,
+            for x, y in labeled(shown):
+                ax_line.text(
+                    x,
+                    y,
+                    str(int(y)),
+                    ha="center",
+                    va="bottom",
+                    fontsize=8,
                 )
-
-                for x, y in zip(series_full.index, series_full.values):
-                    if y:
-                        ax_line.text(
-                            x,
-                            y,
-                            str(int(y)),
-                            ha="center",
-                            va="bottom",
-                            fontsize=8,
-                        )
+            locator = mdates.AutoDateLocator(maxticks=8)
+            ax_line.xaxis.set_major_locator(locator)
+            ax_line.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
         else:
             ax_line.text(0.5, 0.5, "Sem dados de data", ha="center")
 
-        ax_line.set_title("Vagas Recentes (últimos 30 dias)")
+        ax_line.set_title(
+            f"Candidaturas — {self.window.lower()} ({GRANULARITY_LABEL[granularity]})"
+        )
         ax_line.set_xlabel("Data")
 
-        self.fig.tight_layout()
+        self._draw_funnel(axs[1][0])
+        self._draw_latency(axs[1][1])
 
-        try:
-            self.canvas.draw()
-        except:
-            pass
+    # ----------------------------------------------------------------------
+    def _draw_funnel(self, ax):
+        """GRÁFICO 3 — Funil de contratação (barras horizontais)."""
+        style_axes(ax)
+
+        if self._funnel.total:
+            stages = self._funnel.funnel()
+            labels = [stage for stage, _, _ in reversed(stages)]
+            values = [n for _, n, _ in reversed(stages)]
+            colors = [PALETTE["success"], PALETTE["accent"], PALETTE["primary"]]
+
+            ax.barh(labels, values, color=colors)
+            for y, (_, n, pct) in enumerate(reversed(stages)):
+                ax.text(n, y, f" {n} ({pct:.0f}%)", va="center", fontsize=8)
+
+            ax.set_xlim(0, max(values) * 1.3)
+            if self._funnel.rejected:
+                ax.set_xlabel(f"Rejeitadas: {self._funnel.rejected}")
+        else:
+            ax.text(0.5, 0.5, "Sem histórico de status", ha="center")
+
+        ax.set_title("Funil de Contratação")
+
+    def _draw_latency(self, ax):
+        """GRÁFICO 4 — Tempos de resposta em faixas de dias."""
+        style_axes(ax)
+
+        series = [
+            (FIRST_RESPONSE, self._funnel.latency[FIRST_RESPONSE], PALETTE["primary"], -0.2),
+            (DECISION, self._funnel.latency[DECISION], PALETTE["accent"], 0.2),
+        ]
+
+        if any(hist.n for _, hist, _, _ in series):
+            xs = range(len(BUCKETS))
+            for name, hist, color, shift in series:
+                label = name
+                if hist.mean is not None:
+                    label += f" (média {hist.mean:.1f} d)"
+                ax.bar([x + shift for x in xs], hist.counts, width=0.4, color=color, label=label)
+
+            ax.set_xticks(list(xs))
+            ax.set_xticklabels([lb for _, lb in BUCKETS])
+            ax.set_xlabel("Dias")
+            ax.legend()
+        else:
+            ax.text(0.5, 0.5, "Sem respostas registradas", ha="center")
+
+        ax.set_title("Tempo de Resposta")
@@ -0,0 +1,103 @@
+# graphics/downsample.py
+"""
+Redução de pontos para séries longas antes de desenhar.
+
+• lttb(points, limite)  — Largest-Triangle-Three-Buckets: mantém o formato
+  visual da curva (picos e vales) com no máximo `limite` pontos;
+• peaks(points, k)      — os k maiores valores (para rotular só os picos).
+
+Com isso o custo do gráfico (linhas, marcadores e textos) depende apenas
+dos limites, não do período exibido.
+"""
+
+from typing import List, Sequence, Tuple, TypeVar
+
+
+X = TypeVar("X")
+Point = Tuple[X, float]
+
+# Limites usados pela dashboard
+MAX_POINTS = 200
+MAX_MARKERS = 60
+MAX_LABELS = 31      # até aqui todos os pontos recebem rótulo
+MAX_PEAK_LABELS = 8  # acima disso, só os picos
+
+
+def _xnum(x) -> float:
+    """Datas viram ordinais; números ficam como estão."""
+    return x.toordinal() if hasattr(x, "toordinal") else float(x)
+
+
+def lttb(points: Sequence[Point], threshold: int = MAX_POINTS) -> List[Point]:
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013).
+
+    Mantém o primeiro e o último ponto; o restante é dividido em
+    `threshold - 2` faixas e, de cada uma, fica o ponto que forma o maior
+    triângulo com o ponto escolhido antes e a média da faixa seguinte.
+
+    O LTTB sozinho pode trocar o pico da série por um vizinho; aqui a faixa
+    que contém o máximo global fica com ele (e a do mínimo, com o mínimo —
+    se os dois caírem na mesma faixa, vence o máximo).
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    xs = [_xnum(p[0]) for p in points]
+    ys = [float(p[1]) for p in points]
+
+    top = max(range(n), key=ys.__getitem__)
+    bottom = min(range(n), key=ys.__getitem__)
+
+    out = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # média da próxima faixa
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        span = max(1, nxt_end - nxt_start)
+        avg_x = sum(xs[nxt_start:nxt_end]) / span
+        avg_y = sum(ys[nxt_start:nxt_end]) / span
+
+        # faixa atual
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        if start <= top < end:
+            best = top
+        elif start <= bottom < end:
+            best = bottom
+        else:
+            ax, ay = xs[a], ys[a]
+            best, best_area = start, -1.0
+            for j in range(start, end):
+                area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+                if area > best_area:
+                    best, best_area = j, area
+
+        out.append(points[best])
+        a = best
+
+    out.append(points[-1])
+    return out
+
+
+def peaks(points: Sequence[Point], k: int = MAX_PEAK_LABELS) -> List[Point]:
+    """Os `k` pontos de maior valor (> 0), na ordem original."""
+    top = sorted(
+        (i for i, p in enumerate(points) if p[1]),
+        key=lambda i: points[i][1],
+        reverse=True,
+    )[:k]
+    return [points[i] for i in sorted(top)]
+
+
+def labeled(points: Sequence[Point]) -> List[Point]:
+    """Pontos que recebem rótulo: todos os não nulos, ou só os picos."""
+    nonzero = [p for p in points if p[1]]
+    if len(nonzero) <= MAX_LABELS:
+        return nonzero
+    return peaks(points)
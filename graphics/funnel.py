@@ -0,0 +1,193 @@
+"""
+FunnelStats — funil de contratação e tempos de resposta, calculados de
+forma incremental a partir do histórico de status (core/history.py).
+
+Cada transição atualiza contadores e histogramas em O(1); nada é
+recalculado a partir do histórico inteiro. O DashboardGraphs guarda o
+offset do log e, a cada refresh, consome só as transições novas.
+
+Funil: Inscrito → Entrevista → Contratado (quem chega a uma etapa conta
+também nas anteriores). Rejeitado encerra a candidatura sem avançar. Uma
+exclusão (history.EXCLUIDA) desfaz tudo o que a candidatura somou.
+
+Tempos (em dias):
+• "Primeira resposta": inscrição → primeiro status diferente de Inscrito;
+• "Entrevista → decisão": entrevista → Contratado/Rejeitado.
+"""
+
+import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.history import EXCLUIDA
+
+
+STAGES = ["Inscrito", "Entrevista", "Contratado"]
+RANK = {stage: i for i, stage in enumerate(STAGES)}
+CLOSED = ("Contratado", "Rejeitado")
+
+# Faixas dos histogramas: (até N dias, rótulo); a última é aberta
+BUCKETS = [(3, "0–3"), (7, "4–7"), (14, "8–14"), (30, "15–30"), (60, "31–60"), (None, "60+")]
+
+FIRST_RESPONSE = "Primeira resposta"
+DECISION = "Entrevista → decisão"
+
+
+def bucket_index(days: float) -> int:
+    for i, (limit, _) in enumerate(BUCKETS):
+        if limit is None or days <= limit:
+            return i
+    return len(BUCKETS) - 1
+
+
+def _parse_ts(value) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyHistogram:
+    """Histograma por faixas + soma/contagem para a média."""
+
+    __slots__ = ("counts", "total_days", "n")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total_days = 0.0
+        self.n = 0
+
+    def add(self, days: float):
+        days = max(0.0, days)
+        self.counts[bucket_index(days)] += 1
+        self.total_days += days
+        self.n += 1
+
+    def remove(self, days: float):
+        """Desfaz um `add(days)`."""
+        days = max(0.0, days)
+        self.counts[bucket_index(days)] -= 1
+        self.total_days -= days
+        self.n -= 1
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total_days / self.n if self.n else None
+
+
+class FunnelStats:
+    """Estado incremental do funil e dos tempos de resposta."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.reached = [0] * len(STAGES)
+        self.rejected = 0
+        self.latency = {FIRST_RESPONSE: LatencyHistogram(), DECISION: LatencyHistogram()}
+
+        # estado por candidatura
+        self._rank: Dict[str, int] = {}
+        self._applied: Dict[str, datetime.datetime] = {}
+        self._interview: Dict[str, datetime.datetime] = {}
+        self._responded = set()
+        self._closed = set()
+        self._rejected = set()
+        self._latencies: Dict[str, List[Tuple[str, float]]] = {}
+
+    # ----------------------------------------------------------------------
+    def add(self, ev: Dict):
+        rid = ev.get("id")
+        para = ev.get("para") or ""
+        if not rid:
+            return
+        if para == EXCLUIDA:
+            self._discard(rid)
+            return
+        ts = _parse_ts(ev.get("ts"))
+
+        if not ev.get("de") and rid not in self._rank:
+            # inscrição; se já chegou com outro status (importação), o tempo
+            # até esse status é desconhecido
+            self._rank[rid] = -1
+            if ts is not None:
+                self._applied[rid] = ts
+            ts = None
+
+        self._advance(rid, para)
+
+        if para in ("", "Inscrito"):
+            return
+
+        # tempo até a primeira resposta
+        if rid not in self._responded:
+            self._responded.add(rid)
+            if ts is not None and rid in self._applied:
+                self._latency(rid, FIRST_RESPONSE, _days(self._applied[rid], ts))
+
+        if para == "Entrevista" and ts is not None:
+            self._interview.setdefault(rid, ts)
+
+        if para in CLOSED and rid not in self._closed:
+            self._closed.add(rid)
+            if para == "Rejeitado":
+                self.rejected += 1
+                self._rejected.add(rid)
+            start = self._interview.get(rid)
+            if ts is not None and start is not None:
+                self._latency(rid, DECISION, _days(start, ts))
+
+    def _latency(self, rid: str, name: str, days: float):
+        self.latency[name].add(days)
+        self._latencies.setdefault(rid, []).append((name, days))
+
+    def _discard(self, rid: str):
+        """Candidatura excluída: tira das etapas, das rejeitadas e dos tempos."""
+        for i in range(self._rank.pop(rid, -1) + 1):
+            self.reached[i] -= 1
+        if rid in self._rejected:
+            self._rejected.discard(rid)
+            self.rejected -= 1
+        for name, days in self._latencies.pop(rid, ()):
+            self.latency[name].remove(days)
+        self._applied.pop(rid, None)
+        self._interview.pop(rid, None)
+        self._responded.discard(rid)
+        self._closed.discard(rid)
+
+    def _advance(self, rid: str, status: str):
+        """Marca a etapa (e as anteriores) como alcançada uma única vez."""
+        new = RANK.get(status)
+        if new is None:
+            # Rejeitado (ou status desconhecido) conta como inscrito
+            new = 0
+        old = self._rank.get(rid, -1)
+        for i in range(old + 1, new + 1):
+            self.reached[i] += 1
+        if new > old:
+            self._rank[rid] = new
+
+    def consume(self, events: Iterable[Dict], offset: Optional[int] = None, reset: bool = False):
+        """Aplica um lote de transições (`reset` descarta o estado antes)."""
+        if reset:
+            self.reset()
+        for ev in events:
+            self.add(ev)
+        if offset is not None:
+            self.offset = offset
+
+    # ----------------------------------------------------------------------
+    def funnel(self) -> List[Tuple[str, int, float]]:
+        """[(etapa, quantidade, % das inscrições)]."""
+        base = self.reached[0] or 1
+        return [(stage, n, 100.0 * n / base) for stage, n in zip(STAGES, self.reached)]
+
+    @property
+    def total(self) -> int:
+        return self.reached[0]
+
+
+def _days(start: datetime.datetime, end: datetime.datetime) -> float:
+    return (end - start).total_seconds() / 86400.0
@@ -14,18 +14,26 @@ PALETTE = {
 }
 
 
+RC_STYLE = {
+    "figure.facecolor": "white",
+    "axes.titlesize": 12,
+    "axes.labelsize": 10,
+    "xtick.labelsize": 9,
+    "ytick.labelsize": 9,
+    "legend.fontsize": 9,
+    "font.family": "sans-serif",
+    "font.sans-serif": ["DejaVu Sans", "Arial", "Liberation Sans"],
+}
+
+
 def apply_rc_style():
     """Aplica configurações globais de estilo ao matplotlib."""
-    mpl.rcParams.update({
-        "figure.facecolor": "white",
-        "axes.titlesize": 12,
-        "axes.labelsize": 10,
-        "xtick.labelsize": 9,
-        "ytick.labelsize": 9,
-        "legend.fontsize": 9,
-        "font.family": "sans-serif",
-        "font.sans-serif": ["DejaVu Sans", "Arial", "Liberation Sans"],
-    })
+    mpl.rcParams.update(RC_STYLE)
+
+
+def theme_key() -> str:
+    """Identifica o visual atual (paleta + estilo + dpi) — parte da chave do cache de figuras."""
+    return repr((sorted(PALETTE.items()), sorted(RC_STYLE.items()), mpl.rcParams["figure.dpi"]))
 
 
 def style_axes(ax):
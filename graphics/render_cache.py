@@ -0,0 +1,158 @@
+# graphics/render_cache.py
+"""
+Cache das figuras já rasterizadas da dashboard.
+
+Voltar para a "Visão Geral" recria a tela e desenha os quatro gráficos do
+zero; redimensionar a janela (ou maximizar e voltar) redesenha tudo a cada
+tamanho. Quando nem os dados nem o tamanho mudaram, o resultado é o mesmo
+bitmap. Aqui ele fica guardado:
+
+• chave   — (versão dos dados desenhados, largura, altura, tema), com a
+            versão sendo uma impressão digital dos agregados exibidos
+            (`DashboardGraphs._fingerprint`) e o tema a de `theme_key()`;
+• valor   — o buffer RGBA do Agg (largura × altura × 4 bytes);
+• limite  — LRU por bytes: MEU_EMPREGO_RENDER_CACHE_MB (padrão 64; 0 desliga).
+
+`CachedCanvasTkAgg` consulta o cache antes de cada `draw()`: num acerto o
+bitmap é copiado para o buffer do renderer (`get_renderer()`), como se o
+Agg o tivesse desenhado, e vai para a tela pelo `blit()` público do
+FigureCanvasTkAgg — o mesmo passo que segue um desenho; só um erro monta
+os eixos (`before_render`) e chama o Matplotlib. O cache é do processo e
+sobrevive à troca de tela.
+
+Custo de um desenho completo × um acerto no cache:
+
+    python -m bench.render_cache
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+try:
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+except Exception:
+    FigureCanvasTkAgg = None
+
+
+DEFAULT_MB = 64
+
+
+class RenderCache:
+    """LRU chave → buffer RGBA (numpy uint8, altura × largura × 4), limitado em bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            rgba = self._items.get(key)
+            if rgba is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return rgba
+
+    def put(self, key: Hashable, rgba):
+        """Guarda uma cópia de `rgba` (o buffer do Agg é reaproveitado no próximo desenho)."""
+        rgba = np.array(rgba, dtype=np.uint8, copy=True)
+        if rgba.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._items[key] = rgba
+            self.nbytes += rgba.nbytes
+            while self.nbytes > self.max_bytes:
+                _, dropped = self._items.popitem(last=False)
+                self.nbytes -= dropped.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+_shared: Optional[RenderCache] = None
+
+
+def shared_cache() -> RenderCache:
+    """Cache do processo (o tamanho vem do ambiente na primeira chamada)."""
+    global _shared
+    if _shared is None:
+        mb = float(os.getenv("MEU_EMPREGO_RENDER_CACHE_MB", str(DEFAULT_MB)))
+        _shared = RenderCache(int(max(0.0, mb) * 1024 * 1024))
+    return _shared
+
+
+# --------------------------------------------------------------------------
+# CANVAS
+# --------------------------------------------------------------------------
+class _CachedDraw:
+    """
+    Mistura para canvases Agg: `draw()` procura o bitmap no cache.
+
+    Quem usa define `render_version` (None = não usar o cache, ex.: antes
+    do primeiro desenho), `theme` e `before_render` (monta os eixos; só é
+    chamado quando o Matplotlib vai mesmo desenhar).
+    """
+
+    render_cache: Optional[RenderCache] = None
+    render_version: Optional[Hashable] = None
+    theme: Hashable = ""
+    before_render: Optional[Callable[[], None]] = None
+
+    def render_key(self) -> Optional[Tuple]:
+        if self.render_cache is None or self.render_version is None:
+            return None
+        w, h = self.figure.bbox.size
+        return (self.render_version, int(w), int(h), self.theme)  # = tamanho do RendererAgg
+
+    def draw(self):
+        key = self.render_key()
+        if key is not None:
+            rgba = self.render_cache.get(key)
+            if rgba is not None and rgba.shape[:2] == (key[2], key[1]):
+                self._show(rgba)
+                return
+
+        if self.before_render is not None:
+            self.before_render()
+        super().draw()
+        if key is not None:
+            self.render_cache.put(key, self.buffer_rgba())
+
+    def _show(self, rgba: np.ndarray):
+        """Põe um bitmap do cache no buffer do renderer (o do tamanho atual da figura)."""
+        np.copyto(np.asarray(self.get_renderer().buffer_rgba()), rgba)
+
+
+class CachedCanvasAgg(_CachedDraw, FigureCanvasAgg):
+    """Canvas só em memória (benchmark, testes sem Tk)."""
+
+
+if FigureCanvasTkAgg is not None:
+
+    class CachedCanvasTkAgg(_CachedDraw, FigureCanvasTkAgg):
+        """FigureCanvasTkAgg que reaproveita bitmaps do cache."""
+
+        def _show(self, rgba: np.ndarray):
+            super()._show(rgba)
+            self.blit()  # buffer do renderer → PhotoImage do canvas
+
+else:
+    CachedCanvasTkAgg = None
@@ -0,0 +1 @@
+"""Testes dos gráficos (backend Agg, sem tela)."""
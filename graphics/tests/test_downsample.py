@@ -0,0 +1,42 @@
+"""LTTB: extremos, tamanho da saída, ordem em x e os picos da série."""
+
+import datetime
+import random
+
+import pytest
+
+from graphics.downsample import lttb
+
+
+def _series(n, seed=7):
+    rnd = random.Random(seed)
+    start = datetime.date(2020, 1, 1)
+    return [(start + datetime.timedelta(days=i), rnd.randint(0, 5)) for i in range(n)]
+
+
+@pytest.mark.parametrize("n, threshold", [(3650, 200), (1000, 3), (250, 200), (201, 200)])
+def test_shape(n, threshold):
+    points = _series(n)
+    out = lttb(points, threshold)
+
+    assert len(out) == threshold
+    assert out[0] == points[0] and out[-1] == points[-1]
+    xs = [x for x, _ in out]
+    assert xs == sorted(xs) and len(set(xs)) == len(xs)
+
+
+def test_keeps_global_max_and_min():
+    # zigue-zague 0/1 com um pico e um vale pouco acima/abaixo: o LTTB puro
+    # fica com qualquer 1 (ou 0) da faixa, não necessariamente com eles
+    points = [(i, float(i % 2)) for i in range(1000)]
+    points[401] = (401, 1.2)
+    points[600] = (600, -0.2)
+
+    out = lttb(points, 50)
+    assert (401, 1.2) in out and (600, -0.2) in out
+    assert len(out) == 50
+
+
+def test_short_series_untouched():
+    points = _series(10)
+    assert lttb(points, 200) == points
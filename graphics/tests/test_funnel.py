@@ -0,0 +1,29 @@
+"""Funil incremental: uma exclusão desfaz etapas, rejeições e tempos."""
+
+import pytest
+
+from core.history import deletion, transition
+from graphics.funnel import DECISION, FIRST_RESPONSE, FunnelStats
+
+
+def test_deletion_undoes_rejection_and_latencies():
+    funnel = FunnelStats()
+    funnel.consume([
+        transition("a", "", "Inscrito", "2024-03-01T00:00:00"),
+        transition("a", "Inscrito", "Entrevista", "2024-03-05T00:00:00"),
+        transition("a", "Entrevista", "Rejeitado", "2024-03-15T00:00:00"),
+        transition("b", "", "Inscrito", "2024-03-02T00:00:00"),
+        transition("b", "Inscrito", "Entrevista", "2024-03-04T00:00:00"),
+    ])
+    assert (funnel.reached, funnel.rejected) == ([2, 2, 0], 1)
+    assert funnel.latency[DECISION].mean == pytest.approx(10)
+
+    funnel.add(deletion("a", "Rejeitado", "2024-04-01T00:00:00"))
+    assert (funnel.reached, funnel.rejected) == ([1, 1, 0], 0)
+    assert funnel.latency[DECISION].n == 0 and funnel.latency[DECISION].mean is None
+    assert funnel.latency[FIRST_RESPONSE].mean == pytest.approx(2)
+    assert sum(funnel.latency[DECISION].counts) == 0
+
+    # exclusão de quem o funil nunca viu não mexe em nada
+    funnel.add(deletion("x", "", None))
+    assert funnel.reached == [1, 1, 0]
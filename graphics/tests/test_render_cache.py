@@ -0,0 +1,57 @@
+"""Cache de bitmaps: acerto igual ao desenho, chave por tamanho, limite em bytes."""
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from graphics.render_cache import CachedCanvasAgg, RenderCache
+
+
+def _canvas(cache, calls):
+    fig = Figure(figsize=(3, 2), dpi=50)
+    canvas = CachedCanvasAgg(fig)
+    canvas.render_cache = cache
+    canvas.render_version = "v1"
+
+    def compose():
+        calls.append(1)
+        fig.clear()
+        fig.add_subplot().bar(["a", "b"], [3, 5])
+
+    canvas.before_render = compose
+    return canvas
+
+
+def test_hit_restores_drawn_bitmap():
+    cache, calls = RenderCache(), []
+    canvas = _canvas(cache, calls)
+    canvas.draw()
+    drawn = np.array(canvas.buffer_rgba())
+
+    np.asarray(canvas.get_renderer().buffer_rgba())[:] = 0
+    canvas.draw()
+
+    assert len(calls) == 1 and cache.hits == 1
+    assert np.array_equal(np.asarray(canvas.buffer_rgba()), drawn)
+
+
+def test_new_version_or_size_draws_again():
+    cache, calls = RenderCache(), []
+    canvas = _canvas(cache, calls)
+    canvas.draw()
+
+    canvas.render_version = "v2"
+    canvas.draw()
+    canvas.figure.set_size_inches(4, 2)
+    canvas.draw()
+
+    assert len(calls) == 3 and len(cache) == 3
+
+
+def test_lru_bytes_limit():
+    one = np.zeros((10, 10, 4), np.uint8)
+    cache = RenderCache(max_bytes=2 * one.nbytes)
+    for key in "abc":
+        cache.put(key, one)
+
+    assert cache.get("a") is None and cache.get("c") is not None
+    assert cache.nbytes == 2 * one.nbytes
@@ -0,0 +1,219 @@
+# meu_emprego.py
+"""
+Meu Emprego — linha de comando, sem interface gráfica.
+
+Para scripts, cron e consultas rápidas. Usa o mesmo DataStore da
+aplicação (MongoDB ou CSV, conforme o .env), mas não importa tkinter,
+matplotlib, pandas nem pyarrow: no modo CSV, `stats` numa base de alguns
+milhares de candidaturas responde em cerca de 0,1 s.
+
+    python -m meu_emprego add --empresa "ACME" --cargo "Dev Python" --link https://...
+    python -m meu_emprego list --since 2025-11-01 --status Entrevista --limit 20
+    python -m meu_emprego stats
+    python -m meu_emprego export candidaturas.csv --status Inscrito
+    python -m meu_emprego arquivar
+
+Contagens vêm dos caminhos rápidos do DataStore: `count_documents` /
+`$group` no Mongo; índice, manifest e rollups no CSV — a contagem por status
+lê os registros em fluxo, sem a cópia colunar da dashboard.
+
+list, stats e export leem só as candidaturas não arquivadas; `--arquivadas`
+inclui as do nível frio (ver core/archive.py).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from core.dates import format_br, parse_date
+from core.importer import STATUS_ALIASES, TIPO_ALIASES, _norm_name
+
+
+def _date_arg(value: str) -> datetime.date:
+    d = parse_date(value)
+    if d is None:
+        raise argparse.ArgumentTypeError(f"data inválida: {value!r} (use AAAA-MM-DD ou DD-MM-AAAA)")
+    return d
+
+
+def _filters(args) -> dict:
+    filters = {"date_from": args.since, "date_to": args.until}
+    if args.status:
+        filters["status"] = STATUS_ALIASES.get(_norm_name(args.status), args.status)
+    return filters
+
+
+# --------------------------------------------------------------------------
+# COMANDOS
+# --------------------------------------------------------------------------
+def cmd_add(datastore, args) -> int:
+    doc = {
+        "empresa": args.empresa.strip(),
+        "cargo": args.cargo.strip(),
+        "data": args.data.isoformat(),
+        "tipo": TIPO_ALIASES.get(_norm_name(args.tipo), args.tipo),
+        "status": STATUS_ALIASES.get(_norm_name(args.status), args.status),
+        "observacoes": args.obs,
+        "link": args.link,
+    }
+    res = datastore.insert_candidatura(doc, on_duplicate="merge" if args.mesclar else "reject")
+
+    if not res.get("ok"):
+        msg = res.get("msg", "Não foi possível salvar.")
+        if res.get("duplicate") and res.get("id"):
+            msg = f"{msg}\n{res['id']}  (use --mesclar para completar o registro existente)"
+        print(msg, file=sys.stderr)
+        return 1
+    if res.get("merged"):
+        print(f"{res['id']}  já cadastrada — registro existente atualizado ({res.get('backend')})")
+    else:
+        print(f"{res['id']}  salva ({res.get('backend')})")
+    return 0
+
+
+def cmd_list(datastore, args) -> int:
+    rows = datastore.iter_candidaturas(
+        _filters(args), sort="-data", limit=args.limit or None, include_archived=args.arquivadas
+    )
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+
+    n = 0
+    for row in rows:
+        print(
+            f"{format_br(row.get('data')):10}  {row.get('status', '')[:12]:12}  "
+            f"{row.get('empresa', '')[:28]:28}  {row.get('cargo', '')[:32]:32}  {row.get('id', '')}"
+        )
+        n += 1
+    if not n:
+        print("Nenhuma candidatura encontrada.")
+    return 0
+
+
+def cmd_stats(datastore, args) -> int:
+    from core.rollups import MONTH
+
+    total = datastore.count_candidaturas(include_archived=args.arquivadas)
+    print(f"Candidaturas: {total:,}" + ("" if args.arquivadas else " (sem as arquivadas)"))
+
+    by_status = sorted(
+        datastore.count_by_status(include_archived=args.arquivadas, columnar=False).items(),
+        key=lambda kv: -kv[1],
+    )
+    if by_status:
+        print("\nPor status:")
+        for status, n in by_status:
+            print(f"  {status or '(sem status)':14} {n:>7,}")
+
+    recent, _ = datastore.rollup_series("30 dias")
+    print(f"\nÚltimos 30 dias: {sum(n for _, n in recent):,}")
+
+    months, g = datastore.rollup_series("Tudo")
+    if g == MONTH and months:
+        print("\nÚltimos meses:")
+        for start, n in months[-args.meses:]:
+            print(f"  {start:%m/%Y}  {n:>7,}")
+    return 0
+
+
+def cmd_export(datastore, args) -> int:
+    total = datastore.export_csv(
+        args.arquivo, _filters(args), sort="-data", include_archived=args.arquivadas
+    )
+    if not total:
+        print("Nenhuma candidatura para exportar.", file=sys.stderr)
+        return 1
+    print(f"{total:,} candidaturas exportadas → {args.arquivo}")
+    return 0
+
+
+def cmd_archive(datastore, args) -> int:
+    if not datastore.archive_policy.enabled:
+        print("Arquivamento desligado: defina MEU_EMPREGO_ARCHIVE_DAYS (ex.: 180).", file=sys.stderr)
+        return 1
+    res = datastore.archive_old()
+    if not res.get("ok"):
+        print(res.get("msg", "Falha no arquivamento."), file=sys.stderr)
+        return 1
+    print(f"Arquivadas: {res['mongo']:,} no Mongo, {res['csv']:,} no CSV")
+    return 0
+
+
+# --------------------------------------------------------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m meu_emprego",
+        description="Meu Emprego pela linha de comando (sem abrir a interface).",
+    )
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    add = sub.add_parser("add", help="cadastra uma candidatura")
+    add.add_argument("--empresa", required=True)
+    add.add_argument("--cargo", required=True)
+    add.add_argument("--data", type=_date_arg, default=datetime.date.today(), help="padrão: hoje")
+    add.add_argument("--tipo", default="", help="Presencial, Remoto ou Híbrido")
+    add.add_argument("--status", default="Inscrito")
+    add.add_argument("--obs", default="", help="observações")
+    add.add_argument("--link", default="")
+    add.add_argument("--mesclar", action="store_true", help="se já existir, completa o registro existente")
+
+    def add_filters(p):
+        p.add_argument("--since", type=_date_arg, help="a partir desta data (inclusive)")
+        p.add_argument("--until", type=_date_arg, help="até esta data (inclusive)")
+        p.add_argument("--status", help="só este status")
+        p.add_argument("--arquivadas", action="store_true", help="inclui as candidaturas arquivadas")
+
+    ls = sub.add_parser("list", help="lista as candidaturas, mais recentes primeiro")
+    add_filters(ls)
+    ls.add_argument("--limit", type=int, default=20, help="0 = todas (padrão: 20)")
+    ls.add_argument("--json", action="store_true", help="uma linha JSON por candidatura")
+
+    st = sub.add_parser("stats", help="totais por status e por período")
+    st.add_argument("--meses", type=int, default=6, help="meses exibidos (padrão: 6)")
+    st.add_argument("--arquivadas", action="store_true", help="inclui as candidaturas arquivadas")
+
+    ex = sub.add_parser("export", help="exporta para CSV (UTF-8, abre no Excel)")
+    ex.add_argument("arquivo")
+    add_filters(ex)
+
+    sub.add_parser("arquivar", help="move as candidaturas antigas/encerradas para o arquivo")
+
+    return parser
+
+
+COMMANDS = {
+    "add": cmd_add,
+    "list": cmd_list,
+    "stats": cmd_stats,
+    "export": cmd_export,
+    "arquivar": cmd_archive,
+}
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    load_dotenv(".env")
+    from core.datastore import DataStore
+
+    datastore = DataStore(
+        mongo_uri=os.environ.get("MEU_EMPREGO_MONGO_URI", ""),
+        db_name=os.environ.get("MEU_EMPREGO_DB_NAME", "meu_emprego"),
+    )
+    try:
+        return COMMANDS[args.cmd](datastore, args)
+    except BrokenPipeError:  # ex.: `| head`
+        return 0
+    finally:
+        datastore.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
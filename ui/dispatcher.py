@@ -0,0 +1,50 @@
+"""
+TkDispatcher — entrega callbacks de outras threads na thread do Tkinter.
+
+Widgets Tk só podem ser tocados pela thread principal. Threads de trabalho
+chamam `post(callback, *args)` (thread-safe); a fila é drenada a cada
+poucos milissegundos por um laço `after()` na janela principal.
+"""
+
+import queue
+import traceback
+
+
+class TkDispatcher:
+    """Fila de callbacks drenada pelo `after()` da janela raiz."""
+
+    def __init__(self, root, interval_ms: int = 20):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue: "queue.Queue" = queue.Queue()
+        self._after = None
+        self._drain()
+
+    def post(self, callback, *args):
+        """Agenda `callback(*args)` na thread do Tkinter (pode ser chamado de qualquer thread)."""
+        self._queue.put((callback, args))
+
+    def _drain(self):
+        while True:
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception:
+                # uma tela fechada antes da resposta não derruba o laço
+                traceback.print_exc()
+
+        try:
+            self._after = self.root.after(self.interval_ms, self._drain)
+        except Exception:
+            self._after = None  # janela destruída
+
+    def stop(self):
+        if self._after is not None:
+            try:
+                self.root.after_cancel(self._after)
+            except Exception:
+                pass
+            self._after = None
@@ -7,14 +7,27 @@ Funções principais:
 - Controlar o painel dinâmico
 - Atualizar a tela ativa com o botão ↻
 - Testar conexão com o MongoDB via botão 🌐
+- Mostrar no rodapé o backend ativo (atualizado quando o Mongo cai/volta)
+- Repassar mudanças ao vivo para a tela aberta e para o contador: as
+  gravações deste processo (EventBus do DataStore, core/events.py) e as de
+  outros processos (change streams / CSV, core/changefeed.py)
 - Exportar CSV
+- Importar planilhas/exportações (CSV, XLSX, JSON) em segundo plano
+- Acessar o DataStore fora da thread do Tk (AsyncDataStore + TkDispatcher)
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 import tkinter.font as tkfont
 
+from core.asyncstore import AsyncDataStore
+from core.changefeed import ChangeFeed, feed_enabled
 from core.datastore import DataStore
+from core.events import DELETED, INSERTED, UPDATED, VersionTracker
+from core.importer import import_file
+from ui.dispatcher import TkDispatcher
 from ui.widgets import BaseFrame, InfoLabel, ActionButton
 
 # Importa as telas SPA
@@ -35,6 +48,10 @@ class MainWindow:
         self.root = root
         self.datastore = datastore
 
+        # consultas e gravações rodam num pool; as respostas voltam via after()
+        self.dispatcher = TkDispatcher(self.root)
+        self.async_store = AsyncDataStore(self.datastore, deliver=self.dispatcher.post)
+
         self.root.title("Meu Emprego – Visão Geral")
 
         # Fontes do título (com suporte a responsividade)
@@ -52,11 +69,19 @@ class MainWindow:
 
         self._resize_after = None
         self._last_title_sz = None
+        self._backend_after = None
+        self._feed_after = None
+        # contador: o último total conhecido até a recontagem chegar
+        snap = self.datastore.load_snapshot()
+        self._total = snap["total"] if snap else 0
+        self._counted = VersionTracker()
+        self._importing = False
 
         # referências da UI
         self.summary_label: ttk.Label | None = None
         self.content_frame: ttk.Frame | None = None
         self.current_view: ttk.Frame | None = None
+        self.backend_label: ttk.Label | None = None
 
         # constrói layout
         self._build_layout()
@@ -67,6 +92,21 @@ class MainWindow:
         # responsividade do título
         self.root.bind("<Configure>", self._on_root_resize)
 
+        # rodapé acompanha o estado do Mongo (health-check roda em outra thread)
+        self._poll_backend()
+
+        # atualização ao vivo: gravações deste processo chegam pelo barramento
+        # do DataStore (na thread que gravou → thread do Tk); as de outros
+        # processos, pelo ChangeFeed
+        self._unsubscribe = self.datastore.events.subscribe(
+            lambda events: self.dispatcher.post(self._deliver_changes, events)
+        )
+        self.feed = ChangeFeed(self.datastore) if feed_enabled() else None
+        if self.feed is not None:
+            self.feed.start()
+            self._poll_changes()
+        self.root.bind("<Destroy>", self._on_destroy, add="+")
+
     # =====================================================================
     # LAYOUT BASE
     # =====================================================================
@@ -90,8 +130,6 @@ class MainWindow:
             row=0, column=0, pady=(0, 4), sticky="w", columnspan=2
         )
 
-        backend = "MongoDB" if self.datastore.use_mongo else "CSV (fallback)"
-
         # Linha de metadados (apenas ícones aqui). Backend mostrado no rodapé.
         # Mantemos espaço para os ícones no topo direito.
         # (O label de 'Candidaturas' será criado pela view do Dashboard)
@@ -137,6 +175,9 @@ class MainWindow:
         ActionButton(nav, text="Exportar CSV", command=self.export_csv).grid(
             row=3, column=0, sticky="ew", pady=4
         )
+        ActionButton(nav, text="Importar Arquivo", command=self.import_file).grid(
+            row=4, column=0, sticky="ew", pady=4
+        )
 
         # -------------------------------------------------------------
         # Painel dinâmico (SPA)
@@ -149,7 +190,8 @@ class MainWindow:
         # Rodapé: mostra o backend/pendência atual
         footer = ttk.Frame(frame_root)
         footer.grid(row=3, column=0, sticky="w", columnspan=2, pady=(8, 0))
-        InfoLabel(footer, text=f"Conectado ao {backend}", font=("TkDefaultFont", 9)).pack(side="left")
+        self.backend_label = InfoLabel(footer, text=self._backend_text(), font=("TkDefaultFont", 9))
+        self.backend_label.pack(side="left")
 
     # =====================================================================
     # TROCA DE TELAS (SPA)
@@ -165,12 +207,13 @@ class MainWindow:
                 pass
 
         # Cria nova tela
-        self.current_view = view_cls(self.content_frame, self.datastore)
+        self.current_view = view_cls(self.content_frame, self.datastore, self.async_store)
         self.current_view.grid(row=0, column=0, sticky="nsew")
 
         self.summary_label = getattr(self.current_view, "summary_label", self.summary_label)
 
         # Atualiza o contador no cabeçalho
+        self._show_summary()
         self._update_summary()
 
     def show_dashboard(self):
@@ -186,20 +229,103 @@ class MainWindow:
     # RESUMO (CANDIDATURAS)
     # =====================================================================
     def _update_summary(self):
-        try:
-            total = len(self.datastore.list_candidaturas() or [])
-        except Exception:
-            total = 0
+        """Recontagem em segundo plano (pedidos repetidos são coalescidos)."""
+        self.async_store.submit(
+            self.datastore.events.consistent,
+            self.datastore.count_candidaturas,
+            key="summary",
+            callback=self._on_count,
+            errback=lambda e: self._on_count((0, None)),
+        )
 
+    def _on_count(self, result):
+        total, version = result
+        self._total = total or 0
+        # gravações publicadas durante a contagem
+        replay = [self._count(ev) for ev in self._counted.loaded(version)]
+        if not all(replay):
+            self._update_summary()
+        self._show_summary()
+
+    def _count(self, ev) -> bool:
+        """Aplica um evento ao contador; False se só uma recontagem resolve."""
+        if ev.kind == INSERTED:
+            self._total += 1
+        elif ev.kind == DELETED and ev.previous is not None:
+            self._total -= 1
+        elif ev.kind != UPDATED:
+            return False
+        return True
+
+    def _show_summary(self):
         if self.summary_label is not None:
-            self.summary_label.config(text=f"Candidaturas: {total}")
+            try:
+                self.summary_label.config(text=f"Candidaturas: {self._total}")
+            except Exception:
+                pass
+
+    # =====================================================================
+    # ATUALIZAÇÃO AO VIVO
+    # =====================================================================
+    def _poll_changes(self):
+        """Drena o ChangeFeed (sem o eco das gravações deste processo)."""
+        events = [ev for ev in self.feed.poll() if not self.datastore.events.claim(ev)]
+        self._deliver_changes(events)
+
+        self._feed_after = self.root.after(250, self._poll_changes)
+
+    def _deliver_changes(self, events):
+        """Atualiza o contador e entrega os eventos à tela aberta."""
+        if not events:
+            return
+
+        counted = [self._count(ev) for ev in self._counted.fresh(events)]
+        if not all(counted):
+            self._update_summary()
+        self._show_summary()
+
+        handler = getattr(self.current_view, "apply_changes", None)
+        if handler is not None:
+            try:
+                handler(events)
+            except Exception:
+                pass
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self.root:
+            return
+        self._unsubscribe()
+        if self.feed is not None:
+            self.feed.stop()
+        self.dispatcher.stop()
+        self.async_store.shutdown()
+
+    # =====================================================================
+    # BACKEND ATIVO (RODAPÉ)
+    # =====================================================================
+    def _backend_text(self) -> str:
+        backend = "MongoDB" if self.datastore.use_mongo else "CSV (fallback)"
+        return f"Conectado ao {backend}"
+
+    def _poll_backend(self):
+        """Relê o estado da conexão periodicamente (leitura barata, sem rede)."""
+        if self.backend_label is not None and not self._importing:
+            text = self._backend_text()
+            if self.backend_label.cget("text") != text:
+                self.backend_label.config(text=text)
+
+        self._backend_after = self.root.after(2000, self._poll_backend)
 
     # =====================================================================
     # AÇÕES GERAIS
     # =====================================================================
     def _on_test_connection(self):
-        """Ícone 🌐 — testa conexão com MongoDB."""
-        res = self.datastore.test_connection()
+        """Ícone 🌐 — testa conexão com MongoDB (e tenta religar) sem travar a janela."""
+        self.async_store.call("test_connection", key="test_connection", callback=self._on_connection_result)
+
+    def _on_connection_result(self, res):
+        if self.backend_label is not None:
+            self.backend_label.config(text=self._backend_text())
         if res.get("ok"):
             messagebox.showinfo(
                 "Conexão", f"Conectado ao MongoDB {res.get('server')}"
@@ -226,36 +352,88 @@ class MainWindow:
     # EXPORTAR CSV
     # =====================================================================
     def export_csv(self):
-        """Exporta todos os registros para um arquivo CSV."""
+        """Exporta todos os registros para um arquivo CSV (gravado em fluxo, fora da thread do Tk)."""
 
-        try:
-            rows = self.datastore.list_candidaturas()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao obter dados:\n{e}")
+        from tkinter.filedialog import asksaveasfilename
+
+        path = asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            title="Salvar como...",
+        )
+        if not path:
             return
 
-        if not rows:
+        # sem `key`: cada exportação pedida tem a sua confirmação (ou erro)
+        self.async_store.call(
+            "export_csv",
+            path,
+            callback=lambda n: self._on_exported(path, n),
+            errback=lambda e: messagebox.showerror("Erro", f"Falha ao exportar:\n{e}"),
+        )
+
+    def _on_exported(self, path: str, total: int):
+        if not total:
             messagebox.showinfo("Exportação", "Não há dados para exportar.")
             return
+        messagebox.showinfo("Exportação", f"{total} registros salvos em:\n{path}")
 
-        try:
-            import pandas as pd
-            from tkinter.filedialog import asksaveasfilename
+    # =====================================================================
+    # IMPORTAR ARQUIVO
+    # =====================================================================
+    def import_file(self):
+        """Importa um arquivo em lotes numa thread; o rodapé mostra o progresso."""
 
-            path = asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv")],
-                title="Salvar como...",
-            )
+        from tkinter.filedialog import askopenfilename
+
+        path = askopenfilename(
+            title="Importar candidaturas",
+            filetypes=[
+                ("Planilhas e exportações", "*.csv *.xlsx *.json *.jsonl"),
+                ("Todos os arquivos", "*.*"),
+            ],
+        )
+        if not path or self._importing:
+            return
 
-            if not path:
-                return
+        self._importing = True
+        updates: "queue.Queue" = queue.Queue()
 
-            pd.DataFrame(rows).to_csv(path, index=False, encoding="utf-8-sig")
-            messagebox.showinfo("Exportação", f"Arquivo salvo em:\n{path}")
+        def worker():
+            try:
+                report = import_file(
+                    self.datastore,
+                    path,
+                    progress=lambda r: updates.put(("progress", r.lidos)),
+                )
+                updates.put(("done", report))
+            except Exception as e:
+                updates.put(("error", e))
+
+        threading.Thread(target=worker, name="importer", daemon=True).start()
+        self._poll_import(updates)
+
+    def _poll_import(self, updates: "queue.Queue"):
+        while True:
+            try:
+                kind, value = updates.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                self.backend_label.config(text=f"Importando... {value:,} linhas lidas")
+                continue
+
+            self._importing = False
+            self.backend_label.config(text=self._backend_text())
+            if kind == "error":
+                messagebox.showerror("Importação", f"Falha ao importar:\n{value}")
+            else:
+                messagebox.showinfo("Importação", value.resumo())
+                self._on_refresh_current_view()
+            return
 
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao exportar:\n{e}")
+        self.root.after(200, self._poll_import, updates)
 
     # =====================================================================
     # RESPONSIVIDADE DO TÍTULO
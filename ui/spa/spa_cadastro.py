@@ -4,22 +4,25 @@ SPACadastro — Tela SPA responsável pelo cadastro de novas candidaturas.
 - Fonte  (tema gerencia fonte global, campos herdam automaticamente).
 - Layout alinhado, campos organizados e espaçados.
 - refresh local (refresh é o ↻ global no header).
+- Empresa e Cargo sugerem os valores já cadastrados enquanto se digita
+  (mais frequentes primeiro; ver core/autocomplete.py).
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
 
-from ui.widgets import InfoLabel
+from ui.widgets import AutocompleteEntry, InfoLabel
 
 
 class SPACadastro(ttk.Frame):
     """Painel SPA de cadastro de candidatura."""
 
-    def __init__(self, parent, datastore):
+    def __init__(self, parent, datastore, async_store):
         super().__init__(parent, padding=16)
 
         self.datastore = datastore
+        self.async_store = async_store  # gravação fora da thread do Tk
 
         # Layout responsivo
         self.columnconfigure(1, weight=1)
@@ -27,6 +30,10 @@ class SPACadastro(ttk.Frame):
 
         self._build()
 
+        # sugestões de empresa/cargo: carga em segundo plano (na primeira
+        # vez, lê o CSV; depois, só o arquivo de sugestões)
+        self.async_store.submit(self.datastore.load_suggestions, key="cadastro.sugestoes")
+
     # =====================================================================
     # LAYOUT DO FORMULÁRIO
     # =====================================================================
@@ -43,14 +50,22 @@ class SPACadastro(ttk.Frame):
             row=1, column=0, sticky="w", pady=4
         )
         self.empresa_var = tk.StringVar()
-        ttk.Entry(self, textvariable=self.empresa_var).grid(
+        AutocompleteEntry(
+            self,
+            suggest=lambda text: self.datastore.suggest("empresa", text),
+            textvariable=self.empresa_var,
+        ).grid(
             row=1, column=1, sticky="ew", padx=(0, 4)
         )
 
         # Cargo
         ttk.Label(self, text="Cargo:").grid(row=2, column=0, sticky="w", pady=4)
         self.cargo_var = tk.StringVar()
-        ttk.Entry(self, textvariable=self.cargo_var).grid(
+        AutocompleteEntry(
+            self,
+            suggest=lambda text: self.datastore.suggest("cargo", text),
+            textvariable=self.cargo_var,
+        ).grid(
             row=2, column=1, sticky="ew", padx=(0, 4)
         )
 
@@ -116,11 +131,12 @@ class SPACadastro(ttk.Frame):
         btn_frame = ttk.Frame(self)
         btn_frame.grid(row=8, column=1, sticky="e", pady=(12, 0))
 
-        ttk.Button(
+        self.save_btn = ttk.Button(
             btn_frame,
             text="Salvar",
             command=self._on_submit,
-        ).pack(side="left", padx=6)
+        )
+        self.save_btn.pack(side="left", padx=6)
 
         ttk.Button(
             btn_frame,
@@ -166,11 +182,62 @@ class SPACadastro(ttk.Frame):
             )
             return
 
+        # Avisa antes de gravar uma candidatura repetida (consulta em segundo plano)
+        self.save_btn.config(state="disabled")
+        self.async_store.call(
+            "find_duplicate",
+            doc,
+            callback=lambda dup: self._confirm_and_insert(doc, dup),
+            errback=self._on_error,
+        )
+
+    def _confirm_and_insert(self, doc, duplicate: bool):
+        if not self._alive():
+            return
+
+        on_duplicate = "reject"
+        if duplicate:
+            if not messagebox.askyesno(
+                "Candidatura duplicada",
+                "Já existe uma candidatura para esta empresa, cargo e link.\n\n"
+                "Deseja atualizar o registro existente com estes dados?",
+            ):
+                self.save_btn.config(state="normal")
+                return
+            on_duplicate = "merge"
+
         # Insere no banco
-        res = self.datastore.insert_candidatura(doc)
+        self.async_store.call(
+            "insert_candidatura",
+            doc,
+            on_duplicate=on_duplicate,
+            callback=self._on_saved,
+            errback=self._on_error,
+        )
+
+    def _on_saved(self, res):
+        if not self._alive():
+            return
+        self.save_btn.config(state="normal")
 
         if res.get("ok"):
-            messagebox.showinfo("Sucesso", "Registro salvo!")
+            msg = "Registro atualizado!" if res.get("merged") else "Registro salvo!"
+            messagebox.showinfo("Sucesso", msg)
             self._clear_form()
+        elif res.get("duplicate"):
+            messagebox.showwarning("Duplicada", res.get("msg", "Candidatura já cadastrada."))
         else:
             messagebox.showerror("Erro", "Falha ao salvar no banco.")
+
+    def _on_error(self, exc):
+        if not self._alive():
+            return
+        self.save_btn.config(state="normal")
+        messagebox.showerror("Erro", f"Falha ao salvar no banco:\n{exc}")
+
+    def _alive(self) -> bool:
+        """A resposta pode chegar depois de a tela ter sido trocada."""
+        try:
+            return bool(self.winfo_exists())
+        except tk.TclError:
+            return False
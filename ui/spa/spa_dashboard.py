@@ -2,8 +2,10 @@
 Dashboard — Painel embutido de gráficos.
 """
 
+import tkinter as tk
 from tkinter import ttk, messagebox
 
+from core.rollups import DEFAULT_WINDOW, WINDOWS
 from graphics.dashboard_graphs import DashboardGraphs
 from ui.widgets import InfoLabel
 
@@ -11,10 +13,11 @@ from ui.widgets import InfoLabel
 class SPADashboard(ttk.Frame):
     """Painel SPA do Dashboard (gráficos)."""
 
-    def __init__(self, parent, datastore):
+    def __init__(self, parent, datastore, async_store):
         super().__init__(parent, padding=12)
 
         self.datastore = datastore
+        self.async_store = async_store
         self._dashboard = None
 
         self.columnconfigure(0, weight=1)
@@ -42,6 +45,31 @@ class SPADashboard(ttk.Frame):
         self.summary_label = InfoLabel(header, text="Candidaturas: 0")
         self.summary_label.grid(row=0, column=1, sticky="e")
 
+        # seletor da janela da linha do tempo
+        window_frame = ttk.Frame(header)
+        window_frame.grid(row=1, column=0, sticky="w", pady=(4, 0))
+        InfoLabel(window_frame, text="Período:").pack(side="left", padx=(0, 6))
+
+        self.window_var = tk.StringVar(value=DEFAULT_WINDOW)
+        window_box = ttk.Combobox(
+            window_frame,
+            textvariable=self.window_var,
+            values=list(WINDOWS),
+            state="readonly",
+            width=10,
+        )
+        window_box.pack(side="left")
+        window_box.bind("<<ComboboxSelected>>", self._on_window_change)
+
+        # candidaturas arquivadas (ver core/archive.py) entram na contagem por status
+        self.archived_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            window_frame,
+            text="Incluir arquivadas",
+            variable=self.archived_var,
+            command=self._on_archived_change,
+        ).pack(side="left", padx=(12, 0))
+
         # Painel de gráficos
         body = ttk.Frame(self)
         body.grid(row=1, column=0, sticky="nsew")
@@ -50,15 +78,23 @@ class SPADashboard(ttk.Frame):
 
         try:
             self._dashboard = DashboardGraphs(
-                parent=body, datastore=self.datastore
+                parent=body, datastore=self.datastore, async_store=self.async_store
             )
             self._dashboard.build()
-            self._dashboard.refresh()
+            self._dashboard.start()
         except Exception as e:
             InfoLabel(body, text=f"Erro ao carregar gráficos:\n{e}").grid(
                 row=0, column=0, sticky="nsew", padx=12, pady=12
             )
 
+    def _on_window_change(self, event=None):
+        if self._dashboard:
+            self._dashboard.set_window(self.window_var.get())
+
+    def _on_archived_change(self):
+        if self._dashboard:
+            self._dashboard.set_include_archived(self.archived_var.get())
+
     # =====================================================================
     # (chamada pelo ícone ↻ externo)
     # =====================================================================
@@ -71,3 +107,14 @@ class SPADashboard(ttk.Frame):
                 messagebox.showerror(
                     "Erro", f"Não foi possível atualizar:\n{e}"
                 )
+
+    # =====================================================================
+    # (chamada pelo MainWindow quando chegam mudanças ao vivo)
+    # =====================================================================
+    def apply_changes(self, events):
+        """Atualiza os gráficos de forma incremental com os eventos recebidos."""
+        if self._dashboard:
+            try:
+                self._dashboard.apply_changes(events)
+            except Exception:
+                pass
@@ -1,26 +1,47 @@
 """
 SPA Visualização — Tabela de candidaturas.
+
+Permite também alterar o status e excluir a candidatura selecionada, e
+verificar em segundo plano se os links das vagas ainda estão no ar
+(coluna "Vaga ativa?", ver core/linkcheck.py).
+
+Gravações (desta ou de outra tela, ou de outro processo) chegam como
+eventos via MainWindow → `apply_changes`; a tabela não é relida.
+
+A coluna "Observações" mostra só a prévia do texto; o texto completo da
+linha selecionada é lido sob demanda e aparece no painel de detalhes.
 """
 
+import queue
+import threading
+import tkinter as tk
 from tkinter import ttk, messagebox
 import tkinter.font as tkfont
+import math
 import webbrowser
 
+from core.events import DELETED, INSERTED, UPDATED, VersionTracker
+from core.table import CandidaturaTable, is_preview
 from ui.widgets import InfoLabel
 
 
 class SPAVisualizacao(ttk.Frame):
     """Painel SPA que exibe as candidaturas cadastradas."""
 
-    def __init__(self, parent, datastore):
+    def __init__(self, parent, datastore, async_store):
         super().__init__(parent, padding=12)
 
         self.datastore = datastore
+        self.async_store = async_store  # leituras/escritas fora da thread do Tk
         # Paginação
         self.page = 0
         self.page_size = 20
         self.total_pages = 1
 
+        # Registros carregados (ordem: data decrescente), em formato colunar
+        self._table = CandidaturaTable()
+        self._loaded = VersionTracker()  # versão dos dados da última carga
+
         self.columnconfigure(0, weight=1)
         self.rowconfigure(1, weight=1)
 
@@ -49,6 +70,7 @@ class SPAVisualizacao(ttk.Frame):
             "data",
             "tipo",
             "status",
+            "ativa",
             "observacoes",
         ]
 
@@ -66,6 +88,7 @@ class SPAVisualizacao(ttk.Frame):
         self.tree.heading("data", text="Data", anchor="w")
         self.tree.heading("tipo", text="Modelo", anchor="w")
         self.tree.heading("status", text="Status", anchor="w")
+        self.tree.heading("ativa", text="Vaga ativa?", anchor="w")
         self.tree.heading("observacoes", text="Observações", anchor="w")
 
         # Larguras, alinhamento e stretch para melhor redimensionamento
@@ -75,9 +98,11 @@ class SPAVisualizacao(ttk.Frame):
         self.tree.column("data", width=100, minwidth=60, anchor="w", stretch=False)
         self.tree.column("tipo", width=100, minwidth=60, anchor="w", stretch=False)
         self.tree.column("status", width=110, minwidth=70, anchor="w", stretch=False)
+        self.tree.column("ativa", width=90, minwidth=60, anchor="w", stretch=False)
         self.tree.column("observacoes", width=300, minwidth=120, anchor="w", stretch=True)
 
         self.tree.grid(row=1, column=0, sticky="nsew")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
 
         # Scrollbars: vertical à direita e horizontal abaixo
         vscroll = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
@@ -96,9 +121,22 @@ class SPAVisualizacao(ttk.Frame):
         except Exception:
             pass
 
+        # -----------------------------------------------------------------
+        # Detalhes: observações completas da linha selecionada
+        # -----------------------------------------------------------------
+        detail = ttk.LabelFrame(self, text="Descrição e Requisitos", padding=6)
+        detail.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+        detail.columnconfigure(0, weight=1)
+
+        self.detail_text = tk.Text(detail, height=6, wrap="word", state="disabled")
+        self.detail_text.grid(row=0, column=0, sticky="ew")
+        detail_scroll = ttk.Scrollbar(detail, orient="vertical", command=self.detail_text.yview)
+        self.detail_text.configure(yscrollcommand=detail_scroll.set)
+        detail_scroll.grid(row=0, column=1, sticky="ns")
+
         # paginação (prev / página / next)
         pag_frame = ttk.Frame(self)
-        pag_frame.grid(row=3, column=0, sticky="w", pady=(8, 0))
+        pag_frame.grid(row=4, column=0, sticky="w", pady=(8, 0))
 
         self.prev_btn = ttk.Button(pag_frame, text="◀", command=self._on_prev, style="Icon.TButton", width=3)
         self.prev_btn.pack(side="left", padx=(0, 6))
@@ -109,11 +147,31 @@ class SPAVisualizacao(ttk.Frame):
         self.next_btn = ttk.Button(pag_frame, text="▶", command=self._on_next, style="Icon.TButton", width=3)
         self.next_btn.pack(side="left", padx=(0, 6))
 
+        # candidaturas arquivadas (ver core/archive.py) só aparecem se pedidas
+        self.archived_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            pag_frame,
+            text="Incluir arquivadas",
+            variable=self.archived_var,
+            command=self._load_data,
+        ).pack(side="left", padx=(12, 0))
+
         # -----------------------------------------------------------------
-        # Botões inferiores (somente link)
+        # Botões inferiores (edição + link)
         # -----------------------------------------------------------------
         btn_frame = ttk.Frame(self)
-        btn_frame.grid(row=4, column=0, sticky="e", pady=(8, 0))
+        btn_frame.grid(row=5, column=0, sticky="e", pady=(8, 0))
+
+        ttk.Button(btn_frame, text="Alterar Status", command=self._change_status).pack(
+            side="left", padx=4
+        )
+
+        ttk.Button(btn_frame, text="Excluir", command=self._delete_selected).pack(
+            side="left", padx=4
+        )
+
+        self.check_btn = ttk.Button(btn_frame, text="Verificar Links", command=self._check_links)
+        self.check_btn.pack(side="left", padx=4)
 
         ttk.Button(btn_frame, text="Abrir Link", command=self._open_link).pack(
             side="left", padx=4
@@ -136,24 +194,88 @@ class SPAVisualizacao(ttk.Frame):
     # CARREGAR DADOS (é chamado via ↻ no MainWindow)
     # =====================================================================
     def _load_data(self):
-        """Carrega registros do banco e atualiza a tabela."""
+        """Carrega registros do banco em segundo plano e atualiza a tabela."""
+        # cliques repetidos em ↻ disparam no máximo a carga atual e a última
+        self.async_store.submit(
+            self.datastore.events.consistent,
+            self.datastore.load_table,
+            include_archived=self.archived_var.get(),
+            key="visualizacao.load",
+            callback=self._on_loaded,
+            errback=lambda e: self._alive() and messagebox.showerror(
+                "Erro", f"Falha ao carregar dados:\n{e}"
+            ),
+        )
+
+    def _on_loaded(self, result):
+        if not self._alive():
+            return
+        self._table, version = result
+        # gravações feitas durante a leitura (inserir/alterar/excluir de
+        # novo o mesmo registro não tem efeito)
+        self._apply(self._loaded.loaded(version))
+        self._render_page()
+
+    def _alive(self) -> bool:
+        """A resposta pode chegar depois de a tela ter sido trocada."""
         try:
-            rows = self.datastore.list_candidaturas()
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao carregar dados:\n{e}")
+            return bool(self.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def apply_changes(self, events):
+        """
+        Aplica eventos de mudança ao vivo sem reler a base: novas linhas
+        entram na posição certa (bisect), alteradas são reposicionadas,
+        excluídas saem, e só a página atual é redesenhada.
+        """
+        events = self._loaded.fresh(events)
+        if not events:
             return
+        if self._apply(events):
+            self._render_page()
+        else:
+            self._load_data()
 
+    def _apply(self, events) -> bool:
+        """Aplica os eventos à tabela; False se for preciso recarregar."""
+        for ev in events:
+            rid = ev.record.get("id")
+            if ev.kind not in (INSERTED, UPDATED, DELETED) or not rid:
+                return False
+
+            # a data (anterior, nos eventos locais) localiza o registro por bisect
+            i = self._table.index_of(rid, (ev.previous or ev.record).get("data"))
+            if ev.kind == INSERTED:
+                if i < 0:
+                    self._table.insort_desc(ev.record)
+                continue
+            if i < 0:
+                continue  # já aplicado
+            if not ev.version:
+                # de outro processo: o texto completo em cache pode ter mudado
+                self.datastore.obs_cache.discard(rid)
+
+            row = self._table.row(i)
+            self._table.delete(i)
+            if ev.kind == UPDATED:
+                row.update({k: v for k, v in ev.record.items() if k in row})
+                self._table.insort_desc(row)
+        return True
+
+    def _render_page(self):
+        """Redesenha apenas a página atual a partir de `self._table`."""
         # Atualiza paginação
-        total = len(rows or [])
-        import math
+        total = len(self._table)
         self.total_pages = max(1, math.ceil(total / self.page_size))
         if self.page >= self.total_pages:
             self.page = self.total_pages - 1
 
         start = self.page * self.page_size
         end = start + self.page_size
-        page_rows = (rows or [])[start:end]
+        page_rows = self._table.rows(start, end)
 
+        selected = self.tree.selection()
         for i in self.tree.get_children():
             self.tree.delete(i)
 
@@ -161,6 +283,7 @@ class SPAVisualizacao(ttk.Frame):
             self.tree.insert(
                 "",
                 "end",
+                iid=row.get("id") or None,
                 values=(
                     row.get("empresa", ""),
                     row.get("cargo", ""),
@@ -168,10 +291,16 @@ class SPAVisualizacao(ttk.Frame):
                     row.get("data", ""),
                     row.get("tipo", ""),
                     row.get("status", ""),
-                    row.get("observacoes", ""),
+                    self._link_state(row.get("link", "")),
+                    " ".join(row.get("observacoes", "").split()),
                 ),
             )
 
+        # a seleção sobrevive ao redesenho se a linha continua na página
+        keep = [iid for iid in selected if self.tree.exists(iid)]
+        if keep:
+            self.tree.selection_set(keep)
+
         # ajusta colunas automaticamente com base no conteúdo visível
         try:
             self._autosize_columns(page_rows)
@@ -183,6 +312,42 @@ class SPAVisualizacao(ttk.Frame):
         self.prev_btn.config(state=("disabled" if self.page <= 0 else "normal"))
         self.next_btn.config(state=("disabled" if self.page >= self.total_pages-1 else "normal"))
 
+    # =====================================================================
+    # DETALHES (observações completas sob demanda)
+    # =====================================================================
+    def _on_select(self, event=None):
+        selected = self.tree.selection()
+        if not selected:
+            self._show_details("")
+            return
+
+        rid = selected[0]
+        i = self._table.index_of(rid, self.tree.item(rid, "values")[3])
+        if i < 0:
+            self._show_details("")
+            return
+
+        row = self._table.row(i)
+        self._show_details(row["observacoes"])
+        if not is_preview(row["observacoes"]):
+            return  # a prévia já é o texto inteiro
+
+        def done(text):
+            # a resposta só vale se a linha ainda estiver selecionada
+            if self._alive() and self.tree.selection()[:1] == (rid,):
+                self._show_details(row["observacoes"] if text is None else text)
+
+        self.async_store.submit(
+            self.datastore.get_observacoes, rid, row["data"],
+            key="visualizacao.detalhes", callback=done,
+        )
+
+    def _show_details(self, text: str):
+        self.detail_text.configure(state="normal")
+        self.detail_text.delete("1.0", "end")
+        self.detail_text.insert("1.0", text)
+        self.detail_text.configure(state="disabled")
+
     # =====================================================================
     # REDIMENSIONAMENTO AUTOMÁTICO
     # =====================================================================
@@ -216,7 +381,8 @@ class SPAVisualizacao(ttk.Frame):
                 "data": 0.08,
                 "tipo": 0.08,
                 "status": 0.10,
-                "observacoes": 0.08,
+                "ativa": 0.06,
+                "observacoes": 0.06,
             }
 
             for col, r in ratios.items():
@@ -240,6 +406,82 @@ class SPAVisualizacao(ttk.Frame):
         values = self.tree.item(selected[0], "values")
         return values[2]  # índice do link
 
+    def _get_selected_row(self):
+        """Linha completa (com id) da candidatura selecionada."""
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Aviso", "Selecione uma candidatura.")
+            return None
+
+        i = self._table.index_of(selected[0], self.tree.item(selected[0], "values")[3])
+        if i < 0:
+            messagebox.showwarning(
+                "Aviso", "Registro sem identificador; atualize a tela (↻) e tente de novo."
+            )
+            return None
+        return self._table.row(i)
+
+    def _change_status(self):
+        row = self._get_selected_row()
+        if row is None:
+            return
+
+        dialog = tk.Toplevel(self)
+        dialog.title("Alterar Status")
+        dialog.transient(self.winfo_toplevel())
+        dialog.resizable(False, False)
+
+        frame = ttk.Frame(dialog, padding=12)
+        frame.pack(fill="both", expand=True)
+
+        InfoLabel(frame, text=f"{row['empresa']} — {row['cargo']}").pack(anchor="w", pady=(0, 8))
+
+        status_var = tk.StringVar(value=row["status"] or "Inscrito")
+        ttk.Combobox(
+            frame,
+            textvariable=status_var,
+            values=["Inscrito", "Entrevista", "Rejeitado", "Contratado"],
+            state="readonly",
+        ).pack(fill="x")
+
+        def salvar():
+            novo = status_var.get()
+            dialog.destroy()
+            if novo == row["status"]:
+                return
+
+            def done(res):
+                if not self._alive():
+                    return
+                if not res.get("ok"):
+                    messagebox.showerror("Erro", res.get("msg", "Falha ao alterar."))
+                # a tabela é atualizada pelo evento do DataStore
+
+            self.async_store.call(
+                "update_candidatura", row["id"], {"status": novo}, previous=row, callback=done
+            )
+
+        ttk.Button(frame, text="Salvar", command=salvar).pack(anchor="e", pady=(8, 0))
+        dialog.grab_set()
+
+    def _delete_selected(self):
+        row = self._get_selected_row()
+        if row is None:
+            return
+
+        if not messagebox.askyesno(
+            "Excluir", f"Excluir a candidatura {row['empresa']} — {row['cargo']}?"
+        ):
+            return
+
+        def done(res):
+            if not self._alive():
+                return
+            if not res.get("ok"):
+                messagebox.showerror("Erro", res.get("msg", "Falha ao excluir."))
+
+        self.async_store.call("delete_candidatura", row["id"], previous=row, callback=done)
+
     def _open_link(self):
         link = self._get_selected_link()
         if not link:
@@ -262,18 +504,72 @@ class SPAVisualizacao(ttk.Frame):
             "Copiado", "Link copiado para área de transferência."
         )
 
+    # =====================================================================
+    # VAGA ATIVA? (verificação dos links)
+    # =====================================================================
+    def _link_state(self, link: str) -> str:
+        """Texto da coluna a partir do cache (sem rede)."""
+        if not link:
+            return ""
+        res = self.datastore.link_checker.result(link)
+        if res is None:
+            return ""
+        return {True: "Sim", False: "Não"}.get(res.get("ativa"), "?")
+
+    def _check_links(self):
+        """Verifica em segundo plano os links sem resultado ou vencidos (TTL)."""
+        links = list(self._table.link)
+        updates: "queue.Queue" = queue.Queue()
+
+        def worker():
+            try:
+                res = self.datastore.link_checker.check_many(
+                    links, progress=lambda done, total: updates.put(("progress", (done, total)))
+                )
+                updates.put(("done", len(res)))
+            except Exception as e:
+                updates.put(("error", e))
+
+        self.check_btn.config(state="disabled")
+        threading.Thread(target=worker, name="linkcheck-ui", daemon=True).start()
+        self._poll_link_check(updates)
+
+    def _poll_link_check(self, updates: "queue.Queue"):
+        if not self.winfo_exists():
+            return
+
+        while True:
+            try:
+                kind, value = updates.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                self.check_btn.config(text=f"Verificando {value[0]}/{value[1]}")
+                continue
+
+            self.check_btn.config(text="Verificar Links", state="normal")
+            if kind == "error":
+                messagebox.showerror("Erro", f"Falha ao verificar links:\n{value}")
+            elif value == 0:
+                messagebox.showinfo("Links", "Todos os links já foram verificados recentemente.")
+            self._render_page()
+            return
+
+        self.after(200, self._poll_link_check, updates)
+
     # =====================================================================
     # PAGINAÇÃO
     # =====================================================================
     def _on_prev(self):
         if self.page > 0:
             self.page -= 1
-            self._load_data()
+            self._render_page()
 
     def _on_next(self):
         if self.page < self.total_pages - 1:
             self.page += 1
-            self._load_data()
+            self._render_page()
 
     # =====================================================================
     # AUTO SIZE COLUMNS
@@ -293,6 +589,7 @@ class SPAVisualizacao(ttk.Frame):
             "data",
             "tipo",
             "status",
+            "ativa",
             "observacoes",
         ]
 
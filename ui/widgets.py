@@ -2,7 +2,9 @@
 Componentes reutilizáveis de UI para o Meu Emprego.
 """
 
+import tkinter as tk
 from tkinter import ttk
+from typing import Callable, List
 
 
 class BaseFrame(ttk.Frame):
@@ -33,3 +35,99 @@ def ActionButton(
     if width is not None:
         params["width"] = width
     return ttk.Button(master, **params)
+
+
+class AutocompleteEntry(ttk.Entry):
+    """
+    Entry com lista de sugestões logo abaixo do campo.
+
+    `suggest(texto)` devolve os valores a sugerir e é chamado a cada tecla,
+    na thread do Tk (deve ser rápido — ver core/autocomplete.py). ↓ entra
+    na lista; Enter/clique escolhe; Esc fecha.
+    """
+
+    _IGNORED_KEYS = {"Up", "Down", "Return", "Escape", "Tab", "ISO_Left_Tab",
+                     "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R"}
+
+    def __init__(self, master, suggest: Callable[[str], List[str]], textvariable, **kwargs):
+        super().__init__(master, textvariable=textvariable, **kwargs)
+        self._suggest = suggest
+        self._var = textvariable
+        self._popup = None
+        self._listbox = None
+
+        self.bind("<KeyRelease>", self._on_key, add="+")
+        self.bind("<Down>", self._enter_list, add="+")
+        self.bind("<Escape>", lambda e: self._hide(), add="+")
+        self.bind("<FocusOut>", lambda e: self.after(150, self._hide_if_unfocused), add="+")
+
+    def _on_key(self, event):
+        if event.keysym in self._IGNORED_KEYS:
+            return
+        text = self._var.get()
+        values = self._suggest(text) if text.strip() else []
+        if not values or (len(values) == 1 and values[0].casefold() == text.strip().casefold()):
+            self._hide()
+            return
+        self._show(values)
+
+    def _show(self, values: List[str]):
+        if self._popup is None:
+            self._popup = tk.Toplevel(self)
+            self._popup.wm_overrideredirect(True)
+            self._listbox = tk.Listbox(self._popup, activestyle="dotbox", exportselection=False)
+            self._listbox.pack(fill="both", expand=True)
+            self._listbox.bind("<ButtonRelease-1>", self._choose)
+            self._listbox.bind("<Return>", self._choose)
+            self._listbox.bind("<Escape>", lambda e: (self._hide(), self.focus_set()))
+            self._listbox.bind("<Up>", self._leave_list)
+            self._listbox.bind("<FocusOut>", lambda e: self.after(150, self._hide_if_unfocused))
+
+        self._listbox.delete(0, "end")
+        for v in values:
+            self._listbox.insert("end", v)
+        self._listbox.configure(height=len(values))
+        self._popup.wm_geometry(
+            f"{self.winfo_width()}x{self._listbox.winfo_reqheight()}"
+            f"+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}"
+        )
+        self._popup.deiconify()
+        self._popup.lift()
+
+    def _hide(self):
+        if self._popup is not None:
+            try:
+                self._popup.withdraw()
+            except tk.TclError:  # tela já destruída
+                pass
+
+    def _hide_if_unfocused(self):
+        try:
+            focus = self.focus_get()
+        except (KeyError, tk.TclError):
+            focus = None
+        if focus not in (self, self._listbox):
+            self._hide()
+
+    def _enter_list(self, event=None):
+        if self._popup is None or not self._popup.winfo_viewable():
+            return
+        self._listbox.focus_set()
+        self._listbox.selection_clear(0, "end")
+        self._listbox.selection_set(0)
+        self._listbox.activate(0)
+        return "break"
+
+    def _leave_list(self, event=None):
+        if self._listbox.index("active") == 0:
+            self.focus_set()
+            return "break"
+
+    def _choose(self, event=None):
+        sel = self._listbox.curselection()
+        if sel:
+            self._var.set(self._listbox.get(sel[0]))
+            self.icursor("end")
+        self._hide()
+        self.focus_set()
+        return "break"